@@ -14,6 +14,10 @@ This adapter provides:
 Credentials are retrieved from AWS Secrets Manager (production) with fallback
 to environment variables (local development).
 
+Every request runs under a per-host dependency ("carrier:<host>") in
+shared/dependency_registry.py: adaptive concurrency limit, circuit breaker
+and latency histogram.
+
 Secret ARN: faiston-one/postal/credentials
 Secret Format: {"usuario": "...", "token": "...", "id_perfil": "..."}
 """
@@ -31,6 +35,8 @@ from xml.etree import ElementTree as ET
 import boto3
 from botocore.exceptions import ClientError
 
+from shared.dependency_registry import guarded_httpx_transport
+
 from .base import (
     ShippingAdapter,
     QuoteResult,
@@ -252,7 +258,10 @@ class PostalServiceAdapter(ShippingAdapter):
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(timeout=self.timeout)
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                transport=guarded_httpx_transport(lambda request: f"carrier:{request.url.host}"),
+            )
         return self._client
 
     async def get_quotes(
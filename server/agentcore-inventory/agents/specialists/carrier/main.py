@@ -72,7 +72,7 @@ class QuotesResponseModel(BaseModel):
 
 
 # Centralized model configuration (MANDATORY - Gemini 3.0 Flash for speed)
-from agents.utils import get_model, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
@@ -1201,6 +1201,9 @@ def main():
     # Create FastAPI app
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+
     # Add /ping endpoint for health checks
     @app.get("/ping")
     async def ping():
@@ -29,7 +29,7 @@ from fastapi import FastAPI
 import uvicorn
 
 # Centralized model configuration (MANDATORY - Gemini 3.0 Pro for complex reasoning)
-from agents.utils import get_model, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
@@ -79,7 +79,7 @@ AGENT_SKILLS = [
     ),
     AgentSkill(
         name="audit_compliance",
-        description="Verify audit trail completeness for an entity (events, timestamps, responsible parties)",
+        description="Audit historical movements against the approval matrix (missing approvals, restricted locations, cross-project, off-hours)",
         tags=["compliance", "audit", "verification"],
     ),
     AgentSkill(
@@ -127,10 +127,11 @@ Verifica status de aprovacao:
 - Prazos de aprovacao
 
 ### 3. `audit_compliance`
-Verifica completude do audit trail:
-- Todos eventos registrados?
-- Responsaveis identificados?
-- Timestamps consistentes?
+Audita movimentacoes historicas contra a matriz de aprovacao:
+- Operacoes sem aprovacao obrigatoria
+- Locais restritos e operacoes cross-project
+- Aprovacoes retroativas, fora do horario, volumes altos
+- Auditorias longas retornam run_id para continuar
 
 ### 4. `flag_violation`
 Sinaliza violacoes de compliance:
@@ -285,36 +286,46 @@ async def check_approval_status(
 
 @tool
 async def audit_compliance(
-    entity_type: str,
-    entity_id: str,
     date_from: Optional[str] = None,
     date_to: Optional[str] = None,
+    location_id: Optional[str] = None,
+    project_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    user_id: Optional[str] = None,
     session_id: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
-    Verify audit trail completeness for an entity.
+    Audit historical movements against the approval matrix.
+
+    Streams every movement of the period/scope and reports operations
+    without required approvals, restricted-location and cross-project
+    violations, and warnings (late approvals, off-hours, bulk quantities).
 
     Args:
-        entity_type: Type of entity (MOVEMENT, ENTRY, TRANSFER, etc.)
-        entity_id: Entity ID to audit
-        date_from: Optional start date for audit range
-        date_to: Optional end date for audit range
+        date_from: Optional start date for audit range (YYYY-MM-DD)
+        date_to: Optional end date for audit range (YYYY-MM-DD)
+        location_id: Optional location code scope
+        project_id: Optional project code scope
+        run_id: Run ID of a partial audit to resume
+        user_id: User requesting the audit
         session_id: Session ID for context
 
     Returns:
-        Audit compliance result
+        Audit report (resumable=True means call again with run_id)
     """
-    logger.info(f"[{AGENT_NAME}] Auditing compliance: {entity_type}/{entity_id}")
+    logger.info(f"[{AGENT_NAME}] Auditing compliance: {date_from}..{date_to} (run={run_id})")
 
     try:
         # Import tool implementation
         from agents.compliance.tools.audit_compliance import audit_compliance_tool
 
         result = await audit_compliance_tool(
-            entity_type=entity_type,
-            entity_id=entity_id,
-            date_from=date_from,
-            date_to=date_to,
+            start_date=date_from,
+            end_date=date_to,
+            location_id=location_id,
+            project_id=project_id,
+            run_id=run_id,
+            user_id=user_id or "system",
             session_id=session_id,
         )
 
@@ -505,6 +516,9 @@ def main():
     # Create FastAPI app first
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+
     # Add /ping endpoint for health checks
     @app.get("/ping")
     async def ping():
@@ -1,8 +1,18 @@
 # =============================================================================
 # Audit Compliance Tool
 # =============================================================================
+# Audits historical movements against the approval matrix.
+#
+# The approval matrix is compiled once per container into a lookup table and
+# sent to the sga_audit_compliance MCP tool, which streams movements from
+# PostgreSQL with a server-side cursor and writes findings incrementally.
+# Long periods are audited across several invocations (resumable run_id).
+# The run is created before the first invocation, so its run_id is always
+# returned - also when a pass fails - and the audit can be resumed.
+# =============================================================================
 
 import logging
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from shared.audit_emitter import AgentAuditEmitter
 from shared.xray_tracer import trace_tool_call
@@ -11,6 +21,47 @@ logger = logging.getLogger(__name__)
 AGENT_ID = "compliance"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
+# Invocations of the MCP tool per call before returning a resumable run
+MAX_AUDIT_PASSES = 6
+
+# Time budget per MCP invocation (seconds): below the 30s Lambda timeout
+AUDIT_PASS_SECONDS = 20
+
+
+@lru_cache(maxsize=1)
+def _compiled_rules() -> Dict[str, Any]:
+    """Compile APPROVAL_REQUIREMENTS into the audit lookup table (once)."""
+    from tools.compliance_audit import compile_rules
+    from agents.compliance.tools.approval_requirements import APPROVAL_REQUIREMENTS
+    from agents.compliance.tools.validate_operation import (
+        RESTRICTED_LOCATIONS,
+        HIGH_VALUE_THRESHOLD,
+        BULK_QUANTITY_THRESHOLD,
+        BUSINESS_HOURS_START,
+        BUSINESS_HOURS_END,
+    )
+
+    return compile_rules(
+        APPROVAL_REQUIREMENTS,
+        restricted_locations=RESTRICTED_LOCATIONS - {"DESCARTE"},
+        discard_locations={"DESCARTE"},
+        high_value_threshold=HIGH_VALUE_THRESHOLD,
+        bulk_quantity_threshold=BULK_QUANTITY_THRESHOLD,
+        business_hours=(BUSINESS_HOURS_START, BUSINESS_HOURS_END),
+    )
+
+
+_db_adapter = None
+
+
+def _get_db_adapter():
+    """Lazy-load MCP Gateway adapter."""
+    global _db_adapter
+    if _db_adapter is None:
+        from tools.gateway_adapter import GatewayAdapterFactory
+        _db_adapter = GatewayAdapterFactory.create_from_env()
+    return _db_adapter
+
 
 @trace_tool_call("sga_audit_compliance")
 async def audit_compliance_tool(
@@ -18,30 +69,84 @@ async def audit_compliance_tool(
     end_date: Optional[str] = None,
     location_id: Optional[str] = None,
     project_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    user_id: str = "system",
     session_id: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Run compliance audit on historical operations."""
+    """Run (or resume) a compliance audit on historical operations."""
     audit.working(message="Executando auditoria de compliance...", session_id=session_id)
 
     try:
-        # In production, query historical movements and check each against policies
+        from tools.compliance_audit import build_recommendations
+
+        rules = _compiled_rules()
+        adapter = _get_db_adapter()
+
+        if not run_id:
+            started = await adapter.start_compliance_audit(
+                rules_version=rules["version"],
+                start_date=start_date,
+                end_date=end_date,
+                location_id=location_id,
+                project_id=project_id,
+                requested_by=user_id,
+            )
+            if not started.get("success"):
+                raise RuntimeError(started.get("error", "Audit run could not be created"))
+            run_id = started["run_id"]
+
+        result: Dict[str, Any] = {}
+        for _ in range(MAX_AUDIT_PASSES):
+            result = await adapter.audit_compliance(
+                rules=rules,
+                start_date=start_date,
+                end_date=end_date,
+                location_id=location_id,
+                project_id=project_id,
+                run_id=run_id,
+                requested_by=user_id,
+                max_seconds=AUDIT_PASS_SECONDS,
+            )
+            if not result.get("success"):
+                raise RuntimeError(result.get("error", "Audit failed"))
+
+            summary = result.get("summary", {})
+            audit.working(
+                message=f"Auditoria em andamento: {summary.get('total_operations', 0)} operações avaliadas",
+                session_id=session_id,
+            )
+            if result.get("status") == "COMPLETED":
+                break
+
+        completed = result.get("status") == "COMPLETED"
         report = {
+            "run_id": run_id,
+            "status": result.get("status"),
+            "resumable": not completed,
+            "rules_version": rules["version"],
             "audit_period": {"start": start_date or "N/A", "end": end_date or "N/A"},
             "scope": {"location_id": location_id or "ALL", "project_id": project_id or "ALL"},
-            "summary": {
+            "summary": result.get("summary", {
                 "total_operations": 0,
                 "compliant": 0,
                 "non_compliant": 0,
                 "warnings": 0,
-            },
-            "findings": [],
-            "recommendations": [],
+            }),
+            "findings_by_code": result.get("findings_by_code", {}),
+            "findings": result.get("findings", []),
+            "recommendations": build_recommendations(result.get("findings_by_code", {})),
         }
 
-        audit.completed(message="Auditoria concluída", session_id=session_id)
+        if completed:
+            audit.completed(message="Auditoria concluída", session_id=session_id)
+        else:
+            audit.completed(
+                message="Auditoria parcial - chame novamente com run_id para continuar",
+                session_id=session_id,
+            )
         return {"success": True, "report": report}
 
     except Exception as e:
         logger.error(f"[audit_compliance] Error: {e}", exc_info=True)
         audit.error(message="Erro na auditoria", session_id=session_id, error=str(e))
-        return {"success": False, "error": str(e)}
+        return {"success": False, "error": str(e), "run_id": run_id}
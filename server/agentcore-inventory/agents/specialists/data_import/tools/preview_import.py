@@ -4,6 +4,7 @@
 # Analyzes CSV/Excel files before import with column detection and PN matching.
 # =============================================================================
 
+import asyncio
 import csv
 import io
 import logging
@@ -13,6 +14,7 @@ from difflib import SequenceMatcher
 
 from shared.audit_emitter import AgentAuditEmitter
 from shared.xray_tracer import trace_tool_call
+from tools.pn_matcher import get_matcher
 
 logger = logging.getLogger(__name__)
 
@@ -234,47 +236,9 @@ async def match_rows_to_pn(
             elif mapping.get("target_field") == "description":
                 desc_column = mapping.get("source_column")
 
-    # Get all part numbers from database
+    # Get all part numbers from database; matcher index is cached per catalog version
     db_parts = await _get_part_numbers()
-
-    matched_rows = []
-    for row in rows:
-        row_data = dict(row)
-
-        # Try exact match by code
-        pn_value = row.get(pn_column) if pn_column else None
-        matched_pn = None
-        match_confidence = 0
-        match_method = None
-
-        if pn_value:
-            # Exact match
-            for part in db_parts:
-                if str(pn_value).strip().upper() == str(part.get("part_number", "")).strip().upper():
-                    matched_pn = part["part_number"]
-                    match_confidence = 1.0
-                    match_method = "exact"
-                    break
-
-        # Fuzzy match by description if no exact match
-        if not matched_pn and desc_column:
-            desc_value = row.get(desc_column)
-            if desc_value:
-                best_match, best_score = _fuzzy_match_description(
-                    desc_value,
-                    db_parts,
-                )
-                if best_score >= 0.8:
-                    matched_pn = best_match
-                    match_confidence = best_score
-                    match_method = "fuzzy"
-
-        row_data["matched"] = matched_pn is not None
-        row_data["matched_pn"] = matched_pn
-        row_data["match_confidence"] = match_confidence
-        row_data["match_method"] = match_method
-
-        matched_rows.append(row_data)
+    matched_rows = await asyncio.to_thread(_match_rows, rows, db_parts, pn_column, desc_column)
 
     return {
         "success": True,
@@ -410,30 +374,47 @@ def _match_column(normalized: str) -> Tuple[Optional[str], float]:
     return best_field, best_score
 
 
-def _fuzzy_match_description(
-    description: str,
+def _match_rows(
+    rows: List[Dict[str, Any]],
     parts: List[Dict[str, Any]],
-) -> Tuple[Optional[str], float]:
-    """Fuzzy match description to part numbers."""
-    if not description or not parts:
-        return None, 0
+    pn_column: Optional[str],
+    desc_column: Optional[str],
+) -> List[Dict[str, Any]]:
+    """Match rows against the PN catalog (exact PN, then fuzzy description)."""
+    matcher = get_matcher(parts)
+    description_cache: Dict[str, Tuple[Optional[str], float]] = {}
 
-    best_match = None
-    best_score = 0
+    matched_rows = []
+    for row in rows:
+        row_data = dict(row)
 
-    desc_lower = description.lower()
+        # Try exact match by code
+        pn_value = row.get(pn_column) if pn_column else None
+        matched_pn = matcher.match_exact(pn_value) if pn_value else None
+        match_confidence = 1.0 if matched_pn else 0
+        match_method = "exact" if matched_pn else None
 
-    for part in parts:
-        part_desc = part.get("description", "")
-        if not part_desc:
-            continue
+        # Fuzzy match by description if no exact match
+        if not matched_pn and desc_column:
+            desc_value = row.get(desc_column)
+            if desc_value:
+                key = str(desc_value)
+                if key not in description_cache:
+                    description_cache[key] = matcher.match_description(key)
+                best_match, best_score = description_cache[key]
+                if best_score >= 0.8:
+                    matched_pn = best_match
+                    match_confidence = best_score
+                    match_method = "fuzzy"
 
-        score = SequenceMatcher(None, desc_lower, part_desc.lower()).ratio()
-        if score > best_score:
-            best_score = score
-            best_match = part.get("part_number")
+        row_data["matched"] = matched_pn is not None
+        row_data["matched_pn"] = matched_pn
+        row_data["match_confidence"] = match_confidence
+        row_data["match_method"] = match_method
+
+        matched_rows.append(row_data)
 
-    return best_match, best_score
+    return matched_rows
 
 
 async def _get_part_numbers() -> List[Dict[str, Any]]:
@@ -31,7 +31,7 @@ from fastapi import FastAPI
 import uvicorn
 
 # Centralized model configuration (MANDATORY - Gemini 2.5 Pro + Thinking)
-from agents.utils import get_model, requires_thinking, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, requires_thinking, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # NEXO Mind - Direct Memory Access for pattern storage
 from shared.memory_manager import AgentMemoryManager
@@ -443,8 +443,10 @@ async def health_check() -> Dict[str, Any]:
     Health check endpoint for monitoring.
 
     Returns:
-        Health status with agent info
+        Health status with agent info and signature cache statistics
     """
+    from agents.specialists.debug.tools.analyze_error import get_analysis_cache_stats
+
     return {
         "status": "healthy",
         "agent_id": AGENT_ID,
@@ -456,6 +458,7 @@ async def health_check() -> Dict[str, Any]:
         "role": "SPECIALIST",
         "specialty": "ERROR_ANALYSIS",
         "memory_namespace": MEMORY_NAMESPACE,
+        "analysis_cache": get_analysis_cache_stats(),
     }
 
 
@@ -509,6 +512,9 @@ def main():
     # Create FastAPI app first
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+
     # Add /ping health endpoint for AWS ALB
     @app.get("/ping")
     async def ping():
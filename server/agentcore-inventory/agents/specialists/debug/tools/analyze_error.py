@@ -6,9 +6,14 @@
 #
 # Analysis Strategy:
 # 1. Generate error signature for pattern matching
-# 2. Query AgentCore Memory for similar patterns
-# 3. Search documentation via MCP gateways
-# 4. Apply LLM reasoning for root cause analysis
+# 2. Query AgentCore Memory and search documentation concurrently
+#    (independent timeouts - a slow source never blocks the other)
+# 3. Apply LLM reasoning for root cause analysis
+#
+# Signature Cache:
+# - Results are cached by error signature with a TTL
+# - Single-flight: concurrent requests for the same signature share
+#   one in-flight analysis (an error storm costs one analysis)
 #
 # Output:
 # - Technical explanation (pt-BR)
@@ -18,13 +23,26 @@
 # - Similar patterns
 # =============================================================================
 
+import asyncio
+import copy
 import hashlib
 import logging
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Evidence lookup timeouts (seconds) - independent per source
+MEMORY_LOOKUP_TIMEOUT = float(os.environ.get("DEBUG_MEMORY_LOOKUP_TIMEOUT", "5.0"))
+DOCS_LOOKUP_TIMEOUT = float(os.environ.get("DEBUG_DOCS_LOOKUP_TIMEOUT", "8.0"))
+
+# Signature cache configuration
+ANALYSIS_CACHE_TTL = float(os.environ.get("DEBUG_ANALYSIS_CACHE_TTL", "60.0"))
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.environ.get("DEBUG_ANALYSIS_CACHE_MAX", "1000"))
+
 # Error categories for classification
 ERROR_CATEGORIES = {
     "ValidationError": {"recoverable": False, "category": "validation"},
@@ -110,6 +128,131 @@ def classify_error(error_type: str) -> Dict[str, Any]:
     return {"recoverable": False, "category": "unknown"}
 
 
+# =============================================================================
+# Signature Cache (TTL + single-flight)
+# =============================================================================
+
+class AnalysisCache:
+    """
+    TTL cache for error analyses keyed by error signature.
+
+    Combines two mechanisms:
+    - TTL entries: completed analyses are reused until they expire
+    - Single-flight: concurrent requests for a signature already being
+      analyzed await the same future instead of starting a new analysis
+
+    In-flight futures are bound to the event loop that created them, so
+    requests arriving on a different loop run their own analysis.
+    """
+
+    def __init__(self, ttl_seconds: float = 60.0, max_entries: int = 1000):
+        """
+        Initialize AnalysisCache.
+
+        Args:
+            ttl_seconds: Seconds a completed analysis stays valid
+            max_entries: Maximum cached signatures (oldest evicted first)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._coalesced = 0
+
+    def get(self, signature: str) -> Optional[Dict[str, Any]]:
+        """Return a cached analysis if present and not expired."""
+        with self._lock:
+            entry = self._entries.get(signature)
+            if entry is None:
+                return None
+            expires_at, result = entry
+            if expires_at <= time.monotonic():
+                del self._entries[signature]
+                return None
+            self._hits += 1
+            return result
+
+    def put(self, signature: str, result: Dict[str, Any]) -> None:
+        """Store a completed analysis."""
+        with self._lock:
+            if signature not in self._entries and len(self._entries) >= self.max_entries:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[signature] = (time.monotonic() + self.ttl_seconds, result)
+
+    def join_or_lead(self, signature: str) -> Tuple[asyncio.Future, bool]:
+        """
+        Join an in-flight analysis or become its leader.
+
+        Returns:
+            Tuple of (future, is_leader). The leader must resolve the future.
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            future = self._in_flight.get(signature)
+            if future is not None and not future.done() and future.get_loop() is loop:
+                self._coalesced += 1
+                return future, False
+            self._misses += 1
+            future = loop.create_future()
+            self._in_flight[signature] = future
+            return future, True
+
+    def finish(self, signature: str, future: asyncio.Future) -> None:
+        """Drop the in-flight marker for a signature."""
+        with self._lock:
+            if self._in_flight.get(signature) is future:
+                del self._in_flight[signature]
+
+    def clear(self) -> None:
+        """Remove all cached entries and reset statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._in_flight.clear()
+            self._hits = 0
+            self._misses = 0
+            self._coalesced = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache statistics for health reporting."""
+        with self._lock:
+            served = self._hits + self._coalesced
+            total = served + self._misses
+            return {
+                "entries": len(self._entries),
+                "in_flight": len(self._in_flight),
+                "hits": self._hits,
+                "coalesced": self._coalesced,
+                "misses": self._misses,
+                "hit_rate": round(served / total, 4) if total else 0.0,
+                "ttl_seconds": self.ttl_seconds,
+            }
+
+
+_analysis_cache = AnalysisCache(
+    ttl_seconds=ANALYSIS_CACHE_TTL,
+    max_entries=ANALYSIS_CACHE_MAX_ENTRIES,
+)
+
+
+def get_analysis_cache_stats() -> Dict[str, Any]:
+    """
+    Get signature cache statistics.
+
+    Returns:
+        Dict with hits, coalesced requests, misses and hit rate
+    """
+    return _analysis_cache.stats()
+
+
+def clear_analysis_cache() -> None:
+    """Clear the signature cache (used by tests and operators)."""
+    _analysis_cache.clear()
+
+
 async def analyze_error_tool(
     error_type: str,
     message: str,
@@ -124,9 +267,11 @@ async def analyze_error_tool(
 
     This is the primary analysis function that combines:
     1. Error signature generation
-    2. Pattern matching from memory
-    3. Documentation search
-    4. LLM-based root cause analysis
+    2. Pattern matching from memory and documentation search (concurrent)
+    3. LLM-based root cause analysis
+
+    Results are cached by signature (TTL) and concurrent requests for the
+    same signature share a single in-flight analysis.
 
     Args:
         error_type: Exception class name
@@ -138,7 +283,7 @@ async def analyze_error_tool(
         session_id: Session ID for context
 
     Returns:
-        Comprehensive analysis result
+        Comprehensive analysis result (cache_hit=True when served from cache)
     """
     logger.info(f"[analyze_error] Starting analysis: {error_type} in {operation}")
 
@@ -146,45 +291,182 @@ async def analyze_error_tool(
     signature = generate_error_signature(error_type, message, operation)
     logger.debug(f"[analyze_error] Generated signature: {signature}")
 
-    # Step 2: Classify error
-    classification = classify_error(error_type)
-    is_recoverable = recoverable if recoverable is not None else classification["recoverable"]
+    # Step 2: Serve from signature cache (completed or in-flight analysis)
+    cached = _analysis_cache.get(signature)
+    if cached is not None:
+        logger.debug(f"[analyze_error] Cache hit: {signature}")
+        return _from_cache(cached, recoverable)
+
+    future, is_leader = _analysis_cache.join_or_lead(signature)
+    if not is_leader:
+        logger.debug(f"[analyze_error] Joining in-flight analysis: {signature}")
+        return _from_cache(await asyncio.shield(future), recoverable)
 
-    # Step 3: Query memory for similar patterns
-    similar_patterns = []
     try:
-        from agents.specialists.debug.tools.query_memory_patterns import query_memory_patterns_tool
+        result, cacheable = await _run_analysis(
+            signature=signature,
+            error_type=error_type,
+            message=message,
+            operation=operation,
+            stack_trace=stack_trace,
+            context=context,
+            recoverable=recoverable,
+            session_id=session_id,
+        )
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        # Followers observe the exception; avoid "never retrieved" warnings
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        if cacheable:
+            _analysis_cache.put(signature, result)
+    finally:
+        _analysis_cache.finish(signature, future)
+
+    return {**copy.deepcopy(result), "cache_hit": False}
+
+
+def _from_cache(
+    result: Dict[str, Any],
+    recoverable: Optional[bool],
+) -> Dict[str, Any]:
+    """
+    Build a response from a shared analysis.
+
+    Recoverability is re-derived per caller: an explicit recoverable flag
+    wins, otherwise the classification stored with the analysis is used.
+
+    Args:
+        result: Shared analysis result
+        recoverable: Caller override for recoverability
+
+    Returns:
+        Independent copy of the analysis marked as a cache hit
+    """
+    response = copy.deepcopy(result)
+    classification = response.get("classification", {})
+    is_recoverable = recoverable if recoverable is not None else classification.get("recoverable", False)
+    if is_recoverable != response.get("recoverable"):
+        response["recoverable"] = is_recoverable
+        response["suggested_action"] = _determine_suggested_action(
+            is_recoverable=is_recoverable,
+            classification=classification,
+            similar_patterns=response.get("similar_patterns", []),
+        )
+    response["cache_hit"] = True
+    return response
+
+
+async def _gather_evidence(
+    signature: str,
+    error_type: str,
+    message: str,
+    operation: str,
+    session_id: Optional[str],
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]], bool]:
+    """
+    Query memory patterns and documentation concurrently.
+
+    Each lookup has its own timeout, so a slow documentation search
+    never delays the memory lookup (and vice versa).
+
+    Args:
+        signature: Error signature
+        error_type: Exception class name
+        message: Error message
+        operation: Operation that failed
+        session_id: Session ID for context
 
-        memory_result = await query_memory_patterns_tool(
+    Returns:
+        Tuple of (similar_patterns, documentation_links, all_lookups_ok)
+    """
+    from agents.specialists.debug.tools.query_memory_patterns import query_memory_patterns_tool
+    from agents.specialists.debug.tools.search_documentation import search_documentation_tool
+
+    memory_lookup = asyncio.wait_for(
+        query_memory_patterns_tool(
             error_signature=signature,
             error_type=error_type,
             operation=operation,
             max_patterns=3,
             session_id=session_id,
-        )
-        if memory_result.get("success"):
-            similar_patterns = memory_result.get("patterns", [])
-    except Exception as e:
-        logger.warning(f"[analyze_error] Memory query failed: {e}")
+        ),
+        timeout=MEMORY_LOOKUP_TIMEOUT,
+    )
+    docs_lookup = asyncio.wait_for(
+        search_documentation_tool(
+            query=f"{error_type} {operation} {message[:50]}",
+            sources=["aws", "agentcore"],
+            max_results=3,
+            session_id=session_id,
+        ),
+        timeout=DOCS_LOOKUP_TIMEOUT,
+    )
+
+    memory_result, doc_result = await asyncio.gather(
+        memory_lookup, docs_lookup, return_exceptions=True
+    )
+
+    all_ok = True
+
+    similar_patterns = []
+    if isinstance(memory_result, BaseException):
+        logger.warning(f"[analyze_error] Memory query failed: {memory_result!r}")
+        all_ok = False
+    elif memory_result.get("success"):
+        similar_patterns = memory_result.get("patterns", [])
+    else:
+        all_ok = False
 
-    # Step 4: Search documentation (if no patterns found)
     documentation_links = []
-    if not similar_patterns:
-        try:
-            from agents.specialists.debug.tools.search_documentation import search_documentation_tool
-
-            doc_result = await search_documentation_tool(
-                query=f"{error_type} {operation} {message[:50]}",
-                sources=["aws", "agentcore"],
-                max_results=3,
-                session_id=session_id,
-            )
-            if doc_result.get("success"):
-                documentation_links = doc_result.get("results", [])
-        except Exception as e:
-            logger.warning(f"[analyze_error] Documentation search failed: {e}")
-
-    # Step 5: Build root causes based on analysis
+    if isinstance(doc_result, BaseException):
+        logger.warning(f"[analyze_error] Documentation search failed: {doc_result!r}")
+        all_ok = False
+    elif doc_result.get("success"):
+        documentation_links = doc_result.get("results", [])
+    else:
+        all_ok = False
+
+    return similar_patterns, documentation_links, all_ok
+
+
+async def _run_analysis(
+    signature: str,
+    error_type: str,
+    message: str,
+    operation: str,
+    stack_trace: Optional[str],
+    context: Optional[Dict[str, Any]],
+    recoverable: Optional[bool],
+    session_id: Optional[str],
+) -> Tuple[Dict[str, Any], bool]:
+    """
+    Run the full analysis for a signature (cache miss path).
+
+    Returns:
+        Tuple of (analysis result, cacheable). Analyses built while an
+        evidence source was failing are not cached, so a transient outage
+        does not pin a degraded analysis for the whole TTL.
+    """
+    # Classify error
+    classification = classify_error(error_type)
+    is_recoverable = recoverable if recoverable is not None else classification["recoverable"]
+
+    # Query memory and documentation concurrently
+    similar_patterns, documentation_links, lookups_ok = await _gather_evidence(
+        signature=signature,
+        error_type=error_type,
+        message=message,
+        operation=operation,
+        session_id=session_id,
+    )
+
+    # Build root causes based on analysis
     root_causes = _analyze_root_causes(
         error_type=error_type,
         message=message,
@@ -194,7 +476,7 @@ async def analyze_error_tool(
         similar_patterns=similar_patterns,
     )
 
-    # Step 6: Generate debugging steps
+    # Generate debugging steps
     debugging_steps = _generate_debugging_steps(
         error_type=error_type,
         operation=operation,
@@ -202,7 +484,7 @@ async def analyze_error_tool(
         similar_patterns=similar_patterns,
     )
 
-    # Step 7: Build technical explanation
+    # Build technical explanation
     technical_explanation = _build_technical_explanation(
         error_type=error_type,
         message=message,
@@ -210,14 +492,14 @@ async def analyze_error_tool(
         classification=classification,
     )
 
-    # Step 8: Determine suggested action
+    # Determine suggested action
     suggested_action = _determine_suggested_action(
         is_recoverable=is_recoverable,
         classification=classification,
         similar_patterns=similar_patterns,
     )
 
-    return {
+    result = {
         "success": True,
         "error_signature": signature,
         "error_type": error_type,
@@ -231,6 +513,7 @@ async def analyze_error_tool(
         "analysis_timestamp": datetime.utcnow().isoformat() + "Z",
         "classification": classification,
     }
+    return result, lookups_ok
 
 
 def _analyze_root_causes(
@@ -38,7 +38,7 @@ from fastapi import FastAPI
 import uvicorn
 
 # Centralized model configuration (MANDATORY - Gemini 2.5 Pro for complex reasoning)
-from agents.utils import get_model, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
@@ -630,6 +630,9 @@ def main():
     # Create FastAPI app
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+
     # Add /ping health check endpoint
     @app.get("/ping")
     async def ping():
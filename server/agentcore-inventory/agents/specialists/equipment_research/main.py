@@ -29,11 +29,14 @@ from fastapi import FastAPI
 import uvicorn
 
 # Centralized model configuration (MANDATORY - Gemini 3.0 Pro for complex reasoning)
-from agents.utils import get_model, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
 
+# Best-effort side calls (audit events) off the request path
+from shared.background_work import notify_agent, register_background_drain
+
 # Hooks for observability (ADR-002)
 from shared.hooks import LoggingHook, MetricsHook, DebugHook
 
@@ -211,8 +214,8 @@ async def research_equipment(
             session_id=session_id,
         )
 
-        # Log to ObservationAgent
-        await a2a_client.invoke_agent("observation", {
+        # Log to ObservationAgent (background, does not delay the result)
+        notify_agent(a2a_client, "observation", {
             "action": "log_event",
             "event_type": "EQUIPMENT_RESEARCHED",
             "agent_id": AGENT_ID,
@@ -369,6 +372,10 @@ def main():
     # Create FastAPI app
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+    register_background_drain(app)
+
     # Add /ping health check endpoint
     @app.get("/ping")
     async def ping():
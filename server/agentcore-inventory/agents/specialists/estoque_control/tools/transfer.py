@@ -2,9 +2,19 @@
 # Transfer Tool
 # =============================================================================
 # Create transfers between inventory locations.
+#
+# An immediate transfer is one PostgreSQL transaction reached through the
+# MCP Gateway (GatewayPostgresAdapter):
+# - with serials: transfer_assets locks and validates every serial (exists,
+#   belongs to the part number, is at the source), then writes one movement;
+#   the triggers move both balances and relocate all assets
+# - without serials: create_movement writes one TRANSFERENCIA movement and
+#   the balance trigger moves both balances (and rejects missing stock)
+# Either everything is written or nothing is.
 # =============================================================================
 
 import logging
+import time
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
@@ -17,6 +27,17 @@ logger = logging.getLogger(__name__)
 AGENT_ID = "estoque_control"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
+_db_adapter = None
+
+
+def _get_db_adapter():
+    """Lazy-load MCP Gateway adapter."""
+    global _db_adapter
+    if _db_adapter is None:
+        from tools.gateway_adapter import GatewayAdapterFactory
+        _db_adapter = GatewayAdapterFactory.create_from_env()
+    return _db_adapter
+
 
 @trace_tool_call("sga_create_transfer")
 async def create_transfer_tool(
@@ -53,6 +74,8 @@ async def create_transfer_tool(
     )
 
     try:
+        started = time.perf_counter()
+
         # 1. Check source balance
         source_balance = await _get_balance(
             part_number=part_number,
@@ -67,35 +90,40 @@ async def create_transfer_tool(
                 "data": {"source_balance": source_balance},
             }
 
-        # 2. Check if destination is restricted
+        # 2. Reject repeated serials; the rest is validated in the transaction
+        duplicates = _duplicate_serials(serial_numbers or [])
+        if duplicates:
+            return {
+                "success": False,
+                "message": f"{len(duplicates)} serial(is) inválido(s) para transferência",
+                "data": {"invalid_serials": duplicates},
+            }
+
+        # 3. Check if destination is restricted
         dest_location = await _get_location(destination_location_id)
         is_restricted = dest_location and dest_location.get("restricted", False)
 
-        # 3. Determine if HIL required
+        # 4. Determine if HIL required
         requires_hil = is_restricted
 
-        # 4. Create transfer movement
-        movement_id = _generate_id("TRF")
-        now = _now_iso()
-
-        movement_data = {
-            "movement_id": movement_id,
-            "movement_type": "TRANSFER",
-            "part_number": part_number,
-            "quantity": quantity,
-            "serial_numbers": serial_numbers or [],
-            "source_location_id": source_location_id,
-            "destination_location_id": destination_location_id,
-            "project_id": project_id,
-            "status": "PENDING_APPROVAL" if requires_hil else "COMPLETED",
-            "requested_by": requested_by,
-            "notes": notes,
-            "created_at": now,
-        }
-
-        # 5. If HIL required, create task
+        # 5. If HIL required, create task and store the pending movement
         hil_task_id = None
         if requires_hil:
+            movement_id = _generate_id("TRF")
+            movement_data = {
+                "movement_id": movement_id,
+                "movement_type": "TRANSFER",
+                "part_number": part_number,
+                "quantity": quantity,
+                "serial_numbers": serial_numbers or [],
+                "source_location_id": source_location_id,
+                "destination_location_id": destination_location_id,
+                "project_id": project_id,
+                "status": "PENDING_APPROVAL",
+                "requested_by": requested_by,
+                "notes": notes,
+                "created_at": _now_iso(),
+            }
             hil_task_id = await _create_hil_task(
                 task_type="APPROVAL_TRANSFER",
                 title=f"Aprovar transferência para local restrito: {part_number}",
@@ -112,20 +140,36 @@ async def create_transfer_tool(
             )
             movement_data["hil_task_id"] = hil_task_id
 
-        # 6. Save movement
-        await _store_movement(movement_data)
-
-        # 7. If not HIL, execute transfer
-        if not requires_hil:
-            await _execute_transfer(
-                movement_id=movement_id,
+            # Executed after approval
+            await _store_movement(movement_data)
+        else:
+            # 6. Movement, balances and serials in one transaction
+            result = await _execute_transfer(
                 part_number=part_number,
                 quantity=quantity,
                 serial_numbers=serial_numbers,
                 source_location_id=source_location_id,
                 destination_location_id=destination_location_id,
                 project_id=project_id,
+                requested_by=requested_by,
+                notes=notes,
             )
+            if not result.get("success"):
+                invalid = result.get("invalid_serials") or []
+                return {
+                    "success": False,
+                    "message": (
+                        f"{len(invalid)} serial(is) inválido(s) para transferência" if invalid
+                        else f"Transferência não executada: {result.get('error')}"
+                    ),
+                    "data": {"invalid_serials": invalid} if invalid else {"error": result.get("error")},
+                }
+            movement_id = result["movement_id"]
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(
+            f"[create_transfer] {movement_id}: {len(serial_numbers or [])} serials, {duration_ms}ms"
+        )
 
         audit.completed(
             message=f"Transferência {'executada' if not requires_hil else 'aguardando aprovação'}: {movement_id}",
@@ -133,6 +177,8 @@ async def create_transfer_tool(
             details={
                 "movement_id": movement_id,
                 "requires_hil": requires_hil,
+                "serials_count": len(serial_numbers or []),
+                "duration_ms": duration_ms,
             },
         )
 
@@ -147,6 +193,8 @@ async def create_transfer_tool(
                 "movement_type": "TRANSFER",
                 "source": source_location_id,
                 "destination": destination_location_id,
+                "serials_count": len(serial_numbers or []),
+                "duration_ms": duration_ms,
             },
         }
 
@@ -164,43 +212,62 @@ async def create_transfer_tool(
 
 
 async def _execute_transfer(
-    movement_id: str,
     part_number: str,
     quantity: int,
     serial_numbers: Optional[List[str]],
     source_location_id: str,
     destination_location_id: str,
     project_id: str,
-) -> None:
+    requested_by: str = "system",
+    notes: Optional[str] = None,
+) -> Dict[str, Any]:
     """
-    Execute the balance updates for a transfer.
+    Execute a transfer in one PostgreSQL transaction.
+
+    Called after approval (or immediately if no HIL). Serialized transfers
+    move exactly the given serials; the quantity is their count.
 
-    Called after approval (or immediately if no HIL).
+    Returns:
+        Gateway result: success, movement_id, or error / invalid_serials
     """
-    # Decrement source balance
-    await _update_balance(
-        part_number=part_number,
-        location_id=source_location_id,
-        project_id=project_id,
-        quantity_delta=-quantity,
-    )
+    adapter = _get_db_adapter()
 
-    # Increment destination balance
-    await _update_balance(
+    if serial_numbers:
+        return await adapter.transfer_assets(
+            part_number=part_number,
+            source_location_id=source_location_id,
+            destination_location_id=destination_location_id,
+            serial_numbers=list(serial_numbers),
+            project_id=project_id,
+            reason=notes,
+            requested_by=requested_by,
+        )
+
+    from tools.database_adapter import MovementData, MovementType
+
+    result = await adapter.create_movement(MovementData(
+        movement_type=MovementType.TRANSFERENCIA,
         part_number=part_number,
-        location_id=destination_location_id,
+        quantity=quantity,
+        source_location_id=source_location_id,
+        destination_location_id=destination_location_id,
         project_id=project_id,
-        quantity_delta=quantity,
-    )
+        reason=notes,
+    ))
+    if result.get("error") and "success" not in result:
+        return {"success": False, "error": result["error"]}
+    return result
 
-    # Update asset locations if serial numbers
-    for serial in (serial_numbers or []):
-        await _update_asset_status(
-            serial_number=serial,
-            new_status="IN_STOCK",
-            location_id=destination_location_id,
-            movement_id=movement_id,
-        )
+
+def _duplicate_serials(serial_numbers: List[str]) -> List[Dict[str, str]]:
+    """Serials listed more than once in the same transfer."""
+    seen = set()
+    duplicates = []
+    for serial in serial_numbers:
+        if serial in seen:
+            duplicates.append({"serial_number": serial, "reason": "Serial duplicado na transferência"})
+        seen.add(serial)
+    return duplicates
 
 
 # =============================================================================
@@ -212,17 +279,18 @@ async def _get_balance(
     location_id: str,
     project_id: str,
 ) -> Dict[str, Any]:
-    """Get balance from database."""
-    try:
-        from tools.db_client import DBClient
-        db = DBClient()
-        return await db.get_balance(
-            part_number=part_number,
-            location_id=location_id,
-            project_id=project_id,
-        ) or {"total": 0, "reserved": 0, "available": 0}
-    except ImportError:
-        return {"total": 0, "reserved": 0, "available": 0}
+    """Get balance at a location (same database the transfer writes to)."""
+    result = await _get_db_adapter().get_balance(
+        part_number=part_number,
+        location_id=location_id,
+        project_id=project_id,
+    )
+    summary = (result or {}).get("summary") or {}
+    return {
+        "total": summary.get("total_quantity", 0),
+        "reserved": summary.get("total_reserved", 0),
+        "available": summary.get("total_available", 0),
+    }
 
 
 async def _get_location(location_id: str) -> Optional[Dict[str, Any]]:
@@ -245,55 +313,6 @@ async def _store_movement(movement_data: Dict[str, Any]) -> None:
         logger.warning("[transfer] DBClient not available")
 
 
-async def _update_balance(
-    part_number: str,
-    location_id: str,
-    project_id: str,
-    quantity_delta: int,
-) -> None:
-    """Update total balance."""
-    try:
-        from tools.db_client import DBClient
-        db = DBClient()
-        await db.update_balance(
-            part_number=part_number,
-            location_id=location_id,
-            project_id=project_id,
-            quantity_delta=quantity_delta,
-            reserved_delta=0,
-        )
-    except ImportError:
-        logger.warning("[transfer] DBClient not available")
-
-
-async def _update_asset_status(
-    serial_number: str,
-    new_status: str,
-    location_id: str,
-    movement_id: str,
-) -> None:
-    """Update asset status after movement."""
-    try:
-        from tools.db_client import DBClient
-        db = DBClient()
-
-        asset = await db.get_asset_by_serial(serial_number)
-        if not asset:
-            return
-
-        await db.update_asset(
-            asset_id=asset["asset_id"],
-            updates={
-                "status": new_status,
-                "location_id": location_id,
-                "last_movement_id": movement_id,
-                "updated_at": _now_iso(),
-            },
-        )
-    except ImportError:
-        logger.warning("[transfer] DBClient not available")
-
-
 async def _create_hil_task(
     task_type: str,
     title: str,
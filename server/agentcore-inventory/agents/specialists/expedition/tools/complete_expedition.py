@@ -1,8 +1,19 @@
 # =============================================================================
 # Complete Expedition Tools
 # =============================================================================
+# Stock is shipped with one Gateway call (sga_complete_expedition): a single
+# PostgreSQL transaction releases every reservation of the expedition and
+# writes the LIBERACAO and EXPEDIÇÃO movements, one per balance, whatever the
+# number of items. The expedition record (DynamoDB) is marked COMPLETED
+# afterwards, conditioned on the status it was read with.
+#
+# The PostgreSQL transaction is idempotent per expedition, so a completion
+# retried after a failed status update does not ship the stock twice.
+# =============================================================================
 
+import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional
 from datetime import datetime
 import uuid
@@ -15,6 +26,28 @@ AGENT_ID = "expedition"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
 
+_db_client = None
+_db_adapter = None
+
+
+def _get_db():
+    """Lazy-load DynamoDB client (expedition records)."""
+    global _db_client
+    if _db_client is None:
+        from tools.dynamodb_client import SGADynamoDBClient
+        _db_client = SGADynamoDBClient()
+    return _db_client
+
+
+def _get_db_adapter():
+    """Lazy-load MCP Gateway adapter (stock movements)."""
+    global _db_adapter
+    if _db_adapter is None:
+        from tools.gateway_adapter import GatewayAdapterFactory
+        _db_adapter = GatewayAdapterFactory.create_from_env()
+    return _db_adapter
+
+
 def generate_movement_id() -> str:
     """Generate movement ID."""
     return f"MV_{uuid.uuid4().hex[:12].upper()}"
@@ -33,7 +66,8 @@ async def complete_expedition_tool(
     """
     Complete the expedition after NF emission.
 
-    Creates EXIT movements and updates stock.
+    Ships the reserved stock (EXPEDIÇÃO movements) and updates the
+    expedition status.
 
     Args:
         expedition_id: Expedition ID
@@ -49,11 +83,8 @@ async def complete_expedition_tool(
     )
 
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
-
         # Get expedition record
-        expedition = await db.get_expedition(expedition_id)
+        expedition = await asyncio.to_thread(_get_db().get_expedition, expedition_id)
 
         if not expedition:
             return {
@@ -61,54 +92,33 @@ async def complete_expedition_tool(
                 "error": f"Expedicao nao encontrada: {expedition_id}",
             }
 
-        if expedition.get("status") not in ["SEPARATED", "PENDING_SEPARATION"]:
+        status = expedition.get("status")
+        if status not in ["SEPARATED", "PENDING_SEPARATION"]:
             return {
                 "success": False,
-                "error": f"Status invalido para conclusao: {expedition.get('status')}",
+                "error": f"Status invalido para conclusao: {status}",
             }
 
-        items = expedition.get("items_confirmed") or expedition.get("items", [])
-        timestamp = datetime.utcnow().isoformat() + "Z"
-
-        # Create EXIT movements for each item
-        movements = []
-        for item in items:
-            movement_id = generate_movement_id()
-
-            movement_data = {
-                "movement_id": movement_id,
-                "movement_type": "EXIT",
-                "pn_id": item.get("pn_id", ""),
-                "serial_number": item.get("serial", ""),
-                "quantity": -item.get("quantity", 1),  # Negative for exit
-                "source_location_id": item.get("location_id", "01"),
-                "destination": expedition.get("destination_client", ""),
-                "project_id": expedition.get("project_id", ""),
-                "expedition_id": expedition_id,
-                "nf_number": nf_number,
-                "nf_key": nf_key,
-                "carrier": carrier,
-                "tracking_code": tracking_code or "",
-                "operator_id": operator_id,
-                "status": "COMPLETED",
-                "created_at": timestamp,
+        started = time.perf_counter()
+
+        # Release reservations and ship every item in one transaction
+        shipment = await _get_db_adapter().complete_expedition(
+            expedition_id=expedition_id,
+            nf_number=nf_number,
+            nf_key=nf_key,
+            carrier=carrier,
+            tracking_code=tracking_code,
+            destination=expedition.get("destination_client"),
+            completed_by=operator_id,
+        )
+        if not shipment.get("success"):
+            return {
+                "success": False,
+                "error": shipment.get("error", "Falha ao concluir expedicao"),
             }
 
-            await db.put_movement(movement_data)
-            movements.append(movement_id)
-
-            # Update balance
-            await db.update_balance(
-                pn_id=item.get("pn_id", ""),
-                location_id=item.get("location_id", "01"),
-                delta=-item.get("quantity", 1),
-            )
-
-            # Release reservation
-            await db.release_reservation(
-                expedition_id=expedition_id,
-                pn_id=item.get("pn_id", ""),
-            )
+        movements = shipment.get("movement_ids", [])
+        timestamp = datetime.utcnow().isoformat() + "Z"
 
         # Update expedition status
         updates = {
@@ -123,13 +133,27 @@ async def complete_expedition_tool(
             "updated_at": timestamp,
         }
 
-        await db.update_expedition(expedition_id, updates)
+        updated = await asyncio.to_thread(_get_db().update_expedition, expedition_id, updates, status)
+        if not updated:
+            return {
+                "success": False,
+                "error": f"Expedicao alterada durante a conclusao: {expedition_id}",
+                "movements_created": movements,
+            }
+
+        duration_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(
+            f"[complete_expedition] {expedition_id}: {len(movements)} movements, "
+            f"{shipment.get('shipped_quantity')} units, {duration_ms}ms"
+            + (" (already shipped)" if shipment.get("already_completed") else "")
+        )
 
         audit.completed(
             message=f"Expedicao concluida: NF {nf_number}",
             session_id=session_id,
             details={
                 "movements_count": len(movements),
+                "duration_ms": duration_ms,
                 "nf_number": nf_number,
                 "tracking_code": tracking_code,
             },
@@ -144,11 +168,10 @@ async def complete_expedition_tool(
             "nf_key": nf_key,
             "carrier": carrier,
             "tracking_code": tracking_code,
+            "duration_ms": duration_ms,
             "message": f"Expedicao concluida com sucesso. NF {nf_number}.",
         }
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available"}
     except Exception as e:
         logger.error(f"[complete_expedition] Error: {e}", exc_info=True)
         audit.error(message="Erro ao completar expedicao", session_id=session_id, error=str(e))
@@ -1,7 +1,12 @@
 # =============================================================================
 # Process Expedition Tools
 # =============================================================================
+# Stock is verified with one Gateway read (verify_stock.load_stock) and all
+# verified items are reserved in one PostgreSQL transaction
+# (sga_create_reservations). The expedition record lives in DynamoDB.
+# =============================================================================
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -15,6 +20,28 @@ AGENT_ID = "expedition"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
 
+_db_client = None
+_db_adapter = None
+
+
+def _get_db():
+    """Lazy-load DynamoDB client (expedition records)."""
+    global _db_client
+    if _db_client is None:
+        from tools.dynamodb_client import SGADynamoDBClient
+        _db_client = SGADynamoDBClient()
+    return _db_client
+
+
+def _get_db_adapter():
+    """Lazy-load MCP Gateway adapter (reservations)."""
+    global _db_adapter
+    if _db_adapter is None:
+        from tools.gateway_adapter import GatewayAdapterFactory
+        _db_adapter = GatewayAdapterFactory.create_from_env()
+    return _db_adapter
+
+
 def generate_expedition_id() -> str:
     """Generate expedition ID."""
     return f"EXP_{uuid.uuid4().hex[:12].upper()}"
@@ -53,22 +80,16 @@ async def process_expedition_tool(
     )
 
     try:
-        from .verify_stock import verify_stock_item
+        from .verify_stock import load_stock, evaluate_stock
         from .sap_export import generate_item_sap_data
 
-        # Validate project
-        try:
-            from tools.db_client import DBClient
-            db = DBClient()
-            project = await db.get_project(project_id)
-            if not project:
-                return {
-                    "success": False,
-                    "error": f"Projeto nao encontrado: {project_id}",
-                }
-        except ImportError:
-            logger.warning("[process_expedition] DBClient not available")
-            project = {"project_id": project_id}
+        # Project, part numbers, serials and balances in one read
+        stock = await load_stock(items, project_id)
+        if not stock["project"]:
+            return {
+                "success": False,
+                "error": f"Projeto nao encontrado: {project_id}",
+            }
 
         # Generate expedition ID
         expedition_id = generate_expedition_id()
@@ -79,14 +100,13 @@ async def process_expedition_tool(
         unavailable_items = []
         sap_data_list = []
 
-        for item in items:
-            pn_id = item.get("pn_id", "")
+        # Verify stock availability for all items
+        verifications = evaluate_stock(items, stock)
+
+        for item, verification in zip(items, verifications):
             serial = item.get("serial", "")
             quantity = item.get("quantity", 1)
 
-            # Verify stock availability
-            verification = await verify_stock_item(pn_id, serial, quantity)
-
             if verification.get("available"):
                 verified_items.append({
                     **item,
@@ -131,24 +151,19 @@ async def process_expedition_tool(
             "created_at": timestamp,
         }
 
-        # Store expedition
-        try:
-            from tools.db_client import DBClient
-            db = DBClient()
-            await db.put_expedition(expedition_data)
-
-            # Create reservations for verified items
-            for v_item in verified_items:
-                await db.create_reservation(
-                    expedition_id=expedition_id,
-                    pn_id=v_item["pn_id"],
-                    serial=v_item.get("serial"),
-                    quantity=v_item.get("quantity", 1),
-                    location_id=v_item.get("location_id", "01"),
-                    operator_id=operator_id,
-                )
-        except ImportError:
-            logger.warning("[process_expedition] DBClient not available")
+        # Store expedition, then reserve every verified item in one transaction
+        if not await asyncio.to_thread(_get_db().put_expedition, expedition_data):
+            raise RuntimeError(f"Falha ao gravar expedicao {expedition_id}")
+
+        if verified_items:
+            reservation = await _create_reservations(expedition_id, project_id, verified_items, operator_id)
+            if not reservation.get("success"):
+                return await _fail_reservation(expedition_id, verified_items, unavailable_items, reservation)
+            await asyncio.to_thread(
+                _get_db().update_expedition,
+                expedition_id,
+                {"reservation_ids": reservation.get("reservation_ids", [])},
+            )
 
         audit.completed(
             message=f"Expedicao criada: {expedition_id} ({len(verified_items)} itens)",
@@ -183,6 +198,69 @@ async def process_expedition_tool(
         return {"success": False, "error": str(e)}
 
 
+async def _create_reservations(
+    expedition_id: str,
+    project_id: str,
+    verified_items: List[Dict[str, Any]],
+    operator_id: str,
+) -> Dict[str, Any]:
+    """
+    Reserve all verified items with one sga_create_reservations call.
+
+    Either every item is reserved or nothing is; serialized items reserve
+    their asset, the others quantity of the project's balance.
+    """
+    reservations = [
+        {
+            "part_number": v_item["pn_id"],
+            "quantity": v_item.get("quantity", 1),
+            "location_id": v_item.get("location_id", "01"),
+            "serial_number": v_item.get("serial") if v_item.get("asset") else None,
+        }
+        for v_item in verified_items
+    ]
+    return await _get_db_adapter().create_reservations(
+        expedition_id=expedition_id,
+        reservations=reservations,
+        project_id=project_id,
+        reserved_by=operator_id,
+    )
+
+
+async def _fail_reservation(
+    expedition_id: str,
+    verified_items: List[Dict[str, Any]],
+    unavailable_items: List[Dict[str, Any]],
+    reservation: Dict[str, Any],
+) -> Dict[str, Any]:
+    """
+    Mark the expedition FAILED after a rejected reservation (stock changed
+    since verification); nothing was reserved.
+    """
+    reasons = {line.get("line"): line.get("reason") for line in reservation.get("unavailable") or []}
+    unavailable_items = unavailable_items + [
+        {**v_item, "reason": reasons[line]}
+        for line, v_item in enumerate(verified_items)
+        if line in reasons
+    ]
+    error = reservation.get("error", "Reserva nao realizada")
+
+    await asyncio.to_thread(
+        _get_db().update_expedition,
+        expedition_id,
+        {"status": "FAILED", "unavailable_items": unavailable_items, "reservation_error": error},
+    )
+    logger.warning(f"[process_expedition] {expedition_id} not reserved: {error}")
+
+    return {
+        "success": False,
+        "expedition_id": expedition_id,
+        "status": "FAILED",
+        "error": f"Reserva nao realizada: {error}",
+        "unavailable_items": unavailable_items,
+    }
+
+
 @trace_tool_call("sga_get_expedition")
 async def get_expedition_tool(
     expedition_id: str,
@@ -190,17 +268,13 @@ async def get_expedition_tool(
 ) -> Dict[str, Any]:
     """Get expedition details by ID."""
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
-        expedition = await db.get_expedition(expedition_id)
+        expedition = await asyncio.to_thread(_get_db().get_expedition, expedition_id)
 
         if not expedition:
             return {"success": False, "error": "Expedicao nao encontrada"}
 
         return {"success": True, "expedition": expedition}
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available"}
     except Exception as e:
         logger.error(f"[get_expedition] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e)}
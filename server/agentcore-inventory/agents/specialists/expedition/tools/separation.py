@@ -2,6 +2,7 @@
 # Separation Confirmation Tools
 # =============================================================================
 
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
@@ -13,6 +14,17 @@ logger = logging.getLogger(__name__)
 AGENT_ID = "expedition"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
+_db_client = None
+
+
+def _get_db():
+    """Lazy-load DynamoDB client (expedition records)."""
+    global _db_client
+    if _db_client is None:
+        from tools.dynamodb_client import SGADynamoDBClient
+        _db_client = SGADynamoDBClient()
+    return _db_client
+
 
 @trace_tool_call("sga_confirm_separation")
 async def confirm_separation_tool(
@@ -37,11 +49,8 @@ async def confirm_separation_tool(
     )
 
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
-
         # Get expedition record
-        expedition = await db.get_expedition(expedition_id)
+        expedition = await asyncio.to_thread(_get_db().get_expedition, expedition_id)
 
         if not expedition:
             return {
@@ -67,7 +76,14 @@ async def confirm_separation_tool(
             "updated_at": now,
         }
 
-        await db.update_expedition(expedition_id, updates)
+        updated = await asyncio.to_thread(
+            _get_db().update_expedition, expedition_id, updates, "PENDING_SEPARATION",
+        )
+        if not updated:
+            return {
+                "success": False,
+                "error": f"Expedicao alterada durante a separacao: {expedition_id}",
+            }
 
         audit.completed(
             message=f"Separacao confirmada: {expedition_id}",
@@ -89,8 +105,6 @@ async def confirm_separation_tool(
             ],
         }
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available"}
     except Exception as e:
         logger.error(f"[confirm_separation] Error: {e}", exc_info=True)
         audit.error(message="Erro ao confirmar separacao", session_id=session_id, error=str(e))
@@ -1,9 +1,16 @@
 # =============================================================================
 # Verify Stock Tools
 # =============================================================================
+# verify_stock_item checks one item (verify_stock tool). verify_stock_many
+# checks a whole expedition (process_expedition).
+#
+# Part numbers, serials and balances are read from PostgreSQL with one
+# Gateway call (sga_get_expedition_stock, one = ANY query per kind), so the
+# number of round trips does not grow with the number of lines.
+# =============================================================================
 
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 from shared.audit_emitter import AgentAuditEmitter
 from shared.xray_tracer import trace_tool_call
@@ -13,92 +20,224 @@ AGENT_ID = "expedition"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
 
-async def verify_stock_item(
+# Default depot for non-serialized balances
+DEFAULT_LOCATION_ID = "01"
+
+# Asset statuses that cannot be shipped (sga.asset_status)
+UNAVAILABLE_ASSET_STATUSES = ("RESERVED", "IN_TRANSIT", "INSTALLED", "DEFECTIVE", "DISPOSED")
+
+_db_adapter = None
+
+
+def _get_db_adapter():
+    """Lazy-load MCP Gateway adapter (part numbers, assets, balances)."""
+    global _db_adapter
+    if _db_adapter is None:
+        from tools.gateway_adapter import GatewayAdapterFactory
+        _db_adapter = GatewayAdapterFactory.create_from_env()
+    return _db_adapter
+
+
+def _evaluate_stock_item(
     pn_id: str,
     serial: Optional[str],
     quantity: int,
+    pn: Optional[Dict[str, Any]],
+    asset: Optional[Dict[str, Any]],
+    available_qty: Optional[int],
 ) -> Dict[str, Any]:
     """
-    Verify stock availability for a single item.
+    Decide availability of one item from already-loaded records.
 
-    Internal helper function used by process_expedition.
+    Args:
+        pn_id: Part number
+        serial: Serial number (serialized items)
+        quantity: Quantity needed
+        pn: Part number record (None if not found)
+        asset: Asset record for the serial (serialized items)
+        available_qty: Unreserved balance at the default depot (non-serialized)
     """
-    try:
-        from tools.db_client import DBClient
-        db = DBClient()
-
-        # Get part number
-        pn = await db.get_part_number(pn_id)
+    if not pn:
+        return {
+            "available": False,
+            "reason": f"Part number nao encontrado: {pn_id}",
+        }
 
-        if not pn:
+    # For serialized items, check specific asset
+    if pn.get("is_serialized") and serial:
+        if not asset:
             return {
                 "available": False,
-                "reason": f"Part number nao encontrado: {pn_id}",
+                "pn": pn,
+                "reason": f"Serial nao encontrado: {serial}",
             }
 
-        # For serialized items, check specific asset
-        if pn.get("is_serialized") and serial:
-            asset = await db.get_asset_by_serial(serial)
-
-            if not asset:
-                return {
-                    "available": False,
-                    "pn": pn,
-                    "reason": f"Serial nao encontrado: {serial}",
-                }
-
-            # Check if available (not reserved, not in transit)
-            if asset.get("status") in ["RESERVED", "IN_TRANSIT", "MAINTENANCE"]:
-                return {
-                    "available": False,
-                    "pn": pn,
-                    "asset": asset,
-                    "reason": f"Equipamento com status: {asset.get('status')}",
-                }
-
+        if asset.get("part_number") != pn.get("part_number"):
             return {
-                "available": True,
+                "available": False,
                 "pn": pn,
                 "asset": asset,
-                "location_id": asset.get("location_id", "01"),
+                "reason": f"Serial pertence a outro part number: {asset.get('part_number')}",
             }
 
-        # For non-serialized, check balance
-        else:
-            balance = await db.get_balance(pn_id, "01")  # Default depot
-
-            available_qty = (balance.get("quantity", 0) -
-                           balance.get("reserved_quantity", 0))
-
-            if available_qty < quantity:
-                return {
-                    "available": False,
-                    "pn": pn,
-                    "reason": f"Quantidade insuficiente. Disponivel: {available_qty}",
-                }
-
+        # Check if available (not reserved, not in transit)
+        if asset.get("status") in UNAVAILABLE_ASSET_STATUSES:
             return {
-                "available": True,
+                "available": False,
                 "pn": pn,
-                "location_id": "01",
-                "available_quantity": available_qty,
+                "asset": asset,
+                "reason": f"Equipamento com status: {asset.get('status')}",
             }
 
-    except ImportError:
-        logger.warning("[verify_stock_item] DBClient not available")
-        # Return mock data for testing
         return {
             "available": True,
-            "pn": {"pn_id": pn_id, "part_number": pn_id},
-            "location_id": "01",
+            "pn": pn,
+            "asset": asset,
+            "location_id": asset.get("location_id") or DEFAULT_LOCATION_ID,
         }
-    except Exception as e:
-        logger.error(f"[verify_stock_item] Error: {e}", exc_info=True)
+
+    # For non-serialized, check balance
+    available_qty = available_qty or 0
+    if available_qty < quantity:
         return {
             "available": False,
-            "reason": str(e),
+            "pn": pn,
+            "reason": f"Quantidade insuficiente. Disponivel: {available_qty}",
         }
 
+    return {
+        "available": True,
+        "pn": pn,
+        "location_id": DEFAULT_LOCATION_ID,
+        "available_quantity": available_qty,
+    }
+
+
+async def load_stock(
+    items: List[Dict[str, Any]],
+    project_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Read the part numbers, assets and balances of all items with one call.
+
+    Args:
+        items: Expedition items [{pn_id, serial, quantity}]
+        project_id: Project of the expedition (balances are filtered by it)
+
+    Returns:
+        Dict with project (None if not found or not requested), and
+        part_numbers / assets / balances indexed by part number, serial
+        and part number
+
+    Raises:
+        RuntimeError: If the Gateway tool fails
+    """
+    part_numbers = list(dict.fromkeys(item.get("pn_id", "") for item in items))
+    serials = list(dict.fromkeys(item["serial"] for item in items if item.get("serial")))
+
+    result = await _get_db_adapter().get_expedition_stock(
+        part_numbers,
+        serial_numbers=serials,
+        location_id=DEFAULT_LOCATION_ID,
+        project_id=project_id,
+    )
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+
+    available: Dict[str, int] = {}
+    for balance in result.get("balances") or []:
+        pn_id = balance.get("part_number")
+        available[pn_id] = available.get(pn_id, 0) + (balance.get("quantity_available") or 0)
+
+    return {
+        "project": result.get("project"),
+        "part_numbers": {pn["part_number"]: pn for pn in result.get("part_numbers") or []},
+        "assets": {asset["serial_number"]: asset for asset in result.get("assets") or []},
+        "available": available,
+    }
+
+
+def evaluate_stock(items: List[Dict[str, Any]], stock: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Verify every item of an expedition against the loaded stock.
+
+    Quantity requested by several lines of the same PN is consumed from the
+    same balance, and a serial can only be used once per expedition.
+
+    Args:
+        items: Expedition items [{pn_id, serial, quantity}]
+        stock: Result of load_stock
+
+    Returns:
+        One verify_stock_item-shaped result per item, in order
+    """
+    remaining = dict(stock["available"])
+    used_serials = set()
+    results = []
+
+    for item in items:
+        pn_id = item.get("pn_id", "")
+        serial = item.get("serial")
+        quantity = item.get("quantity", 1)
+        pn = stock["part_numbers"].get(pn_id)
+
+        if pn and pn.get("is_serialized") and serial:
+            if serial in used_serials:
+                results.append({
+                    "available": False,
+                    "pn": pn,
+                    "reason": f"Serial repetido na expedicao: {serial}",
+                })
+                continue
+            result = _evaluate_stock_item(pn_id, serial, quantity, pn, stock["assets"].get(serial), None)
+            if result.get("available"):
+                used_serials.add(serial)
+        else:
+            result = _evaluate_stock_item(pn_id, serial, quantity, pn, None, remaining.get(pn_id))
+            if result.get("available"):
+                remaining[pn_id] -= quantity
+
+        results.append(result)
+
+    return results
+
+
+async def verify_stock_many(
+    items: List[Dict[str, Any]],
+    project_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Verify stock availability for all items of an expedition at once.
+
+    Args:
+        items: Expedition items [{pn_id, serial, quantity}]
+        project_id: Project of the expedition
+
+    Returns:
+        One verify_stock_item-shaped result per item, in order
+    """
+    try:
+        stock = await load_stock(items, project_id)
+    except Exception as e:
+        logger.error(f"[verify_stock_many] Error: {e}", exc_info=True)
+        return [{"available": False, "reason": str(e)} for _ in items]
+
+    return evaluate_stock(items, stock)
+
+
+async def verify_stock_item(
+    pn_id: str,
+    serial: Optional[str],
+    quantity: int,
+) -> Dict[str, Any]:
+    """
+    Verify stock availability for a single item.
+
+    Internal helper function used by verify_stock_tool.
+    """
+    results = await verify_stock_many([{"pn_id": pn_id, "serial": serial, "quantity": quantity}])
+    return results[0]
+
 
 @trace_tool_call("sga_verify_stock")
 async def verify_stock_tool(
@@ -111,7 +250,7 @@ async def verify_stock_tool(
     Verify stock availability for an item.
 
     Args:
-        pn_id: Part number ID
+        pn_id: Part number
         serial: Optional serial number for serialized items
         quantity: Quantity needed
     """
@@ -29,7 +29,7 @@ from fastapi import FastAPI
 import uvicorn
 
 # Centralized model configuration (MANDATORY - Gemini 3.0 Pro + Thinking)
-from agents.utils import get_model, requires_thinking, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, requires_thinking, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
@@ -713,6 +713,9 @@ def main():
     # Create FastAPI app
     app = FastAPI(title=AGENT_NAME, description=AGENT_DESCRIPTION, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+
     # Add /ping endpoint
     @app.get("/ping")
     async def ping():
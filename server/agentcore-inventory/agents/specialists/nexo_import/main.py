@@ -32,7 +32,7 @@ import uvicorn
 from a2a.types import AgentSkill
 
 # Centralized model configuration (MANDATORY - Gemini 3.0 Pro + Thinking)
-from agents.utils import get_model, requires_thinking, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, requires_thinking, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
@@ -40,6 +40,14 @@ from shared.a2a_client import A2AClient
 # NEXO MIND: Direct memory access (replaces A2A for memory operations)
 from shared.memory_manager import AgentMemoryManager, MemoryOriginType
 
+# Best-effort side calls (audit events, memory writes) off the request path
+from shared.background_work import (
+    notify_agent,
+    register_background_drain,
+    submit_memory_facts,
+    submit_memory_write,
+)
+
 # Hooks for observability (ADR-002)
 from shared.hooks import LoggingHook, MetricsHook, DebugHook
 
@@ -371,8 +379,8 @@ async def analyze_file(
             memory_context=memory_context,  # NEXO MIND: Pass memory to Gemini
         )
 
-        # Log to ObservationAgent via A2A
-        await a2a_client.invoke_agent("observation", {
+        # Log to ObservationAgent via A2A (background, does not delay the result)
+        notify_agent(a2a_client, "observation", {
             "action": "log_event",
             "event_type": "FILE_ANALYZED",
             "agent_id": AGENT_ID,
@@ -603,32 +611,35 @@ async def execute_import(
 
         # ═══════════════════════════════════════════════════════════════════
         # NEXO MIND LEARN: Store successful patterns DIRECTLY (no A2A)
+        # Queued in the background - the import result is returned right away
         # ═══════════════════════════════════════════════════════════════════
         if result.get("success") and result.get("rows_imported", 0) > 0:
             memory = get_memory_manager(actor_id=user_id or "system")
 
-            # Store each column mapping as a FACT (human-confirmed via HIL)
-            for source_col, target_field in column_mappings.items():
-                fact = f"Column '{source_col}' → field '{target_field}'"
-                logger.info(f"[{AGENT_NAME}] LEARN: Storing fact: {fact}")
-
-                await memory.learn_fact(
-                    fact=fact,
-                    category="column_mapping",
-                    emotional_weight=0.85,  # High weight (HIL confirmed)
-                    confidence=0.9,         # High confidence (successful import)
-                    session_id=session_id,
-                    use_global=True,        # Share across all users/sessions
-                    target_table=target_table,
-                    rows_imported=result.get("rows_imported", 0),
-                )
+            # Column mappings as FACTs (human-confirmed via HIL), batched
+            # into one memory event per FACTS_PER_EVENT mappings
+            facts = [
+                f"Column '{source_col}' → field '{target_field}'"
+                for source_col, target_field in column_mappings.items()
+            ]
+            submit_memory_facts(
+                memory,
+                facts,
+                category="column_mapping",
+                emotional_weight=0.85,  # High weight (HIL confirmed)
+                confidence=0.9,         # High confidence (successful import)
+                session_id=session_id,
+                use_global=True,        # Share across all users/sessions
+                target_table=target_table,
+                rows_imported=result.get("rows_imported", 0),
+            )
 
             # Store episode for complete import cycle
             episode = (
                 f"Import successful: {result.get('rows_imported', 0)} rows to {target_table}. "
                 f"Mappings: {len(column_mappings)} columns. File: {s3_key}"
             )
-            await memory.learn_episode(
+            submit_memory_write("learn_episode", lambda: memory.learn_episode(
                 episode_content=episode,
                 category="import_completed",
                 outcome="success",
@@ -636,14 +647,14 @@ async def execute_import(
                 session_id=session_id,
                 s3_key=s3_key,
                 mappings_count=len(column_mappings),
-            )
+            ))
 
             logger.info(
-                f"[{AGENT_NAME}] LEARN: Stored {len(column_mappings)} facts + 1 episode"
+                f"[{AGENT_NAME}] LEARN: Queued {len(facts)} facts + 1 episode"
             )
 
         # Log to ObservationAgent (still via A2A - this is audit, not memory)
-        await a2a_client.invoke_agent("observation", {
+        notify_agent(a2a_client, "observation", {
             "action": "log_event",
             "event_type": "IMPORT_COMPLETED",
             "agent_id": AGENT_ID,
@@ -818,6 +829,10 @@ def main():
     # This is CRITICAL for AgentCore cold start - /ping must respond before A2A server is ready
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+    register_background_drain(app)
+
     @app.get("/ping")
     def ping():
         """Health check endpoint - responds immediately for AgentCore cold start."""
@@ -94,6 +94,7 @@ async def analyze_file_tool(
             user_responses=user_responses,
             user_comments=user_comments,
             analysis_round=analysis_round,
+            session_id=session_id,
         )
 
         if not analysis.get("success", False):
@@ -115,6 +115,7 @@ async def execute_import_tool(
         extract_result = await extract_data_with_gemini(
             s3_key=s3_key,
             column_mappings=column_mappings,
+            session_id=session_id,
         )
 
         if not extract_result.get("success", False):
@@ -29,7 +29,7 @@ from fastapi import FastAPI
 import uvicorn
 
 # Centralized model configuration (MANDATORY - Gemini 3.0 Flash for speed)
-from agents.utils import get_model, AGENT_VERSION, create_gemini_model
+from agents.utils import get_model, AGENT_VERSION, create_gemini_model, register_model_prewarm
 
 # A2A client for inter-agent communication
 from shared.a2a_client import A2AClient
@@ -91,6 +91,14 @@ AGENT_SKILLS = [
             "session_id": "Session ID for context"
         }
     ),
+    AgentSkill(
+        name="resume_campaign_generation",
+        description="Resume background count item generation of a large campaign (status GENERATING)",
+        parameters={
+            "campaign_id": "Campaign ID to resume",
+            "session_id": "Session ID for context"
+        }
+    ),
     AgentSkill(
         name="get_campaign_items",
         description="Get items for counting campaign with optional status filter",
@@ -114,6 +122,16 @@ AGENT_SKILLS = [
             "user_id": "Counter user ID"
         }
     ),
+    AgentSkill(
+        name="submit_counts",
+        description="Submit a batch of counts (handheld scanners) in one call",
+        parameters={
+            "campaign_id": "Campaign ID",
+            "counts": "List of {part_number, location_id, counted_quantity, counted_serials, notes}",
+            "session_id": "Session ID for context",
+            "user_id": "Counter user ID"
+        }
+    ),
     AgentSkill(
         name="analyze_divergences",
         description="Analyze divergences in campaign with causes and recommendations",
@@ -176,12 +194,15 @@ Consulta campanhas e itens:
 - Status da campanha
 - Itens a contar
 - Progresso da contagem
+- Progresso da geracao (campanhas grandes ficam em GENERATING; use
+  `resume_campaign_generation` se a geracao parou com erro)
 
-### 3. `submit_count`
+### 3. `submit_count` / `submit_counts`
 Registra contagem:
 - Quantidade fisica
 - Serial numbers
 - Observacoes
+- Lotes de contagens (coletores) via `submit_counts` (ate 500 por envio)
 
 ### 4. `analyze_divergences`
 Analisa divergencias:
@@ -353,6 +374,48 @@ async def get_campaign(
         }
 
 
+@tool
+async def resume_campaign_generation(
+    campaign_id: str,
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Resume background count item generation of a large campaign.
+
+    Args:
+        campaign_id: Campaign ID in GENERATING status
+        session_id: Session ID for context
+
+    Returns:
+        Generation progress
+    """
+    logger.info(f"[{AGENT_NAME}] Resuming campaign generation: {campaign_id}")
+
+    try:
+        # Import tool implementation
+        from agents.reconciliacao.tools.campaign import resume_campaign_generation_tool
+
+        return await resume_campaign_generation_tool(
+            campaign_id=campaign_id,
+            session_id=session_id,
+        )
+
+    except Exception as e:
+        logger.error(f"[{AGENT_NAME}] resume_campaign_generation failed: {e}", exc_info=True)
+        # Sandwich Pattern: Feed error context to LLM for decision
+        return {
+            "success": False,
+            "error": str(e),
+            "error_context": {
+                "error_type": type(e).__name__,
+                "operation": "resume_campaign_generation",
+                "campaign_id": campaign_id,
+                "recoverable": isinstance(e, (TimeoutError, ConnectionError, OSError)),
+            },
+            "suggested_actions": ["retry", "validate_campaign_id", "check_database", "escalate"],
+        }
+
+
 @tool
 async def get_campaign_items(
     campaign_id: str,
@@ -466,6 +529,56 @@ async def submit_count(
         }
 
 
+@tool
+async def submit_counts(
+    campaign_id: str,
+    counts: List[Dict[str, Any]],
+    session_id: Optional[str] = None,
+    user_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Submit a batch of counts (handheld scanners).
+
+    Args:
+        campaign_id: Campaign ID
+        counts: List of {part_number, location_id, counted_quantity,
+            counted_serials, evidence_keys, notes}
+        session_id: Session ID for context
+        user_id: Counter user ID
+
+    Returns:
+        Per-item results with accepted/rejected/divergent totals
+    """
+    logger.info(f"[{AGENT_NAME}] Submitting {len(counts)} counts: {campaign_id}")
+
+    try:
+        # Import tool implementation
+        from agents.reconciliacao.tools.counting import submit_counts_tool
+
+        return await submit_counts_tool(
+            campaign_id=campaign_id,
+            counts=counts,
+            counted_by=user_id or "system",
+            session_id=session_id,
+        )
+
+    except Exception as e:
+        logger.error(f"[{AGENT_NAME}] submit_counts failed: {e}", exc_info=True)
+        # Sandwich Pattern: Feed error context to LLM for decision
+        return {
+            "success": False,
+            "error": str(e),
+            "error_context": {
+                "error_type": type(e).__name__,
+                "operation": "submit_counts",
+                "campaign_id": campaign_id,
+                "counts": len(counts),
+                "recoverable": isinstance(e, (TimeoutError, ConnectionError, OSError)),
+            },
+            "suggested_actions": ["retry", "split_batch", "check_campaign_status", "escalate"],
+        }
+
+
 @tool
 async def analyze_divergences(
     campaign_id: str,
@@ -691,8 +804,10 @@ def create_agent() -> Agent:
         tools=[
             start_campaign,
             get_campaign,
+            resume_campaign_generation,
             get_campaign_items,
             submit_count,
+            submit_counts,
             analyze_divergences,
             propose_adjustment,
             complete_campaign,
@@ -725,6 +840,9 @@ def main():
     # Create FastAPI app
     app = FastAPI(title=AGENT_NAME, version=AGENT_VERSION)
 
+    # Prewarm Gemini model in background once serving (cold start)
+    register_model_prewarm(app)
+
     # Add /ping health check endpoint
     @app.get("/ping")
     async def ping():
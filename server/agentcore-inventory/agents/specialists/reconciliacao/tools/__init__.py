@@ -7,8 +7,9 @@ from .campaign import (
     get_campaign_tool,
     get_campaign_items_tool,
     complete_campaign_tool,
+    resume_campaign_generation_tool,
 )
-from .counting import submit_count_tool
+from .counting import submit_count_tool, submit_counts_tool
 from .divergence import analyze_divergences_tool
 from .adjustment import propose_adjustment_tool
 
@@ -17,7 +18,9 @@ __all__ = [
     "get_campaign_tool",
     "get_campaign_items_tool",
     "complete_campaign_tool",
+    "resume_campaign_generation_tool",
     "submit_count_tool",
+    "submit_counts_tool",
     "analyze_divergences_tool",
     "propose_adjustment_tool",
 ]
@@ -1,8 +1,22 @@
 # =============================================================================
 # Campaign Management Tools
 # =============================================================================
+# Campaigns and their count items live in the inventory table
+# (SGADynamoDBClient, PK=CAMPAIGN#{id}); balances and serials come from
+# PostgreSQL through the MCP Gateway (GatewayPostgresAdapter).
+#
+# Generation is set-based: one get_balances_by_locations and one
+# get_serials_for_balances call per slice of locations, then the count
+# items are written with parallel BatchWriteItem requests (put_count_items).
+#
+# Campaigns spanning more than BACKGROUND_CAMPAIGN_LOCATIONS locations are
+# generated by a background job that checkpoints processed locations on the
+# campaign record (status GENERATING) and can be resumed after a restart.
+# =============================================================================
 
+import asyncio
 import logging
+import os
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 import uuid
@@ -14,10 +28,41 @@ logger = logging.getLogger(__name__)
 AGENT_ID = "reconciliacao"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
+# Campaigns above this number of locations are generated in background
+BACKGROUND_CAMPAIGN_LOCATIONS = int(os.environ.get("BACKGROUND_CAMPAIGN_LOCATIONS", "20"))
+
+# Locations per checkpoint of a background generation job
+GENERATION_SLICE_LOCATIONS = 10
+
+# Running background generation jobs (campaign_id -> task)
+_generation_jobs: Dict[str, asyncio.Task] = {}
+
+_db_client = None
+_db_adapter = None
+
+
+def _get_db():
+    """Lazy-load DynamoDB client (campaigns and count items)."""
+    global _db_client
+    if _db_client is None:
+        from tools.dynamodb_client import SGADynamoDBClient
+        _db_client = SGADynamoDBClient()
+    return _db_client
+
+
+def _get_db_adapter():
+    """Lazy-load MCP Gateway adapter (balances and serials)."""
+    global _db_adapter
+    if _db_adapter is None:
+        from tools.gateway_adapter import GatewayAdapterFactory
+        _db_adapter = GatewayAdapterFactory.create_from_env()
+    return _db_adapter
+
 
 # Campaign status values
 class CampaignStatus:
     DRAFT = "DRAFT"
+    GENERATING = "GENERATING"
     ACTIVE = "ACTIVE"
     IN_PROGRESS = "IN_PROGRESS"
     COMPLETED = "COMPLETED"
@@ -76,13 +121,6 @@ async def start_campaign_tool(
             "part_numbers": part_numbers or ["ALL"],
         }
 
-        # Generate count items based on filters
-        items_to_count = await _generate_count_items(
-            location_ids=location_ids,
-            project_ids=project_ids,
-            part_numbers=part_numbers,
-        )
-
         campaign_data = {
             "campaign_id": campaign_id,
             "name": name,
@@ -92,34 +130,55 @@ async def start_campaign_tool(
             "start_date": start_date or now,
             "end_date": end_date,
             "require_double_count": require_double_count,
-            "total_items": len(items_to_count),
+            "total_items": 0,
             "counted_items": 0,
             "divergent_items": 0,
             "created_by": created_by,
             "created_at": now,
         }
 
-        # Store campaign
-        try:
-            from tools.db_client import DBClient
-            db = DBClient()
-            await db.put_campaign(campaign_data)
-
-            # Create count items
-            for item in items_to_count:
-                count_item = {
-                    "campaign_id": campaign_id,
-                    "part_number": item["part_number"],
-                    "location_id": item["location_id"],
-                    "project_id": item.get("project_id", ""),
-                    "system_quantity": item["system_quantity"],
-                    "system_serials": item.get("system_serials", []),
-                    "status": CountStatus.PENDING,
-                    "created_at": now,
-                }
-                await db.put_count_item(count_item)
-        except ImportError:
-            logger.warning("[start_campaign] DBClient not available")
+        # Large campaigns: generate count items in a resumable background job
+        if location_ids and len(location_ids) > BACKGROUND_CAMPAIGN_LOCATIONS:
+            campaign_data["status"] = CampaignStatus.GENERATING
+            campaign_data["generation"] = {
+                "total_locations": len(location_ids),
+                "processed_locations": [],
+                "items_written": 0,
+                "error": None,
+            }
+            await _put_campaign(campaign_data)
+            _start_generation_job(campaign_data)
+
+            audit.completed(
+                message=f"Campanha '{name}' em geracao ({len(location_ids)} locais)",
+                session_id=session_id,
+                details={"campaign_id": campaign_id, "total_locations": len(location_ids)},
+            )
+            return {
+                "success": True,
+                "campaign_id": campaign_id,
+                "message": (
+                    f"Campanha '{name}' criada. Itens de contagem sendo gerados em "
+                    f"segundo plano para {len(location_ids)} locais"
+                ),
+                "data": {
+                    "status": CampaignStatus.GENERATING,
+                    "scope": scope,
+                    "generation": campaign_data["generation"],
+                },
+            }
+
+        # Generate count items based on filters
+        items_to_count = await _generate_count_items(
+            location_ids=location_ids,
+            project_ids=project_ids,
+            part_numbers=part_numbers,
+        )
+        campaign_data["total_items"] = len(items_to_count)
+
+        # Store campaign and count items (batched)
+        await _put_campaign(campaign_data)
+        await _write_count_items(_build_count_items(campaign_id, items_to_count, now))
 
         audit.completed(
             message=f"Campanha '{name}' criada com {len(items_to_count)} itens",
@@ -149,40 +208,218 @@ async def _generate_count_items(
     project_ids: Optional[List[str]],
     part_numbers: Optional[List[str]],
 ) -> List[Dict[str, Any]]:
-    """Generate list of items to be counted based on filters."""
-    items = []
+    """
+    Generate list of items to be counted based on filters.
+
+    Balances and serials are read with one query each. Count items are
+    keyed by (part_number, location): balances of several projects at the
+    same location are counted together.
+    """
+    if not location_ids:
+        return []
+
+    adapter = _get_db_adapter()
+    balances = _gateway_rows(
+        await adapter.get_balances_by_locations(
+            location_ids,
+            part_numbers=part_numbers or None,
+            project_ids=project_ids or None,
+        ),
+        "balances",
+    )
+
+    items: Dict[tuple, Dict[str, Any]] = {}
+    for bal in balances:
+        key = (bal.get("part_number"), bal.get("location_id"))
+        item = items.get(key)
+        if item is None:
+            items[key] = {
+                "part_number": key[0],
+                "location_id": key[1],
+                "project_id": bal.get("project_id"),
+                "system_quantity": bal.get("quantity_total") or 0,
+                "system_serials": [],
+            }
+        else:
+            item["system_quantity"] += bal.get("quantity_total") or 0
+            if item["project_id"] != bal.get("project_id"):
+                item["project_id"] = None
+
+    if items:
+        serials = _gateway_rows(await adapter.get_serials_for_balances(list(items)), "serials")
+        for row in serials:
+            item = items.get((row.get("part_number"), row.get("location_id")))
+            if item is not None:
+                item["system_serials"] = list(row.get("serials") or [])
+
+    return list(items.values())
+
+
+def _gateway_rows(result: Dict[str, Any], key: str) -> List[Dict[str, Any]]:
+    """Rows of a Gateway tool result; tool errors are raised."""
+    if result.get("error"):
+        raise RuntimeError(result["error"])
+    return result.get(key) or []
+
+
+def _build_count_items(
+    campaign_id: str,
+    items: List[Dict[str, Any]],
+    now: str,
+) -> List[Dict[str, Any]]:
+    """Build PENDING count item records for a campaign."""
+    return [
+        {
+            "campaign_id": campaign_id,
+            "part_number": item["part_number"],
+            "location_id": item["location_id"],
+            "project_id": item.get("project_id") or "",
+            "system_quantity": item["system_quantity"],
+            "system_serials": item.get("system_serials", []),
+            "status": CountStatus.PENDING,
+            "created_at": now,
+        }
+        for item in items
+    ]
 
+
+async def _put_campaign(campaign: Dict[str, Any]) -> None:
+    """Store a campaign record."""
+    if not await asyncio.to_thread(_get_db().put_campaign, campaign):
+        raise RuntimeError(f"Falha ao gravar campanha {campaign['campaign_id']}")
+
+
+async def _update_campaign(campaign_id: str, updates: Dict[str, Any]) -> None:
+    """Update a campaign record."""
+    if not await asyncio.to_thread(_get_db().update_campaign, campaign_id, updates):
+        raise RuntimeError(f"Falha ao atualizar campanha {campaign_id}")
+
+
+async def _write_count_items(count_items: List[Dict[str, Any]]) -> None:
+    """Write count items with parallel BatchWriteItem requests."""
+    if not count_items:
+        return
+    stats = await asyncio.to_thread(_get_db().put_count_items, count_items)
+    if not stats["success"]:
+        raise RuntimeError(
+            f"{stats['items_failed']} de {stats['items']} itens de contagem nao gravados"
+        )
+
+
+# =============================================================================
+# Background Generation (large campaigns)
+# =============================================================================
+
+def _start_generation_job(campaign: Dict[str, Any]) -> None:
+    """Schedule the background generation job for a campaign."""
+    campaign_id = campaign["campaign_id"]
+    task = asyncio.create_task(_run_generation_job(campaign))
+    _generation_jobs[campaign_id] = task
+    task.add_done_callback(lambda _: _generation_jobs.pop(campaign_id, None))
+
+
+async def _run_generation_job(campaign: Dict[str, Any]) -> None:
+    """
+    Generate count items slice by slice, checkpointing progress.
+
+    Each slice of locations is fetched, written and then recorded in
+    generation.processed_locations. Re-running a slice after a crash
+    rewrites the same item keys, so resuming is idempotent.
+    """
+    campaign_id = campaign["campaign_id"]
+    scope = campaign.get("scope", {})
+    generation = dict(campaign.get("generation") or {})
+    processed = list(generation.get("processed_locations") or [])
+    items_written = generation.get("items_written", 0)
+
+    location_ids = [loc for loc in scope.get("location_ids", []) if loc not in set(processed)]
+    project_ids = [p for p in scope.get("project_ids", []) if p != "ALL"] or None
+    part_numbers = [p for p in scope.get("part_numbers", []) if p != "ALL"] or None
+
+    try:
+        for i in range(0, len(location_ids), GENERATION_SLICE_LOCATIONS):
+            slice_ids = location_ids[i:i + GENERATION_SLICE_LOCATIONS]
+            items = await _generate_count_items(slice_ids, project_ids, part_numbers)
+            now = datetime.utcnow().isoformat() + "Z"
+            await _write_count_items(_build_count_items(campaign_id, items, now))
+
+            processed.extend(slice_ids)
+            items_written += len(items)
+            await _update_campaign(campaign_id, {
+                "total_items": items_written,
+                "generation": {
+                    "total_locations": generation.get("total_locations", len(processed)),
+                    "processed_locations": processed,
+                    "items_written": items_written,
+                    "error": None,
+                },
+            })
+
+        await _update_campaign(campaign_id, {
+            "status": CampaignStatus.ACTIVE,
+            "total_items": items_written,
+            "generation_completed_at": datetime.utcnow().isoformat() + "Z",
+        })
+        logger.info(f"[campaign_generation] {campaign_id} completed with {items_written} items")
+
+    except Exception as e:
+        logger.error(f"[campaign_generation] {campaign_id} failed: {e}", exc_info=True)
+        await asyncio.to_thread(_get_db().update_campaign, campaign_id, {
+            "generation": {
+                "total_locations": generation.get("total_locations", len(processed)),
+                "processed_locations": processed,
+                "items_written": items_written,
+                "error": str(e),
+            },
+        })
+
+
+def _generation_progress(campaign: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Progress summary of a campaign's background generation."""
+    generation = campaign.get("generation")
+    if not generation:
+        return None
+    total = generation.get("total_locations") or 0
+    done = len(generation.get("processed_locations") or [])
+    return {
+        "running": campaign.get("campaign_id") in _generation_jobs,
+        "processed_locations": done,
+        "total_locations": total,
+        "items_written": generation.get("items_written", 0),
+        "percent": round(100.0 * done / total, 1) if total else 100.0,
+        "error": generation.get("error"),
+    }
+
+
+@trace_tool_call("sga_resume_campaign_generation")
+async def resume_campaign_generation_tool(
+    campaign_id: str,
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Resume count item generation of a campaign still in GENERATING."""
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
-
-        # Query balances based on filters
-        if location_ids:
-            for loc_id in location_ids:
-                balances = await db.get_balances_by_location(loc_id)
-                for bal in balances:
-                    if part_numbers and bal.get("part_number") not in part_numbers:
-                        continue
-                    if project_ids and bal.get("project_id") not in project_ids:
-                        continue
-
-                    # Get serials for this balance
-                    serials = await db.get_serials_for_balance(
-                        part_number=bal.get("part_number"),
-                        location_id=loc_id,
-                    )
-
-                    items.append({
-                        "part_number": bal.get("part_number"),
-                        "location_id": loc_id,
-                        "project_id": bal.get("project_id"),
-                        "system_quantity": bal.get("quantity_total", 0),
-                        "system_serials": serials,
-                    })
-    except ImportError:
-        logger.warning("[_generate_count_items] DBClient not available")
-
-    return items
+        campaign = await asyncio.to_thread(_get_db().get_campaign, campaign_id)
+
+        if not campaign:
+            return {"success": False, "error": "Campanha nao encontrada"}
+        if campaign.get("status") != CampaignStatus.GENERATING:
+            return {"success": False, "error": f"Campanha nao esta em geracao. Status: {campaign.get('status')}"}
+        if campaign_id in _generation_jobs:
+            return {"success": True, "campaign_id": campaign_id, "generation": _generation_progress(campaign)}
+
+        _start_generation_job(campaign)
+        audit.working(message=f"Retomando geracao da campanha {campaign_id}", session_id=session_id)
+
+        return {
+            "success": True,
+            "campaign_id": campaign_id,
+            "message": "Geracao de itens retomada",
+            "generation": _generation_progress(campaign),
+        }
+
+    except Exception as e:
+        logger.error(f"[resume_campaign_generation] Error: {e}", exc_info=True)
+        return {"success": False, "error": str(e)}
 
 
 @trace_tool_call("sga_get_campaign")
@@ -192,17 +429,17 @@ async def get_campaign_tool(
 ) -> Dict[str, Any]:
     """Get campaign details by ID."""
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
-        campaign = await db.get_campaign(campaign_id)
+        campaign = await asyncio.to_thread(_get_db().get_campaign, campaign_id)
 
         if not campaign:
             return {"success": False, "error": "Campanha nao encontrada"}
 
-        return {"success": True, "campaign": campaign}
+        result = {"success": True, "campaign": campaign}
+        progress = _generation_progress(campaign)
+        if progress:
+            result["generation"] = progress
+        return result
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available"}
     except Exception as e:
         logger.error(f"[get_campaign] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e)}
@@ -216,9 +453,7 @@ async def get_campaign_items_tool(
 ) -> Dict[str, Any]:
     """Get count items for a campaign."""
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
-        items = await db.get_campaign_items(campaign_id, status=status)
+        items = await asyncio.to_thread(_get_db().get_campaign_items, campaign_id, status)
 
         return {
             "success": True,
@@ -226,8 +461,6 @@ async def get_campaign_items_tool(
             "total": len(items),
         }
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available", "items": []}
     except Exception as e:
         logger.error(f"[get_campaign_items] Error: {e}", exc_info=True)
         return {"success": False, "error": str(e), "items": []}
@@ -247,16 +480,15 @@ async def complete_campaign_tool(
     audit.working(message=f"Finalizando campanha: {campaign_id}", session_id=session_id)
 
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
+        db = _get_db()
 
         # Get campaign
-        campaign = await db.get_campaign(campaign_id)
+        campaign = await asyncio.to_thread(db.get_campaign, campaign_id)
         if not campaign:
             return {"success": False, "error": "Campanha nao encontrada"}
 
         # Get items
-        items = await db.get_campaign_items(campaign_id)
+        items = await asyncio.to_thread(db.get_campaign_items, campaign_id)
         pending = [i for i in items if i.get("status") == CountStatus.PENDING]
 
         if pending:
@@ -273,7 +505,7 @@ async def complete_campaign_tool(
         accuracy = (len(items) - len(divergent)) / len(items) if items else 0
 
         # Update campaign
-        await db.update_campaign(campaign_id, {
+        await _update_campaign(campaign_id, {
             "status": CampaignStatus.COMPLETED,
             "completed_at": now,
             "completed_by": completed_by,
@@ -298,8 +530,6 @@ async def complete_campaign_tool(
             },
         }
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available"}
     except Exception as e:
         logger.error(f"[complete_campaign] Error: {e}", exc_info=True)
         audit.error(message="Erro ao finalizar campanha", session_id=session_id, error=str(e))
@@ -1,9 +1,22 @@
 # =============================================================================
 # Counting Tools
 # =============================================================================
+# Campaign counters (counted_items, divergent_items) are maintained
+# incrementally: each count applies +/- deltas on the campaign record in the
+# same DynamoDB transaction as the count item update
+# (SGADynamoDBClient.update_count_item_with_counters), conditioned on the
+# item's previous status. A periodic reconciliation recounts campaigns that
+# received counts and rewrites their counters (never their status).
+#
+# submit_counts_tool accepts a whole batch from handheld scanners: items are
+# loaded with BatchGetItem, evaluated in memory and written with one
+# transaction per item.
+# =============================================================================
 
+import asyncio
 import logging
-from typing import Dict, Any, List, Optional
+import os
+from typing import Dict, Any, List, Optional, Set, Tuple
 from datetime import datetime
 import uuid
 
@@ -14,6 +27,35 @@ logger = logging.getLogger(__name__)
 AGENT_ID = "reconciliacao"
 audit = AgentAuditEmitter(agent_id=AGENT_ID)
 
+# Seconds between counter reconciliation passes
+COUNTER_RECONCILE_INTERVAL = float(os.environ.get("COUNTER_RECONCILE_INTERVAL", "300"))
+
+# Max counts per submit_counts call
+MAX_BULK_COUNTS = 500
+
+# Max concurrent count item transactions in bulk submissions
+BULK_COUNT_CONCURRENCY = 16
+
+# Campaign statuses that accept counts
+COUNTABLE_CAMPAIGN_STATUSES = ("ACTIVE", "IN_PROGRESS")
+
+CONFLICT_ERROR = "Item alterado por outra contagem, tente novamente"
+
+# Campaigns with counts since the last reconciliation pass
+_dirty_campaigns: Set[str] = set()
+_reconcile_task: Optional[asyncio.Task] = None
+
+_db_client = None
+
+
+def _get_db():
+    """Lazy-load DynamoDB client (campaigns and count items)."""
+    global _db_client
+    if _db_client is None:
+        from tools.dynamodb_client import SGADynamoDBClient
+        _db_client = SGADynamoDBClient()
+    return _db_client
+
 
 class CountStatus:
     PENDING = "PENDING"
@@ -60,11 +102,15 @@ async def submit_count_tool(
     )
 
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
+        db = _get_db()
+
+        campaign = await asyncio.to_thread(db.get_campaign, campaign_id)
+        error = _campaign_error(campaign)
+        if error:
+            return {"success": False, "error": error}
 
         # Get count item
-        count_item = await db.get_count_item(campaign_id, part_number, location_id)
+        count_item = await asyncio.to_thread(db.get_count_item, campaign_id, part_number, location_id)
 
         if not count_item:
             return {
@@ -72,54 +118,31 @@ async def submit_count_tool(
                 "error": f"Item de contagem nao encontrado: {part_number} @ {location_id}",
             }
 
-        if count_item.get("status") not in [CountStatus.PENDING, CountStatus.COUNTED]:
-            return {
-                "success": False,
-                "error": f"Item ja foi processado. Status: {count_item.get('status')}",
-            }
-
-        now = datetime.utcnow().isoformat() + "Z"
-
         # Check if campaign requires double count
-        campaign = await db.get_campaign(campaign_id)
-        require_double = campaign and campaign.get("require_double_count", False)
-
-        # Determine new status
-        system_qty = count_item.get("system_quantity", 0)
-        is_divergent = counted_quantity != system_qty
-
-        if require_double and not count_item.get("counted_by"):
-            # First count, needs verification
-            new_status = CountStatus.COUNTED
-        elif require_double and count_item.get("counted_by") == counted_by:
-            # Same person trying to verify - not allowed
-            return {
-                "success": False,
-                "error": "Verificacao deve ser feita por pessoa diferente",
-            }
-        else:
-            # Final count or no double-count required
-            new_status = CountStatus.DIVERGENT if is_divergent else CountStatus.VERIFIED
-
-        # Update count item
-        updates = {
-            "counted_quantity": counted_quantity,
-            "counted_serials": counted_serials or [],
-            "counted_by": counted_by,
-            "counted_at": now,
-            "status": new_status,
-            "evidence_keys": evidence_keys or [],
-            "notes": notes,
-        }
+        require_double = bool(campaign.get("require_double_count", False))
 
-        if new_status in [CountStatus.VERIFIED, CountStatus.DIVERGENT]:
-            updates["verified_by"] = counted_by
-            updates["verified_at"] = now
+        now = datetime.utcnow().isoformat() + "Z"
+        evaluation = _evaluate_count(
+            count_item=count_item,
+            counted_quantity=counted_quantity,
+            counted_serials=counted_serials,
+            counted_by=counted_by,
+            evidence_keys=evidence_keys,
+            notes=notes,
+            require_double=require_double,
+            now=now,
+        )
+        if "error" in evaluation:
+            return {"success": False, "error": evaluation["error"]}
 
-        await db.update_count_item(campaign_id, part_number, location_id, updates)
+        new_status = evaluation["status"]
+        system_qty = evaluation["system_quantity"]
+        is_divergent = evaluation["is_divergent"]
 
-        # Update campaign counters
-        await _update_campaign_counters(campaign_id)
+        # Update count item and campaign counters together
+        conflicts = await _apply_count_updates(campaign_id, [(count_item, evaluation)], campaign)
+        if conflicts:
+            return {"success": False, "error": CONFLICT_ERROR}
 
         # If divergent, create divergence record
         if new_status == CountStatus.DIVERGENT:
@@ -154,32 +177,337 @@ async def submit_count_tool(
             },
         }
 
-    except ImportError:
-        return {"success": False, "error": "DBClient not available"}
     except Exception as e:
         logger.error(f"[submit_count] Error: {e}", exc_info=True)
         audit.error(message="Erro ao registrar contagem", session_id=session_id, error=str(e))
         return {"success": False, "error": str(e)}
 
 
-async def _update_campaign_counters(campaign_id: str) -> None:
-    """Update campaign progress counters."""
+@trace_tool_call("sga_submit_counts")
+async def submit_counts_tool(
+    campaign_id: str,
+    counts: List[Dict[str, Any]],
+    counted_by: str = "system",
+    session_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Submit a batch of count results (handheld scanners).
+
+    Args:
+        campaign_id: Campaign ID
+        counts: List of {part_number, location_id, counted_quantity,
+            counted_serials?, evidence_keys?, notes?}
+        counted_by: User who counted
+    """
+    if len(counts) > MAX_BULK_COUNTS:
+        return {
+            "success": False,
+            "error": f"Maximo de {MAX_BULK_COUNTS} contagens por envio ({len(counts)} recebidas)",
+        }
+
+    audit.working(
+        message=f"Registrando {len(counts)} contagens na campanha {campaign_id}",
+        session_id=session_id,
+    )
+
+    try:
+        db = _get_db()
+
+        campaign = await asyncio.to_thread(db.get_campaign, campaign_id)
+        error = _campaign_error(campaign)
+        if error:
+            return {"success": False, "error": error}
+        require_double = bool(campaign.get("require_double_count", False))
+
+        keys = [(c.get("part_number"), c.get("location_id")) for c in counts]
+        items = await _get_count_items(campaign_id, keys)
+
+        now = datetime.utcnow().isoformat() + "Z"
+        results: List[Dict[str, Any]] = []
+        result_by_key: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        accepted: List[Tuple[Dict[str, Any], Dict[str, Any]]] = []
+        seen: Set[Tuple[str, str]] = set()
+
+        for count, key in zip(counts, keys):
+            result = {"part_number": key[0], "location_id": key[1]}
+            count_item = items.get(key)
+            if key in seen:
+                result["error"] = "Item repetido no mesmo envio"
+            elif not count_item:
+                result["error"] = f"Item de contagem nao encontrado: {key[0]} @ {key[1]}"
+            else:
+                evaluation = _evaluate_count(
+                    count_item=count_item,
+                    counted_quantity=int(count.get("counted_quantity", 0)),
+                    counted_serials=count.get("counted_serials"),
+                    counted_by=counted_by,
+                    evidence_keys=count.get("evidence_keys"),
+                    notes=count.get("notes"),
+                    require_double=require_double,
+                    now=now,
+                )
+                if "error" in evaluation:
+                    result["error"] = evaluation["error"]
+                else:
+                    accepted.append((count_item, evaluation))
+                    result_by_key[key] = result
+                    result.update({
+                        "status": evaluation["status"],
+                        "system_quantity": evaluation["system_quantity"],
+                        "counted_quantity": evaluation["updates"]["counted_quantity"],
+                        "is_divergent": evaluation["is_divergent"],
+                    })
+            seen.add(key)
+            results.append(result)
+
+        if accepted:
+            conflicts = await _apply_count_updates(campaign_id, accepted, campaign)
+            for key in conflicts:
+                result = result_by_key[key]
+                for field in ("status", "system_quantity", "counted_quantity", "is_divergent"):
+                    result.pop(field, None)
+                result["error"] = CONFLICT_ERROR
+            accepted = [
+                (item, ev) for item, ev in accepted
+                if (item.get("part_number"), item.get("location_id")) not in conflicts
+            ]
+
+            divergent = [
+                (item, ev) for item, ev in accepted if ev["status"] == CountStatus.DIVERGENT
+            ]
+            await asyncio.gather(*(
+                _create_divergence_record(
+                    campaign_id=campaign_id,
+                    count_item=item,
+                    counted_quantity=ev["updates"]["counted_quantity"],
+                    counted_serials=ev["updates"]["counted_serials"],
+                )
+                for item, ev in divergent
+            ))
+
+        rejected = len(counts) - len(accepted)
+        divergent_count = sum(1 for _, ev in accepted if ev["status"] == CountStatus.DIVERGENT)
+
+        audit.completed(
+            message=f"{len(accepted)} contagens registradas ({rejected} rejeitadas)",
+            session_id=session_id,
+            details={"accepted": len(accepted), "rejected": rejected, "divergent": divergent_count},
+        )
+
+        return {
+            "success": rejected == 0,
+            "campaign_id": campaign_id,
+            "message": f"{len(accepted)} de {len(counts)} contagens registradas",
+            "data": {
+                "accepted": len(accepted),
+                "rejected": rejected,
+                "divergent": divergent_count,
+                "results": results,
+            },
+        }
+
+    except Exception as e:
+        logger.error(f"[submit_counts] Error: {e}", exc_info=True)
+        audit.error(message="Erro ao registrar contagens", session_id=session_id, error=str(e))
+        return {"success": False, "error": str(e)}
+
+
+def _evaluate_count(
+    count_item: Dict[str, Any],
+    counted_quantity: int,
+    counted_serials: Optional[List[str]],
+    counted_by: str,
+    evidence_keys: Optional[List[str]],
+    notes: Optional[str],
+    require_double: bool,
+    now: str,
+) -> Dict[str, Any]:
+    """
+    Decide the new status of a count item and build its updates.
+
+    Returns:
+        Dict with status, updates, system_quantity, is_divergent and
+        counter deltas - or {"error": ...} when the count is rejected.
+    """
+    old_status = count_item.get("status")
+    if old_status not in [CountStatus.PENDING, CountStatus.COUNTED]:
+        return {"error": f"Item ja foi processado. Status: {old_status}"}
+
+    # Determine new status
+    system_qty = count_item.get("system_quantity", 0)
+    is_divergent = counted_quantity != system_qty
+
+    if require_double and not count_item.get("counted_by"):
+        # First count, needs verification
+        new_status = CountStatus.COUNTED
+    elif require_double and count_item.get("counted_by") == counted_by:
+        # Same person trying to verify - not allowed
+        return {"error": "Verificacao deve ser feita por pessoa diferente"}
+    else:
+        # Final count or no double-count required
+        new_status = CountStatus.DIVERGENT if is_divergent else CountStatus.VERIFIED
+
+    updates = {
+        "counted_quantity": counted_quantity,
+        "counted_serials": counted_serials or [],
+        "counted_by": counted_by,
+        "counted_at": now,
+        "status": new_status,
+        "evidence_keys": evidence_keys or [],
+        "notes": notes,
+    }
+
+    if new_status in [CountStatus.VERIFIED, CountStatus.DIVERGENT]:
+        updates["verified_by"] = counted_by
+        updates["verified_at"] = now
+
+    return {
+        "status": new_status,
+        "previous_status": old_status,
+        "updates": updates,
+        "system_quantity": system_qty,
+        "is_divergent": is_divergent,
+        "deltas": _counter_deltas(old_status, new_status),
+    }
+
+
+def _counter_deltas(old_status: Optional[str], new_status: str) -> Dict[str, int]:
+    """Campaign counter deltas for a count item status transition."""
+    counted = int(new_status != CountStatus.PENDING) - int(old_status not in (None, CountStatus.PENDING))
+    divergent = int(new_status == CountStatus.DIVERGENT) - int(old_status == CountStatus.DIVERGENT)
+    return {"counted_items": counted, "divergent_items": divergent}
+
+
+def _campaign_error(campaign: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Why a campaign cannot receive counts (None if it can)."""
+    if not campaign:
+        return "Campanha nao encontrada"
+    if campaign.get("status") not in COUNTABLE_CAMPAIGN_STATUSES:
+        return f"Campanha nao aceita contagens. Status: {campaign.get('status')}"
+    return None
+
+
+async def _get_count_items(
+    campaign_id: str,
+    keys: List[Tuple[str, str]],
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Load count items for (part_number, location_id) keys (BatchGetItem)."""
+    unique = list(dict.fromkeys(keys))
+    rows = await asyncio.to_thread(_get_db().get_count_items, campaign_id, unique)
+    return {(r.get("part_number"), r.get("location_id")): r for r in rows}
+
+
+async def _apply_count_updates(
+    campaign_id: str,
+    accepted: List[Tuple[Dict[str, Any], Dict[str, Any]]],
+    campaign: Optional[Dict[str, Any]] = None,
+) -> Set[Tuple[str, str]]:
+    """
+    Write count item updates and campaign counter deltas.
+
+    Each item is updated with update_count_item_with_counters: the item
+    update (conditioned on its previous status) and the counter increments
+    commit in one transaction.
+
+    Returns:
+        (part_number, location_id) keys whose transaction was cancelled
+        because the item changed since it was read
+    """
+    db = _get_db()
+    _mark_dirty(campaign_id)
+
+    # First count moves the campaign to IN_PROGRESS (only from ACTIVE)
+    if campaign and campaign.get("status") == "ACTIVE":
+        await asyncio.to_thread(db.update_campaign, campaign_id, {"status": "IN_PROGRESS"}, "ACTIVE")
+
+    semaphore = asyncio.Semaphore(BULK_COUNT_CONCURRENCY)
+
+    async def update(item: Dict[str, Any], evaluation: Dict[str, Any]) -> bool:
+        async with semaphore:
+            return await asyncio.to_thread(
+                db.update_count_item_with_counters,
+                campaign_id,
+                item.get("part_number"),
+                item.get("location_id"),
+                evaluation["updates"],
+                evaluation["deltas"],
+                evaluation["previous_status"],
+            )
+
+    applied = await asyncio.gather(*(update(item, ev) for item, ev in accepted))
+    return {
+        (item.get("part_number"), item.get("location_id"))
+        for (item, _), ok in zip(accepted, applied) if not ok
+    }
+
+
+async def reconcile_campaign_counters(campaign_id: str) -> Dict[str, int]:
+    """
+    Recount campaign progress counters from its items (full scan).
+
+    Used by the periodic reconciliation to correct counter drift. Only the
+    counters are written: the campaign status belongs to the count and
+    completion tools.
+    """
+    db = _get_db()
+    items = await asyncio.to_thread(db.get_campaign_items, campaign_id)
+
+    counted = len([i for i in items if i.get("status") != CountStatus.PENDING])
+    divergent = len([i for i in items if i.get("status") == CountStatus.DIVERGENT])
+
+    await asyncio.to_thread(db.update_campaign, campaign_id, {
+        "counted_items": counted,
+        "divergent_items": divergent,
+    })
+    return {"counted_items": counted, "divergent_items": divergent}
+
+
+# Backward-compatible name (full recount)
+_update_campaign_counters = reconcile_campaign_counters
+
+
+def _mark_dirty(campaign_id: str) -> None:
+    """Queue a campaign for the next reconciliation pass."""
+    _dirty_campaigns.add(campaign_id)
+    _ensure_reconcile_task()
+
+
+def _ensure_reconcile_task() -> None:
+    """Start the periodic reconciliation loop on the running event loop."""
+    global _reconcile_task
+    if COUNTER_RECONCILE_INTERVAL <= 0:
+        return
+    if _reconcile_task is not None and not _reconcile_task.done():
+        return
     try:
-        from tools.db_client import DBClient
-        db = DBClient()
+        _reconcile_task = asyncio.get_running_loop().create_task(_reconcile_loop())
+    except RuntimeError:
+        pass  # No running loop (sync caller) - next async submit starts it
 
-        items = await db.get_campaign_items(campaign_id)
 
-        counted = len([i for i in items if i.get("status") != CountStatus.PENDING])
-        divergent = len([i for i in items if i.get("status") == CountStatus.DIVERGENT])
+async def _reconcile_loop() -> None:
+    """Periodically recount campaigns that received counts."""
+    while True:
+        await asyncio.sleep(COUNTER_RECONCILE_INTERVAL)
+        await reconcile_dirty_campaigns()
 
-        await db.update_campaign(campaign_id, {
-            "counted_items": counted,
-            "divergent_items": divergent,
-            "status": "IN_PROGRESS" if counted > 0 else "ACTIVE",
-        })
-    except ImportError:
-        logger.warning("[_update_campaign_counters] DBClient not available")
+
+async def reconcile_dirty_campaigns() -> int:
+    """
+    Reconcile counters of every campaign counted since the last pass.
+
+    Returns:
+        Number of campaigns reconciled
+    """
+    pending = list(_dirty_campaigns)
+    _dirty_campaigns.difference_update(pending)
+    for campaign_id in pending:
+        try:
+            await reconcile_campaign_counters(campaign_id)
+        except Exception as e:
+            logger.warning(f"[reconcile_counters] {campaign_id} failed: {e}")
+            _dirty_campaigns.add(campaign_id)
+    return len(pending)
 
 
 async def _create_divergence_record(
@@ -229,9 +557,5 @@ async def _create_divergence_record(
         "created_at": now,
     }
 
-    try:
-        from tools.db_client import DBClient
-        db = DBClient()
-        await db.put_divergence(div_data)
-    except ImportError:
-        logger.warning("[_create_divergence_record] DBClient not available")
+    if not await asyncio.to_thread(_get_db().put_divergence, div_data):
+        logger.warning(f"[_create_divergence_record] {div_id} not stored")
@@ -292,7 +292,7 @@ async def create_column_tool(
             )
             return result.to_dict()
 
-        mcp_result = db_adapter.create_column_safe(
+        mcp_result = await db_adapter.create_column_safe(
             table_name=table_name,
             column_name=safe_column,
             column_type=column_type,
@@ -10,11 +10,21 @@
 # GOOGLE_API_KEY is loaded from SSM Parameter Store at runtime (BUG-010 fix).
 # SSM Path: /faiston-one/academy/google-api-key
 # If env var is already set, SSM lookup is skipped.
+#
+# Cold Start:
+# LazyGeminiModel defers credentials + model construction; register_model_prewarm()
+# does both in the background once the server is up. GeminiModel instances are
+# shared process-wide per (model_id, params).
 # =============================================================================
 
+import asyncio
 import json
+import logging
 import re
-from typing import Dict, Any, Optional, List
+import threading
+import time
+import weakref
+from typing import Dict, Any, Optional, List, AsyncGenerator
 from datetime import datetime
 import os
 
@@ -138,6 +148,147 @@ def requires_thinking(agent_type: str) -> bool:
     return agent_type in PRO_THINKING_AGENTS
 
 
+# =============================================================================
+# Gemini Model Bootstrap (credentials, params, process-wide registry)
+# =============================================================================
+# Cold start cost of an agent container is dominated by two blocking calls:
+# the SSM lookup of GOOGLE_API_KEY and the GeminiModel construction. Both are
+# done once per process (guarded by locks) and can be moved off the request
+# path by prewarming after the A2A server starts serving.
+# =============================================================================
+
+# SSM Parameter holding the Google AI Studio API key (BUG-010)
+GOOGLE_API_KEY_SSM_PARAMETER = "/faiston-one/academy/google-api-key"
+
+# Prewarm models in the background once the server is up (set "false" to disable)
+GEMINI_PREWARM_ENABLED = os.environ.get("GEMINI_PREWARM", "true").lower() == "true"
+
+_api_key_lock = threading.Lock()
+_model_registry_lock = threading.Lock()
+_model_registry: Dict[str, GeminiModel] = {}
+_model_init_locks: Dict[str, threading.Lock] = {}
+_lazy_models: "weakref.WeakSet[LazyGeminiModel]" = weakref.WeakSet()
+
+
+def ensure_google_api_key() -> None:
+    """
+    Ensure GOOGLE_API_KEY is in the environment, loading it from SSM once.
+
+    Concurrent callers block on a lock so SSM is queried at most once per
+    process.
+
+    Raises:
+        RuntimeError: If the key is not in env and the SSM lookup fails
+    """
+    if os.environ.get("GOOGLE_API_KEY"):
+        return
+
+    logger = logging.getLogger(__name__)
+    with _api_key_lock:
+        if os.environ.get("GOOGLE_API_KEY"):
+            return
+        logger.info("[LazyGeminiModel] GOOGLE_API_KEY not in env, loading from SSM...")
+        try:
+            import boto3
+            ssm = boto3.client("ssm", region_name="us-east-2")
+            response = ssm.get_parameter(
+                Name=GOOGLE_API_KEY_SSM_PARAMETER,
+                WithDecryption=True
+            )
+            os.environ["GOOGLE_API_KEY"] = response["Parameter"]["Value"]
+            logger.info("[LazyGeminiModel] GOOGLE_API_KEY loaded from SSM successfully")
+        except Exception as e:
+            logger.error(f"[LazyGeminiModel] Failed to load GOOGLE_API_KEY from SSM: {e}")
+            raise RuntimeError(
+                "GOOGLE_API_KEY not found in environment and SSM lookup failed. "
+                f"SSM path: {GOOGLE_API_KEY_SSM_PARAMETER}. Error: {e}"
+            )
+
+
+def build_gemini_params(agent_type: str, model_id: str) -> Dict[str, Any]:
+    """
+    Build GeminiModel params for an agent type.
+
+    Args:
+        agent_type: Agent identifier (thinking mode selection)
+        model_id: Gemini model ID (thinking parameter format)
+
+    Returns:
+        Params dict for GeminiModel
+    """
+    # BUG-011 FIX: Increased max_output_tokens from 4096 to 16384
+    # The file analysis response includes: structure, mappings, confidence scores,
+    # HIL questions, unmapped columns, and full JSON output. With the new
+    # RESPONSE FORMAT requirement (commit 09caf83), responses can easily exceed
+    # 4096 tokens, causing MaxTokensReachedException in Strands A2A.
+    # Gemini 2.5 Pro supports up to 65,536 output tokens.
+    # Reference: https://ai.google.dev/gemini-api/docs/models/gemini#gemini-2.5-pro
+    #
+    # BUG-021 v7 FIX: REMOVED response_mime_type: "application/json"
+    # Gemini API does NOT support response_mime_type when tools (function calling)
+    # are enabled. The error was: "Function calling with a response mime type:
+    # 'application/json' is unsupported"
+    # Reference: https://ai.google.dev/gemini-api/docs/function-calling
+    # JSON output is enforced via system prompt instead.
+    params: Dict[str, Any] = {
+        "temperature": 0.7,
+        "max_output_tokens": 16384,  # 4x increase to handle detailed analysis
+    }
+
+    # BUG-009 CORRECT FIX: Different thinking parameters per Gemini version
+    # - Gemini 2.5: Uses "thinking_budget" (integer: 128-32768, or -1 for dynamic)
+    # - Gemini 3: Uses "thinking_level" (string: "high", "medium", "low")
+    # Reference: https://ai.google.dev/gemini-api/docs/thinking
+    if requires_thinking(agent_type):
+        if "gemini-3" in model_id:
+            params["thinking_config"] = {
+                "thinking_level": "high"  # Max reasoning for Gemini 3
+            }
+        else:
+            # Gemini 2.5 uses thinking_budget instead of thinking_level
+            params["thinking_config"] = {
+                "thinking_budget": -1  # Dynamic allocation for Gemini 2.5
+            }
+    return params
+
+
+def get_shared_gemini_model(model_id: str, params: Dict[str, Any]) -> GeminiModel:
+    """
+    Return the process-wide GeminiModel for (model_id, params), creating it once.
+
+    Agents (and swarm members) in the same process with the same model
+    configuration share one instance and its HTTP client.
+
+    Args:
+        model_id: Gemini model ID
+        params: GeminiModel params
+
+    Returns:
+        Shared GeminiModel instance
+    """
+    key = f"{model_id}|{json.dumps(params, sort_keys=True)}"
+    model = _model_registry.get(key)
+    if model is not None:
+        return model
+
+    # One lock per configuration: different models initialize in parallel
+    with _model_registry_lock:
+        init_lock = _model_init_locks.setdefault(key, threading.Lock())
+
+    with init_lock:
+        model = _model_registry.get(key)
+        if model is None:
+            ensure_google_api_key()
+            # NOW make the actual connection to Google
+            model = GeminiModel(model_id=model_id, params=params)
+            _model_registry[key] = model
+            logging.getLogger(__name__).info(
+                f"[LazyGeminiModel] GeminiModel initialized ({model_id}, "
+                f"{len(_model_registry)} model(s) in registry)"
+            )
+    return model
+
+
 class LazyGeminiModel:
     """
     Lazy-loading wrapper for GeminiModel to enable fast A2A server startup.
@@ -148,13 +299,15 @@ class LazyGeminiModel:
     which can exceed this timeout on cold starts.
 
     This wrapper defers the actual GeminiModel initialization until the first
-    inference call, allowing the A2A server to start instantly and respond to
-    AgentCore's health probes.
+    inference call (or a background prewarm), allowing the A2A server to start
+    instantly and respond to AgentCore's health probes. Initialization never
+    runs on the event loop: stream() and prewarm() build the model in a worker
+    thread, guarded by a lock so concurrent first requests don't race.
 
     Usage:
         model = LazyGeminiModel(agent_type="nexo_import")
         agent = Agent(model=model, ...)  # Server starts immediately
-        # First actual request triggers GeminiModel initialization
+        register_model_prewarm(app)      # Optional: warm up after startup
 
     Reference: https://strandsagents.com/latest/documentation/docs/user-guide/concepts/model-providers/gemini/
     """
@@ -169,92 +322,86 @@ class LazyGeminiModel:
         self._agent_type = agent_type
         self._model: GeminiModel | None = None
         self._model_id = get_model(agent_type)
+        self._init_lock = threading.Lock()
+        self._created_at = time.perf_counter()
+        self._timings: Dict[str, Any] = {
+            "agent_type": agent_type,
+            "model_id": self._model_id,
+            "initialized_by": None,
+            "init_ms": None,
+            "ready_after_ms": None,
+            "first_token_ms": None,
+            "cold_start_to_first_token_ms": None,
+        }
+        _lazy_models.add(self)
         # Log immediately so CloudWatch shows server started
-        import logging
         logging.getLogger(__name__).info(
             f"[LazyGeminiModel] Initialized for {agent_type} (model: {self._model_id}) - "
             f"actual connection deferred to first request"
         )
 
-    def _ensure_model(self) -> GeminiModel:
+    def _ensure_model(self, source: str = "request") -> GeminiModel:
         """
         Ensure GeminiModel is initialized, creating it on first call.
 
+        Args:
+            source: What triggered initialization ("request" or "prewarm")
+
         Returns:
             Initialized GeminiModel instance
         """
-        if self._model is None:
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(f"[LazyGeminiModel] First request - initializing GeminiModel...")
-
-            # BUG-010 FIX: Load GOOGLE_API_KEY from SSM if not in environment
-            # SSM Parameter: /faiston-one/academy/google-api-key
-            if not os.environ.get("GOOGLE_API_KEY"):
-                logger.info("[LazyGeminiModel] GOOGLE_API_KEY not in env, loading from SSM...")
-                try:
-                    import boto3
-                    ssm = boto3.client("ssm", region_name="us-east-2")
-                    response = ssm.get_parameter(
-                        Name="/faiston-one/academy/google-api-key",
-                        WithDecryption=True
-                    )
-                    api_key = response["Parameter"]["Value"]
-                    os.environ["GOOGLE_API_KEY"] = api_key
-                    logger.info("[LazyGeminiModel] GOOGLE_API_KEY loaded from SSM successfully")
-                except Exception as e:
-                    logger.error(f"[LazyGeminiModel] Failed to load GOOGLE_API_KEY from SSM: {e}")
-                    raise RuntimeError(
-                        "GOOGLE_API_KEY not found in environment and SSM lookup failed. "
-                        f"SSM path: /faiston-one/academy/google-api-key. Error: {e}"
-                    )
-
-            # Build params
-            # BUG-011 FIX: Increased max_output_tokens from 4096 to 16384
-            # The file analysis response includes: structure, mappings, confidence scores,
-            # HIL questions, unmapped columns, and full JSON output. With the new
-            # RESPONSE FORMAT requirement (commit 09caf83), responses can easily exceed
-            # 4096 tokens, causing MaxTokensReachedException in Strands A2A.
-            # Gemini 2.5 Pro supports up to 65,536 output tokens.
-            # Reference: https://ai.google.dev/gemini-api/docs/models/gemini#gemini-2.5-pro
-            #
-            # BUG-021 v7 FIX: REMOVED response_mime_type: "application/json"
-            # Gemini API does NOT support response_mime_type when tools (function calling)
-            # are enabled. The error was: "Function calling with a response mime type:
-            # 'application/json' is unsupported"
-            # Reference: https://ai.google.dev/gemini-api/docs/function-calling
-            # JSON output is enforced via system prompt instead.
-            params = {
-                "temperature": 0.7,
-                "max_output_tokens": 16384,  # 4x increase to handle detailed analysis
-            }
+        if self._model is not None:
+            return self._model
+
+        with self._init_lock:
+            if self._model is None:
+                logging.getLogger(__name__).info(
+                    f"[LazyGeminiModel] Initializing GeminiModel for {self._agent_type} ({source})..."
+                )
+                started = time.perf_counter()
+                params = build_gemini_params(self._agent_type, self._model_id)
+                self._model = get_shared_gemini_model(self._model_id, params)
+                finished = time.perf_counter()
+                self._timings["initialized_by"] = source
+                self._timings["init_ms"] = round((finished - started) * 1000, 1)
+                self._timings["ready_after_ms"] = round((finished - self._created_at) * 1000, 1)
 
-            # BUG-009 CORRECT FIX: Different thinking parameters per Gemini version
-            # - Gemini 2.5: Uses "thinking_budget" (integer: 128-32768, or -1 for dynamic)
-            # - Gemini 3: Uses "thinking_level" (string: "high", "medium", "low")
-            # Reference: https://ai.google.dev/gemini-api/docs/thinking
-            is_gemini_3 = "gemini-3" in self._model_id
-            if requires_thinking(self._agent_type):
-                if is_gemini_3:
-                    params["thinking_config"] = {
-                        "thinking_level": "high"  # Max reasoning for Gemini 3
-                    }
-                    logger.info(f"[LazyGeminiModel] Thinking mode enabled (Gemini 3 - thinking_level: high)")
-                else:
-                    # Gemini 2.5 uses thinking_budget instead of thinking_level
-                    params["thinking_config"] = {
-                        "thinking_budget": -1  # Dynamic allocation for Gemini 2.5
-                    }
-                    logger.info(f"[LazyGeminiModel] Thinking mode enabled (Gemini 2.5 - thinking_budget: dynamic)")
+        return self._model
 
-            # NOW make the actual connection to Google
-            self._model = GeminiModel(
-                model_id=self._model_id,
-                params=params,
+    async def _ensure_model_async(self, source: str = "request") -> GeminiModel:
+        """Initialize the model in a worker thread (never blocks the event loop)."""
+        if self._model is not None:
+            return self._model
+        return await asyncio.to_thread(self._ensure_model, source)
+
+    async def prewarm(self) -> None:
+        """Resolve credentials and build the model in the background."""
+        try:
+            await self._ensure_model_async(source="prewarm")
+        except Exception as e:
+            # A failed prewarm is retried by the first request
+            logging.getLogger(__name__).warning(
+                f"[LazyGeminiModel] Prewarm failed for {self._agent_type}: {e}"
             )
-            logger.info(f"[LazyGeminiModel] GeminiModel initialized successfully")
 
-        return self._model
+    async def stream(self, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        """Stream from the underlying GeminiModel, recording first-token timing."""
+        model = await self._ensure_model_async()
+        started = time.perf_counter()
+        first = self._timings["first_token_ms"] is None
+        async for event in model.stream(*args, **kwargs):
+            if first:
+                first = False
+                now = time.perf_counter()
+                self._timings["first_token_ms"] = round((now - started) * 1000, 1)
+                self._timings["cold_start_to_first_token_ms"] = round((now - self._created_at) * 1000, 1)
+            yield event
+
+    async def structured_output(self, *args: Any, **kwargs: Any) -> AsyncGenerator[Any, None]:
+        """Structured output from the underlying GeminiModel."""
+        model = await self._ensure_model_async()
+        async for event in model.structured_output(*args, **kwargs):
+            yield event
 
     def __getattr__(self, name: str):
         """
@@ -271,6 +418,16 @@ class LazyGeminiModel:
         """Return model ID without initializing the model."""
         return self._model_id
 
+    @property
+    def is_ready(self) -> bool:
+        """Whether the underlying GeminiModel is initialized."""
+        return self._model is not None
+
+    @property
+    def timings(self) -> Dict[str, Any]:
+        """Cold start timings (ms) without initializing the model."""
+        return dict(self._timings)
+
 
 def create_gemini_model(agent_type: str = "default") -> LazyGeminiModel:
     """
@@ -278,7 +435,7 @@ def create_gemini_model(agent_type: str = "default") -> LazyGeminiModel:
 
     BUG-008 FIX: Returns LazyGeminiModel instead of GeminiModel to enable
     fast A2A server startup. The actual Google API connection is deferred
-    until the first inference request.
+    until the first inference request or background prewarm.
 
     TEMPORARY: Using Gemini 2.5 due to Strands SDK thoughtSignature issue.
     See: https://github.com/strands-agents/sdk-python/issues/1199
@@ -289,6 +446,7 @@ def create_gemini_model(agent_type: str = "default") -> LazyGeminiModel:
     2. Configure thinking mode for complex reasoning agents
     3. Ensure consistent parameters across all agents
     4. Enable lazy loading for fast AgentCore startup (BUG-008)
+    5. Share GeminiModel instances with identical config (process registry)
 
     Reference: https://strandsagents.com/latest/documentation/docs/user-guide/concepts/model-providers/gemini/
 
@@ -301,6 +459,41 @@ def create_gemini_model(agent_type: str = "default") -> LazyGeminiModel:
     return LazyGeminiModel(agent_type=agent_type)
 
 
+async def prewarm_models() -> None:
+    """Prewarm every LazyGeminiModel created in this process, concurrently."""
+    models = [m for m in list(_lazy_models) if not m.is_ready]
+    if models:
+        await asyncio.gather(*(m.prewarm() for m in models))
+
+
+def get_model_timings() -> List[Dict[str, Any]]:
+    """Cold start timings for every LazyGeminiModel in this process."""
+    return [m.timings for m in list(_lazy_models)]
+
+
+def register_model_prewarm(app) -> None:
+    """
+    Prewarm models after the A2A server starts, and expose their timings.
+
+    Registers a FastAPI startup hook that schedules prewarm_models() as a
+    background task (the server keeps answering /ping meanwhile) and a
+    GET /model/timings endpoint. No-op prewarm when GEMINI_PREWARM=false.
+
+    Args:
+        app: FastAPI app wrapping the A2A server (call before mounting "/")
+    """
+    background: Dict[str, asyncio.Task] = {}
+
+    @app.on_event("startup")
+    async def _schedule_prewarm():
+        if GEMINI_PREWARM_ENABLED:
+            background["prewarm"] = asyncio.create_task(prewarm_models())
+
+    @app.get("/model/timings")
+    async def _model_timings():
+        return {"prewarm_enabled": GEMINI_PREWARM_ENABLED, "models": get_model_timings()}
+
+
 # =============================================================================
 # A2A Agent Skills Helper (100% A2A Architecture)
 # =============================================================================
@@ -84,6 +84,8 @@ CREATE TRIGGER trg_movements_immutable
 -- Function: update_balance_on_movement
 -- =============================================================================
 -- Automatically updates balance projections when a movement is created.
+-- Statement-level alternative for bulk inserts: 009_statement_balance_trigger.sql
+-- (sga.set_balance_trigger_mode).
 
 CREATE OR REPLACE FUNCTION sga.update_balance_on_movement()
 RETURNS TRIGGER AS $$
@@ -178,6 +180,7 @@ CREATE TRIGGER trg_movements_update_balance
 -- Function: update_asset_on_movement
 -- =============================================================================
 -- Updates asset status and location when movement items are created.
+-- Replaced by a statement-level trigger in 014_bulk_asset_transfer.sql.
 
 CREATE OR REPLACE FUNCTION sga.update_asset_on_movement_item()
 RETURNS TRIGGER AS $$
@@ -0,0 +1,86 @@
+-- =============================================================================
+-- Migration: 008_compliance_audit.sql
+-- =============================================================================
+-- Storage for the streaming compliance audit engine
+-- (SGAPostgresClient.run_compliance_audit / sga_audit_compliance tool).
+--
+-- New Tables:
+--   - compliance_audit_runs: One row per audit run (scope, counters, checkpoint)
+--   - compliance_audit_findings: Findings written incrementally per chunk
+--
+-- Resumability:
+--   Each chunk commits its findings together with the run checkpoint
+--   (movement_date, movement_id). A resumed run continues strictly after
+--   the checkpoint; findings are idempotent per (run, movement, code).
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- =============================================================================
+-- Table: compliance_audit_runs
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS sga.compliance_audit_runs (
+    run_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    period_start DATE,
+    period_end DATE,
+    location_code VARCHAR(50),
+    project_code VARCHAR(50),
+    rules_version VARCHAR(32) NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'RUNNING',  -- RUNNING, COMPLETED
+    total_operations BIGINT NOT NULL DEFAULT 0,
+    compliant BIGINT NOT NULL DEFAULT 0,
+    non_compliant BIGINT NOT NULL DEFAULT 0,
+    warnings BIGINT NOT NULL DEFAULT 0,
+    findings_by_code JSONB NOT NULL DEFAULT '{}',
+    checkpoint_movement_date TIMESTAMPTZ,
+    checkpoint_movement_id UUID,
+    requested_by VARCHAR(100),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    updated_at TIMESTAMPTZ DEFAULT NOW(),
+    completed_at TIMESTAMPTZ
+);
+
+COMMENT ON TABLE sga.compliance_audit_runs IS 'Compliance audit runs with resumable checkpoint';
+
+-- =============================================================================
+-- Table: compliance_audit_findings
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS sga.compliance_audit_findings (
+    finding_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    run_id UUID NOT NULL REFERENCES sga.compliance_audit_runs(run_id) ON DELETE CASCADE,
+    movement_id UUID NOT NULL,
+    movement_type VARCHAR(50),
+    movement_date TIMESTAMPTZ,
+    finding_code VARCHAR(50) NOT NULL,
+    severity VARCHAR(20) NOT NULL,  -- non_compliant, warning
+    required_role VARCHAR(50),
+    message VARCHAR(500),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (run_id, movement_id, finding_code)
+);
+
+COMMENT ON TABLE sga.compliance_audit_findings IS 'Findings produced by compliance audit runs';
+
+-- =============================================================================
+-- Indexes
+-- =============================================================================
+
+-- Keyset scan of movements in (movement_date, movement_id) order
+CREATE INDEX IF NOT EXISTS idx_movements_date_id
+    ON sga.movements(movement_date, movement_id);
+
+CREATE INDEX IF NOT EXISTS idx_audit_runs_status
+    ON sga.compliance_audit_runs(status, created_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_audit_findings_run_severity
+    ON sga.compliance_audit_findings(run_id, severity, movement_date);
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
@@ -0,0 +1,252 @@
+-- =============================================================================
+-- Migration: 009_statement_balance_trigger.sql
+-- =============================================================================
+-- Statement-level alternative to sga.update_balance_on_movement (003).
+--
+-- The row trigger upserts sga.balances once per inserted movement, so a
+-- 10k-movement import runs 10k upserts and contends on hot balance rows.
+-- sga.update_balance_on_movement_batch reads the statement's transition
+-- table (REFERENCING NEW TABLE), aggregates deltas per
+-- (part_number_id, location_id, project_id) and movement kind, and applies
+-- them with one set-based update + insert per INSERT statement. Balance
+-- rows are locked in balance_id order to avoid deadlocks between
+-- concurrent bulk inserts.
+--
+-- Semantics match the row trigger:
+--   - ENTRADA / AJUSTE_POSITIVO / REVERSA / TRANSFERENCIA (destination)
+--     increase quantity_total and create the balance row if missing
+--   - SAIDA / AJUSTE_NEGATIVO / EXPEDIÇÃO / TRANSFERENCIA (source)
+--     decrease quantity_total of existing rows only
+--   - RESERVA / LIBERACAO change quantity_reserved of existing rows only
+--     (including rows created earlier in the statement), clamped at zero
+--     after every row: they are replayed in insertion order (prefix sums
+--     over the transition table), so RESERVA 2, LIBERACAO 5, RESERVA 2
+--     leaves 2 reserved, as with the row trigger
+-- Within one statement, exits are netted against entries of the same key
+-- regardless of row order.
+--
+-- Switching (the row trigger stays the default):
+--   SELECT sga.set_balance_trigger_mode('statement');
+--   SELECT sga.set_balance_trigger_mode('row');
+--   SELECT sga.balance_trigger_mode();
+--
+-- Benchmark: scripts/benchmarks/bench_balance_trigger.py
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- =============================================================================
+-- Function: update_balance_on_movement_batch
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION sga.update_balance_on_movement_batch()
+RETURNS TRIGGER AS $$
+BEGIN
+    WITH numbered AS (
+        -- Transition table rows in insertion order
+        SELECT movement_type, part_number_id, quantity, source_location_id,
+               destination_location_id, project_id, row_number() OVER () AS seq
+        FROM new_movements
+    ),
+    deltas AS (
+        -- Increases at destination
+        SELECT part_number_id, destination_location_id AS location_id, project_id,
+               quantity AS qty_in, 0 AS qty_out, seq AS in_seq
+        FROM numbered
+        WHERE movement_type IN ('ENTRADA', 'AJUSTE_POSITIVO', 'REVERSA', 'TRANSFERENCIA')
+          AND destination_location_id IS NOT NULL
+        UNION ALL
+        -- Decreases at source
+        SELECT part_number_id, source_location_id, project_id,
+               0, quantity, NULL
+        FROM numbered
+        WHERE movement_type IN ('SAIDA', 'AJUSTE_NEGATIVO', 'EXPEDIÇÃO', 'TRANSFERENCIA')
+          AND source_location_id IS NOT NULL
+        UNION ALL
+        -- Keys touched by reservations and releases only
+        SELECT part_number_id, source_location_id, project_id,
+               0, 0, NULL
+        FROM numbered
+        WHERE movement_type IN ('RESERVA', 'LIBERACAO')
+          AND source_location_id IS NOT NULL
+    ),
+    aggregated AS (
+        SELECT part_number_id, location_id, project_id,
+               SUM(qty_in) AS qty_in,
+               SUM(qty_out) AS qty_out,
+               MIN(in_seq) AS first_in_seq
+        FROM deltas
+        GROUP BY part_number_id, location_id, project_id
+    ),
+    reservation_running AS (
+        -- Prefix sums of the reserved deltas in insertion order: over all
+        -- rows (balance rows that existed before the statement), and over
+        -- the rows after the first increase (balance rows it creates)
+        SELECT n.part_number_id, n.source_location_id AS location_id, n.project_id,
+               n.seq > a.first_in_seq AS after_create,
+               r.delta,
+               SUM(r.delta) OVER w AS running,
+               SUM(CASE WHEN n.seq > a.first_in_seq THEN r.delta ELSE 0 END) OVER w AS running_created
+        FROM numbered n
+        JOIN aggregated a
+          ON a.part_number_id = n.part_number_id
+         AND a.location_id = n.source_location_id
+         AND a.project_id IS NOT DISTINCT FROM n.project_id
+        CROSS JOIN LATERAL (
+            SELECT CASE WHEN n.movement_type = 'RESERVA' THEN n.quantity ELSE -n.quantity END AS delta
+        ) r
+        WHERE n.movement_type IN ('RESERVA', 'LIBERACAO')
+          AND n.source_location_id IS NOT NULL
+        WINDOW w AS (PARTITION BY n.part_number_id, n.source_location_id, n.project_id ORDER BY n.seq)
+    ),
+    reserved AS (
+        -- The row trigger clamps at zero after every row:
+        --   r_k = GREATEST(0, r_(k-1) + d_k)
+        -- whose final value is S_n + GREATEST(r_0, -MIN(S_k)), S_k = prefix sums
+        SELECT part_number_id, location_id, project_id,
+               SUM(delta) AS net,
+               MIN(running) AS low,
+               SUM(delta) FILTER (WHERE after_create) AS net_created,
+               MIN(running_created) FILTER (WHERE after_create) AS low_created
+        FROM reservation_running
+        GROUP BY part_number_id, location_id, project_id
+    ),
+    locked AS (
+        SELECT b.balance_id, a.qty_in, a.qty_out, r.net, r.low
+        FROM sga.balances b
+        JOIN aggregated a
+          ON b.part_number_id = a.part_number_id
+         AND b.location_id = a.location_id
+         AND b.project_id IS NOT DISTINCT FROM a.project_id
+        LEFT JOIN reserved r
+          ON r.part_number_id = a.part_number_id
+         AND r.location_id = a.location_id
+         AND r.project_id IS NOT DISTINCT FROM a.project_id
+        ORDER BY b.balance_id
+        FOR UPDATE OF b
+    ),
+    updated AS (
+        UPDATE sga.balances b
+        SET quantity_total = b.quantity_total + l.qty_in - l.qty_out,
+            quantity_reserved = COALESCE(
+                l.net + GREATEST(b.quantity_reserved, -l.low),
+                b.quantity_reserved
+            ),
+            last_movement_at = NOW(),
+            updated_at = NOW()
+        FROM locked l
+        WHERE b.balance_id = l.balance_id
+        RETURNING b.part_number_id, b.location_id, b.project_id
+    )
+    INSERT INTO sga.balances (
+        part_number_id, location_id, project_id, quantity_total, quantity_reserved, last_movement_at
+    )
+    SELECT a.part_number_id, a.location_id, a.project_id, a.qty_in - a.qty_out,
+           COALESCE(r.net_created + GREATEST(0, -r.low_created), 0), NOW()
+    FROM aggregated a
+    LEFT JOIN reserved r
+      ON r.part_number_id = a.part_number_id
+     AND r.location_id = a.location_id
+     AND r.project_id IS NOT DISTINCT FROM a.project_id
+    WHERE a.qty_in > 0
+      AND NOT EXISTS (
+          SELECT 1 FROM updated u
+          WHERE u.part_number_id = a.part_number_id
+            AND u.location_id = a.location_id
+            AND u.project_id IS NOT DISTINCT FROM a.project_id
+      )
+    ORDER BY a.part_number_id, a.location_id
+    ON CONFLICT (part_number_id, location_id, project_id)
+    DO UPDATE SET
+        -- Row created by a concurrent statement since the update above
+        quantity_total = sga.balances.quantity_total + EXCLUDED.quantity_total,
+        quantity_reserved = sga.balances.quantity_reserved + EXCLUDED.quantity_reserved,
+        last_movement_at = NOW(),
+        updated_at = NOW();
+
+    -- Same warning as the row trigger for unhandled movement types
+    IF EXISTS (
+        SELECT 1 FROM new_movements
+        WHERE movement_type NOT IN (
+            'ENTRADA', 'AJUSTE_POSITIVO', 'REVERSA', 'TRANSFERENCIA',
+            'SAIDA', 'AJUSTE_NEGATIVO', 'EXPEDIÇÃO', 'RESERVA', 'LIBERACAO'
+        )
+    ) THEN
+        RAISE WARNING 'Unknown movement type in batch insert';
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION sga.update_balance_on_movement_batch() IS
+    'Statement-level balance maintenance using the NEW TABLE transition table';
+
+-- =============================================================================
+-- Function: set_balance_trigger_mode
+-- =============================================================================
+-- Swaps the balance trigger on sga.movements in one transaction.
+-- mode: 'row' (trg_movements_update_balance, default) or
+--       'statement' (trg_movements_update_balance_batch).
+
+CREATE OR REPLACE FUNCTION sga.set_balance_trigger_mode(p_mode TEXT)
+RETURNS TEXT AS $$
+BEGIN
+    IF p_mode NOT IN ('row', 'statement') THEN
+        RAISE EXCEPTION 'Invalid balance trigger mode: % (expected row or statement)', p_mode;
+    END IF;
+
+    -- Serialize with concurrent movement inserts while swapping
+    LOCK TABLE sga.movements IN SHARE ROW EXCLUSIVE MODE;
+
+    DROP TRIGGER IF EXISTS trg_movements_update_balance ON sga.movements;
+    DROP TRIGGER IF EXISTS trg_movements_update_balance_batch ON sga.movements;
+
+    IF p_mode = 'row' THEN
+        CREATE TRIGGER trg_movements_update_balance
+            AFTER INSERT ON sga.movements
+            FOR EACH ROW
+            EXECUTE FUNCTION sga.update_balance_on_movement();
+    ELSE
+        CREATE TRIGGER trg_movements_update_balance_batch
+            AFTER INSERT ON sga.movements
+            REFERENCING NEW TABLE AS new_movements
+            FOR EACH STATEMENT
+            EXECUTE FUNCTION sga.update_balance_on_movement_batch();
+    END IF;
+
+    RETURN p_mode;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION sga.set_balance_trigger_mode(TEXT) IS
+    'Switch balance maintenance between row-level and statement-level triggers';
+
+-- =============================================================================
+-- Function: balance_trigger_mode
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION sga.balance_trigger_mode()
+RETURNS TEXT AS $$
+    SELECT CASE
+        WHEN EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgrelid = 'sga.movements'::regclass
+              AND tgname = 'trg_movements_update_balance_batch'
+        ) THEN 'statement'
+        WHEN EXISTS (
+            SELECT 1 FROM pg_trigger
+            WHERE tgrelid = 'sga.movements'::regclass
+              AND tgname = 'trg_movements_update_balance'
+        ) THEN 'row'
+        ELSE 'none'
+    END;
+$$ LANGUAGE sql STABLE;
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
@@ -0,0 +1,782 @@
+-- =============================================================================
+-- Migration: 010_incremental_summaries.sql
+-- =============================================================================
+-- Incrementally maintained dashboard summaries replacing the full refresh of
+-- mv_inventory_summary, mv_location_utilization and
+-- mv_pending_tasks_dashboard (004).
+--
+-- New Tables:
+--   - inventory_summary: balances by (location, part number)
+--   - location_utilization_summary: asset counts by location
+--   - pending_tasks_summary: pending entries by (status, source_type)
+--   - summary_consistency_reports: nightly diff results
+--
+-- Maintenance:
+--   Statement-level triggers (transition tables) on balances, assets,
+--   pending_entries, locations and part_numbers collect the keys touched by
+--   each statement and recompute only those keys from the v_*_source views,
+--   in the same transaction. Summaries are therefore current in real time
+--   and readers never wait on a REFRESH.
+--
+-- Compatibility:
+--   The three materialized views are replaced by plain views with the same
+--   names and columns over the summary tables.
+--   refresh_dashboard_views() now runs the consistency check with repair.
+--
+-- Consistency check (nightly):
+--   SELECT * FROM sga.check_dashboard_summaries(p_repair => TRUE);
+--   e.g. pg_cron: SELECT cron.schedule('sga-summary-check', '0 3 * * *',
+--                 'SELECT sga.check_dashboard_summaries(TRUE)');
+--   Fully recomputes each source view, diffs it against the summary table
+--   (missing / extra / mismatched rows) and stores the result in
+--   summary_consistency_reports.
+--
+-- Note: inventory_summary aggregates balances across projects, so there is
+-- exactly one row per (location_id, part_number_id) as the unique index of
+-- the old materialized view assumed.
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- =============================================================================
+-- Source Views (full recompute definitions)
+-- =============================================================================
+-- Filtering on the grouping keys is pushed down, so the incremental refresh
+-- functions read only the affected keys.
+
+CREATE OR REPLACE VIEW sga.v_inventory_summary_source AS
+SELECT
+    l.location_id,
+    l.location_code,
+    l.location_name,
+    pn.part_number_id,
+    pn.part_number,
+    pn.description,
+    pn.category,
+    SUM(b.quantity_total)::INTEGER AS quantity_total,
+    SUM(b.quantity_reserved)::INTEGER AS quantity_reserved,
+    (SUM(b.quantity_total) - SUM(b.quantity_reserved))::INTEGER AS quantity_available,
+    pn.min_stock_level,
+    CASE
+        WHEN SUM(b.quantity_total) - SUM(b.quantity_reserved) <= 0 THEN 'OUT_OF_STOCK'
+        WHEN SUM(b.quantity_total) - SUM(b.quantity_reserved) <= pn.min_stock_level THEN 'LOW_STOCK'
+        ELSE 'IN_STOCK'
+    END AS stock_status,
+    MAX(b.last_movement_at) AS last_movement_at,
+    MAX(b.last_count_at) AS last_count_at
+FROM sga.balances b
+JOIN sga.locations l ON b.location_id = l.location_id
+JOIN sga.part_numbers pn ON b.part_number_id = pn.part_number_id
+WHERE l.is_active = TRUE
+  AND pn.is_active = TRUE
+GROUP BY l.location_id, l.location_code, l.location_name,
+         pn.part_number_id, pn.part_number, pn.description, pn.category, pn.min_stock_level;
+
+CREATE OR REPLACE VIEW sga.v_location_utilization_source AS
+SELECT
+    l.location_id,
+    l.location_code,
+    l.location_name,
+    l.location_type,
+    COUNT(DISTINCT a.asset_id) AS total_assets,
+    COUNT(DISTINCT a.part_number_id) AS unique_parts,
+    COUNT(DISTINCT a.project_id) AS projects_stored,
+    SUM(CASE WHEN a.status = 'IN_STOCK' THEN 1 ELSE 0 END) AS available_assets,
+    SUM(CASE WHEN a.status = 'RESERVED' THEN 1 ELSE 0 END) AS reserved_assets,
+    MAX(a.last_movement_at) AS last_activity
+FROM sga.locations l
+LEFT JOIN sga.assets a ON l.location_id = a.location_id AND a.is_active = TRUE
+WHERE l.is_active = TRUE
+GROUP BY l.location_id, l.location_code, l.location_name, l.location_type;
+
+CREATE OR REPLACE VIEW sga.v_pending_tasks_source AS
+SELECT
+    pe.status,
+    pe.source_type,
+    COUNT(*) AS entry_count,
+    SUM(pe.total_items) AS total_items,
+    MIN(pe.created_at) AS oldest_entry,
+    TO_TIMESTAMP(AVG(EXTRACT(EPOCH FROM pe.created_at))) AS avg_created_at
+FROM sga.pending_entries pe
+WHERE pe.status IN ('PENDING', 'PROCESSING')
+GROUP BY pe.status, pe.source_type;
+
+-- =============================================================================
+-- Summary Tables
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS sga.inventory_summary (
+    location_id UUID NOT NULL,
+    location_code VARCHAR(50) NOT NULL,
+    location_name VARCHAR(255) NOT NULL,
+    part_number_id UUID NOT NULL,
+    part_number VARCHAR(100) NOT NULL,
+    description VARCHAR(500) NOT NULL,
+    category VARCHAR(100),
+    quantity_total INTEGER NOT NULL DEFAULT 0,
+    quantity_reserved INTEGER NOT NULL DEFAULT 0,
+    quantity_available INTEGER NOT NULL DEFAULT 0,
+    min_stock_level INTEGER,
+    stock_status VARCHAR(20) NOT NULL,
+    last_movement_at TIMESTAMPTZ,
+    last_count_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (location_id, part_number_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_inventory_summary_location ON sga.inventory_summary(location_code);
+CREATE INDEX IF NOT EXISTS idx_inventory_summary_pn ON sga.inventory_summary(part_number);
+CREATE INDEX IF NOT EXISTS idx_inventory_summary_status ON sga.inventory_summary(stock_status);
+CREATE INDEX IF NOT EXISTS idx_inventory_summary_order
+    ON sga.inventory_summary(part_number, location_code);
+
+COMMENT ON TABLE sga.inventory_summary IS 'Inventory by location and part number (trigger-maintained)';
+
+CREATE TABLE IF NOT EXISTS sga.location_utilization_summary (
+    location_id UUID PRIMARY KEY,
+    location_code VARCHAR(50) NOT NULL,
+    location_name VARCHAR(255) NOT NULL,
+    location_type VARCHAR(50) NOT NULL,
+    total_assets BIGINT NOT NULL DEFAULT 0,
+    unique_parts BIGINT NOT NULL DEFAULT 0,
+    projects_stored BIGINT NOT NULL DEFAULT 0,
+    available_assets BIGINT NOT NULL DEFAULT 0,
+    reserved_assets BIGINT NOT NULL DEFAULT 0,
+    last_activity TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_location_utilization_summary_type
+    ON sga.location_utilization_summary(location_type);
+
+COMMENT ON TABLE sga.location_utilization_summary IS 'Location utilization metrics (trigger-maintained)';
+
+CREATE TABLE IF NOT EXISTS sga.pending_tasks_summary (
+    status VARCHAR(50) NOT NULL,
+    source_type sga.entry_source NOT NULL,
+    entry_count BIGINT NOT NULL DEFAULT 0,
+    total_items BIGINT,
+    oldest_entry TIMESTAMPTZ,
+    avg_created_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (status, source_type)
+);
+
+COMMENT ON TABLE sga.pending_tasks_summary IS 'Pending entries by status and source (trigger-maintained)';
+
+CREATE TABLE IF NOT EXISTS sga.summary_consistency_reports (
+    report_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    checked_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    summary_name VARCHAR(100) NOT NULL,
+    missing_rows BIGINT NOT NULL DEFAULT 0,
+    extra_rows BIGINT NOT NULL DEFAULT 0,
+    mismatched_rows BIGINT NOT NULL DEFAULT 0,
+    sample JSONB NOT NULL DEFAULT '[]',
+    repaired BOOLEAN NOT NULL DEFAULT FALSE
+);
+
+CREATE INDEX IF NOT EXISTS idx_summary_consistency_reports_checked
+    ON sga.summary_consistency_reports(checked_at DESC);
+
+COMMENT ON TABLE sga.summary_consistency_reports IS 'Nightly diff between incremental summaries and full recompute';
+
+-- =============================================================================
+-- Incremental Refresh Functions
+-- =============================================================================
+-- Recompute the given keys from the source view: upsert keys that still
+-- exist, delete keys that no longer qualify.
+
+CREATE OR REPLACE FUNCTION sga.refresh_inventory_summary(
+    p_location_ids UUID[],
+    p_part_number_ids UUID[]
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_location_ids IS NULL OR cardinality(p_location_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    WITH keys AS (
+        SELECT DISTINCT location_id, part_number_id
+        FROM unnest(p_location_ids, p_part_number_ids) AS k(location_id, part_number_id)
+    ),
+    fresh AS (
+        SELECT s.*
+        FROM sga.v_inventory_summary_source s
+        JOIN keys k ON s.location_id = k.location_id AND s.part_number_id = k.part_number_id
+    ),
+    upserted AS (
+        INSERT INTO sga.inventory_summary (
+            location_id, location_code, location_name, part_number_id, part_number,
+            description, category, quantity_total, quantity_reserved, quantity_available,
+            min_stock_level, stock_status, last_movement_at, last_count_at, updated_at
+        )
+        SELECT
+            location_id, location_code, location_name, part_number_id, part_number,
+            description, category, quantity_total, quantity_reserved, quantity_available,
+            min_stock_level, stock_status, last_movement_at, last_count_at, NOW()
+        FROM fresh
+        ORDER BY location_id, part_number_id
+        ON CONFLICT (location_id, part_number_id) DO UPDATE SET
+            location_code = EXCLUDED.location_code,
+            location_name = EXCLUDED.location_name,
+            part_number = EXCLUDED.part_number,
+            description = EXCLUDED.description,
+            category = EXCLUDED.category,
+            quantity_total = EXCLUDED.quantity_total,
+            quantity_reserved = EXCLUDED.quantity_reserved,
+            quantity_available = EXCLUDED.quantity_available,
+            min_stock_level = EXCLUDED.min_stock_level,
+            stock_status = EXCLUDED.stock_status,
+            last_movement_at = EXCLUDED.last_movement_at,
+            last_count_at = EXCLUDED.last_count_at,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    DELETE FROM sga.inventory_summary s
+    USING keys k
+    WHERE s.location_id = k.location_id
+      AND s.part_number_id = k.part_number_id
+      AND NOT EXISTS (
+          SELECT 1 FROM fresh f
+          WHERE f.location_id = k.location_id AND f.part_number_id = k.part_number_id
+      );
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sga.refresh_location_utilization(p_location_ids UUID[])
+RETURNS VOID AS $$
+BEGIN
+    IF p_location_ids IS NULL OR cardinality(p_location_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    WITH keys AS (
+        SELECT DISTINCT location_id
+        FROM unnest(p_location_ids) AS k(location_id)
+        WHERE location_id IS NOT NULL
+    ),
+    fresh AS (
+        SELECT s.*
+        FROM sga.v_location_utilization_source s
+        JOIN keys k ON s.location_id = k.location_id
+    ),
+    upserted AS (
+        INSERT INTO sga.location_utilization_summary (
+            location_id, location_code, location_name, location_type, total_assets,
+            unique_parts, projects_stored, available_assets, reserved_assets,
+            last_activity, updated_at
+        )
+        SELECT
+            location_id, location_code, location_name, location_type, total_assets,
+            unique_parts, projects_stored, available_assets, reserved_assets,
+            last_activity, NOW()
+        FROM fresh
+        ORDER BY location_id
+        ON CONFLICT (location_id) DO UPDATE SET
+            location_code = EXCLUDED.location_code,
+            location_name = EXCLUDED.location_name,
+            location_type = EXCLUDED.location_type,
+            total_assets = EXCLUDED.total_assets,
+            unique_parts = EXCLUDED.unique_parts,
+            projects_stored = EXCLUDED.projects_stored,
+            available_assets = EXCLUDED.available_assets,
+            reserved_assets = EXCLUDED.reserved_assets,
+            last_activity = EXCLUDED.last_activity,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    DELETE FROM sga.location_utilization_summary s
+    USING keys k
+    WHERE s.location_id = k.location_id
+      AND NOT EXISTS (SELECT 1 FROM fresh f WHERE f.location_id = k.location_id);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sga.refresh_pending_tasks_summary(
+    p_statuses TEXT[],
+    p_source_types sga.entry_source[]
+)
+RETURNS VOID AS $$
+BEGIN
+    IF p_statuses IS NULL OR cardinality(p_statuses) = 0 THEN
+        RETURN;
+    END IF;
+
+    WITH keys AS (
+        SELECT DISTINCT status, source_type
+        FROM unnest(p_statuses, p_source_types) AS k(status, source_type)
+    ),
+    fresh AS (
+        SELECT s.*
+        FROM sga.v_pending_tasks_source s
+        JOIN keys k ON s.status = k.status AND s.source_type = k.source_type
+    ),
+    upserted AS (
+        INSERT INTO sga.pending_tasks_summary (
+            status, source_type, entry_count, total_items, oldest_entry, avg_created_at, updated_at
+        )
+        SELECT status, source_type, entry_count, total_items, oldest_entry, avg_created_at, NOW()
+        FROM fresh
+        ORDER BY status, source_type
+        ON CONFLICT (status, source_type) DO UPDATE SET
+            entry_count = EXCLUDED.entry_count,
+            total_items = EXCLUDED.total_items,
+            oldest_entry = EXCLUDED.oldest_entry,
+            avg_created_at = EXCLUDED.avg_created_at,
+            updated_at = NOW()
+        RETURNING 1
+    )
+    DELETE FROM sga.pending_tasks_summary s
+    USING keys k
+    WHERE s.status = k.status
+      AND s.source_type = k.source_type
+      AND NOT EXISTS (
+          SELECT 1 FROM fresh f WHERE f.status = k.status AND f.source_type = k.source_type
+      );
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================================================
+-- Trigger Functions (statement level, transition tables)
+-- =============================================================================
+
+-- balances -> inventory_summary
+CREATE OR REPLACE FUNCTION sga.summary_on_balances_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_location_ids UUID[];
+    v_part_number_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(location_id), array_agg(part_number_id)
+        INTO v_location_ids, v_part_number_ids
+        FROM (SELECT DISTINCT location_id, part_number_id FROM new_rows) k;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(location_id), array_agg(part_number_id)
+        INTO v_location_ids, v_part_number_ids
+        FROM (SELECT DISTINCT location_id, part_number_id FROM old_rows) k;
+    ELSE
+        SELECT array_agg(location_id), array_agg(part_number_id)
+        INTO v_location_ids, v_part_number_ids
+        FROM (
+            SELECT location_id, part_number_id FROM old_rows
+            UNION
+            SELECT location_id, part_number_id FROM new_rows
+        ) k;
+    END IF;
+
+    PERFORM sga.refresh_inventory_summary(v_location_ids, v_part_number_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- part_numbers (descriptive columns, is_active) -> inventory_summary
+CREATE OR REPLACE FUNCTION sga.summary_on_part_numbers_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_location_ids UUID[];
+    v_part_number_ids UUID[];
+BEGIN
+    SELECT array_agg(b.location_id), array_agg(b.part_number_id)
+    INTO v_location_ids, v_part_number_ids
+    FROM (
+        SELECT DISTINCT b.location_id, b.part_number_id
+        FROM old_rows o
+        JOIN new_rows n ON n.part_number_id = o.part_number_id
+        JOIN sga.balances b ON b.part_number_id = n.part_number_id
+        WHERE (o.part_number, o.description, o.category, o.min_stock_level, o.is_active)
+              IS DISTINCT FROM
+              (n.part_number, n.description, n.category, n.min_stock_level, n.is_active)
+    ) b;
+
+    PERFORM sga.refresh_inventory_summary(v_location_ids, v_part_number_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- locations -> location_utilization_summary (+ inventory_summary on UPDATE)
+CREATE OR REPLACE FUNCTION sga.summary_on_locations_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_location_ids UUID[];
+    v_balance_location_ids UUID[];
+    v_balance_part_number_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(location_id) INTO v_location_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(location_id) INTO v_location_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(n.location_id) INTO v_location_ids
+        FROM old_rows o
+        JOIN new_rows n ON n.location_id = o.location_id
+        WHERE (o.location_code, o.location_name, o.location_type, o.is_active)
+              IS DISTINCT FROM
+              (n.location_code, n.location_name, n.location_type, n.is_active);
+
+        SELECT array_agg(b.location_id), array_agg(b.part_number_id)
+        INTO v_balance_location_ids, v_balance_part_number_ids
+        FROM (
+            SELECT DISTINCT location_id, part_number_id
+            FROM sga.balances
+            WHERE location_id = ANY(v_location_ids)
+        ) b;
+
+        PERFORM sga.refresh_inventory_summary(v_balance_location_ids, v_balance_part_number_ids);
+    END IF;
+
+    PERFORM sga.refresh_location_utilization(v_location_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- assets -> location_utilization_summary (old and new location)
+CREATE OR REPLACE FUNCTION sga.summary_on_assets_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_location_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT location_id) INTO v_location_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT location_id) INTO v_location_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT k.location_id) INTO v_location_ids
+        FROM (
+            SELECT o.location_id, n.location_id AS new_location_id
+            FROM old_rows o
+            JOIN new_rows n ON n.asset_id = o.asset_id
+            WHERE (o.location_id, o.part_number_id, o.project_id, o.status, o.is_active, o.last_movement_at)
+                  IS DISTINCT FROM
+                  (n.location_id, n.part_number_id, n.project_id, n.status, n.is_active, n.last_movement_at)
+        ) c
+        CROSS JOIN LATERAL (VALUES (c.location_id), (c.new_location_id)) AS k(location_id);
+    END IF;
+
+    PERFORM sga.refresh_location_utilization(v_location_ids);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- pending_entries -> pending_tasks_summary
+CREATE OR REPLACE FUNCTION sga.summary_on_pending_entries_change()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_statuses TEXT[];
+    v_source_types sga.entry_source[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(status), array_agg(source_type)
+        INTO v_statuses, v_source_types
+        FROM (SELECT DISTINCT status, source_type FROM new_rows WHERE status IS NOT NULL) k;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(status), array_agg(source_type)
+        INTO v_statuses, v_source_types
+        FROM (SELECT DISTINCT status, source_type FROM old_rows WHERE status IS NOT NULL) k;
+    ELSE
+        SELECT array_agg(status), array_agg(source_type)
+        INTO v_statuses, v_source_types
+        FROM (
+            SELECT status, source_type FROM old_rows WHERE status IS NOT NULL
+            UNION
+            SELECT status, source_type FROM new_rows WHERE status IS NOT NULL
+        ) k;
+    END IF;
+
+    PERFORM sga.refresh_pending_tasks_summary(v_statuses, v_source_types);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================================================
+-- Triggers
+-- =============================================================================
+-- Transition tables require one trigger per event.
+
+DROP TRIGGER IF EXISTS trg_balances_summary_ins ON sga.balances;
+CREATE TRIGGER trg_balances_summary_ins
+    AFTER INSERT ON sga.balances
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_balances_change();
+
+DROP TRIGGER IF EXISTS trg_balances_summary_upd ON sga.balances;
+CREATE TRIGGER trg_balances_summary_upd
+    AFTER UPDATE ON sga.balances
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_balances_change();
+
+DROP TRIGGER IF EXISTS trg_balances_summary_del ON sga.balances;
+CREATE TRIGGER trg_balances_summary_del
+    AFTER DELETE ON sga.balances
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_balances_change();
+
+DROP TRIGGER IF EXISTS trg_part_numbers_summary_upd ON sga.part_numbers;
+CREATE TRIGGER trg_part_numbers_summary_upd
+    AFTER UPDATE ON sga.part_numbers
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_part_numbers_change();
+
+DROP TRIGGER IF EXISTS trg_locations_summary_ins ON sga.locations;
+CREATE TRIGGER trg_locations_summary_ins
+    AFTER INSERT ON sga.locations
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_locations_change();
+
+DROP TRIGGER IF EXISTS trg_locations_summary_upd ON sga.locations;
+CREATE TRIGGER trg_locations_summary_upd
+    AFTER UPDATE ON sga.locations
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_locations_change();
+
+DROP TRIGGER IF EXISTS trg_locations_summary_del ON sga.locations;
+CREATE TRIGGER trg_locations_summary_del
+    AFTER DELETE ON sga.locations
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_locations_change();
+
+DROP TRIGGER IF EXISTS trg_assets_summary_ins ON sga.assets;
+CREATE TRIGGER trg_assets_summary_ins
+    AFTER INSERT ON sga.assets
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_assets_change();
+
+DROP TRIGGER IF EXISTS trg_assets_summary_upd ON sga.assets;
+CREATE TRIGGER trg_assets_summary_upd
+    AFTER UPDATE ON sga.assets
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_assets_change();
+
+DROP TRIGGER IF EXISTS trg_assets_summary_del ON sga.assets;
+CREATE TRIGGER trg_assets_summary_del
+    AFTER DELETE ON sga.assets
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_assets_change();
+
+DROP TRIGGER IF EXISTS trg_pending_entries_summary_ins ON sga.pending_entries;
+CREATE TRIGGER trg_pending_entries_summary_ins
+    AFTER INSERT ON sga.pending_entries
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_pending_entries_change();
+
+DROP TRIGGER IF EXISTS trg_pending_entries_summary_upd ON sga.pending_entries;
+CREATE TRIGGER trg_pending_entries_summary_upd
+    AFTER UPDATE ON sga.pending_entries
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_pending_entries_change();
+
+DROP TRIGGER IF EXISTS trg_pending_entries_summary_del ON sga.pending_entries;
+CREATE TRIGGER trg_pending_entries_summary_del
+    AFTER DELETE ON sga.pending_entries
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sga.summary_on_pending_entries_change();
+
+-- =============================================================================
+-- Consistency Check (nightly full recompute + diff)
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION sga.check_summary(
+    p_summary_name TEXT,
+    p_table TEXT,
+    p_source TEXT,
+    p_keys TEXT[],
+    p_repair BOOLEAN DEFAULT FALSE
+)
+RETURNS sga.summary_consistency_reports AS $$
+DECLARE
+    v_columns TEXT;
+    v_join TEXT;
+    v_set TEXT;
+    v_report sga.summary_consistency_reports;
+BEGIN
+    -- Value columns = source view columns
+    SELECT
+        string_agg(quote_ident(attname), ', ' ORDER BY attnum),
+        string_agg(format('%1$I = EXCLUDED.%1$I', attname), ', ' ORDER BY attnum)
+            FILTER (WHERE attname::TEXT <> ALL(p_keys))
+    INTO v_columns, v_set
+    FROM pg_attribute
+    WHERE attrelid = p_source::regclass AND attnum > 0 AND NOT attisdropped;
+
+    SELECT string_agg(format('f.%1$I = c.%1$I', k), ' AND ')
+    INTO v_join
+    FROM unnest(p_keys) AS k;
+
+    CREATE TEMP TABLE IF NOT EXISTS _summary_diff (
+        kind TEXT,
+        fresh JSONB,
+        current JSONB
+    ) ON COMMIT DROP;
+    TRUNCATE _summary_diff;
+
+    EXECUTE format(
+        'INSERT INTO _summary_diff '
+        'SELECT CASE WHEN c IS NULL THEN ''missing'' WHEN f IS NULL THEN ''extra'' ELSE ''mismatched'' END, '
+        '       to_jsonb(f), to_jsonb(c) '
+        'FROM (SELECT %1$s FROM %2$s) f '
+        'FULL OUTER JOIN (SELECT %1$s FROM %3$s) c ON %4$s '
+        'WHERE to_jsonb(f) IS DISTINCT FROM to_jsonb(c)',
+        v_columns, p_source, p_table, v_join
+    );
+
+    INSERT INTO sga.summary_consistency_reports (
+        summary_name, missing_rows, extra_rows, mismatched_rows, sample, repaired
+    )
+    SELECT
+        p_summary_name,
+        COUNT(*) FILTER (WHERE kind = 'missing'),
+        COUNT(*) FILTER (WHERE kind = 'extra'),
+        COUNT(*) FILTER (WHERE kind = 'mismatched'),
+        COALESCE(
+            (SELECT jsonb_agg(jsonb_build_object('kind', kind, 'fresh', fresh, 'current', current))
+             FROM (SELECT * FROM _summary_diff LIMIT 20) s),
+            '[]'::jsonb
+        ),
+        p_repair AND COUNT(*) > 0
+    FROM _summary_diff
+    RETURNING * INTO v_report;
+
+    IF v_report.repaired THEN
+        EXECUTE format(
+            'DELETE FROM %1$s c WHERE NOT EXISTS (SELECT 1 FROM %2$s f WHERE %3$s)',
+            p_table, p_source, v_join
+        );
+        EXECUTE format(
+            'INSERT INTO %1$s (%2$s) SELECT %2$s FROM %3$s '
+            'ON CONFLICT (%4$s) DO UPDATE SET %5$s, updated_at = NOW()',
+            p_table, v_columns, p_source, array_to_string(p_keys, ', '), v_set
+        );
+    END IF;
+
+    RETURN v_report;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sga.check_dashboard_summaries(p_repair BOOLEAN DEFAULT FALSE)
+RETURNS SETOF sga.summary_consistency_reports AS $$
+BEGIN
+    RETURN NEXT sga.check_summary(
+        'inventory_summary', 'sga.inventory_summary', 'sga.v_inventory_summary_source',
+        ARRAY['location_id', 'part_number_id'], p_repair
+    );
+    RETURN NEXT sga.check_summary(
+        'location_utilization_summary', 'sga.location_utilization_summary',
+        'sga.v_location_utilization_source', ARRAY['location_id'], p_repair
+    );
+    RETURN NEXT sga.check_summary(
+        'pending_tasks_summary', 'sga.pending_tasks_summary', 'sga.v_pending_tasks_source',
+        ARRAY['status', 'source_type'], p_repair
+    );
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION sga.check_dashboard_summaries(BOOLEAN) IS
+    'Nightly full recompute of dashboard summaries with diff report (optional repair)';
+
+-- =============================================================================
+-- Initial Load
+-- =============================================================================
+
+INSERT INTO sga.inventory_summary (
+    location_id, location_code, location_name, part_number_id, part_number,
+    description, category, quantity_total, quantity_reserved, quantity_available,
+    min_stock_level, stock_status, last_movement_at, last_count_at
+)
+SELECT
+    location_id, location_code, location_name, part_number_id, part_number,
+    description, category, quantity_total, quantity_reserved, quantity_available,
+    min_stock_level, stock_status, last_movement_at, last_count_at
+FROM sga.v_inventory_summary_source
+ON CONFLICT (location_id, part_number_id) DO NOTHING;
+
+INSERT INTO sga.location_utilization_summary (
+    location_id, location_code, location_name, location_type, total_assets,
+    unique_parts, projects_stored, available_assets, reserved_assets, last_activity
+)
+SELECT
+    location_id, location_code, location_name, location_type, total_assets,
+    unique_parts, projects_stored, available_assets, reserved_assets, last_activity
+FROM sga.v_location_utilization_source
+ON CONFLICT (location_id) DO NOTHING;
+
+INSERT INTO sga.pending_tasks_summary (
+    status, source_type, entry_count, total_items, oldest_entry, avg_created_at
+)
+SELECT status, source_type, entry_count, total_items, oldest_entry, avg_created_at
+FROM sga.v_pending_tasks_source
+ON CONFLICT (status, source_type) DO NOTHING;
+
+-- =============================================================================
+-- Compatibility Views (replace materialized views from 004)
+-- =============================================================================
+
+-- Guarded so the migration can be re-applied once the names are plain views
+DO $$
+DECLARE
+    v_name TEXT;
+BEGIN
+    FOREACH v_name IN ARRAY ARRAY['mv_inventory_summary', 'mv_location_utilization', 'mv_pending_tasks_dashboard'] LOOP
+        IF EXISTS (SELECT 1 FROM pg_matviews WHERE schemaname = 'sga' AND matviewname = v_name) THEN
+            EXECUTE format('DROP MATERIALIZED VIEW sga.%I', v_name);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+CREATE OR REPLACE VIEW sga.mv_inventory_summary AS
+SELECT
+    location_id, location_code, location_name, part_number_id, part_number,
+    description, category, quantity_total, quantity_reserved, quantity_available,
+    min_stock_level, stock_status, last_movement_at, last_count_at
+FROM sga.inventory_summary;
+
+CREATE OR REPLACE VIEW sga.mv_location_utilization AS
+SELECT
+    location_id, location_code, location_name, location_type, total_assets,
+    unique_parts, projects_stored, available_assets, reserved_assets, last_activity
+FROM sga.location_utilization_summary;
+
+CREATE OR REPLACE VIEW sga.mv_pending_tasks_dashboard AS
+SELECT
+    status,
+    source_type,
+    entry_count,
+    total_items,
+    oldest_entry,
+    EXTRACT(EPOCH FROM (NOW() - avg_created_at)) / 3600 AS avg_age_hours
+FROM sga.pending_tasks_summary;
+
+-- =============================================================================
+-- Refresh Functions (redefined from 004)
+-- =============================================================================
+
+CREATE OR REPLACE FUNCTION sga.refresh_all_materialized_views()
+RETURNS VOID AS $$
+BEGIN
+    -- mv_inventory_summary, mv_location_utilization and
+    -- mv_pending_tasks_dashboard are trigger-maintained (010)
+    REFRESH MATERIALIZED VIEW CONCURRENTLY sga.mv_movement_daily_stats;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY sga.mv_project_inventory;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY sga.mv_divergence_summary;
+    REFRESH MATERIALIZED VIEW CONCURRENTLY sga.mv_asset_timeline_summary;
+    REFRESH MATERIALIZED VIEW sga.mv_inventory_accuracy_kpi;  -- No unique index
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION sga.refresh_dashboard_views()
+RETURNS VOID AS $$
+BEGIN
+    -- Dashboard summaries are current; kept for existing schedulers as the
+    -- nightly consistency check with repair
+    PERFORM sga.check_dashboard_summaries(TRUE);
+END;
+$$ LANGUAGE plpgsql;
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
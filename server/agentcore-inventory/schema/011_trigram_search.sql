@@ -0,0 +1,172 @@
+-- =============================================================================
+-- Migration: 011_trigram_search.sql
+-- =============================================================================
+-- Index-backed asset search for SGAPostgresClient.search_assets.
+--
+-- The contains search (serial_number / part_number ILIKE '%q%') could only
+-- use sequential scans with the btree indexes from 002. This migration adds:
+--   - pg_trgm GIN indexes: ILIKE '%q%', similarity and word_similarity
+--   - lower(...) text_pattern_ops btree indexes: prefix search fast path
+--     (lower(col) LIKE 'q%')
+--   - sga.search_assets_ranked(): ranked search combining exact / prefix /
+--     trigram word similarity on serial and part number with the
+--     full-text rank of part_numbers.search_vector
+--
+-- Scores (0..1.5):
+--   exact match 1.0, prefix 0.9, otherwise 0.8 * word_similarity,
+--   plus 0.5 * ts_rank(search_vector) for description matches.
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- pg_trgm goes to public, which is on the default search_path: the
+-- unqualified word_similarity() and <% in search_assets_ranked are resolved
+-- with the caller's search_path once the function is inlined. Earlier runs
+-- of this migration installed it in sga (first schema of the path above).
+CREATE EXTENSION IF NOT EXISTS pg_trgm WITH SCHEMA public;
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM pg_extension
+        WHERE extname = 'pg_trgm' AND extnamespace = 'sga'::regnamespace
+    ) THEN
+        ALTER EXTENSION pg_trgm SET SCHEMA public;
+    END IF;
+END;
+$$;
+
+-- =============================================================================
+-- Indexes
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_assets_serial_trgm_gin
+    ON sga.assets USING GIN (serial_number gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_part_numbers_pn_trgm_gin
+    ON sga.part_numbers USING GIN (part_number gin_trgm_ops);
+
+CREATE INDEX IF NOT EXISTS idx_assets_serial_lower_prefix
+    ON sga.assets (lower(serial_number) text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS idx_part_numbers_pn_lower_prefix
+    ON sga.part_numbers (lower(part_number) text_pattern_ops);
+
+-- Assets of a part number in serial order (ranked search fan-out)
+CREATE INDEX IF NOT EXISTS idx_assets_pn_serial_active
+    ON sga.assets (part_number_id, serial_number) WHERE is_active = TRUE;
+
+-- =============================================================================
+-- Function: like_prefix
+-- =============================================================================
+-- Lowercased LIKE prefix pattern with wildcards escaped. IMMUTABLE so it
+-- folds to a constant and the text_pattern_ops index can be used.
+
+CREATE OR REPLACE FUNCTION sga.like_prefix(p_term TEXT)
+RETURNS TEXT AS $$
+    SELECT replace(replace(replace(lower(p_term), '\', '\\'), '%', '\%'), '_', '\_') || '%';
+$$ LANGUAGE sql IMMUTABLE STRICT;
+
+-- =============================================================================
+-- Function: search_assets_ranked
+-- =============================================================================
+-- p_search_type: serial, part_number, description or all.
+-- Part number / description hits are capped at p_pn_candidates part numbers,
+-- each contributing at most p_limit assets (in serial order).
+
+CREATE OR REPLACE FUNCTION sga.search_assets_ranked(
+    p_query TEXT,
+    p_search_type TEXT DEFAULT 'all',
+    p_limit INTEGER DEFAULT 50,
+    p_pn_candidates INTEGER DEFAULT 20
+)
+RETURNS TABLE (asset_id UUID, score REAL, matched_on TEXT) AS $$
+    WITH serial_hits AS (
+        SELECT
+            a.asset_id,
+            (CASE
+                WHEN lower(a.serial_number) = lower(p_query) THEN 1.0
+                WHEN lower(a.serial_number) LIKE sga.like_prefix(p_query) THEN 0.9
+                ELSE 0.8 * word_similarity(p_query, a.serial_number)
+            END)::REAL AS score,
+            'serial'::TEXT AS matched_on
+        FROM sga.assets a
+        WHERE p_search_type IN ('serial', 'all')
+          AND a.is_active = TRUE
+          AND (
+              lower(a.serial_number) LIKE sga.like_prefix(p_query)
+              OR p_query <% a.serial_number
+          )
+        ORDER BY 2 DESC
+        LIMIT p_limit
+    ),
+    pn_hits AS (
+        SELECT
+            pn.part_number_id,
+            s.pn_score,
+            s.text_score
+        FROM sga.part_numbers pn
+        CROSS JOIN LATERAL (
+            SELECT
+                CASE
+                    WHEN p_search_type = 'description' THEN 0.0
+                    WHEN lower(pn.part_number) = lower(p_query) THEN 1.0
+                    WHEN lower(pn.part_number) LIKE sga.like_prefix(p_query) THEN 0.9
+                    ELSE 0.8 * word_similarity(p_query, pn.part_number)
+                END AS pn_score,
+                CASE
+                    WHEN p_search_type = 'part_number' THEN 0.0
+                    ELSE 0.5 * ts_rank(pn.search_vector, plainto_tsquery('portuguese', p_query), 32)
+                END AS text_score
+        ) s
+        WHERE p_search_type IN ('part_number', 'description', 'all')
+          AND (
+              (p_search_type <> 'description' AND (
+                  lower(pn.part_number) LIKE sga.like_prefix(p_query)
+                  OR p_query <% pn.part_number
+              ))
+              OR (p_search_type <> 'part_number'
+                  AND pn.search_vector @@ plainto_tsquery('portuguese', p_query))
+          )
+        ORDER BY s.pn_score + s.text_score DESC
+        LIMIT p_pn_candidates
+    ),
+    pn_assets AS (
+        SELECT
+            a.asset_id,
+            (h.pn_score + h.text_score)::REAL AS score,
+            CASE WHEN h.pn_score >= h.text_score THEN 'part_number' ELSE 'description' END AS matched_on
+        FROM pn_hits h
+        CROSS JOIN LATERAL (
+            SELECT a.asset_id
+            FROM sga.assets a
+            WHERE a.part_number_id = h.part_number_id
+              AND a.is_active = TRUE
+            ORDER BY a.serial_number
+            LIMIT p_limit
+        ) a
+    )
+    SELECT
+        hits.asset_id,
+        MAX(hits.score) AS score,
+        (array_agg(hits.matched_on ORDER BY hits.score DESC))[1] AS matched_on
+    FROM (
+        SELECT * FROM serial_hits
+        UNION ALL
+        SELECT * FROM pn_assets
+    ) hits
+    GROUP BY hits.asset_id
+    ORDER BY 2 DESC
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION sga.search_assets_ranked(TEXT, TEXT, INTEGER, INTEGER) IS
+    'Ranked asset search (trigram similarity + full-text rank) with scores';
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
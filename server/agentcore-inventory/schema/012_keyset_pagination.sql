@@ -0,0 +1,24 @@
+-- =============================================================================
+-- Migration: 012_keyset_pagination.sql
+-- =============================================================================
+-- Indexes matching the keyset (cursor) pagination order of
+-- SGAPostgresClient.list_inventory and get_movements.
+--
+--   - inventory_summary: (part_number, location_code), created in 010
+--   - movements: (movement_date DESC, movement_id DESC), so the seek
+--     (movement_date, movement_id) < (last_date, last_id) is an index range
+--     scan and ties on movement_date have a stable order
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+CREATE INDEX IF NOT EXISTS idx_movements_date_id
+    ON sga.movements(movement_date DESC, movement_id DESC);
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
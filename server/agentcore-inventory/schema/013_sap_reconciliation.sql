@@ -0,0 +1,77 @@
+-- =============================================================================
+-- Migration: 013_sap_reconciliation.sql
+-- =============================================================================
+-- Storage for set-based SAP reconciliation
+-- (SGAPostgresClient.reconcile_with_sap mode "set" / sga_reconcile_sap tool).
+--
+-- New Tables:
+--   - sap_reconciliation_runs: One row per reconciliation (source, counts)
+--   - sap_reconciliation_lines: Non-matching keys (discrepancy, sap_only,
+--     sga_only) of a run, numbered by absolute variance for keyset paging
+--
+-- The SAP export itself is only loaded into a session temp table; matching
+-- keys are counted but not stored.
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- =============================================================================
+-- Table: sap_reconciliation_runs
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS sga.sap_reconciliation_runs (
+    run_id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    source VARCHAR(20) NOT NULL,  -- inline, s3
+    source_uri VARCHAR(1024),
+    status VARCHAR(20) NOT NULL DEFAULT 'RUNNING',  -- RUNNING, COMPLETED
+    total_rows BIGINT NOT NULL DEFAULT 0,
+    invalid_rows BIGINT NOT NULL DEFAULT 0,
+    matches_count BIGINT NOT NULL DEFAULT 0,
+    discrepancies_count BIGINT NOT NULL DEFAULT 0,
+    sap_only_count BIGINT NOT NULL DEFAULT 0,
+    sga_only_count BIGINT NOT NULL DEFAULT 0,
+    sap_total_quantity NUMERIC NOT NULL DEFAULT 0,
+    sga_total_quantity NUMERIC NOT NULL DEFAULT 0,
+    requested_by VARCHAR(100),
+    created_at TIMESTAMPTZ DEFAULT NOW(),
+    completed_at TIMESTAMPTZ
+);
+
+COMMENT ON TABLE sga.sap_reconciliation_runs IS 'SAP reconciliation runs with summary counts';
+
+-- =============================================================================
+-- Table: sap_reconciliation_lines
+-- =============================================================================
+
+CREATE TABLE IF NOT EXISTS sga.sap_reconciliation_lines (
+    run_id UUID NOT NULL REFERENCES sga.sap_reconciliation_runs(run_id) ON DELETE CASCADE,
+    line_no BIGINT NOT NULL,
+    category VARCHAR(20) NOT NULL,  -- discrepancy, sap_only, sga_only
+    part_number VARCHAR(100) NOT NULL,
+    location_code VARCHAR(50),
+    sap_quantity NUMERIC NOT NULL,
+    sga_quantity NUMERIC NOT NULL,
+    variance NUMERIC NOT NULL,
+    PRIMARY KEY (run_id, line_no)
+);
+
+COMMENT ON TABLE sga.sap_reconciliation_lines IS 'Non-matching keys of a SAP reconciliation run';
+
+-- =============================================================================
+-- Indexes
+-- =============================================================================
+
+-- Keyset pages filtered by category
+CREATE INDEX IF NOT EXISTS idx_sap_reconciliation_lines_category
+    ON sga.sap_reconciliation_lines(run_id, category, line_no);
+
+CREATE INDEX IF NOT EXISTS idx_sap_reconciliation_runs_created
+    ON sga.sap_reconciliation_runs(created_at DESC);
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
@@ -0,0 +1,95 @@
+-- =============================================================================
+-- Migration: 014_bulk_asset_transfer.sql
+-- =============================================================================
+-- Set-based asset updates for multi-serial movements
+-- (SGAPostgresClient.transfer_assets / sga_transfer_assets tool).
+--
+-- trg_movement_items_update_asset (003) ran one UPDATE of sga.assets, plus a
+-- lookup of the parent movement, per inserted movement item. A pallet
+-- transfer inserting hundreds of items in one statement therefore ran
+-- hundreds of single-row updates. The replacement trigger fires once per
+-- statement and applies the same per-movement-type rules to all inserted
+-- items with a single UPDATE ... FROM the transition table.
+--
+-- Behaviour per movement type is unchanged (see 003_triggers.sql).
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- =============================================================================
+-- Function: update_assets_on_movement_items_batch
+-- =============================================================================
+-- If a statement inserts several items for the same asset, the most recent
+-- movement wins.
+
+CREATE OR REPLACE FUNCTION sga.update_assets_on_movement_items_batch()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE sga.assets a
+    SET location_id = CASE
+            WHEN m.movement_type IN ('ENTRADA', 'REVERSA', 'TRANSFERENCIA')
+                THEN m.destination_location_id
+            ELSE a.location_id
+        END,
+        project_id = CASE
+            WHEN m.movement_type IN ('ENTRADA', 'REVERSA') THEN m.project_id
+            ELSE a.project_id
+        END,
+        status = CASE
+            WHEN m.movement_type IN ('ENTRADA', 'REVERSA', 'LIBERACAO') THEN 'IN_STOCK'::sga.asset_status
+            WHEN m.movement_type IN ('SAIDA', 'EXPEDIÇÃO') THEN 'IN_TRANSIT'::sga.asset_status
+            WHEN m.movement_type = 'RESERVA' THEN 'RESERVED'::sga.asset_status
+            ELSE a.status
+        END,
+        nf_number = CASE
+            WHEN m.movement_type IN ('ENTRADA', 'REVERSA') THEN COALESCE(m.nf_number, a.nf_number)
+            ELSE a.nf_number
+        END,
+        nf_date = CASE
+            WHEN m.movement_type IN ('ENTRADA', 'REVERSA') THEN COALESCE(m.nf_date, a.nf_date)
+            ELSE a.nf_date
+        END,
+        last_movement_at = m.movement_date,
+        updated_at = NOW()
+    FROM (
+        SELECT DISTINCT ON (i.asset_id)
+            i.asset_id,
+            mv.movement_type,
+            mv.movement_date,
+            mv.destination_location_id,
+            mv.project_id,
+            mv.nf_number,
+            mv.nf_date
+        FROM new_items i
+        JOIN sga.movements mv ON mv.movement_id = i.movement_id
+        ORDER BY i.asset_id, mv.movement_date DESC
+    ) m
+    WHERE a.asset_id = m.asset_id;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION sga.update_assets_on_movement_items_batch() IS
+    'Statement-level asset update for inserted movement items';
+
+-- =============================================================================
+-- Trigger swap
+-- =============================================================================
+
+DROP TRIGGER IF EXISTS trg_movement_items_update_asset ON sga.movement_items;
+DROP TRIGGER IF EXISTS trg_movement_items_update_asset_batch ON sga.movement_items;
+
+CREATE TRIGGER trg_movement_items_update_asset_batch
+    AFTER INSERT ON sga.movement_items
+    REFERENCING NEW TABLE AS new_items
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION sga.update_assets_on_movement_items_batch();
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
@@ -0,0 +1,32 @@
+-- =============================================================================
+-- Migration: 015_expedition_indexes.sql
+-- =============================================================================
+-- Indexes for the expedition transactions
+-- (SGAPostgresClient.create_reservations / complete_expedition).
+--
+-- An expedition is identified by reservations.metadata->>'expedition_id' and
+-- by movements.reference_document. complete_expedition releases the active
+-- reservations of one expedition and checks for existing EXPEDIÇÃO movements
+-- of it (idempotent retries); without these indexes both lookups scan the
+-- whole table.
+--
+-- Author: Faiston NEXO Team
+-- Date: 2026-10-18
+-- =============================================================================
+
+-- Set search path
+SET search_path TO sga, public;
+
+-- Active reservations of an expedition
+CREATE INDEX IF NOT EXISTS idx_reservations_expedition_active
+    ON sga.reservations ((metadata->>'expedition_id'))
+    WHERE is_active = TRUE;
+
+-- Movements of a reference document (expedition ID, SAP document)
+CREATE INDEX IF NOT EXISTS idx_movements_reference_document
+    ON sga.movements (reference_document)
+    WHERE reference_document IS NOT NULL;
+
+-- =============================================================================
+-- End of migration
+-- =============================================================================
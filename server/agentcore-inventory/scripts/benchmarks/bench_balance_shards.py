@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+# =============================================================================
+# Benchmark: Sharded Balance Counters
+# =============================================================================
+# Contention on one hot balance: N threads call SGADynamoDBClient.
+# update_balance on the same location/part number, first with the single
+# balance item (BALANCE_SHARDING=off), then with shard items
+# (BALANCE_SHARDING=always). Reports throughput, latency percentiles,
+# failed writes, get_balance latency and compaction time, and checks that
+# the final balance equals the sum of the deltas.
+#
+# DynamoDB Local does not enforce per-partition throughput, so there the
+# numbers show the sharding overhead; run against a real table (--table
+# without --endpoint-url) to see throttling on the unsharded item.
+#
+# Run: docker run -d -p 8000:8000 amazon/dynamodb-local
+#      cd server/agentcore-inventory && \
+#      AWS_ACCESS_KEY_ID=x AWS_SECRET_ACCESS_KEY=x \
+#      python scripts/benchmarks/bench_balance_shards.py \
+#          --endpoint-url http://localhost:8000 --threads 32 --writes 200
+# =============================================================================
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+
+def create_table(resource, name):
+    table = resource.create_table(
+        TableName=name,
+        KeySchema=[
+            {"AttributeName": "PK", "KeyType": "HASH"},
+            {"AttributeName": "SK", "KeyType": "RANGE"},
+        ],
+        AttributeDefinitions=[
+            {"AttributeName": "PK", "AttributeType": "S"},
+            {"AttributeName": "SK", "AttributeType": "S"},
+        ],
+        BillingMode="PAY_PER_REQUEST",
+    )
+    table.wait_until_exists()
+    return table
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(dynamodb_client, table_name, mode, threads, writes, shards):
+    dynamodb_client.BALANCE_SHARDING = mode
+    dynamodb_client.BALANCE_SHARD_COUNT = shards
+    dynamodb_client._sharded_balances.clear()
+    dynamodb_client._balance_compacted_at.clear()
+
+    client = dynamodb_client.SGADynamoDBClient(table_name=table_name)
+    location = f"BENCH-{mode}-{uuid.uuid4().hex[:8]}"
+
+    def worker(thread_id):
+        latencies, failures = [], 0
+        for i in range(writes):
+            started = time.perf_counter()
+            ok = client.update_balance(location, "PN-HOT", 1, shard_key=f"{thread_id}-{i}")
+            latencies.append((time.perf_counter() - started) * 1000)
+            failures += not ok
+        return latencies, failures
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(worker, range(threads)))
+    elapsed = time.perf_counter() - started
+
+    latencies = [ms for thread_latencies, _ in results for ms in thread_latencies]
+    failures = sum(f for _, f in results)
+
+    read_started = time.perf_counter()
+    balance = client.get_balance(location, "PN-HOT")
+    read_ms = (time.perf_counter() - read_started) * 1000
+
+    compact_started = time.perf_counter()
+    compaction = client.compact_balance(location, "PN-HOT")
+    compact_ms = (time.perf_counter() - compact_started) * 1000
+    after = client.get_balance(location, "PN-HOT")
+
+    expected = threads * writes - failures
+    print(
+        f"{mode:<7} {len(latencies) / elapsed:>9.0f} {statistics.median(latencies):>8.2f} "
+        f"{percentile(latencies, 99):>8.2f} {failures:>7} {read_ms:>8.2f} {compact_ms:>10.2f} "
+        f"{'ok' if balance['total'] == after['total'] == expected else 'MISMATCH'}"
+        f" (shards={compaction['shards']}, compacted={compaction['compacted']})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--endpoint-url", default=os.environ.get("DYNAMODB_ENDPOINT_URL"))
+    parser.add_argument("--table", help="Existing table (default: create a temporary one)")
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--writes", type=int, default=200, help="Writes per thread")
+    parser.add_argument("--shards", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.endpoint_url:
+        os.environ["DYNAMODB_ENDPOINT_URL"] = args.endpoint_url
+    os.environ.setdefault("DYNAMODB_BULK_WORKERS", "8")
+
+    from tools import dynamodb_client
+
+    resource = dynamodb_client._get_dynamodb_resource()
+    table_name = args.table
+    table = None
+    if not table_name:
+        table_name = f"bench-balance-shards-{uuid.uuid4().hex[:8]}"
+        table = create_table(resource, table_name)
+
+    print(f"{args.threads} threads x {args.writes} writes on one balance, {args.shards} shards")
+    print(f"{'mode':<7} {'writes/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'failed':>7} "
+          f"{'read ms':>8} {'compact ms':>10} balance")
+    try:
+        for mode in ("off", "always"):
+            run(dynamodb_client, table_name, mode, args.threads, args.writes, args.shards)
+    finally:
+        if table is not None:
+            table.delete()
+
+
+if __name__ == "__main__":
+    main()
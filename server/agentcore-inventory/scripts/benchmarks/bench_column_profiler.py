@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+# =============================================================================
+# Benchmark: Columnar Profiler
+# =============================================================================
+# Profiles a synthetic sheet (ids, part numbers, quantities, prices, dates,
+# free text, sparse columns) and compares:
+# - legacy: per-column lists built by indexing every row, then the previous
+#   detect_data_type (sheet_analyzer) and _analyze_column (swarm) loops
+# - profile_rows with the pure-Python backend
+# - profile_rows with the pandas backend (when pandas is installed)
+#
+# Run: cd server/agentcore-inventory && \
+#      python scripts/benchmarks/bench_column_profiler.py --columns 50 --rows 100000
+# =============================================================================
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tools.column_profiler as column_profiler  # noqa: E402
+from tools.column_profiler import profile_rows  # noqa: E402
+
+COLUMN_KINDS = ["id", "part_number", "quantity", "price", "date", "text", "sparse"]
+
+
+def synthetic_rows(columns: int, rows: int, rng: random.Random):
+    kinds = [COLUMN_KINDS[c % len(COLUMN_KINDS)] for c in range(columns)]
+
+    def cell(kind, r):
+        if kind == "id":
+            return r + 1
+        if kind == "part_number":
+            return f"C{rng.randint(9000, 9500)}-{rng.choice(['24P', '48T', '8PC'])}"
+        if kind == "quantity":
+            return rng.randint(1, 50)
+        if kind == "price":
+            return f"R$ {rng.randint(1, 9999)},{rng.randint(0, 99):02d}"
+        if kind == "date":
+            return f"{rng.randint(1, 28):02d}/{rng.randint(1, 12):02d}/2026"
+        if kind == "text":
+            return rng.choice(["Switch gerenciavel", "Cabo UTP", "Fonte 48V", "Rack 1U"])
+        return rng.choice([None, "", "obs"]) if rng.random() < 0.3 else None
+
+    headers = [f"{kind}_{c}" for c, kind in enumerate(kinds)]
+    return headers, [tuple(cell(kind, r) for kind in kinds) for r in range(rows)]
+
+
+# =============================================================================
+# Legacy implementation (per-cell, before tools.column_profiler)
+# =============================================================================
+
+def legacy_detect_data_type(values):
+    type_counts = {"text": 0, "number": 0, "date": 0, "empty": 0}
+    for val in values:
+        if val is None or str(val).strip() == "":
+            type_counts["empty"] += 1
+            continue
+        str_val = str(val).strip()
+        try:
+            float(str_val.replace(",", ".").replace(" ", ""))
+            type_counts["number"] += 1
+            continue
+        except ValueError:
+            pass
+        if any(sep in str_val for sep in ["/", "-"]) and len(str_val) <= 20:
+            if any(c.isdigit() for c in str_val):
+                type_counts["date"] += 1
+                continue
+        type_counts["text"] += 1
+    non_empty = sum(v for k, v in type_counts.items() if k != "empty")
+    if non_empty == 0:
+        return "text"
+    for dtype, count in type_counts.items():
+        if dtype != "empty" and count / non_empty > 0.7:
+            return dtype
+    return "mixed"
+
+
+def _is_integer(val):
+    try:
+        int(val.replace(",", "").replace(".", ""))
+        return "." not in val and "," not in val
+    except (ValueError, AttributeError):
+        return False
+
+
+def _is_decimal(val):
+    try:
+        float(val.replace(",", "."))
+        return True
+    except (ValueError, AttributeError):
+        return False
+
+
+def _is_date(val):
+    date_patterns = [r"\d{4}-\d{2}-\d{2}", r"\d{2}/\d{2}/\d{4}", r"\d{2}-\d{2}-\d{4}"]
+    return any(re.match(p, str(val)) for p in date_patterns)
+
+
+def legacy_analyze_column(name, values, sample_rows):
+    non_null = [v for v in values if v is not None and str(v).strip()]
+    type_counts = {"integer": 0, "decimal": 0, "date": 0, "string": 0}
+    for v in non_null[:100]:
+        str_val = str(v).strip()
+        if _is_integer(str_val):
+            type_counts["integer"] += 1
+        elif _is_decimal(str_val):
+            type_counts["decimal"] += 1
+        elif _is_date(str_val):
+            type_counts["date"] += 1
+        else:
+            type_counts["string"] += 1
+    inferred = max(type_counts, key=type_counts.get) if non_null else "unknown"
+    checks = {"integer": _is_integer, "decimal": _is_decimal, "date": _is_date}
+    matches = sum(1 for v in non_null if checks.get(inferred, lambda _: True)(str(v).strip()))
+    return {
+        "name": name,
+        "inferred_type": inferred,
+        "sample_values": [str(v) for v in non_null[:sample_rows]],
+        "null_count": len(values) - len(non_null),
+        "unique_count": len(set(str(v) for v in non_null)),
+        "confidence": round(matches / len(non_null), 2) if non_null else 0.0,
+    }
+
+
+def legacy_profile(headers, rows):
+    results = []
+    for i, header in enumerate(headers):
+        col_values = [row[i] if i < len(row) else None for row in rows]
+        info = legacy_analyze_column(header, col_values, 10)
+        info["data_type"] = legacy_detect_data_type(col_values)
+        results.append(info)
+    return results
+
+
+def profiler(headers, rows):
+    return [
+        {"name": p.name, "inferred_type": p.inferred_type, "data_type": p.data_type()}
+        for p in profile_rows(rows, headers, sample_size=10)
+    ]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def run(columns: int, rows: int) -> None:
+    headers, data = synthetic_rows(columns, rows, random.Random(rows))
+    cells = columns * rows
+    print(f"sheet: {columns} columns x {rows:,} rows ({cells:,} cells)")
+
+    legacy, legacy_s = timed(lambda: legacy_profile(headers, data))
+    print(f"legacy per-cell:      {legacy_s:6.2f}s  ({cells / legacy_s:,.0f} cells/s)")
+
+    column_profiler.BACKEND = "python"
+    python, python_s = timed(lambda: profiler(headers, data))
+    print(f"profiler (python):    {python_s:6.2f}s  ({cells / python_s:,.0f} cells/s)  "
+          f"{legacy_s / python_s:.1f}x")
+
+    column_profiler.BACKEND = "pandas"
+    if column_profiler._get_pandas() is not None:
+        vectorized, pandas_s = timed(lambda: profiler(headers, data))
+        print(f"profiler (pandas):    {pandas_s:6.2f}s  ({cells / pandas_s:,.0f} cells/s)  "
+              f"{legacy_s / pandas_s:.1f}x  same result={vectorized == python}")
+    else:
+        print("profiler (pandas):    skipped (pandas not installed)")
+
+    changed = [
+        f"{old['name']}: {old['data_type']} -> {new['data_type']}"
+        for old, new in zip(legacy, python) if old["data_type"] != new["data_type"]
+    ]
+    print(f"data_type changes vs legacy: {changed or 'none'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--columns", type=int, default=50)
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    run(args.columns, args.rows)
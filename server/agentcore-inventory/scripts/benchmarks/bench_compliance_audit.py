@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# =============================================================================
+# Benchmark: Compliance Audit Engine
+# =============================================================================
+# Evaluates synthetic movements in chunks (same path as
+# SGAPostgresClient.run_compliance_audit, minus the database) and reports
+# throughput and peak process memory (max RSS).
+#
+# Run: cd server/agentcore-inventory && \
+#      python scripts/benchmarks/bench_compliance_audit.py --rows 1000000
+# =============================================================================
+
+import argparse
+import importlib.util
+import random
+import resource
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+from tools.compliance_audit import (  # noqa: E402
+    AuditAccumulator,
+    OPERATION_BY_MOVEMENT_TYPE,
+    compile_rules,
+    evaluate_chunk,
+)
+
+LOCATIONS = ["01", "02", "05", "COFRE", "QUARENTENA", "DESCARTE"]
+PROJECTS = ["P-100", "P-200", "P-300"]
+
+
+def _load_tool_module(name: str):
+    """Load a ComplianceAgent tool module by path (deployed as agents.compliance)."""
+    path = ROOT / "agents" / "specialists" / "compliance" / "tools" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_rules():
+    """Compile the production approval matrix (same inputs as audit_compliance)."""
+    matrix = _load_tool_module("approval_requirements")
+    policy = _load_tool_module("validate_operation")
+    return compile_rules(
+        matrix.APPROVAL_REQUIREMENTS,
+        restricted_locations=policy.RESTRICTED_LOCATIONS - {"DESCARTE"},
+        discard_locations={"DESCARTE"},
+        high_value_threshold=policy.HIGH_VALUE_THRESHOLD,
+        bulk_quantity_threshold=policy.BULK_QUANTITY_THRESHOLD,
+        business_hours=(policy.BUSINESS_HOURS_START, policy.BUSINESS_HOURS_END),
+    )
+
+
+def synthetic_movements(count: int, seed: int = 42):
+    """Yield synthetic movement rows with a mix of compliant and violating cases."""
+    rng = random.Random(seed)
+    types = list(OPERATION_BY_MOVEMENT_TYPE)
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for i in range(count):
+        moved_at = start + timedelta(minutes=7 * i)
+        approved = rng.random() < 0.7
+        project = rng.choice(PROJECTS)
+        yield {
+            "movement_id": uuid.UUID(int=i),
+            "movement_type": rng.choice(types),
+            "movement_date": moved_at,
+            "quantity": rng.randint(1, 80),
+            "source_location": rng.choice(LOCATIONS),
+            "destination_location": rng.choice(LOCATIONS),
+            "project_code": project,
+            "destination_project": project if rng.random() < 0.9 else rng.choice(PROJECTS),
+            "total_value": round(rng.uniform(10, 20000), 2),
+            "approved_by": "manager" if approved else None,
+            "approved_at": moved_at + timedelta(minutes=rng.choice([-5, 30])) if approved else None,
+            "created_by": "operator",
+        }
+
+
+def run(rows: int, chunk_size: int) -> None:
+    rules = load_rules()
+    accumulator = AuditAccumulator(sample_limit=50)
+
+    started = time.perf_counter()
+    chunk = []
+    for row in synthetic_movements(rows):
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            accumulator.add(*evaluate_chunk(chunk, rules))
+            chunk = []
+    if chunk:
+        accumulator.add(*evaluate_chunk(chunk, rules))
+    elapsed = time.perf_counter() - started
+    peak_kib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(f"rows:          {rows:,}")
+    print(f"chunk_size:    {chunk_size:,}")
+    print(f"elapsed:       {elapsed:.2f}s")
+    print(f"throughput:    {rows / elapsed:,.0f} rows/s")
+    print(f"max RSS:       {peak_kib / 1024:.1f} MiB")
+    print(f"counts:        {accumulator.counts}")
+    print(f"by code:       {accumulator.findings_by_code}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    args = parser.parse_args()
+    run(args.rows, args.chunk_size)
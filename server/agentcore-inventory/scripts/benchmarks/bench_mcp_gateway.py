@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# =============================================================================
+# Benchmark: MCP Gateway Transport
+# =============================================================================
+# N tool calls through MCPGatewayClient against a local stub gateway that
+# charges --connect-ms for every new connection (stand-in for TCP+TLS
+# handshakes) and --rtt-ms per request:
+#
+#   unpooled     requests.post per call (previous behavior)
+#   pooled       call_tool over the keep-alive session, sequential
+#   async        call_tool_async, concurrent over the async pool
+#   batched      call_tools_batch_async, one JSON-RPC batch
+#
+# Run: cd server/agentcore-inventory && \
+#      python scripts/benchmarks/bench_mcp_gateway.py --calls 50 --connect-ms 30 --rtt-ms 10
+# =============================================================================
+
+import argparse
+import asyncio
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+
+CONNECT_SECONDS = 0.03
+RTT_SECONDS = 0.01
+
+
+def tool_response(request):
+    text = json.dumps({"part_number": request["params"]["arguments"].get("part_number"), "total": 1})
+    return {"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": text}]}}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        time.sleep(CONNECT_SECONDS)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(RTT_SECONDS)
+        with self.server.lock:
+            self.server.requests += 1
+        payload = [tool_response(r) for r in body] if isinstance(body, list) else tool_response(body)
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubGateway(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.connections = 0
+        self.requests = 0
+
+
+def unpooled(client, calls):
+    """Previous call_tool: a fresh requests.post (new connection) per call."""
+    import requests
+
+    for name, arguments in calls:
+        payload = client._tool_payload(name, arguments)
+        headers = client._sign_request("POST", client.gateway_url, payload)
+        response = requests.post(client.gateway_url, headers=headers, json=payload, timeout=30)
+        client._parse_tool_result(name, response.json())
+
+
+def pooled(client, calls):
+    for name, arguments in calls:
+        client.call_tool(name, arguments)
+
+
+async def concurrent_async(client, calls):
+    await asyncio.gather(*(client.call_tool_async(name, args) for name, args in calls))
+    await client.aclose()
+
+
+async def batched(client, calls):
+    await client.call_tools_batch_async(calls)
+    await client.aclose()
+
+
+def main():
+    global CONNECT_SECONDS, RTT_SECONDS
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=50)
+    parser.add_argument("--connect-ms", type=float, default=30)
+    parser.add_argument("--rtt-ms", type=float, default=10)
+    args = parser.parse_args()
+    CONNECT_SECONDS = args.connect_ms / 1000
+    RTT_SECONDS = args.rtt_ms / 1000
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "bench")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "bench")
+    from tools.mcp_gateway_client import MCPGatewayClient
+
+    server = StubGateway()
+    threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/mcp"
+    calls = [("SGAPostgresTools___sga_get_balance", {"part_number": f"PN-{i}"}) for i in range(args.calls)]
+
+    variants = [
+        ("unpooled", lambda c: unpooled(c, calls)),
+        ("pooled", lambda c: pooled(c, calls)),
+        ("async", lambda c: asyncio.run(concurrent_async(c, calls))),
+        ("batched", lambda c: asyncio.run(batched(c, calls))),
+    ]
+
+    print(f"{args.calls} calls, connect {args.connect_ms} ms, rtt {args.rtt_ms} ms")
+    print(f"{'variant':<10} {'total ms':>9} {'ms/call':>8} {'requests':>9} {'connections':>12}")
+    for name, run in variants:
+        client = MCPGatewayClient(gateway_url=url, region="us-east-2")
+        server.reset()
+        started = time.perf_counter()
+        run(client)
+        elapsed = (time.perf_counter() - started) * 1000
+        client.close()
+        print(f"{name:<10} {elapsed:>9.1f} {elapsed / args.calls:>8.2f} "
+              f"{server.requests:>9} {server.connections:>12}")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# =============================================================================
+# Benchmark: Part Number Matcher
+# =============================================================================
+# Index build time, per-row match latency and agreement with the previous
+# brute-force SequenceMatcher scan, for 1k / 10k / 100k catalogs.
+#
+# Run: cd server/agentcore-inventory && \
+#      python scripts/benchmarks/bench_pn_matcher.py --sizes 1000 10000 100000
+# =============================================================================
+
+import argparse
+import random
+import sys
+import time
+from difflib import SequenceMatcher
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+from tools.pn_matcher import PartNumberMatcher, normalize_description  # noqa: E402
+
+NOUNS = ["CABO", "SWITCH", "ROTEADOR", "FONTE", "MODULO", "ANTENA", "PLACA", "CONECTOR",
+         "BATERIA", "SENSOR", "TRANSCEPTOR", "GABINETE", "RACK", "PATCH CORD", "INJETOR"]
+ATTRS = ["24 PORTAS", "48V", "SFP+", "10GBE", "POE", "OPTICO", "CAT6", "1U", "MONOMODO",
+         "MULTIMODO", "5M", "IP67", "DUAL BAND", "AC/DC", "GIGABIT", "LC/LC"]
+BRANDS = ["CISCO", "HUAWEI", "MIKROTIK", "FURUKAWA", "INTELBRAS", "UBIQUITI", "DELL", "HP"]
+
+
+def synthetic_catalog(size: int, rng: random.Random):
+    return [
+        {
+            "part_number": f"PN-{i:07d}",
+            "description": " ".join([
+                rng.choice(NOUNS),
+                rng.choice(BRANDS),
+                *rng.sample(ATTRS, 2),
+                f"MOD {rng.randint(100, 9999)}",
+            ]),
+        }
+        for i in range(size)
+    ]
+
+
+def perturb(text: str, rng: random.Random) -> str:
+    """Typo + case change, like hand-typed spreadsheets."""
+    chars = list(text.lower())
+    for _ in range(2):
+        pos = rng.randrange(len(chars))
+        chars[pos] = rng.choice("abcdefghijklmnopqrstuvwxyz ")
+    return "".join(chars)
+
+
+def brute_force(description: str, catalog):
+    text = normalize_description(description)
+    best, best_score = None, 0.0
+    for part in catalog:
+        score = SequenceMatcher(None, text, normalize_description(part["description"])).ratio()
+        if score > best_score:
+            best, best_score = part["part_number"], score
+    return best, best_score
+
+
+def run(size: int, queries: int, baseline_queries: int) -> None:
+    rng = random.Random(size)
+    catalog = synthetic_catalog(size, rng)
+
+    started = time.perf_counter()
+    matcher = PartNumberMatcher(catalog)
+    build_s = time.perf_counter() - started
+
+    sample = [rng.choice(catalog) for _ in range(queries)]
+    descriptions = [perturb(p["description"], rng) for p in sample]
+
+    started = time.perf_counter()
+    for part in sample:
+        matcher.match_exact(part["part_number"].lower())
+    exact_us = (time.perf_counter() - started) / queries * 1e6
+
+    started = time.perf_counter()
+    results = [matcher.match_description(d) for d in descriptions]
+    fuzzy_ms = (time.perf_counter() - started) / queries * 1000
+
+    # Agreement with the brute-force scan on a subset
+    n = min(baseline_queries, queries)
+    started = time.perf_counter()
+    baseline = [brute_force(d, catalog) for d in descriptions[:n]]
+    brute_ms = (time.perf_counter() - started) / n * 1000
+    agree = sum(
+        1 for (pn, score), (bpn, bscore) in zip(results[:n], baseline)
+        if pn == bpn or abs(score - bscore) < 1e-9
+    )
+
+    print(
+        f"catalog={size:>7,}  build={build_s:6.2f}s  exact={exact_us:5.1f}us/row  "
+        f"fuzzy={fuzzy_ms:6.2f}ms/row  brute={brute_ms:8.1f}ms/row  "
+        f"speedup={brute_ms / fuzzy_ms:6.0f}x  agreement={agree}/{n}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--baseline-queries", type=int, default=20)
+    args = parser.parse_args()
+    for size in args.sizes:
+        run(size, args.queries, args.baseline_queries)
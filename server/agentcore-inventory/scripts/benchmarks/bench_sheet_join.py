@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# =============================================================================
+# Benchmark: Value-Overlap Relationships and Streaming Master-Detail Join
+# =============================================================================
+# Builds a multi-sheet workbook (ITEMS + SERIALS + unrelated sheets) and
+# measures:
+# - analyze_workbook with and without column sketches (sketching overhead)
+# - whether the ITEMS/SERIALS relationship is found from values alone
+#   (column names are deliberately unrelated)
+# - streaming join throughput and peak memory vs. loading both sheets and
+#   joining in memory
+#
+# Run: cd server/agentcore-inventory && \
+#      python scripts/benchmarks/bench_sheet_join.py --sheets 20 --rows 200000
+# =============================================================================
+
+import argparse
+import io
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+
+import tools.sheet_analyzer as sheet_analyzer  # noqa: E402
+from tools.sheet_analyzer import analyze_workbook  # noqa: E402
+from tools.sheet_join import JoinStats, plan_master_detail_join, stream_joined_rows  # noqa: E402
+
+
+def build_workbook(sheets: int, rows: int, rng: random.Random) -> bytes:
+    """ITEMS gets 10% of the rows, SERIALS 50%, the rest is spread over noise sheets."""
+    from openpyxl import Workbook
+
+    items_rows = rows // 10
+    serial_rows = rows // 2
+    noise_sheets = max(0, sheets - 2)
+    noise_rows = (rows - items_rows - serial_rows) // max(1, noise_sheets)
+
+    wb = Workbook(write_only=True)
+
+    ws = wb.create_sheet("Plan1")
+    ws.append(["Cod Interno", "Texto Breve", "Qtde Pedida", "Linha"])
+    for i in range(items_rows):
+        ws.append([f"PN-{i:07d}", f"Equipamento modelo {i % 977}", rng.randint(1, 20), i + 1])
+
+    ws = wb.create_sheet("Plan2")
+    ws.append(["Ref", "Identificador Unico", "Situacao"])
+    for n in range(serial_rows):
+        # 95% reference existing items, 5% are orphans
+        ref = rng.randrange(items_rows) if rng.random() < 0.95 else items_rows + rng.randrange(1000)
+        ws.append([f"pn-{ref:07d}", f"SN{n:09d}", rng.choice(["OK", "AVARIA", "RMA"])])
+
+    for s in range(noise_sheets):
+        ws = wb.create_sheet(f"Aux{s + 1}")
+        ws.append(["Chave", "Valor", "Observacao"])
+        for i in range(noise_rows):
+            ws.append([f"K{s}-{i:07d}", rng.random() * 1000, f"nota {rng.randrange(50)}"])
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+def in_memory_join(content: bytes, plan) -> int:
+    """Baseline: materialize both sheets, then join."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    master = list(wb[plan.master_sheet].iter_rows(values_only=True))
+    detail = list(wb[plan.detail_sheet].iter_rows(values_only=True))
+    wb.close()
+
+    master_idx = list(master[0]).index(plan.master_key)
+    detail_idx = list(detail[0]).index(plan.detail_key)
+    index = {str(row[master_idx]).upper(): row for row in master[1:]}
+    joined = [index[str(row[detail_idx]).upper()] + row for row in detail[1:]
+              if str(row[detail_idx]).upper() in index]
+    return len(joined)
+
+
+def measure(fn):
+    """(result of the timed run, seconds, peak MB) - timing and tracing run separately."""
+    started = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def run(sheets: int, rows: int) -> None:
+    rng = random.Random(rows)
+    # Legacy name patterns only (the schema matcher needs the MCP Gateway)
+    sheet_analyzer._get_schema_matcher = lambda: None
+
+    started = time.perf_counter()
+    content = build_workbook(sheets, rows, rng)
+    print(f"workbook: {sheets} sheets, {rows:,} rows, {len(content) / 1024 / 1024:.1f}MB "
+          f"(built in {time.perf_counter() - started:.1f}s)")
+
+    started = time.perf_counter()
+    plain = analyze_workbook(content, "bench.xlsx", sketch_columns=False)
+    plain_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    analysis = analyze_workbook(content, "bench.xlsx")
+    sketch_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    sheet_analyzer.detect_sheet_relationships(analysis.sheets)
+    detect_ms = (time.perf_counter() - started) * 1000
+
+    print(f"analyze (names only):   {plain_s:6.2f}s  strategy={plain.recommended_strategy}")
+    print(f"analyze (with sketches): {sketch_s:6.2f}s  strategy={analysis.recommended_strategy}  "
+          f"relationship detection={detect_ms:.1f}ms")
+    for rel in analysis.relationships:
+        if rel.evidence == "value_overlap":
+            print(f"  {rel.relationship_type.value:<12} {rel.sheet1} -> {rel.sheet2} "
+                  f"{rel.join_columns} confidence={rel.confidence}")
+
+    plan = plan_master_detail_join(analysis)
+    if plan is None:
+        print("no master-detail plan found")
+        return
+
+    def streaming_join():
+        stats = JoinStats()
+        return sum(1 for _ in stream_joined_rows(content, plan, stats=stats)), stats
+
+    (count, stats), stream_s, stream_mb = measure(streaming_join)
+    baseline, memory_s, memory_mb = measure(lambda: in_memory_join(content, plan))
+
+    print(f"streaming join: {count:,} rows in {stream_s:.2f}s "
+          f"({count / stream_s:,.0f} rows/s), peak {stream_mb:.1f}MB  "
+          f"matched={stats.matched_rows:,} orphans={stats.orphan_detail_rows:,} "
+          f"masters without details={stats.unmatched_master_rows:,}")
+    print(f"in-memory join: {baseline:,} matched rows in {memory_s:.2f}s, peak {memory_mb:.1f}MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sheets", type=int, default=20)
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+    run(args.sheets, args.rows)
@@ -35,6 +35,8 @@ import urllib.parse
 from typing import Dict, Any, Optional, List, Set
 from dataclasses import dataclass, field
 
+from shared.dependency_registry import get_dependency_registry
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -929,26 +931,38 @@ class A2AClient:
             # The payload is the A2A JSON-RPC 2.0 request - format is preserved!
             logger.info(f"[A2A] Invoking {agent_id} via boto3 SDK (ARN: {runtime_arn[:50]}...)")
 
-            response = client.invoke_agent_runtime(
-                agentRuntimeArn=runtime_arn,
-                runtimeSessionId=runtime_session_id,
-                payload=json.dumps(a2a_request).encode('utf-8')
-            )
-
-            # =================================================================
-            # DEBUG: Log full response structure to diagnose "Empty response"
-            # =================================================================
-            logger.info(f"[A2A-DEBUG] Response keys: {list(response.keys())}")
-            logger.info(f"[A2A-DEBUG] Response metadata: {response.get('ResponseMetadata', {})}")
+            # Per-target adaptive concurrency limit + circuit breaker: a slow
+            # agent sheds excess delegations (DependencySaturatedError) instead
+            # of piling them up until timeouts cascade. A delegation's latency
+            # depends on the task, so only failures shrink the limit.
+            dependency = get_dependency_registry().get(f"a2a:{agent_id}", latency_tolerance=None)
+            # The boto3 call and the body read block, so they run in a worker
+            # thread: other delegations on this loop stay in flight and the
+            # limiter sees the real concurrency
+            async with dependency.guard_async(wait_timeout=timeout):
+                response = await asyncio.to_thread(
+                    client.invoke_agent_runtime,
+                    agentRuntimeArn=runtime_arn,
+                    runtimeSessionId=runtime_session_id,
+                    payload=json.dumps(a2a_request).encode('utf-8'),
+                )
 
-            # Read response body (boto3 returns StreamingBody in 'response' key, not 'payload')
-            # Reference: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/bedrock-agentcore/client/invoke_agent_runtime.html
-            response_body_stream = response.get('response')
-            logger.info(f"[A2A-DEBUG] Response type: {type(response_body_stream)}, truthy: {bool(response_body_stream)}")
+                # =============================================================
+                # DEBUG: Log full response structure to diagnose "Empty response"
+                # =============================================================
+                logger.info(f"[A2A-DEBUG] Response keys: {list(response.keys())}")
+                logger.info(f"[A2A-DEBUG] Response metadata: {response.get('ResponseMetadata', {})}")
+
+                # Read response body (boto3 returns StreamingBody in 'response' key, not 'payload')
+                # Reference: https://boto3.amazonaws.com/v1/documentation/api/latest/reference/services/bedrock-agentcore/client/invoke_agent_runtime.html
+                response_body_stream = response.get('response')
+                logger.info(f"[A2A-DEBUG] Response type: {type(response_body_stream)}, truthy: {bool(response_body_stream)}")
+                response_body = (
+                    (await asyncio.to_thread(response_body_stream.read)).decode('utf-8')
+                    if response_body_stream else None
+                )
 
-            if response_body_stream:
-                # response_body_stream is a StreamingBody, read it
-                response_body = response_body_stream.read().decode('utf-8')
+            if response_body is not None:
                 response_data = json.loads(response_body)
                 logger.debug(f"[A2A] Response from {agent_id}: {str(response_data)[:200]}...")
                 return self._parse_a2a_response(response_data, agent_id, message_id)
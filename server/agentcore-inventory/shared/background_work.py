@@ -0,0 +1,315 @@
+# =============================================================================
+# Background Work Queue - Best-Effort Side Calls Off the Request Path
+# =============================================================================
+# Tools used to await non-critical side effects (ObservationAgent audit
+# events via A2A, AgentCore Memory writes) before returning to the user.
+# This module gives each container one in-process queue for that work:
+#
+# - Bounded concurrency: a fixed pool of worker tasks
+# - Bounded backlog: submit() never blocks; when the queue is full the job
+#   is dropped and counted (these calls are best effort by definition)
+# - Retries: exponential backoff with jitter, up to max_attempts
+# - Drain on shutdown: register_background_drain(app) waits (bounded) for
+#   pending jobs when uvicorn stops the container
+#
+# Usage:
+#   from shared.background_work import (
+#       notify_agent, submit_memory_write, register_background_drain,
+#   )
+#
+#   # In a tool - returns immediately
+#   notify_agent(a2a_client, "observation", {...}, session_id)
+#   submit_memory_write("learn_episode", lambda: memory.learn_episode(...))
+#
+#   # In main()
+#   register_background_drain(app)
+#
+# Jobs are zero-argument callables returning an awaitable, so every retry
+# creates a fresh coroutine. A job fails by raising.
+# =============================================================================
+
+import asyncio
+import logging
+import os
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = int(os.environ.get("BACKGROUND_WORK_CONCURRENCY", "4"))
+DEFAULT_MAX_PENDING = int(os.environ.get("BACKGROUND_WORK_MAX_PENDING", "1000"))
+DEFAULT_MAX_ATTEMPTS = int(os.environ.get("BACKGROUND_WORK_MAX_ATTEMPTS", "4"))
+DEFAULT_DRAIN_SECONDS = float(os.environ.get("BACKGROUND_WORK_DRAIN_SECONDS", "10"))
+
+BACKOFF_BASE_SECONDS = 0.5
+BACKOFF_MAX_SECONDS = 8.0
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class BackgroundWorkQueue:
+    """
+    Bounded, retrying queue of best-effort async jobs.
+
+    Workers start lazily on the first submit() from a running event loop.
+
+    Example:
+        queue = BackgroundWorkQueue(name="side-calls", concurrency=4)
+        queue.submit("a2a:observation", lambda: client.invoke_agent(...))
+        await queue.drain(timeout=10)
+    """
+
+    def __init__(
+        self,
+        name: str = "background",
+        concurrency: int = DEFAULT_CONCURRENCY,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = BACKOFF_BASE_SECONDS,
+        max_delay: float = BACKOFF_MAX_SECONDS,
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_pending = max_pending
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._workers: List[asyncio.Task] = []
+        self._closed = False
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "retried": 0,
+            "failed": 0,
+            "dropped": 0,
+        }
+
+    def submit(self, label: str, job: Job) -> bool:
+        """
+        Enqueue a job without waiting for it.
+
+        Args:
+            label: Short description for logs (e.g. "a2a:observation")
+            job: Zero-argument callable returning an awaitable
+
+        Returns:
+            True if queued, False if dropped (closed, no loop, or full)
+        """
+        if self._closed:
+            return self._drop(label, "queue closed")
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return self._drop(label, "no running event loop")
+
+        self._ensure_workers(loop)
+        try:
+            self._queue.put_nowait((label, job))
+        except asyncio.QueueFull:
+            return self._drop(label, "queue full")
+
+        self._stats["submitted"] += 1
+        return True
+
+    def _drop(self, label: str, reason: str) -> bool:
+        self._stats["dropped"] += 1
+        logger.warning(f"[{self.name}] Dropped {label}: {reason}")
+        return False
+
+    def _ensure_workers(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is loop and self._queue is not None:
+            return
+        # First use, or a new event loop (the old one's workers are gone)
+        self._loop = loop
+        self._queue = asyncio.Queue(maxsize=self.max_pending)
+        self._workers = [
+            loop.create_task(self._worker(), name=f"{self.name}-worker-{i}")
+            for i in range(self.concurrency)
+        ]
+
+    async def _worker(self) -> None:
+        while True:
+            label, job = await self._queue.get()
+            try:
+                await self._run(label, job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, label: str, job: Job) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await job()
+                self._stats["completed"] += 1
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.max_attempts:
+                    self._stats["failed"] += 1
+                    logger.warning(
+                        f"[{self.name}] {label} failed after {attempt} attempt(s): {e}"
+                    )
+                    return
+                self._stats["retried"] += 1
+                delay = min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+                await asyncio.sleep(random.uniform(delay / 2, delay))
+
+    async def join(self, timeout: float = DEFAULT_DRAIN_SECONDS) -> bool:
+        """
+        Wait for pending jobs without closing the queue.
+
+        Returns:
+            True if the backlog emptied within the timeout
+        """
+        if self._queue is None or self._loop is not asyncio.get_running_loop():
+            return True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def drain(self, timeout: float = DEFAULT_DRAIN_SECONDS) -> bool:
+        """
+        Stop accepting jobs and wait for pending ones.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if every pending job finished within the timeout
+        """
+        self._closed = True
+        if self._queue is None:
+            return True
+
+        drained = True
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            drained = False
+            logger.warning(
+                f"[{self.name}] Drain timed out after {timeout}s, "
+                f"{self._queue.qsize()} job(s) still pending"
+            )
+        finally:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+            self._workers = []
+
+        logger.info(f"[{self.name}] Drained: {self.get_stats()}")
+        return drained
+
+    def get_stats(self) -> Dict[str, int]:
+        """Counters plus current backlog."""
+        return {
+            **self._stats,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+# =============================================================================
+# Process-wide Queue
+# =============================================================================
+
+_queue: Optional[BackgroundWorkQueue] = None
+
+
+def get_background_queue() -> BackgroundWorkQueue:
+    """Per-container queue (singleton)."""
+    global _queue
+    if _queue is None:
+        _queue = BackgroundWorkQueue(name="background-work")
+    return _queue
+
+
+def submit_background(label: str, job: Job) -> bool:
+    """Enqueue a job on the per-container queue."""
+    return get_background_queue().submit(label, job)
+
+
+def notify_agent(
+    a2a_client: Any,
+    agent_id: str,
+    payload: Dict[str, Any],
+    session_id: Optional[str] = None,
+) -> bool:
+    """
+    Fire-and-forget A2A call (e.g. ObservationAgent log_event).
+
+    Unsuccessful A2AResponses are retried like exceptions.
+    """
+    async def job() -> None:
+        response = await a2a_client.invoke_agent(agent_id, payload, session_id)
+        if not response.success:
+            raise RuntimeError(response.error or f"{agent_id} call failed")
+
+    action = payload.get("event_type") or payload.get("action")
+    return submit_background(f"a2a:{agent_id}:{action}", job)
+
+
+def submit_memory_write(label: str, write: Callable[[], Awaitable[Any]]) -> bool:
+    """
+    Fire-and-forget AgentMemoryManager write.
+
+    AgentMemoryManager.learn* return None (or a list containing None for
+    learn_facts) instead of raising, so those results count as failures.
+    """
+    async def job() -> None:
+        result = await write()
+        if result is None or (isinstance(result, list) and None in result):
+            raise RuntimeError(f"{label} returned no event id")
+
+    return submit_background(f"memory:{label}", job)
+
+
+def submit_memory_facts(
+    memory: Any,
+    facts: List[str],
+    category: str,
+    **kwargs,
+) -> Tuple[int, int]:
+    """
+    Queue facts as learn_facts batches (one job per CreateEvent batch).
+
+    A failed batch is retried alone, so other batches are not resent.
+
+    Returns:
+        (batches queued, batches dropped)
+    """
+    from shared.memory_manager import FACTS_PER_EVENT
+
+    queued = dropped = 0
+    for start in range(0, len(facts), FACTS_PER_EVENT):
+        batch = facts[start:start + FACTS_PER_EVENT]
+        ok = submit_memory_write(
+            f"learn_facts:{category}",
+            lambda batch=batch: memory.learn_facts(batch, category=category, **kwargs),
+        )
+        queued += ok
+        dropped += not ok
+    return queued, dropped
+
+
+def register_background_drain(app, timeout: float = DEFAULT_DRAIN_SECONDS) -> None:
+    """
+    Drain the per-container queue when the FastAPI app shuts down.
+
+    Also exposes GET /background/stats.
+
+    Args:
+        app: FastAPI app wrapping the A2A server (call before mounting "/")
+        timeout: Maximum seconds to wait for pending jobs
+    """
+    @app.on_event("shutdown")
+    async def _drain_background_work():
+        await get_background_queue().drain(timeout)
+
+    @app.get("/background/stats")
+    async def _background_stats():
+        return get_background_queue().get_stats()
@@ -2,7 +2,8 @@
 # Circuit Breaker for Debug Agent Protection
 # =============================================================================
 # Thread-safe circuit breaker pattern to protect system from cascade failures.
-# Used by DebugHook to prevent degradation when Debug Agent is unavailable.
+# Used by DebugHook to prevent degradation when Debug Agent is unavailable,
+# and by shared/dependency_registry.py for every outbound dependency.
 #
 # States:
 # - CLOSED: Normal operation, requests pass through
@@ -12,8 +13,8 @@
 # Reference: https://martinfowler.com/bliki/CircuitBreaker.html
 # =============================================================================
 
-import asyncio
 import logging
+import threading
 import time
 from enum import Enum
 from typing import Any, Dict, Optional
@@ -56,7 +57,8 @@ class CircuitBreaker:
             raise CircuitOpenError("Service unavailable")
 
     Thread Safety:
-        Uses asyncio.Lock for thread-safe state transitions in async contexts.
+        State transitions run under a threading.Lock (critical sections never
+        await), so the async and *_sync methods can be mixed across threads.
     """
 
     def __init__(
@@ -87,7 +89,7 @@ class CircuitBreaker:
         self._half_open_calls = 0
 
         # Thread safety
-        self._lock = asyncio.Lock()
+        self._lock = threading.Lock()
 
         logger.info(
             f"[CircuitBreaker:{self._name}] Initialized with "
@@ -148,13 +150,29 @@ class CircuitBreaker:
         # OPEN state - reject
         return False
 
+    def acquire(self) -> bool:
+        """
+        Like can_execute(), but counts the call against the HALF_OPEN probe
+        limit. Every True must be followed by record_success/record_failure.
+        """
+        with self._lock:
+            if not self.can_execute():
+                return False
+            if self._state == CircuitState.HALF_OPEN:
+                self._half_open_calls += 1
+            return True
+
     async def record_success(self) -> None:
         """
         Record successful execution.
 
         Resets failure count and closes circuit if in HALF_OPEN state.
         """
-        async with self._lock:
+        self.record_success_sync()
+
+    def record_success_sync(self) -> None:
+        """record_success() for synchronous callers."""
+        with self._lock:
             if self._state == CircuitState.HALF_OPEN:
                 # Success in HALF_OPEN means service recovered
                 self._state = CircuitState.CLOSED
@@ -174,7 +192,11 @@ class CircuitBreaker:
 
         Increments failure count and may trip circuit to OPEN state.
         """
-        async with self._lock:
+        self.record_failure_sync()
+
+    def record_failure_sync(self) -> None:
+        """record_failure() for synchronous callers."""
+        with self._lock:
             self._failure_count += 1
             self._last_failure_time = time.monotonic()
 
@@ -0,0 +1,578 @@
+# =============================================================================
+# Dependency Registry - Adaptive Concurrency for Outbound Calls
+# =============================================================================
+# A2A delegations, MCP Gateway calls and carrier APIs used to run with
+# unbounded concurrency: when a dependency slowed down, requests piled up
+# until timeouts cascaded. This module gives each named dependency, once per
+# container:
+#
+# - Adaptive concurrency limit: additive increase while latency stays within
+#   LATENCY_TOLERANCE x the no-load baseline, gradient (latency-proportional)
+#   decrease when it grows, multiplicative decrease on failures
+# - Plain AIMD (latency_tolerance=None) for dependencies whose latency
+#   depends on the request, not the load: one MCP Gateway serves 50 ms
+#   lookups and 20 s audit passes, A2A delegations run whole agent turns.
+#   Their limit only shrinks on failures and timeouts.
+# - Bounded wait queue: when the limit is reached, at most MAX_QUEUE callers
+#   wait up to QUEUE_TIMEOUT seconds (or the call's own timeout, if longer);
+#   the rest are shed immediately with DependencySaturatedError
+# - Circuit breaker (shared/circuit_breaker.py): DependencyUnavailableError
+#   while open
+# - Latency histogram (log buckets) with approximate percentiles
+#
+# Usage:
+#   from shared.dependency_registry import guarded, get_dependency_registry
+#
+#   @guarded("mcp_gateway", timeout_arg="timeout")
+#   def _post(..., timeout): ...             # sync or async functions
+#
+#   dependency = get_dependency_registry().get(f"a2a:{agent_id}", latency_tolerance=None)
+#   async with dependency.guard_async(wait_timeout=timeout):
+#       ...
+#
+#   with get_dependency_registry().get("tavily").guard() as call:
+#       response = ...
+#       if response.status_code >= 500:
+#           call.mark_failure()             # failure without an exception
+#
+#   get_dependency_registry().get_stats()    # limits, queue, breaker, latency
+#
+# Environment (defaults for every dependency):
+#   DEPENDENCY_INITIAL_LIMIT (16), DEPENDENCY_MIN_LIMIT (1),
+#   DEPENDENCY_MAX_LIMIT (128), DEPENDENCY_MAX_QUEUE (32),
+#   DEPENDENCY_QUEUE_TIMEOUT (5.0), DEPENDENCY_LATENCY_TOLERANCE (2.0),
+#   DEPENDENCY_FAILURE_THRESHOLD (5), DEPENDENCY_RESET_TIMEOUT (30.0)
+# =============================================================================
+
+import asyncio
+import functools
+import inspect
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from shared.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+logger = logging.getLogger(__name__)
+
+INITIAL_LIMIT = int(os.environ.get("DEPENDENCY_INITIAL_LIMIT", "16"))
+MIN_LIMIT = int(os.environ.get("DEPENDENCY_MIN_LIMIT", "1"))
+MAX_LIMIT = int(os.environ.get("DEPENDENCY_MAX_LIMIT", "128"))
+MAX_QUEUE = int(os.environ.get("DEPENDENCY_MAX_QUEUE", "32"))
+QUEUE_TIMEOUT = float(os.environ.get("DEPENDENCY_QUEUE_TIMEOUT", "5.0"))
+LATENCY_TOLERANCE = float(os.environ.get("DEPENDENCY_LATENCY_TOLERANCE", "2.0"))
+FAILURE_THRESHOLD = int(os.environ.get("DEPENDENCY_FAILURE_THRESHOLD", "5"))
+RESET_TIMEOUT = float(os.environ.get("DEPENDENCY_RESET_TIMEOUT", "30.0"))
+
+# Multiplicative decrease on failure, and the floor for gradient decreases
+FAILURE_BACKOFF = 0.7
+MIN_GRADIENT = 0.5
+# Successes per no-load baseline refresh (lets the baseline drift up)
+BASELINE_WINDOW = 200
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class DependencySaturatedError(Exception):
+    """Raised when a dependency's concurrency limit and wait queue are full."""
+
+    def __init__(self, name: str, limit: int, in_flight: int, waiting: int):
+        self.name = name
+        self.limit = limit
+        self.in_flight = in_flight
+        self.waiting = waiting
+        super().__init__(
+            f"Dependência '{name}' saturada ({in_flight} chamadas em andamento, "
+            f"limite {limit}, {waiting} na fila). Tente novamente em instantes."
+        )
+
+
+class DependencyUnavailableError(CircuitOpenError):
+    """Raised while a dependency's circuit breaker is open."""
+
+    def __init__(self, name: str):
+        self.name = name
+        super().__init__(f"Dependência '{name}' indisponível (circuit breaker aberto)")
+
+
+class LatencyHistogram:
+    """Fixed log-bucket latency histogram."""
+
+    def __init__(self, buckets_ms: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets_ms = list(buckets_ms)
+        self.counts = [0] * (len(self.buckets_ms) + 1)
+        self.total = 0
+        self.sum_ms = 0.0
+
+    def observe(self, latency_ms: float) -> None:
+        self.counts[bisect_left(self.buckets_ms, latency_ms)] += 1
+        self.total += 1
+        self.sum_ms += latency_ms
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the pct-th sample (None if empty)."""
+        if not self.total:
+            return None
+        rank = max(1, round(self.total * pct / 100))
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else float("inf")
+        return float("inf")
+
+    def to_dict(self) -> Dict[str, Any]:
+        labels = [f"le_{b}" for b in self.buckets_ms] + ["inf"]
+        return {
+            "count": self.total,
+            "mean_ms": round(self.sum_ms / self.total, 1) if self.total else None,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class AdaptiveLimit:
+    """
+    AIMD concurrency limit with a latency gradient.
+
+    - Success within tolerance x baseline: limit += 1 / limit (about +1 per
+      window of `limit` calls), only while the limit is actually being used
+    - Success slower than that: limit *= max(MIN_GRADIENT, tolerance x baseline / latency)
+    - Failure: limit *= FAILURE_BACKOFF
+
+    With tolerance None latency never shrinks the limit (plain AIMD).
+    """
+
+    def __init__(
+        self,
+        initial: int = INITIAL_LIMIT,
+        minimum: int = MIN_LIMIT,
+        maximum: int = MAX_LIMIT,
+        tolerance: Optional[float] = LATENCY_TOLERANCE,
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.value = float(min(self.maximum, max(self.minimum, initial)))
+        self.tolerance = tolerance
+        self.baseline_ms: Optional[float] = None
+        self._window_min = float("inf")
+        self._window_samples = 0
+
+    @property
+    def current(self) -> int:
+        return max(self.minimum, int(self.value))
+
+    def on_success(self, latency_ms: float, in_flight: int) -> None:
+        self._window_min = min(self._window_min, latency_ms)
+        self._window_samples += 1
+        if self.baseline_ms is None or latency_ms < self.baseline_ms:
+            self.baseline_ms = latency_ms
+        elif self._window_samples >= BASELINE_WINDOW:
+            self.baseline_ms = self._window_min
+            self._window_min, self._window_samples = float("inf"), 0
+
+        threshold = (
+            float("inf") if self.tolerance is None
+            else self.tolerance * max(self.baseline_ms, 1.0)
+        )
+        if latency_ms <= threshold:
+            # Grow only when the limit is the bottleneck
+            if in_flight >= self.current / 2:
+                self.value = min(self.maximum, self.value + 1 / self.value)
+        else:
+            gradient = max(MIN_GRADIENT, threshold / latency_ms)
+            self.value = max(self.minimum, self.value * gradient)
+
+    def on_failure(self) -> None:
+        self.value = max(self.minimum, self.value * FAILURE_BACKOFF)
+
+
+class _Waiter:
+    __slots__ = ("granted", "event", "loop", "future")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.granted = False
+        self.event = event
+        self.loop = loop
+        self.future = future
+
+
+class _Call:
+    """Handle yielded by guard(); mark_failure() records a failure without raising."""
+
+    __slots__ = ("failed",)
+
+    def __init__(self):
+        self.failed = False
+
+    def mark_failure(self) -> None:
+        self.failed = True
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(True)
+
+
+class Dependency:
+    """
+    One named outbound dependency: adaptive limit, wait queue, breaker, histogram.
+
+    Safe to use from event loops and worker threads at the same time.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int = INITIAL_LIMIT,
+        min_limit: int = MIN_LIMIT,
+        max_limit: int = MAX_LIMIT,
+        max_queue: int = MAX_QUEUE,
+        queue_timeout: float = QUEUE_TIMEOUT,
+        latency_tolerance: Optional[float] = LATENCY_TOLERANCE,
+        failure_threshold: int = FAILURE_THRESHOLD,
+        reset_timeout: float = RESET_TIMEOUT,
+    ):
+        self.name = name
+        self.limit = AdaptiveLimit(initial_limit, min_limit, max_limit, latency_tolerance)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.breaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            reset_timeout=reset_timeout,
+            name=name,
+        )
+        self.histogram = LatencyHistogram()
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._stats = {
+            "calls": 0,
+            "successes": 0,
+            "failures": 0,
+            "shed": 0,
+            "queued": 0,
+            "rejected_open": 0,
+        }
+
+    # -------------------------------------------------------------------------
+    # Slots
+    # -------------------------------------------------------------------------
+
+    def _try_take_slot(self) -> bool:
+        """Take a slot if free (caller holds the lock)."""
+        if self._in_flight < self.limit.current and not self._waiters:
+            self._in_flight += 1
+            return True
+        return False
+
+    def _shed(self) -> DependencySaturatedError:
+        """Count and build the shed error (caller holds the lock)."""
+        self._stats["shed"] += 1
+        return DependencySaturatedError(
+            self.name, self.limit.current, self._in_flight, len(self._waiters)
+        )
+
+    def _handoff(self) -> None:
+        """Grant freed slots to waiters in FIFO order (caller holds the lock)."""
+        while self._waiters and self._in_flight < self.limit.current:
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            if waiter.event is not None:
+                waiter.event.set()
+                continue
+            try:
+                waiter.loop.call_soon_threadsafe(_resolve, waiter.future)
+            except RuntimeError:
+                # Waiter's event loop is closed; nobody will use the slot
+                self._in_flight -= 1
+
+    def _return_slot(self) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._handoff()
+
+    def _wait_timeout(self, wait_timeout: Optional[float]) -> float:
+        """Queue wait: queue_timeout, or the call's own timeout if longer."""
+        return max(self.queue_timeout, wait_timeout or 0.0)
+
+    def _acquire_sync(self, wait_timeout: Optional[float] = None) -> None:
+        with self._lock:
+            if self._try_take_slot():
+                return
+            if len(self._waiters) >= self.max_queue:
+                raise self._shed()
+            waiter = _Waiter(event=threading.Event())
+            self._waiters.append(waiter)
+            self._stats["queued"] += 1
+
+        waiter.event.wait(self._wait_timeout(wait_timeout))
+        with self._lock:
+            if waiter.granted:
+                return
+            self._waiters.remove(waiter)
+            raise self._shed()
+
+    async def _acquire_async(self, wait_timeout: Optional[float] = None) -> None:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._try_take_slot():
+                return
+            if len(self._waiters) >= self.max_queue:
+                raise self._shed()
+            waiter = _Waiter(loop=loop, future=loop.create_future())
+            self._waiters.append(waiter)
+            self._stats["queued"] += 1
+
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter.future), self._wait_timeout(wait_timeout))
+        except asyncio.TimeoutError:
+            with self._lock:
+                if waiter.granted:
+                    return
+                self._waiters.remove(waiter)
+                raise self._shed()
+        except asyncio.CancelledError:
+            with self._lock:
+                if not waiter.granted:
+                    self._waiters.remove(waiter)
+                    raise
+            self._return_slot()
+            raise
+
+    def _admit_breaker(self) -> None:
+        """Check the breaker after taking a slot (so a shed never burns a probe)."""
+        if not self.breaker.acquire():
+            with self._lock:
+                self._stats["rejected_open"] += 1
+            self._return_slot()
+            raise DependencyUnavailableError(self.name)
+
+    def _finish(self, started: float, ok: bool) -> None:
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["calls"] += 1
+            self.histogram.observe(latency_ms)
+            if ok:
+                self._stats["successes"] += 1
+                self.limit.on_success(latency_ms, self._in_flight)
+            else:
+                self._stats["failures"] += 1
+                self.limit.on_failure()
+            self._in_flight -= 1
+            self._handoff()
+
+        if ok:
+            self.breaker.record_success_sync()
+        else:
+            self.breaker.record_failure_sync()
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    @contextmanager
+    def guard(
+        self,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        """
+        Run a synchronous call under the limit and breaker.
+
+        Args:
+            is_failure: Decides whether an exception counts against the
+                dependency (default: every exception does)
+            wait_timeout: The call's own timeout; a queued call waits at
+                least this long for a slot (default: queue_timeout)
+
+        Raises:
+            DependencySaturatedError: Limit and queue full, or queue wait timed out
+            DependencyUnavailableError: Circuit breaker open
+        """
+        self._acquire_sync(wait_timeout)
+        self._admit_breaker()
+        call = _Call()
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException as e:
+            self._finish(started, ok=is_failure is not None and not is_failure(e))
+            raise
+        self._finish(started, ok=not call.failed)
+
+    @asynccontextmanager
+    async def guard_async(
+        self,
+        is_failure: Optional[Callable[[BaseException], bool]] = None,
+        wait_timeout: Optional[float] = None,
+    ):
+        """Async guard(); waiting for a slot does not block the event loop."""
+        await self._acquire_async(wait_timeout)
+        self._admit_breaker()
+        call = _Call()
+        started = time.perf_counter()
+        try:
+            yield call
+        except BaseException as e:
+            self._finish(started, ok=is_failure is not None and not is_failure(e))
+            raise
+        self._finish(started, ok=not call.failed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self._stats,
+                "limit": self.limit.current,
+                "baseline_ms": round(self.limit.baseline_ms, 1) if self.limit.baseline_ms else None,
+                "in_flight": self._in_flight,
+                "waiting": len(self._waiters),
+                "circuit": self.breaker.state.value,
+                "latency": self.histogram.to_dict(),
+            }
+
+
+class DependencyRegistry:
+    """Process-wide map of dependency name -> Dependency."""
+
+    def __init__(self):
+        self._dependencies: Dict[str, Dependency] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **options: Any) -> Dependency:
+        """
+        Get or create a dependency.
+
+        Args:
+            name: Dependency name (e.g. "mcp_gateway", "a2a:learning")
+            **options: Dependency constructor overrides, applied on creation only
+        """
+        dependency = self._dependencies.get(name)
+        if dependency is None:
+            with self._lock:
+                dependency = self._dependencies.get(name)
+                if dependency is None:
+                    dependency = Dependency(name, **options)
+                    self._dependencies[name] = dependency
+        return dependency
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            dependencies = dict(self._dependencies)
+        return {name: dep.get_stats() for name, dep in sorted(dependencies.items())}
+
+
+_registry = DependencyRegistry()
+
+
+def get_dependency_registry() -> DependencyRegistry:
+    """Per-container dependency registry (singleton)."""
+    return _registry
+
+
+def guarded(
+    name: str,
+    is_failure: Optional[Callable[[BaseException], bool]] = None,
+    timeout_arg: Optional[str] = None,
+    **options: Any,
+) -> Callable:
+    """
+    Decorator running a sync or async function under dependency `name`.
+
+    Args:
+        name: Dependency name
+        is_failure: Decides whether an exception counts against the
+            dependency (default: every exception does)
+        timeout_arg: Name of the function argument holding the call's
+            timeout in seconds (used as the guard's wait_timeout)
+        **options: Dependency constructor overrides (first use only)
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        default = None
+        if timeout_arg is not None:
+            default = signature.parameters[timeout_arg].default
+            if default is inspect.Parameter.empty:
+                default = None
+
+        def wait_timeout(args, kwargs) -> Optional[float]:
+            if timeout_arg is None:
+                return None
+            return signature.bind_partial(*args, **kwargs).arguments.get(timeout_arg, default)
+
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                dependency = get_dependency_registry().get(name, **options)
+                async with dependency.guard_async(is_failure, wait_timeout(args, kwargs)):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            dependency = get_dependency_registry().get(name, **options)
+            with dependency.guard(is_failure, wait_timeout(args, kwargs)):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def is_server_failure(error: BaseException) -> bool:
+    """
+    is_failure predicate: HTTP 4xx responses (other than 429) mean the
+    dependency is healthy and rejected the request, so they do not count.
+    """
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return not (isinstance(status, int) and 400 <= status < 500 and status != 429)
+
+
+def guarded_httpx_transport(name: Union[str, Callable[[Any], str]], **transport_options: Any):
+    """
+    httpx.AsyncBaseTransport running every request under a dependency.
+
+    Responses with status 429 or >= 500 count as failures (the response is
+    still returned to the caller).
+
+    Args:
+        name: Dependency name, or a callable mapping the httpx.Request to one
+            (e.g. per host)
+        **transport_options: httpx.AsyncHTTPTransport arguments
+
+    Example:
+        client = httpx.AsyncClient(
+            transport=guarded_httpx_transport(lambda r: f"carrier:{r.url.host}")
+        )
+    """
+    import httpx
+
+    name_for = name if callable(name) else (lambda request: name)
+
+    class _GuardedTransport(httpx.AsyncBaseTransport):
+        def __init__(self):
+            self._inner = httpx.AsyncHTTPTransport(**transport_options)
+
+        async def handle_async_request(self, request):
+            dependency = get_dependency_registry().get(name_for(request))
+            wait_timeout = request.extensions.get("timeout", {}).get("read")
+            async with dependency.guard_async(wait_timeout=wait_timeout) as call:
+                response = await self._inner.handle_async_request(request)
+                if response.status_code == 429 or response.status_code >= 500:
+                    call.mark_failure()
+                return response
+
+        async def aclose(self):
+            await self._inner.aclose()
+
+    return _GuardedTransport()
@@ -4,7 +4,7 @@ Faiston SGA Agent Hooks
 HookProvider implementations for Strands Agents:
 - LoggingHook: Structured logging for all agent events
 - MetricsHook: CloudWatch metrics emission
-- GuardrailsHook: Shadow mode content moderation
+- GuardrailsHook: Shadow mode content moderation (async, cached verdicts)
 - DebugHook: Intelligent error analysis via Debug Agent (ADR-003)
 
 Usage:
@@ -16,7 +16,7 @@ Usage:
 """
 from .logging_hook import LoggingHook
 from .metrics_hook import MetricsHook
-from .guardrails_hook import GuardrailsHook
+from .guardrails_hook import GuardrailsHook, GuardrailViolationError
 from .debug_hook import DebugHook
 
-__all__ = ["LoggingHook", "MetricsHook", "GuardrailsHook", "DebugHook"]
+__all__ = ["LoggingHook", "MetricsHook", "GuardrailsHook", "GuardrailViolationError", "DebugHook"]
@@ -4,17 +4,25 @@
 # Intercepts errors from agent tool calls and sends them to Debug Agent
 # for intelligent analysis and enrichment.
 #
-# NON-BLOCKING: Uses circuit breaker and timeout to ensure agent execution
-# is not degraded if Debug Agent is unavailable.
+# NON-BLOCKING: Enrichment is queued to a bounded background worker (shared
+# by all DebugHook instances in the container), deduplicated per error
+# signature and rate limited. Results are published to the audit log (Agent
+# Room) for the session. Only tools listed in DEBUG_HOOK_SYNC_TOOLS are
+# enriched inline, with circuit breaker and timeout as before.
 #
 # Reference: https://strandsagents.com/latest/documentation/docs/user-guide/concepts/agents/hooks/
 # =============================================================================
 
 import asyncio
+import hashlib
 import logging
 import os
+import re
+import threading
+import time
+from collections import deque
 from datetime import datetime
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from strands.hooks import HookProvider, HookRegistry
 from strands.hooks.events import (
@@ -22,10 +30,27 @@ from strands.hooks.events import (
     AfterInvocationEvent,
 )
 
+from shared.background_work import BackgroundWorkQueue
 from shared.circuit_breaker import CircuitBreaker, CircuitState
 
 logger = logging.getLogger(__name__)
 
+# Enrichment state shared by all hook instances (agents may be created per
+# request, so per-instance state would neither bound nor deduplicate)
+_enrichment_queue = BackgroundWorkQueue(
+    name="debug-enrichment",
+    concurrency=int(os.environ.get("DEBUG_HOOK_WORKERS", "2")),
+    max_pending=int(os.environ.get("DEBUG_HOOK_MAX_PENDING", "100")),
+    max_attempts=1,  # Circuit breaker already handles Debug Agent failures
+)
+_signatures_seen: Dict[str, float] = {}
+_recent_enrichments: deque = deque()
+_gate_lock = threading.Lock()
+_gate_stats = {"duplicates": 0, "rate_limited": 0, "published": 0}
+
+# Volatile parts of error messages (ids, numbers, quoted values)
+_VOLATILE_PATTERN = re.compile(r"'[^']*'|\"[^\"]*\"|0x[0-9a-f]+|[0-9a-f]{8,}|\d+", re.IGNORECASE)
+
 
 class DebugHook(HookProvider):
     """
@@ -53,6 +78,10 @@ class DebugHook(HookProvider):
         DEBUG_HOOK_TIMEOUT: Timeout in seconds (default: 5.0)
         DEBUG_CIRCUIT_THRESHOLD: Failures before opening circuit (default: 3)
         DEBUG_CIRCUIT_RESET: Reset timeout in seconds (default: 60.0)
+        DEBUG_HOOK_SYNC_TOOLS: Comma-separated tools enriched inline (default: none)
+        DEBUG_HOOK_DEDUP_SECONDS: Window for skipping a repeated error signature (default: 300)
+        DEBUG_HOOK_RATE_PER_MINUTE: Max background enrichments per minute (default: 30)
+        DEBUG_HOOK_WORKERS / DEBUG_HOOK_MAX_PENDING: Worker pool and backlog (default: 2 / 100)
     """
 
     def __init__(
@@ -61,6 +90,9 @@ class DebugHook(HookProvider):
         enabled: bool = True,
         failure_threshold: int = 3,
         reset_timeout: float = 60.0,
+        sync_tools: Optional[List[str]] = None,
+        dedup_seconds: float = 300.0,
+        rate_per_minute: int = 30,
     ):
         """
         Initialize DebugHook.
@@ -70,6 +102,9 @@ class DebugHook(HookProvider):
             enabled: Whether hook is active (default: True)
             failure_threshold: Failures before circuit opens (default: 3)
             reset_timeout: Seconds before circuit resets (default: 60.0)
+            sync_tools: Tools whose errors are enriched inline (default: none)
+            dedup_seconds: Skip a repeated error signature within this window
+            rate_per_minute: Max background enrichments per minute
         """
         # Configuration from environment or parameters
         self.timeout = float(os.environ.get("DEBUG_HOOK_TIMEOUT", timeout_seconds))
@@ -84,6 +119,14 @@ class DebugHook(HookProvider):
             name="debug_hook",
         )
 
+        # Background enrichment (sync only for explicitly configured tools)
+        env_sync_tools = os.environ.get("DEBUG_HOOK_SYNC_TOOLS")
+        if env_sync_tools is not None:
+            sync_tools = [t.strip() for t in env_sync_tools.split(",") if t.strip()]
+        self.sync_tools = set(sync_tools or [])
+        self.dedup_seconds = float(os.environ.get("DEBUG_HOOK_DEDUP_SECONDS", dedup_seconds))
+        self.rate_per_minute = int(os.environ.get("DEBUG_HOOK_RATE_PER_MINUTE", rate_per_minute))
+
         # Lazy-loaded A2A client (avoid import at startup)
         self._a2a_client = None
 
@@ -107,7 +150,8 @@ class DebugHook(HookProvider):
         Called after every tool call completes. Only processes events
         that have an error attached.
         """
-        error = getattr(event, "error", None)
+        # Strands sets "exception"; "error" kept for custom events
+        error = getattr(event, "error", None) or getattr(event, "exception", None)
         if error is None:
             return  # No error, nothing to do
 
@@ -120,11 +164,16 @@ class DebugHook(HookProvider):
             logger.debug("[DebugHook] Circuit open, skipping error enrichment")
             return
 
-        # Enrich the error
-        await self._enrich_error(
+        tool_use = getattr(event, "tool_use", None) or {}
+        operation = getattr(event, "tool_name", None) or tool_use.get("name", "unknown_tool")
+        invocation_state = getattr(event, "invocation_state", None) or {}
+        session_id = invocation_state.get("session_id")
+
+        await self._dispatch(
             error=error,
-            operation=getattr(event, "tool_name", "unknown_tool"),
+            operation=operation,
             event_type="tool_call",
+            context={"session_id": session_id} if session_id else None,
         )
 
     async def _on_invocation_end(self, event: AfterInvocationEvent) -> None:
@@ -154,8 +203,8 @@ class DebugHook(HookProvider):
 
                 error_msg = response.get("error", response.get("message", "Unknown error"))
 
-                # Enrich the soft error
-                enrichment = await self._enrich_error(
+                # Enrich the soft error (attached to the response only in sync mode)
+                enrichment = await self._dispatch(
                     error=Exception(str(error_msg)),
                     operation=response.get("action", response.get("operation", "unknown")),
                     event_type="soft_error",
@@ -172,7 +221,7 @@ class DebugHook(HookProvider):
 
             # Check if response contains error_context (our standard error pattern)
             if response.get("error_context"):
-                await self._enrich_error(
+                await self._dispatch(
                     error=Exception(response.get("error", "Unknown error")),
                     operation=response.get("error_context", {}).get("operation", "unknown"),
                     event_type="invocation",
@@ -185,13 +234,118 @@ class DebugHook(HookProvider):
         error_indicators = ["error", "exception", "failed", "timeout"]
         if any(indicator in str(stop_reason).lower() for indicator in error_indicators):
             if isinstance(response, dict) and response.get("error_context"):
-                await self._enrich_error(
+                await self._dispatch(
                     error=Exception(response.get("error", "Unknown error")),
                     operation=response.get("error_context", {}).get("operation", "unknown"),
                     event_type="invocation",
                     context=response.get("error_context"),
                 )
 
+    # =========================================================================
+    # Background Dispatch
+    # =========================================================================
+
+    @staticmethod
+    def _signature(error: Exception, operation: str) -> str:
+        """Error signature: type + operation + message without volatile parts."""
+        message = _VOLATILE_PATTERN.sub("#", str(error))[:200]
+        raw = f"{type(error).__name__}|{operation}|{message}"
+        return hashlib.sha1(raw.encode("utf-8", "replace")).hexdigest()[:16]
+
+    def _admit(self, signature: str) -> Optional[str]:
+        """None if the enrichment may be queued, else the reason to skip it."""
+        now = time.monotonic()
+        with _gate_lock:
+            seen_at = _signatures_seen.get(signature)
+            if seen_at is not None and now - seen_at < self.dedup_seconds:
+                _gate_stats["duplicates"] += 1
+                return "duplicate"
+
+            while _recent_enrichments and now - _recent_enrichments[0] >= 60:
+                _recent_enrichments.popleft()
+            if len(_recent_enrichments) >= self.rate_per_minute:
+                _gate_stats["rate_limited"] += 1
+                return "rate_limited"
+
+            _recent_enrichments.append(now)
+            _signatures_seen[signature] = now
+            # Bound the signature map
+            if len(_signatures_seen) > 1000:
+                for key in [k for k, t in _signatures_seen.items() if now - t >= self.dedup_seconds]:
+                    del _signatures_seen[key]
+        return None
+
+    async def _dispatch(
+        self,
+        error: Exception,
+        operation: str,
+        event_type: str,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Enrich inline for sync tools, otherwise queue in the background.
+
+        Returns:
+            Enrichment result (sync) or {"enriched": False, "reason": "queued"
+            | "duplicate" | "rate_limited" | "queue_full"}
+        """
+        if operation in self.sync_tools:
+            return await self._enrich_error(error, operation, event_type, context)
+
+        signature = self._signature(error, operation)
+        reason = self._admit(signature)
+        if reason:
+            logger.debug(f"[DebugHook] Skipping enrichment ({reason}): {signature}")
+            return {"enriched": False, "reason": reason}
+
+        queued = _enrichment_queue.submit(
+            f"debug:{operation}",
+            lambda: self._enrich_and_publish(error, operation, event_type, context, signature),
+        )
+        return {"enriched": False, "reason": "queued" if queued else "queue_full"}
+
+    async def _enrich_and_publish(
+        self,
+        error: Exception,
+        operation: str,
+        event_type: str,
+        context: Optional[Dict[str, Any]],
+        signature: str,
+    ) -> None:
+        """Background job: enrich, then attach the analysis to the session audit log."""
+        enrichment = await self._enrich_error(error, operation, event_type, context)
+        if not enrichment.get("enriched"):
+            return
+
+        from shared.audit_emitter import emit_agent_event
+
+        published = await asyncio.to_thread(
+            emit_agent_event,
+            "debug",
+            "erro",
+            f"Analisei o erro em {operation}: {type(error).__name__}",
+            (context or {}).get("session_id"),
+            {
+                "operation": operation,
+                "event_type": event_type,
+                "error_signature": signature,
+                "source_agent": os.environ.get("AGENT_ID", "unknown"),
+                "debug_analysis": enrichment.get("analysis", {}),
+            },
+        )
+        if published:
+            with _gate_lock:
+                _gate_stats["published"] += 1
+
+    async def flush(self, timeout: float = 10.0) -> bool:
+        """Wait for queued enrichments (tests and shutdown)."""
+        return await _enrichment_queue.join(timeout)
+
+    def get_enrichment_stats(self) -> Dict[str, Any]:
+        """Background queue counters plus dedup/rate-limit skips."""
+        with _gate_lock:
+            return {**_enrichment_queue.get_stats(), **_gate_stats}
+
     async def _enrich_error(
         self,
         error: Exception,
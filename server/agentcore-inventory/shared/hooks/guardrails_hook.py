@@ -3,21 +3,84 @@
 # =============================================================================
 # Implements content moderation in shadow mode (monitor without blocking).
 #
+# NON-BLOCKING: In shadow mode, ApplyGuardrail runs in a bounded background
+# pool, so agent turns never wait on it. In enforce mode, the input check
+# starts when the user message is added to the conversation (MessageAdded)
+# and is only awaited before the next model call.
+#
+# BeforeInvocation cannot be used for input: it fires before Strands appends
+# the prompt, so agent.messages[-1] is the previous turn's reply (or nothing).
+#
+# Verdicts are cached by content hash (TTL), and long content is split into
+# chunks evaluated in parallel.
+#
+# Configuration via environment variables:
+#   GUARDRAILS_WORKERS          ApplyGuardrail threads (default: 4)
+#   GUARDRAILS_MAX_PENDING      queued shadow evaluations before dropping (default: 100)
+#   GUARDRAILS_CACHE_TTL        verdict cache TTL in seconds (default: 300)
+#   GUARDRAILS_CACHE_SIZE       cached verdicts (default: 1000)
+#   GUARDRAILS_CHUNK_CHARS      max characters per ApplyGuardrail call (default: 5000)
+#
 # Reference: https://strandsagents.com/latest/documentation/docs/user-guide/safety-security/guardrails/
 # =============================================================================
 
+import asyncio
+import hashlib
 import logging
-from typing import Optional
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
 from strands.hooks import HookProvider, HookRegistry
 from strands.hooks.events import (
     BeforeInvocationEvent,
     AfterInvocationEvent,
     BeforeModelCallEvent,
+    MessageAddedEvent,
 )
 
 logger = logging.getLogger(__name__)
 
+GUARDRAILS_WORKERS = int(os.environ.get("GUARDRAILS_WORKERS", "4"))
+GUARDRAILS_MAX_PENDING = int(os.environ.get("GUARDRAILS_MAX_PENDING", "100"))
+GUARDRAILS_CACHE_TTL = float(os.environ.get("GUARDRAILS_CACHE_TTL", "300"))
+GUARDRAILS_CACHE_SIZE = int(os.environ.get("GUARDRAILS_CACHE_SIZE", "1000"))
+GUARDRAILS_CHUNK_CHARS = int(os.environ.get("GUARDRAILS_CHUNK_CHARS", "5000"))
+
+# Latency samples kept for percentiles
+LATENCY_SAMPLES = 1000
+
+# Shared by all hook instances: evaluations (shadow + enforce) and chunk calls.
+# Separate pools so an evaluation waiting on its chunks never starves them.
+_evaluation_executor: Optional[ThreadPoolExecutor] = None
+_chunk_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executors() -> tuple:
+    global _evaluation_executor, _chunk_executor
+    with _executor_lock:
+        if _evaluation_executor is None:
+            _evaluation_executor = ThreadPoolExecutor(
+                max_workers=GUARDRAILS_WORKERS, thread_name_prefix="guardrails"
+            )
+            _chunk_executor = ThreadPoolExecutor(
+                max_workers=GUARDRAILS_WORKERS, thread_name_prefix="guardrails-chunk"
+            )
+        return _evaluation_executor, _chunk_executor
+
+
+class GuardrailViolationError(Exception):
+    """Raised in enforce mode when a guardrail intervenes."""
+
+    def __init__(self, source: str, assessments: List[Dict[str, Any]]):
+        super().__init__(f"Conteúdo bloqueado pelo guardrail ({source})")
+        self.source = source
+        self.assessments = assessments
+
 
 class GuardrailsHook(HookProvider):
     """
@@ -31,6 +94,10 @@ class GuardrailsHook(HookProvider):
     - Collect data to tune guardrail policies
     - Gradual rollout of content moderation
 
+    In enforce mode (shadow_mode=False), violations raise
+    GuardrailViolationError: user input before the model is called with
+    it, output at the end of the invocation.
+
     Usage:
         agent = Agent(hooks=[GuardrailsHook(guardrail_id="abc123")])
     """
@@ -40,6 +107,9 @@ class GuardrailsHook(HookProvider):
         guardrail_id: Optional[str] = None,
         guardrail_version: str = "DRAFT",
         shadow_mode: bool = True,
+        cache_ttl: float = GUARDRAILS_CACHE_TTL,
+        chunk_chars: int = GUARDRAILS_CHUNK_CHARS,
+        max_pending: int = GUARDRAILS_MAX_PENDING,
     ):
         """
         Initialize GuardrailsHook.
@@ -48,12 +118,35 @@ class GuardrailsHook(HookProvider):
             guardrail_id: AWS Bedrock Guardrail ID (None to skip)
             guardrail_version: Guardrail version (default: DRAFT)
             shadow_mode: If True, monitor only; if False, block violations
+            cache_ttl: Seconds a verdict is reused for identical content
+            chunk_chars: Max characters per ApplyGuardrail call
+            max_pending: Queued shadow evaluations before new ones are dropped
         """
         self.guardrail_id = guardrail_id
         self.guardrail_version = guardrail_version
         self.shadow_mode = shadow_mode
+        self.cache_ttl = cache_ttl
+        self.chunk_chars = max(1, chunk_chars)
+        self.max_pending = max_pending
         self._bedrock_client = None
 
+        # content hash -> (expires_at, safe, assessments)
+        self._verdicts: "OrderedDict[str, tuple]" = OrderedDict()
+        self._pending = 0
+        # (future or None if dropped, content) per user message not yet checked
+        self._pending_input: List[tuple] = []
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "evaluations": 0,
+            "cache_hits": 0,
+            "chunks": 0,
+            "interventions": 0,
+            "errors": 0,
+            "dropped": 0,
+        }
+        self._latencies_ms: deque = deque(maxlen=LATENCY_SAMPLES)
+
     def _get_bedrock_client(self):
         """Lazy load Bedrock client."""
         if self._bedrock_client is None and self.guardrail_id:
@@ -69,9 +162,110 @@ class GuardrailsHook(HookProvider):
 
     def register_hooks(self, registry: HookRegistry) -> None:
         """Register callbacks for content evaluation."""
-        registry.add_callback(BeforeInvocationEvent, self._evaluate_input)
+        registry.add_callback(BeforeInvocationEvent, self._reset_input)
+        registry.add_callback(MessageAddedEvent, self._evaluate_input)
+        registry.add_callback(BeforeModelCallEvent, self._check_input)
         registry.add_callback(AfterInvocationEvent, self._evaluate_output)
 
+    # =========================================================================
+    # Evaluation
+    # =========================================================================
+
+    def _cache_key(self, content: str, source: str) -> str:
+        digest = hashlib.sha256(content.encode("utf-8", "replace")).hexdigest()
+        return f"{self.guardrail_id}:{self.guardrail_version}:{source}:{digest}"
+
+    def _cached_verdict(self, key: str) -> Optional[tuple]:
+        with self._lock:
+            entry = self._verdicts.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                del self._verdicts[key]
+                return None
+            self._verdicts.move_to_end(key)
+            self._stats["cache_hits"] += 1
+            return entry[1], entry[2]
+
+    def _store_verdict(self, key: str, safe: bool, assessments: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._verdicts[key] = (time.monotonic() + self.cache_ttl, safe, assessments)
+            self._verdicts.move_to_end(key)
+            while len(self._verdicts) > GUARDRAILS_CACHE_SIZE:
+                self._verdicts.popitem(last=False)
+
+    def _chunks(self, content: str) -> List[str]:
+        return [
+            content[i:i + self.chunk_chars]
+            for i in range(0, len(content), self.chunk_chars)
+        ]
+
+    def _apply_guardrail(self, client, chunk: str, source: str) -> Dict[str, Any]:
+        return client.apply_guardrail(
+            guardrailIdentifier=self.guardrail_id,
+            guardrailVersion=self.guardrail_version,
+            source=source,
+            content=[{"text": {"text": chunk}}],
+        )
+
+    def _assess(self, content: str, source: str) -> tuple:
+        """
+        Evaluate content (cached, chunked) without logging the verdict.
+
+        Returns:
+            (safe, assessments) - fails open on errors
+        """
+        if not self.guardrail_id or not content:
+            return True, []
+
+        key = self._cache_key(content, source)
+        cached = self._cached_verdict(key)
+        if cached is not None:
+            return cached
+
+        client = self._get_bedrock_client()
+        if not client:
+            return True, []
+
+        started = time.perf_counter()
+        chunks = self._chunks(content)
+        try:
+            if len(chunks) == 1:
+                responses = [self._apply_guardrail(client, chunks[0], source)]
+            else:
+                _, chunk_executor = _get_executors()
+                futures = [
+                    chunk_executor.submit(self._apply_guardrail, client, chunk, source)
+                    for chunk in chunks
+                ]
+                responses = [f.result() for f in futures]
+        except Exception as e:
+            with self._lock:
+                self._stats["errors"] += 1
+            logger.warning(f"[GuardrailsHook] Evaluation failed: {e}")
+            # Fail open - allow content if guardrail evaluation fails
+            return True, []
+
+        assessments = []
+        safe = True
+        for response in responses:
+            if response.get("action", "NONE") == "GUARDRAIL_INTERVENED":
+                safe = False
+                assessments.extend(response.get("assessments", []))
+
+        latency_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            self._stats["evaluations"] += 1
+            self._stats["chunks"] += len(chunks)
+            self._latencies_ms.append(latency_ms)
+        logger.debug(
+            f"[GuardrailsHook] {source} evaluated in {latency_ms:.1f}ms "
+            f"({len(chunks)} chunks, {len(content)} chars)"
+        )
+
+        self._store_verdict(key, safe, assessments)
+        return safe, assessments
+
     def _evaluate_content(self, content: str, source: str = "INPUT") -> bool:
         """
         Evaluate content against guardrails.
@@ -83,57 +277,125 @@ class GuardrailsHook(HookProvider):
         Returns:
             True if content is safe, False if violation detected
         """
-        if not self.guardrail_id or not content:
+        safe, assessments = self._assess(content, source)
+        if safe:
             return True
 
-        client = self._get_bedrock_client()
-        if not client:
-            return True
+        with self._lock:
+            self._stats["interventions"] += 1
+        logger.warning(
+            f"[GuardrailsHook] {'WOULD BLOCK' if self.shadow_mode else 'BLOCKED'} "
+            f"- {source}: {assessments}"
+        )
 
-        try:
-            response = client.apply_guardrail(
-                guardrailIdentifier=self.guardrail_id,
-                guardrailVersion=self.guardrail_version,
-                source=source,
-                content=[{"text": {"text": content}}],
-            )
+        # In shadow mode, allow but log
+        # In enforce mode, return False to block
+        return self.shadow_mode
 
-            action = response.get("action", "NONE")
+    def _submit(self, content: str, source: str) -> Optional[Future]:
+        """Queue an evaluation; None (dropped) if max_pending is reached."""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._stats["dropped"] += 1
+                return None
+            self._pending += 1
 
-            if action == "GUARDRAIL_INTERVENED":
-                # Log the intervention
-                assessments = response.get("assessments", [])
-                logger.warning(
-                    f"[GuardrailsHook] {'WOULD BLOCK' if self.shadow_mode else 'BLOCKED'} "
-                    f"- {source}: {assessments}"
-                )
+        def run() -> bool:
+            try:
+                return self._evaluate_content(content, source)
+            finally:
+                with self._lock:
+                    self._pending -= 1
 
-                # In shadow mode, allow but log
-                # In enforce mode, return False to block
-                return self.shadow_mode
+        evaluation_executor, _ = _get_executors()
+        return evaluation_executor.submit(run)
 
-            return True
+    def _raise_violation(self, content: str, source: str) -> None:
+        _, assessments = self._assess(content, source)  # cached by now
+        raise GuardrailViolationError(source, assessments)
 
-        except Exception as e:
-            logger.warning(f"[GuardrailsHook] Evaluation failed: {e}")
-            # Fail open - allow content if guardrail evaluation fails
-            return True
+    # =========================================================================
+    # Hook Callbacks
+    # =========================================================================
+
+    @staticmethod
+    def _message_text(message: Any) -> str:
+        """Text of a str message or a Strands message (content blocks)."""
+        if isinstance(message, str):
+            return message
+        content = message.get("content", "") if isinstance(message, dict) else ""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return "\n".join(
+                block["text"] for block in content
+                if isinstance(block, dict) and isinstance(block.get("text"), str)
+            )
+        return ""
 
-    def _evaluate_input(self, event: BeforeInvocationEvent) -> None:
-        """Evaluate user input against guardrails."""
-        # Get the latest user message
-        messages = getattr(event.agent, "messages", [])
-        if messages:
-            last_message = messages[-1]
-            content = last_message.get("content", "")
-            if isinstance(content, str):
-                self._evaluate_content(content, "INPUT")
-
-    def _evaluate_output(self, event: AfterInvocationEvent) -> None:
+    def _reset_input(self, event: BeforeInvocationEvent) -> None:
+        """Drop checks left over by an invocation that raised."""
+        self._pending_input = []
+
+    def _evaluate_input(self, event: MessageAddedEvent) -> None:
+        """Start evaluating a user message against guardrails."""
+        message = event.message
+        if not self.guardrail_id or message.get("role") != "user":
+            return
+        # Tool results are user messages without text blocks - skipped
+        content = self._message_text(message)
+        if not content:
+            return
+
+        future = self._submit(content, "INPUT")
+        if not self.shadow_mode:
+            # Awaited in _check_input, before the next model call. A dropped
+            # submission (future None) is evaluated there instead - enforce
+            # mode never skips the check.
+            self._pending_input.append((future, content))
+
+    async def _check_input(self, event: BeforeModelCallEvent) -> None:
+        """Enforce mode: wait for the input verdicts before calling the model."""
+        pending, self._pending_input = self._pending_input, []
+        for future, content in pending:
+            if future is None:
+                safe = await asyncio.to_thread(self._evaluate_content, content, "INPUT")
+            else:
+                safe = await asyncio.wrap_future(future)
+            if not safe:
+                self._raise_violation(content, "INPUT")
+
+    async def _evaluate_output(self, event: AfterInvocationEvent) -> None:
         """Evaluate agent output against guardrails."""
         # Get the result message
         result = getattr(event, "result", None)
-        if result:
-            message = getattr(result, "message", "")
-            if message:
-                self._evaluate_content(message, "OUTPUT")
+        if not result or not self.guardrail_id:
+            return
+        content = self._message_text(getattr(result, "message", ""))
+        if not content:
+            return
+
+        if self.shadow_mode:
+            self._submit(content, "OUTPUT")
+            return
+
+        safe = await asyncio.to_thread(self._evaluate_content, content, "OUTPUT")
+        if not safe:
+            self._raise_violation(content, "OUTPUT")
+
+    # =========================================================================
+    # Metrics
+    # =========================================================================
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Evaluation counters and latency percentiles (ms)."""
+        with self._lock:
+            stats = dict(self._stats, pending=self._pending)
+            latencies = sorted(self._latencies_ms)
+        if latencies:
+            stats["latency_ms"] = {
+                "p50": round(latencies[len(latencies) // 2], 1),
+                "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 1),
+                "max": round(latencies[-1], 1),
+            }
+        return stats
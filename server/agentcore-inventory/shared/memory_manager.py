@@ -65,6 +65,9 @@ NS_FACTS = "/facts/{actorId}"           # SemanticStrategy
 NS_EPISODES = "/episodes/{actorId}"     # EpisodicStrategy
 NS_GLOBAL = "/strategy/import/company"  # Global (all agents)
 
+# Fatos agrupados por evento em learn_facts (um CreateEvent por lote)
+FACTS_PER_EVENT = int(os.environ.get("MEMORY_FACTS_PER_EVENT", "25"))
+
 
 # ============================================================================
 # MEMORY CLIENT SINGLETON
@@ -410,6 +413,55 @@ class AgentMemoryManager:
             **extra_metadata,
         )
 
+    @trace_memory_operation("learn_facts")
+    async def learn_facts(
+        self,
+        facts: List[str],
+        category: str,
+        emotional_weight: float = 0.8,
+        confidence: float = 0.9,
+        session_id: Optional[str] = None,
+        use_global: bool = True,
+        **extra_metadata,
+    ) -> List[Optional[str]]:
+        """
+        LEARN: Gravar varios FATOS (HIL) em lote.
+
+        Each event carries up to FACTS_PER_EVENT facts (one per line in
+        content, plus the list in "facts"), so N column mappings cost
+        ceil(N / FACTS_PER_EVENT) CreateEvent calls instead of N.
+        SemanticStrategy extracts each line as a separate fact.
+
+        Args:
+            facts: Fatos confirmados
+            category: Categoria (column_mapping, ...)
+            emotional_weight: Peso Hebbian
+            confidence: Nivel de confianca
+            session_id: ID da sessao
+            use_global: Se True, armazena no namespace global
+
+        Returns:
+            Event ID (or None if failed) per batch
+        """
+        event_ids: List[Optional[str]] = []
+        for start in range(0, len(facts), FACTS_PER_EVENT):
+            batch = facts[start:start + FACTS_PER_EVENT]
+            event_ids.append(await self.learn(
+                content="\n".join(batch),
+                category=category,
+                origin_type=MemoryOriginType.FACT,
+                source_type=MemorySourceType.HUMAN_HIL,
+                emotional_weight=emotional_weight,
+                confidence=confidence,
+                session_id=session_id,
+                event_type="import_pattern",
+                use_global=use_global,
+                facts=batch,
+                facts_count=len(batch),
+                **extra_metadata,
+            ))
+        return event_ids
+
     @trace_memory_operation("learn_inference")
     async def learn_inference(
         self,
@@ -9,10 +9,12 @@
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, Any, Optional
 
 from strands import tool
 
+from tools.column_profiler import ColumnProfile, classify_value, profile_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -132,11 +134,7 @@ def analyze_csv(
     row_count = len(data_rows)
 
     # Analyze columns
-    columns = []
-    for i, header in enumerate(headers):
-        col_values = [row[i] if i < len(row) else None for row in data_rows]
-        col_info = _analyze_column(header, col_values, sample_rows)
-        columns.append(col_info)
+    columns = [_column_info(p) for p in profile_rows(data_rows, headers, sample_rows)]
 
     # Calculate overall confidence
     confidences = [c["confidence"] for c in columns]
@@ -220,11 +218,7 @@ def analyze_xlsx(
         row_count = len(data_rows)
 
         # Analyze columns
-        columns = []
-        for i, header in enumerate(headers):
-            col_values = [row[i] if i < len(row) else None for row in data_rows]
-            col_info = _analyze_column(header, col_values, sample_rows)
-            columns.append(col_info)
+        columns = [_column_info(p) for p in profile_rows(data_rows, headers, sample_rows)]
 
         # Calculate confidence
         confidences = [c["confidence"] for c in columns]
@@ -420,114 +414,21 @@ def _detect_csv_delimiter(text: str) -> str:
         return max(counts, key=counts.get)
 
 
-def _analyze_column(
-    name: str,
-    values: List[Any],
-    sample_rows: int,
-) -> Dict[str, Any]:
-    """Analyze a single column's type and statistics."""
-    # Filter non-null values
-    non_null = [v for v in values if v is not None and str(v).strip()]
-    null_count = len(values) - len(non_null)
-
-    # Get sample values
-    samples = [str(v) for v in non_null[:sample_rows]]
-
-    # Infer type
-    inferred_type = _infer_column_type(non_null)
-
-    # Calculate confidence based on type consistency
-    if non_null:
-        type_matches = sum(1 for v in non_null if _matches_type(v, inferred_type))
-        confidence = type_matches / len(non_null)
-    else:
-        confidence = 0.0
-
+def _column_info(profile: ColumnProfile) -> Dict[str, Any]:
+    """Column info dict of a ColumnProfile."""
     return {
-        "name": name,
-        "inferred_type": inferred_type,
-        "sample_values": samples,
-        "null_count": null_count,
-        "unique_count": len(set(str(v) for v in non_null)),
-        "confidence": round(confidence, 2),
+        "name": profile.name,
+        "inferred_type": profile.inferred_type,
+        "sample_values": profile.sample_values,
+        "null_count": profile.null_count,
+        "unique_count": profile.unique_count,
+        "confidence": round(profile.type_confidence, 2),
     }
 
 
-def _infer_column_type(values: List[Any]) -> str:
-    """Infer the data type of a column."""
-    if not values:
-        return "unknown"
-
-    # Sample for type detection
-    sample = values[:100]
-
-    # Count type matches
-    type_counts = {"integer": 0, "decimal": 0, "date": 0, "string": 0}
-
-    for v in sample:
-        str_val = str(v).strip()
-        if _is_integer(str_val):
-            type_counts["integer"] += 1
-        elif _is_decimal(str_val):
-            type_counts["decimal"] += 1
-        elif _is_date(str_val):
-            type_counts["date"] += 1
-        else:
-            type_counts["string"] += 1
-
-    return max(type_counts, key=type_counts.get)
-
-
 def _infer_type(value: Optional[str]) -> str:
     """Infer type of a single value."""
-    if value is None:
+    value_class = classify_value(value)
+    if value_class is None:
         return "unknown"
-    if _is_integer(value):
-        return "integer"
-    if _is_decimal(value):
-        return "decimal"
-    if _is_date(value):
-        return "date"
-    return "string"
-
-
-def _is_integer(val: str) -> bool:
-    """Check if value is integer."""
-    try:
-        int(val.replace(",", "").replace(".", ""))
-        return "." not in val and "," not in val
-    except (ValueError, AttributeError):
-        return False
-
-
-def _is_decimal(val: str) -> bool:
-    """Check if value is decimal."""
-    try:
-        float(val.replace(",", "."))
-        return True
-    except (ValueError, AttributeError):
-        return False
-
-
-def _is_date(val: str) -> bool:
-    """Check if value looks like a date."""
-    import re
-
-    date_patterns = [
-        r"\d{4}-\d{2}-\d{2}",  # ISO
-        r"\d{2}/\d{2}/\d{4}",  # DD/MM/YYYY or MM/DD/YYYY
-        r"\d{2}-\d{2}-\d{4}",  # DD-MM-YYYY
-    ]
-    return any(re.match(p, str(val)) for p in date_patterns)
-
-
-def _matches_type(value: Any, expected_type: str) -> bool:
-    """Check if value matches expected type."""
-    str_val = str(value).strip()
-    if expected_type == "integer":
-        return _is_integer(str_val)
-    if expected_type == "decimal":
-        return _is_decimal(str_val)
-    if expected_type == "date":
-        return _is_date(str_val)
-    return True  # String matches everything
+    return "string" if value_class == "text" else value_class
@@ -1,4 +1,10 @@
 """Pytest configuration and fixtures for AgentCore tests."""
+import importlib
+import sys
+import threading
+from pathlib import Path
+from types import ModuleType
+
 import pytest
 from unittest.mock import MagicMock, patch
 from datetime import datetime, timedelta
@@ -130,3 +136,216 @@ def reset_environment():
     yield
     os.environ.clear()
     os.environ.update(original_env)
+
+
+@pytest.fixture
+def specialist_tools():
+    """
+    Import a specialist's tool module without running the package __init__
+    files (they import the agent runtime, which is not importable in tests).
+
+    Usage:
+        transfer = specialist_tools("estoque_control", "transfer")
+    """
+    specialists = Path(__file__).resolve().parents[1] / "agents" / "specialists"
+
+    def load(agent: str, module: str):
+        package = f"agents.specialists.{agent}"
+        for name, path in ((package, specialists / agent), (f"{package}.tools", specialists / agent / "tools")):
+            if name not in sys.modules:
+                bare = ModuleType(name)
+                bare.__path__ = [str(path)]
+                sys.modules[name] = bare
+        return importlib.import_module(f"{package}.tools.{module}")
+
+    return load
+
+
+# =============================================================================
+# In-memory Inventory Table
+# =============================================================================
+
+class FakeTableError(Exception):
+    """botocore ClientError look-alike (response["Error"]["Code"])."""
+
+    def __init__(self, code, cancellation_reasons=None):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+        if cancellation_reasons is not None:
+            self.response["CancellationReasons"] = [{"Code": r} for r in cancellation_reasons]
+
+
+class FakeInventoryTable:
+    """
+    In-memory stand-in for the inventory table (PK/SK single table).
+
+    Serves the Table calls of SGADynamoDBClient (get/put/update/query),
+    the batch calls of its bulk I/O and transact_write_items (meta.client).
+    Understands the expressions the client builds: SET/ADD updates,
+    begins_with key conditions, equality filters and conditions made of
+    attribute_exists() / equality clauses joined by AND. Queries return
+    at most page_size items per page. The next transaction_conflicts
+    transactions are cancelled with TransactionConflict.
+    """
+
+    def __init__(self, table_name, page_size=1000):
+        self.table_name = table_name
+        self.page_size = page_size
+        self.items = {}
+        self.calls = []
+        self.transaction_conflicts = 0
+        self._conflicts_lock = threading.Lock()
+        self.meta = type("Meta", (), {"client": self})()
+
+    # -- expressions ---------------------------------------------------------
+
+    @staticmethod
+    def _resolve(token, names, values):
+        token = token.strip()
+        if token.startswith(":"):
+            return values[token]
+        return names.get(token, token)
+
+    def _check(self, item, expression, names, values):
+        for clause in expression.split(" AND "):
+            clause = clause.strip()
+            if clause.startswith("attribute_exists("):
+                ok = item is not None and self._resolve(clause[17:-1], names, values) in item
+            elif clause.startswith("attribute_not_exists("):
+                ok = item is None or self._resolve(clause[21:-1], names, values) not in item
+            elif clause.startswith("begins_with("):
+                attr, prefix = clause[12:-1].split(",")
+                value = (item or {}).get(self._resolve(attr, names, values), "")
+                ok = str(value).startswith(self._resolve(prefix, names, values))
+            else:
+                attr, expected = clause.split("=")
+                ok = (item or {}).get(self._resolve(attr, names, values)) == self._resolve(expected, names, values)
+            if not ok:
+                return False
+        return True
+
+    def _apply_update(self, key, expression, names, values):
+        item = dict(self.items.get(key) or {"PK": key[0], "SK": key[1]})
+        set_part, _, add_part = expression.partition(" ADD ")
+        set_part = set_part.strip()
+        if set_part.startswith("ADD "):
+            set_part, add_part = "", set_part[4:]
+        assignments = [a.split("=") for a in filter(None, set_part[4:].split(","))]
+        additions = [a.split() for a in filter(None, add_part.split(","))]
+        paths = [self._resolve(attr, names, values) for attr, _ in assignments + additions]
+        if len(paths) != len(set(paths)):
+            raise FakeTableError("ValidationException")        # overlapping document paths
+        for attr, value in assignments:
+            item[self._resolve(attr, names, values)] = self._resolve(value, names, values)
+        for attr, value in additions:
+            name = self._resolve(attr, names, values)
+            item[name] = item.get(name, 0) + self._resolve(value, names, values)
+        self.items[key] = item
+
+    # -- Table API -----------------------------------------------------------
+
+    def get_item(self, Key):
+        self.calls.append("get_item")
+        item = self.items.get((Key["PK"], Key["SK"]))
+        return {"Item": dict(item)} if item else {}
+
+    def put_item(self, Item):
+        self.calls.append("put_item")
+        self.items[(Item["PK"], Item["SK"])] = dict(Item)
+        return {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues,
+                    ExpressionAttributeNames=None, ConditionExpression=None, **_):
+        self.calls.append("update_item")
+        key = (Key["PK"], Key["SK"])
+        names = ExpressionAttributeNames or {}
+        if ConditionExpression and not self._check(
+            self.items.get(key), ConditionExpression, names, ExpressionAttributeValues,
+        ):
+            raise FakeTableError("ConditionalCheckFailedException")
+        self._apply_update(key, UpdateExpression, names, ExpressionAttributeValues)
+        return {}
+
+    def query(self, KeyConditionExpression, ExpressionAttributeValues,
+              ExpressionAttributeNames=None, FilterExpression=None,
+              ExclusiveStartKey=None, Limit=None, **_):
+        self.calls.append("query")
+        names = ExpressionAttributeNames or {}
+        matching = sorted(
+            (item for item in self.items.values()
+             if self._check(item, KeyConditionExpression, names, ExpressionAttributeValues)),
+            key=lambda item: item["SK"],
+        )
+        if ExclusiveStartKey:
+            matching = [i for i in matching if i["SK"] > ExclusiveStartKey["SK"]]
+        page = matching[:min(self.page_size, Limit or self.page_size)]
+        response = {"Items": [
+            dict(item) for item in page
+            if not FilterExpression
+            or self._check(item, FilterExpression, names, ExpressionAttributeValues)
+        ]}
+        if len(matching) > len(page):
+            response["LastEvaluatedKey"] = {"PK": page[-1]["PK"], "SK": page[-1]["SK"]}
+        return response
+
+    # -- batch / transaction API (resource and meta.client) ------------------
+
+    def batch_write_item(self, RequestItems):
+        self.calls.append("batch_write_item")
+        requests = RequestItems[self.table_name]
+        assert len(requests) <= 25
+        for request in requests:
+            item = request["PutRequest"]["Item"]
+            self.items[(item["PK"], item["SK"])] = dict(item)
+        return {"UnprocessedItems": {}}
+
+    def batch_get_item(self, RequestItems):
+        self.calls.append("batch_get_item")
+        keys = RequestItems[self.table_name]["Keys"]
+        assert len(keys) <= 100
+        found = [dict(self.items[(k["PK"], k["SK"])]) for k in keys if (k["PK"], k["SK"]) in self.items]
+        return {"Responses": {self.table_name: found}, "UnprocessedKeys": {}}
+
+    def transact_write_items(self, TransactItems):
+        self.calls.append("transact_write_items")
+        updates = [entry["Update"] for entry in TransactItems]
+        with self._conflicts_lock:
+            conflict = self.transaction_conflicts > 0
+            self.transaction_conflicts -= conflict
+        if conflict:
+            raise FakeTableError("TransactionCanceledException", ["TransactionConflict"] * len(updates))
+        reasons = []
+        for update in updates:
+            condition = update.get("ConditionExpression")
+            key = (update["Key"]["PK"], update["Key"]["SK"])
+            passed = not condition or self._check(
+                self.items.get(key), condition,
+                update.get("ExpressionAttributeNames", {}), update["ExpressionAttributeValues"],
+            )
+            reasons.append("None" if passed else "ConditionalCheckFailed")
+        if "ConditionalCheckFailed" in reasons:
+            raise FakeTableError("TransactionCanceledException", reasons)
+        for update in updates:
+            self._apply_update(
+                (update["Key"]["PK"], update["Key"]["SK"]), update["UpdateExpression"],
+                update.get("ExpressionAttributeNames", {}), update["ExpressionAttributeValues"],
+            )
+        return {}
+
+
+@pytest.fixture
+def inventory_table(monkeypatch):
+    """
+    SGADynamoDBClient backed by a FakeInventoryTable.
+
+    Usage:
+        client, table = inventory_table
+    """
+    from tools import dynamodb_client
+    from tools.dynamodb_client import SGADynamoDBClient
+
+    table = FakeInventoryTable("test-inventory")
+    client = SGADynamoDBClient(table_name="test-inventory")
+    client._table = table
+    monkeypatch.setattr(dynamodb_client, "_get_thread_dynamodb_resource", lambda: table)
+    return client, table
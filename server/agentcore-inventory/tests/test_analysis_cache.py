@@ -0,0 +1,200 @@
+# =============================================================================
+# Tests for Smart Import Analysis Caching
+# =============================================================================
+# Unit tests for tools/analysis_cache.py and its use by
+# tools/gemini_text_analyzer.py, with a fake S3 client and a fake Gemini
+# client.
+#
+# These tests verify:
+# - Artifacts are revalidated by ETag and re-downloaded when the object changes
+# - Artifacts are scoped per session and bounded by total bytes
+# - Identical HIL rounds are served from the result cache
+# - HIL rounds and extraction share one download
+# - CSV sampling stops decoding after the requested rows
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_analysis_cache.py -v
+# =============================================================================
+
+import hashlib
+import io
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import tools.gemini_text_analyzer as analyzer
+from tools.analysis_cache import (
+    AnalysisResultCache,
+    FileArtifactCache,
+    analysis_cache_key,
+)
+
+CSV = b"PART_NUMBER;SERIAL\nC9200-24P;FOC123\nC9300-48P;FOC456\n"
+
+
+class FakeS3:
+    """get_object with ETags and IfNoneMatch -> 304."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def put(self, key, body):
+        self.objects[key] = body
+
+    def get_object(self, Bucket, Key, IfNoneMatch=None):
+        body = self.objects[Key]
+        etag = f'"{hashlib.md5(body).hexdigest()}"'
+        self.calls.append((Key, IfNoneMatch))
+        if IfNoneMatch == etag:
+            error = Exception("Not Modified")
+            error.response = {"Error": {"Code": "304"}}
+            raise error
+        return {"Body": io.BytesIO(body), "ETag": etag}
+
+
+class FakeGemini:
+    def __init__(self):
+        self.prompts = []
+        self.models = self
+
+    def generate_content(self, model, contents, config):
+        self.prompts.append(contents)
+        return SimpleNamespace(text=json.dumps({
+            "analysis_confidence": 0.9,
+            "columns": [{"source_name": "PART_NUMBER"}],
+            "hil_questions": [],
+        }))
+
+
+@pytest.fixture
+def s3(monkeypatch):
+    fake = FakeS3()
+    monkeypatch.setattr(analyzer, "_s3_client", fake)
+    return fake
+
+
+@pytest.fixture
+def gemini(monkeypatch):
+    fake = FakeGemini()
+    monkeypatch.setattr(analyzer, "_genai_client", fake)
+    return fake
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    import tools.analysis_cache as analysis_cache
+
+    monkeypatch.setattr(analysis_cache, "_artifact_cache", FileArtifactCache())
+    monkeypatch.setattr(analysis_cache, "_result_cache", AnalysisResultCache())
+    return analysis_cache
+
+
+class TestFileArtifactCache:
+    """Tests for FileArtifactCache."""
+
+    def test_revalidates_by_etag(self, s3):
+        cache = FileArtifactCache()
+        s3.put("a.csv", CSV)
+
+        first = cache.fetch(s3, "bucket", "a.csv", "s1")
+        second = cache.fetch(s3, "bucket", "a.csv", "s1")
+
+        assert second is first
+        assert first.sha256 == hashlib.sha256(CSV).hexdigest()
+        assert s3.calls == [("a.csv", None), ("a.csv", first.etag)]
+        assert cache.get_stats()["hits"] == 1
+
+    def test_changed_object_is_downloaded_again(self, s3):
+        cache = FileArtifactCache()
+        s3.put("a.csv", CSV)
+        first = cache.fetch(s3, "bucket", "a.csv", "s1")
+        first.derive("sample", lambda: "old sample")
+
+        s3.put("a.csv", CSV + b"C9500;FOC789\n")
+        second = cache.fetch(s3, "bucket", "a.csv", "s1")
+
+        assert second.sha256 != first.sha256
+        assert second.derive("sample", lambda: "new sample") == "new sample"
+        assert cache.get_stats()["changed"] == 1
+
+    def test_sessions_are_isolated_and_bytes_bounded(self, s3):
+        cache = FileArtifactCache(max_bytes=len(CSV) * 2)
+        s3.put("a.csv", CSV)
+
+        for session in ("s1", "s2", "s3"):
+            cache.fetch(s3, "bucket", "a.csv", session)
+
+        stats = cache.get_stats()
+        assert (stats["misses"], stats["entries"], stats["evicted"]) == (3, 2, 1)
+        assert cache.drop_session("s3") == 1
+
+
+class TestAnalysisCacheKey:
+    """Tests for analysis_cache_key."""
+
+    def test_response_order_and_whitespace_do_not_matter(self):
+        a = [{"question_id": "q1", "field": "serial", "answer": "Numero  de Serie"},
+             {"question_id": "q2", "field": "part", "answer": "PN"}]
+        b = [a[1], {"question_id": "q1", "field": "serial", "answer": " Numero de Serie "}]
+
+        assert analysis_cache_key("f", "schema", None, a, None) == analysis_cache_key("f", "schema", "", b, "")
+
+    def test_inputs_change_key(self):
+        base = analysis_cache_key("f", "schema", None, None, None)
+        assert base != analysis_cache_key("g", "schema", None, None, None)
+        assert base != analysis_cache_key("f", "other schema", None, None, None)
+        assert base != analysis_cache_key("f", "schema", None, [{"answer": "x"}], None)
+        assert base != analysis_cache_key("f", "schema", None, None, None, version="2")
+
+
+class TestAnalyzerCaching:
+    """Tests for analyze_file_with_gemini / extract_data_with_gemini."""
+
+    @pytest.mark.asyncio
+    async def test_identical_round_skips_gemini(self, s3, gemini):
+        s3.put("uploads/file.csv", CSV)
+        responses = [{"question_id": "q1", "field": "serial", "answer": "SERIAL"}]
+
+        first = await analyzer.analyze_file_with_gemini("uploads/file.csv", session_id="s1")
+        second = await analyzer.re_analyze_with_responses(
+            "uploads/file.csv", responses, previous_round=1, session_id="s1"
+        )
+        retry = await analyzer.re_analyze_with_responses(
+            "uploads/file.csv", list(reversed(responses)), previous_round=2, session_id="s1"
+        )
+
+        assert first["success"] and second["success"] and retry["success"]
+        assert len(gemini.prompts) == 2
+        assert retry["analysis_round"] == 3
+        assert [etag is None for _, etag in s3.calls] == [True, False, False]
+
+    @pytest.mark.asyncio
+    async def test_extraction_reuses_analysis_download(self, s3, gemini):
+        s3.put("uploads/file.csv", CSV)
+
+        await analyzer.analyze_file_with_gemini("uploads/file.csv", session_id="s1")
+        extracted = await analyzer.extract_data_with_gemini(
+            "uploads/file.csv", {"PART_NUMBER": "part_number"}, session_id="s1"
+        )
+
+        assert extracted["rows"] == [{"part_number": "C9200-24P"}, {"part_number": "C9300-48P"}]
+        assert [etag is None for _, etag in s3.calls] == [True, False]
+
+
+class TestCsvSampling:
+    """Tests for _extract_csv_content."""
+
+    def test_stops_decoding_after_sample(self):
+        # Invalid UTF-8 after the sampled rows is never decoded
+        content = b"a;b\n" + b"1;\xc3\xa7\n" * 3 + b"2;\xff\n" * 10
+
+        text = analyzer._extract_csv_content(content, max_rows=3)
+
+        assert text.startswith("Encoding: utf-8\nTotal linhas: 14\n\n")
+        assert "a;b\n1;ç\n1;ç\n1;ç\n\n[... mais 10 linhas ...]" in text
+
+    def test_small_file_is_returned_whole(self):
+        text = analyzer._extract_csv_content("x;y\n1;é\n".encode("latin-1"), max_rows=50)
+
+        assert text == "Encoding: latin-1\nTotal linhas: 2\n\nx;y\n1;é\n"
@@ -0,0 +1,169 @@
+# =============================================================================
+# Tests for Background Work Queue
+# =============================================================================
+# Unit tests for shared/background_work.py.
+#
+# These tests verify:
+# - submit() returns immediately and jobs run with bounded concurrency
+# - Failed jobs are retried with backoff, then counted as failed
+# - Jobs are dropped (not blocked) when the queue is full or closed
+# - drain() waits for pending jobs
+# - A2A notifications and memory writes are retried on soft failures
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_background_work.py -v
+# =============================================================================
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from shared import background_work
+from shared.background_work import BackgroundWorkQueue
+
+
+def make_queue(**overrides):
+    options = dict(name="test", concurrency=2, max_pending=100,
+                   max_attempts=3, base_delay=0.001, max_delay=0.002)
+    options.update(overrides)
+    return BackgroundWorkQueue(**options)
+
+
+@pytest.fixture
+def fresh_queue():
+    """Replace the process-wide queue for one test."""
+    queue = make_queue()
+    with patch.object(background_work, "_queue", queue):
+        yield queue
+
+
+class TestBackgroundWorkQueue:
+    """Tests for BackgroundWorkQueue."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        """Test that no more than `concurrency` jobs run at once."""
+        queue = make_queue(concurrency=3)
+        running = peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for i in range(12):
+            assert queue.submit(f"job-{i}", job) is True
+
+        assert await queue.drain(timeout=5) is True
+        assert peak == 3
+        assert queue.get_stats()["completed"] == 12
+
+    @pytest.mark.asyncio
+    async def test_retries_then_succeeds(self):
+        """Test that a failing job is retried with a fresh coroutine."""
+        queue = make_queue()
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("throttled")
+
+        queue.submit("flaky", flaky)
+        await queue.drain(timeout=5)
+
+        stats = queue.get_stats()
+        assert len(attempts) == 3
+        assert stats["retried"] == 2 and stats["completed"] == 1 and stats["failed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_attempts(self):
+        queue = make_queue(max_attempts=2)
+        job = AsyncMock(side_effect=RuntimeError("down"))
+
+        queue.submit("down", job)
+        await queue.drain(timeout=5)
+
+        assert job.await_count == 2
+        assert queue.get_stats()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_drops_when_full_or_closed(self):
+        """Test that submit() never blocks the caller."""
+        queue = make_queue(concurrency=1, max_pending=1)
+        release = asyncio.Event()
+
+        assert queue.submit("blocker", release.wait) is True
+        await asyncio.sleep(0)  # worker picks up the blocker
+        assert queue.submit("queued", release.wait) is True
+        assert queue.submit("overflow", release.wait) is False
+
+        release.set()
+        await queue.drain(timeout=5)
+        assert queue.submit("late", release.wait) is False
+        assert queue.get_stats()["dropped"] == 2
+
+    def test_drops_without_event_loop(self):
+        queue = make_queue()
+        assert queue.submit("sync", AsyncMock()) is False
+
+    @pytest.mark.asyncio
+    async def test_drain_timeout(self):
+        queue = make_queue(concurrency=1)
+        queue.submit("slow", lambda: asyncio.sleep(10))
+
+        assert await queue.drain(timeout=0.01) is False
+
+
+class TestHelpers:
+    """Tests for the A2A and memory helpers."""
+
+    @pytest.mark.asyncio
+    async def test_notify_agent_retries_unsuccessful_response(self, fresh_queue):
+        """Test that an A2AResponse with success=False is retried."""
+        client = SimpleNamespace(invoke_agent=AsyncMock(side_effect=[
+            SimpleNamespace(success=False, error="503"),
+            SimpleNamespace(success=True, error=None),
+        ]))
+
+        assert background_work.notify_agent(
+            client, "observation", {"action": "log_event", "event_type": "X"}, "s1"
+        ) is True
+        await fresh_queue.drain(timeout=5)
+
+        assert client.invoke_agent.await_count == 2
+        client.invoke_agent.assert_awaited_with(
+            "observation", {"action": "log_event", "event_type": "X"}, "s1"
+        )
+        assert fresh_queue.get_stats()["completed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_memory_facts_are_batched(self, fresh_queue):
+        """Test one learn_facts job per FACTS_PER_EVENT facts."""
+        from shared.memory_manager import FACTS_PER_EVENT
+
+        memory = SimpleNamespace(learn_facts=AsyncMock(return_value=["evt"]))
+        facts = [f"fact {i}" for i in range(FACTS_PER_EVENT * 2 + 1)]
+
+        assert background_work.submit_memory_facts(
+            memory, facts, category="column_mapping", confidence=0.9
+        ) == (3, 0)
+        await fresh_queue.drain(timeout=5)
+
+        batches = [call.args[0] for call in memory.learn_facts.await_args_list]
+        assert [len(b) for b in batches] == [FACTS_PER_EVENT, FACTS_PER_EVENT, 1]
+        assert sum(batches, []) == facts
+        assert memory.learn_facts.await_args.kwargs == {"category": "column_mapping", "confidence": 0.9}
+
+    @pytest.mark.asyncio
+    async def test_memory_write_without_event_id_is_retried(self, fresh_queue):
+        write = AsyncMock(side_effect=[None, "evt"])
+
+        background_work.submit_memory_write("learn_episode", write)
+        await fresh_queue.drain(timeout=5)
+
+        assert write.await_count == 2
+        assert fresh_queue.get_stats()["completed"] == 1
@@ -0,0 +1,140 @@
+# =============================================================================
+# Tests for the Statement-Level Balance Trigger
+# =============================================================================
+# Database tests for schema/009_statement_balance_trigger.sql: the same
+# multi-row INSERT of movements is applied with the row trigger (003) and
+# the statement trigger, and the resulting balances are compared.
+#
+# These tests verify:
+# - Reservations and releases are clamped at zero after every row, in
+#   insertion order (RESERVA 2, LIBERACAO 5, RESERVA 2 leaves 2 reserved)
+# - Reservations only apply to balance rows that exist when they are
+#   inserted, including rows created earlier in the same statement
+# - Reservations on keys without a balance row are ignored
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_balance_trigger.py -v
+#      SGA_TEST_DSN=postgresql://... enables the database tests
+# =============================================================================
+
+import os
+import uuid
+
+import pytest
+
+TEST_DSN = os.environ.get("SGA_TEST_DSN")
+
+pytestmark = pytest.mark.skipif(not TEST_DSN, reason="SGA_TEST_DSN not set")
+
+
+@pytest.fixture
+def db():
+    """A location, a project and a part number, all rolled back afterwards."""
+    psycopg = pytest.importorskip("psycopg")
+
+    tag = uuid.uuid4().hex[:8].upper()
+    with psycopg.connect(TEST_DSN) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO sga.projects (project_code, project_name, client_name) "
+                "VALUES (%s, 'Teste', 'Cliente') RETURNING project_id",
+                (f"T{tag}-P",),
+            )
+            project = cur.fetchone()[0]
+            cur.execute(
+                "INSERT INTO sga.locations (location_code, location_name, location_type) "
+                "VALUES (%s, 'Deposito', 'WAREHOUSE') RETURNING location_id",
+                (f"T{tag}-L",),
+            )
+            location = cur.fetchone()[0]
+            cur.execute(
+                "INSERT INTO sga.part_numbers (part_number, description) "
+                "VALUES (%s, 'Peca') RETURNING part_number_id",
+                (f"T{tag}-PN",),
+            )
+            pn = cur.fetchone()[0]
+
+        yield conn, {"pn": pn, "location": location, "project": project}
+        conn.rollback()
+
+
+def balance_after(conn, ids, mode, movements, project=True, existing=None):
+    """
+    (quantity_total, quantity_reserved) after inserting `movements` in one
+    statement under trigger `mode`; None if no balance row. Rolled back.
+
+    Args:
+        movements: (movement_type, quantity) pairs, in insertion order
+        project: Use the fixture project (False: project_id NULL)
+        existing: (total, reserved) of a balance row created beforehand
+    """
+    project_id = ids["project"] if project else None
+    with conn.cursor() as cur:
+        cur.execute("SAVEPOINT balance_case")
+        cur.execute("SELECT sga.set_balance_trigger_mode(%s)", (mode,))
+        if existing:
+            cur.execute(
+                "INSERT INTO sga.balances (part_number_id, location_id, project_id, "
+                "quantity_total, quantity_reserved) VALUES (%s, %s, %s, %s, %s)",
+                (ids["pn"], ids["location"], project_id, *existing),
+            )
+        values = []
+        params = []
+        for movement_type, quantity in movements:
+            values.append("(%s::sga.movement_type, %s, %s, %s, %s, %s, 'test')")
+            entry = movement_type in ("ENTRADA", "AJUSTE_POSITIVO")
+            params += [
+                movement_type, ids["pn"], quantity,
+                None if entry else ids["location"], ids["location"] if entry else None,
+                project_id,
+            ]
+        cur.execute(
+            "INSERT INTO sga.movements (movement_type, part_number_id, quantity, "
+            "source_location_id, destination_location_id, project_id, created_by) "
+            "VALUES " + ", ".join(values),
+            params,
+        )
+        cur.execute(
+            "SELECT quantity_total, quantity_reserved FROM sga.balances "
+            "WHERE part_number_id = %s AND location_id = %s AND project_id IS NOT DISTINCT FROM %s",
+            (ids["pn"], ids["location"], project_id),
+        )
+        row = cur.fetchone()
+        cur.execute("ROLLBACK TO SAVEPOINT balance_case")
+    return row
+
+
+def both_modes(conn, ids, movements, **kwargs):
+    row = balance_after(conn, ids, "row", movements, **kwargs)
+    statement = balance_after(conn, ids, "statement", movements, **kwargs)
+    assert statement == row
+    return row
+
+
+class TestReservedQuantity:
+    """quantity_reserved matches the row trigger for any insertion order."""
+
+    def test_release_is_clamped_before_later_reservations(self, db):
+        conn, ids = db
+        movements = [("RESERVA", 2), ("LIBERACAO", 5), ("RESERVA", 2)]
+
+        assert both_modes(conn, ids, movements, existing=(10, 0)) == (10, 2)
+
+    def test_clamps_against_reserved_before_the_statement(self, db):
+        conn, ids = db
+        movements = [("LIBERACAO", 1), ("RESERVA", 4), ("LIBERACAO", 9), ("RESERVA", 1), ("SAIDA", 2)]
+
+        assert both_modes(conn, ids, movements, existing=(10, 3)) == (8, 1)
+        assert both_modes(conn, ids, movements, project=False, existing=(10, 3)) == (8, 1)
+
+    def test_reservations_after_the_row_is_created(self, db):
+        conn, ids = db
+        movements = [("RESERVA", 1), ("LIBERACAO", 1), ("ENTRADA", 10), ("RESERVA", 3),
+                     ("LIBERACAO", 5), ("RESERVA", 2)]
+
+        assert both_modes(conn, ids, movements) == (10, 2)
+        assert both_modes(conn, ids, movements, project=False) == (10, 2)
+
+    def test_reservations_without_balance_row_are_ignored(self, db):
+        conn, ids = db
+
+        assert both_modes(conn, ids, [("RESERVA", 3), ("LIBERACAO", 1)]) is None
@@ -0,0 +1,189 @@
+# =============================================================================
+# Tests for Inventory Campaign Counting
+# =============================================================================
+# Unit tests for the reconciliacao counting tools
+# (agents/specialists/reconciliacao/tools/counting.py) and the count item
+# methods of SGADynamoDBClient, against an in-memory inventory table.
+#
+# These tests verify:
+# - A count updates its item and the campaign counters in one transaction,
+#   without rescanning the campaign items
+# - Bulk submissions read their items with BatchGetItem
+# - A count based on a stale item status is rejected and not double counted
+# - Transactions cancelled by concurrent counts (TransactionConflict) are
+#   retried, not reported as conflicts
+# - Reconciliation rewrites counters only, never the campaign status
+# - Campaigns that are not ACTIVE/IN_PROGRESS reject counts
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_campaign_counting.py -v
+# =============================================================================
+
+import pytest
+
+CAMPAIGN_ID = "INV_TEST"
+
+
+@pytest.fixture
+def counting(specialist_tools, inventory_table, monkeypatch):
+    module = specialist_tools("reconciliacao", "counting")
+    client, _ = inventory_table
+    monkeypatch.setattr(module, "_get_db", lambda: client)
+    monkeypatch.setattr(module, "COUNTER_RECONCILE_INTERVAL", 0)
+    module._dirty_campaigns.clear()
+    return module
+
+
+@pytest.fixture
+def seeded(inventory_table):
+    """An ACTIVE campaign with 60 PENDING items of quantity 2."""
+    client, table = inventory_table
+    client.put_campaign({
+        "campaign_id": CAMPAIGN_ID,
+        "status": "ACTIVE",
+        "require_double_count": False,
+        "total_items": 60,
+        "counted_items": 0,
+        "divergent_items": 0,
+    })
+    client.put_count_items(
+        {
+            "campaign_id": CAMPAIGN_ID,
+            "part_number": f"PN-{i}",
+            "location_id": "L1",
+            "system_quantity": 2,
+            "system_serials": [],
+            "status": "PENDING",
+        }
+        for i in range(60)
+    )
+    table.calls.clear()
+    return client, table
+
+
+class TestSubmitCount:
+    """Tests for submit_count_tool."""
+
+    @pytest.mark.asyncio
+    async def test_item_and_counters_in_one_transaction(self, counting, seeded):
+        client, table = seeded
+
+        result = await counting.submit_count_tool(CAMPAIGN_ID, "PN-1", "L1", counted_quantity=2)
+
+        assert result["success"] is True and result["data"]["status"] == "VERIFIED"
+        assert table.calls.count("transact_write_items") == 1
+        assert "query" not in table.calls                   # no rescan of the campaign
+        campaign = client.get_campaign(CAMPAIGN_ID)
+        assert (campaign["counted_items"], campaign["divergent_items"]) == (1, 0)
+        assert campaign["status"] == "IN_PROGRESS"
+        assert client.get_count_item(CAMPAIGN_ID, "PN-1", "L1")["status"] == "VERIFIED"
+
+    @pytest.mark.asyncio
+    async def test_divergent_count_stores_divergence(self, counting, seeded):
+        client, table = seeded
+
+        result = await counting.submit_count_tool(CAMPAIGN_ID, "PN-2", "L1", counted_quantity=1)
+
+        assert result["data"]["status"] == "DIVERGENT"
+        campaign = client.get_campaign(CAMPAIGN_ID)
+        assert (campaign["counted_items"], campaign["divergent_items"]) == (1, 1)
+        divergences = [i for (pk, sk), i in table.items.items() if sk.startswith("DIVERGENCE#")]
+        assert len(divergences) == 1
+        assert divergences[0]["divergence_type"] == "NEGATIVE"
+        assert divergences[0]["divergence_percentage"] == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_completed_campaign_rejects_counts(self, counting, seeded):
+        client, _ = seeded
+        client.update_campaign(CAMPAIGN_ID, {"status": "COMPLETED"})
+
+        result = await counting.submit_count_tool(CAMPAIGN_ID, "PN-1", "L1", counted_quantity=2)
+
+        assert result["success"] is False and "COMPLETED" in result["error"]
+        assert client.get_count_item(CAMPAIGN_ID, "PN-1", "L1")["status"] == "PENDING"
+
+
+class TestSubmitCounts:
+    """Tests for submit_counts_tool (handheld batches)."""
+
+    @pytest.mark.asyncio
+    async def test_batch_reads_items_together(self, counting, seeded):
+        client, table = seeded
+        counts = [
+            {"part_number": f"PN-{i}", "location_id": "L1", "counted_quantity": 2 if i % 5 else 3}
+            for i in range(50)
+        ]
+        counts.append({"part_number": "PN-X", "location_id": "L1", "counted_quantity": 1})
+
+        result = await counting.submit_counts_tool(CAMPAIGN_ID, counts)
+
+        assert result["data"]["accepted"] == 50 and result["data"]["rejected"] == 1
+        assert result["data"]["divergent"] == 10
+        assert table.calls.count("batch_get_item") == 1
+        assert table.calls.count("get_item") == 1            # the campaign record
+        assert "query" not in table.calls
+        campaign = client.get_campaign(CAMPAIGN_ID)
+        assert (campaign["counted_items"], campaign["divergent_items"]) == (50, 10)
+
+    @pytest.mark.asyncio
+    async def test_stale_item_is_not_counted_twice(self, counting, seeded):
+        """Test that a count evaluated on an old status is cancelled."""
+        client, _ = seeded
+        item = client.get_count_item(CAMPAIGN_ID, "PN-3", "L1")
+        evaluation = counting._evaluate_count(
+            count_item=item, counted_quantity=2, counted_serials=None, counted_by="ana",
+            evidence_keys=None, notes=None, require_double=False, now="2026-10-18T00:00:00Z",
+        )
+
+        first = await counting._apply_count_updates(CAMPAIGN_ID, [(item, evaluation)])
+        second = await counting._apply_count_updates(CAMPAIGN_ID, [(item, evaluation)])
+
+        assert first == set()
+        assert second == {("PN-3", "L1")}
+        assert client.get_campaign(CAMPAIGN_ID)["counted_items"] == 1
+
+    @pytest.mark.asyncio
+    async def test_transaction_conflicts_are_retried(self, counting, seeded, monkeypatch):
+        """Test that concurrent counter updates do not reject valid counts."""
+        from tools import dynamodb_client
+
+        client, table = seeded
+        monkeypatch.setattr(dynamodb_client, "BULK_BACKOFF_BASE_SECONDS", 0.001)
+        # Fewer than BULK_MAX_ATTEMPTS, so no item can run out of retries
+        table.transaction_conflicts = 7
+        counts = [
+            {"part_number": f"PN-{i}", "location_id": "L1", "counted_quantity": 2}
+            for i in range(20)
+        ]
+
+        result = await counting.submit_counts_tool(CAMPAIGN_ID, counts)
+
+        assert result["data"]["accepted"] == 20 and result["data"]["rejected"] == 0
+        assert table.calls.count("transact_write_items") == 27
+        assert client.get_campaign(CAMPAIGN_ID)["counted_items"] == 20
+
+
+class TestReconciliation:
+    """Tests for reconcile_campaign_counters."""
+
+    @pytest.mark.asyncio
+    async def test_rewrites_counters_not_status(self, counting, seeded):
+        client, table = seeded
+        for key, item in table.items.items():
+            if key[1] in ("ITEM#L1#PN-1", "ITEM#L1#PN-2"):
+                item["status"] = "DIVERGENT" if key[1].endswith("PN-2") else "VERIFIED"
+        client.update_campaign(CAMPAIGN_ID, {"status": "COMPLETED", "counted_items": 7})
+        table.page_size = 25
+
+        counters = await counting.reconcile_campaign_counters(CAMPAIGN_ID)
+
+        assert counters == {"counted_items": 2, "divergent_items": 1}
+        campaign = client.get_campaign(CAMPAIGN_ID)
+        assert campaign["status"] == "COMPLETED"
+        assert (campaign["counted_items"], campaign["divergent_items"]) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_dirty_campaigns_are_reconciled_once(self, counting, seeded):
+        await counting.submit_count_tool(CAMPAIGN_ID, "PN-1", "L1", counted_quantity=2)
+
+        assert await counting.reconcile_dirty_campaigns() == 1
+        assert await counting.reconcile_dirty_campaigns() == 0
@@ -0,0 +1,262 @@
+# =============================================================================
+# Tests for Inventory Campaign Generation
+# =============================================================================
+# Unit tests for the reconciliacao campaign tools
+# (agents/specialists/reconciliacao/tools/campaign.py), the campaign methods
+# of SGADynamoDBClient and the set-based balance/serial queries of
+# SGAPostgresClient.
+#
+# These tests verify:
+# - Balances and serials are read with one Gateway call each per slice
+# - Count items are written with BatchWriteItem, not one put per item
+# - Large campaigns are generated by a background job that checkpoints
+#   progress, records failures and resumes with the remaining locations
+# - Campaign items are read across query pages
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_campaign_generation.py -v
+# =============================================================================
+
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tools.gateway_adapter import GatewayPostgresAdapter
+from tools.postgres_client import SGAPostgresClient
+
+PREFIX = "SGAPostgresTools___"
+
+
+def balances_for(location_ids, part_numbers=None, project_ids=None):
+    """Two projects of PN-A and one of PN-B at every location."""
+    rows = []
+    for loc in location_ids:
+        rows += [
+            {"part_number": "PN-A", "location_id": loc, "project_id": "P1", "quantity_total": 2},
+            {"part_number": "PN-A", "location_id": loc, "project_id": "P2", "quantity_total": 1},
+            {"part_number": "PN-B", "location_id": loc, "project_id": "P1", "quantity_total": 5},
+        ]
+    return [r for r in rows if not part_numbers or r["part_number"] in part_numbers]
+
+
+class FakeGateway:
+    """Answers the campaign tools; fail_on_call makes that balance call fail."""
+
+    def __init__(self):
+        self.balance_calls = []
+        self.serial_calls = []
+        self.fail_on_call = None
+
+    async def call(self, tool_name, arguments, **_):
+        tool = tool_name.replace(PREFIX, "")
+        if tool == "sga_get_balances_by_locations":
+            self.balance_calls.append(arguments)
+            if len(self.balance_calls) == self.fail_on_call:
+                return {"error": "connection reset"}
+            return {"balances": balances_for(
+                arguments["location_ids"], arguments.get("part_numbers"), arguments.get("project_ids"),
+            )}
+        if tool == "sga_get_serials_for_balances":
+            self.serial_calls.append(arguments)
+            return {"serials": [
+                {"part_number": k["part_number"], "location_id": k["location_id"],
+                 "serials": [f"SN-{k['location_id']}-{i}" for i in range(3)]}
+                for k in arguments["keys"] if k["part_number"] == "PN-A"
+            ]}
+        raise AssertionError(f"unexpected tool {tool}")
+
+
+@pytest.fixture
+def campaign(specialist_tools, inventory_table, monkeypatch):
+    module = specialist_tools("reconciliacao", "campaign")
+    client, _ = inventory_table
+    gateway = FakeGateway()
+    mcp = MagicMock()
+    mcp.call_tool_async = AsyncMock(side_effect=gateway.call)
+    monkeypatch.setattr(module, "_get_db", lambda: client)
+    monkeypatch.setattr(module, "_get_db_adapter", lambda: GatewayPostgresAdapter(mcp))
+    module.gateway = gateway
+    return module
+
+
+def count_items(table):
+    return {sk: item for (pk, sk), item in table.items.items() if sk.startswith("ITEM#")}
+
+
+class TestStartCampaign:
+    """Tests for start_campaign_tool (synchronous generation)."""
+
+    @pytest.mark.asyncio
+    async def test_small_campaign_is_set_based(self, campaign, inventory_table):
+        """Test one balance query, one serial query and batched item writes."""
+        _, table = inventory_table
+
+        result = await campaign.start_campaign_tool(name="Ciclo", location_ids=["L1", "L2", "L3"])
+
+        assert result["success"] is True
+        assert result["data"]["total_items"] == 6
+        assert len(campaign.gateway.balance_calls) == 1
+        assert len(campaign.gateway.serial_calls) == 1
+        assert table.calls.count("put_item") == 1           # the campaign record only
+        assert table.calls.count("batch_write_item") == 1   # 6 items, one chunk
+
+        items = count_items(table)
+        pn_a = items["ITEM#L1#PN-A"]
+        assert pn_a["system_quantity"] == 3                 # P1 + P2 counted together
+        assert pn_a["project_id"] == ""
+        assert pn_a["system_serials"] == ["SN-L1-0", "SN-L1-1", "SN-L1-2"]
+        assert items["ITEM#L2#PN-B"]["project_id"] == "P1"
+
+    @pytest.mark.asyncio
+    async def test_filters_are_pushed_to_the_query(self, campaign, inventory_table):
+        _, table = inventory_table
+
+        result = await campaign.start_campaign_tool(
+            name="PN-B", location_ids=["L1"], part_numbers=["PN-B"], project_ids=["P1"],
+        )
+
+        assert result["data"]["total_items"] == 1
+        assert campaign.gateway.balance_calls[0]["part_numbers"] == ["PN-B"]
+        assert campaign.gateway.balance_calls[0]["project_ids"] == ["P1"]
+        assert list(count_items(table)) == ["ITEM#L1#PN-B"]
+
+
+class TestBackgroundGeneration:
+    """Tests for the background generation job, progress and resume."""
+
+    @staticmethod
+    def locations(count):
+        return [f"L{i:02d}" for i in range(count)]
+
+    @pytest.mark.asyncio
+    async def test_large_campaign_generates_in_slices(self, campaign, inventory_table):
+        client, table = inventory_table
+
+        result = await campaign.start_campaign_tool(name="Anual", location_ids=self.locations(25))
+        campaign_id = result["campaign_id"]
+        assert result["data"]["status"] == "GENERATING"
+        await campaign._generation_jobs[campaign_id]
+
+        stored = client.get_campaign(campaign_id)
+        assert stored["status"] == "ACTIVE"
+        assert stored["total_items"] == 50
+        assert len(stored["generation"]["processed_locations"]) == 25
+        assert len(count_items(table)) == 50
+        # 3 slices (10, 10, 5): one balance and one serial call each
+        assert [len(c["location_ids"]) for c in campaign.gateway.balance_calls] == [10, 10, 5]
+        assert len(campaign.gateway.serial_calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_failure_is_recorded_and_resume_continues(self, campaign, inventory_table):
+        """Test checkpoint on failure, progress report and resume of the rest."""
+        client, table = inventory_table
+        campaign.gateway.fail_on_call = 2
+
+        result = await campaign.start_campaign_tool(name="Anual", location_ids=self.locations(25))
+        campaign_id = result["campaign_id"]
+        await campaign._generation_jobs[campaign_id]
+
+        progress = (await campaign.get_campaign_tool(campaign_id))["generation"]
+        assert progress == {
+            "running": False,
+            "processed_locations": 10,
+            "total_locations": 25,
+            "items_written": 20,
+            "percent": 40.0,
+            "error": "connection reset",
+        }
+        assert client.get_campaign(campaign_id)["status"] == "GENERATING"
+
+        resumed = await campaign.resume_campaign_generation_tool(campaign_id)
+        assert resumed["success"] is True and resumed["generation"]["running"] is True
+        await campaign._generation_jobs[campaign_id]
+
+        stored = client.get_campaign(campaign_id)
+        assert stored["status"] == "ACTIVE"
+        assert stored["total_items"] == 50 and len(count_items(table)) == 50
+        assert stored["generation"]["error"] is None
+        # The resumed job only fetched the 15 locations not yet processed
+        assert [len(c["location_ids"]) for c in campaign.gateway.balance_calls] == [10, 10, 10, 5]
+
+    @pytest.mark.asyncio
+    async def test_resume_rejects_active_campaign(self, campaign):
+        result = await campaign.start_campaign_tool(name="Ciclo", location_ids=["L1"])
+
+        resumed = await campaign.resume_campaign_generation_tool(result["campaign_id"])
+
+        assert resumed["success"] is False
+        assert "ACTIVE" in resumed["error"]
+
+
+class TestCampaignRecords:
+    """Tests for the SGADynamoDBClient campaign methods."""
+
+    LOCATIONS = ["L1", "L2", "L3", "L4", "L5"]
+
+    @pytest.mark.asyncio
+    async def test_items_are_read_across_pages(self, campaign, inventory_table):
+        client, table = inventory_table
+        table.page_size = 4
+        result = await campaign.start_campaign_tool(name="Ciclo", location_ids=self.LOCATIONS)
+        campaign_id = result["campaign_id"]
+        client.update_item(f"CAMPAIGN#{campaign_id}", "ITEM#L3#PN-B", {"status": "DIVERGENT"})
+
+        items = await campaign.get_campaign_items_tool(campaign_id)
+        divergent = await campaign.get_campaign_items_tool(campaign_id, status="DIVERGENT")
+
+        assert items["total"] == 10
+        assert [i["location_id"] for i in divergent["items"]] == ["L3"]
+
+    @pytest.mark.asyncio
+    async def test_complete_stores_float_accuracy(self, campaign, inventory_table):
+        client, table = inventory_table
+        result = await campaign.start_campaign_tool(name="Ciclo", location_ids=["L1", "L2", "L3"])
+        campaign_id = result["campaign_id"]
+        for key, item in count_items(table).items():
+            item["status"] = "DIVERGENT" if key == "ITEM#L1#PN-A" else "VERIFIED"
+
+        completed = await campaign.complete_campaign_tool(campaign_id)
+
+        assert completed["success"] is True
+        raw = table.items[(f"CAMPAIGN#{campaign_id}", "METADATA")]
+        assert isinstance(raw["final_accuracy"], Decimal)
+        stored = client.get_campaign(campaign_id)
+        assert stored["status"] == "COMPLETED"
+        assert stored["final_accuracy"] == pytest.approx(5 / 6)
+
+
+class TestPostgresCampaignQueries:
+    """Tests for the set-based SGAPostgresClient queries."""
+
+    @pytest.fixture
+    def client(self):
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        client.executed = []
+
+        def execute(query, params=None, fetch_all=True):
+            client.executed.append((query, params))
+            return []
+
+        client._execute_query = execute
+        return client
+
+    def test_balances_use_one_any_query(self, client):
+        client.get_balances_by_locations(["L1", "L2"], part_numbers=["PN-A"], project_ids=["P1"])
+
+        (query, params), = client.executed
+        assert "l.location_code = ANY(%s)" in query
+        assert "pn.part_number = ANY(%s)" in query and "p.project_code = ANY(%s)" in query
+        assert params == (["L1", "L2"], ["PN-A"], ["P1"])
+
+    def test_serials_join_unnested_pairs(self, client):
+        client.get_serials_for_balances([("PN-A", "L1"), ("PN-B", "L1"), ("PN-A", "L1")])
+
+        (query, params), = client.executed
+        assert "unnest(%s::text[], %s::text[])" in query and "array_agg" in query
+        assert params[0] == ["PN-A", "PN-B"] and params[1] == ["L1", "L1"]
+        assert set(params[2]) == {"IN_TRANSIT", "INSTALLED", "DISPOSED"}
+
+    def test_empty_input_skips_the_database(self, client):
+        assert client.get_balances_by_locations([]) == []
+        assert client.get_serials_for_balances([]) == []
+        assert client.executed == []
@@ -0,0 +1,137 @@
+# =============================================================================
+# Tests for the Columnar Profiler
+# =============================================================================
+# Unit tests for tools/column_profiler.py and the analyzers built on it
+# (tools/sheet_analyzer.py, swarm/tools/analysis_tools.py).
+#
+# These tests verify:
+# - Values are classified once into integer / decimal / date / text
+# - Part numbers with dashes are not mistaken for dates
+# - Ragged rows are transposed with missing cells counted as empty
+# - Each caller's type vocabulary and thresholds are preserved
+# - The pandas backend produces the same profile as pure Python
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_column_profiler.py -v
+# =============================================================================
+
+import pytest
+
+import tools.column_profiler as column_profiler
+import tools.sheet_analyzer as sheet_analyzer
+from tools.column_profiler import classify_value, profile_column, profile_records, profile_rows
+
+
+@pytest.fixture(autouse=True)
+def legacy_column_patterns(monkeypatch):
+    # The schema-aware matcher needs the MCP Gateway; use COLUMN_PATTERNS
+    monkeypatch.setattr(sheet_analyzer, "_get_schema_matcher", lambda: None)
+
+
+class TestClassification:
+    """Tests for classify_value."""
+
+    @pytest.mark.parametrize("value,expected", [
+        (42, "integer"),
+        ("-7", "integer"),
+        (3.5, "decimal"),
+        ("12,5", "decimal"),
+        ("R$ 1.234,56", "decimal"),
+        ("2026-01-15", "date"),
+        ("15/01/2026 10:30", "date"),
+        ("C9200-24P", "text"),
+        ("SN-2026-0001", "text"),
+        ("  ", None),
+        (None, None),
+        (float("nan"), None),
+    ])
+    def test_classify_value(self, value, expected):
+        assert classify_value(value) == expected
+
+
+class TestProfiles:
+    """Tests for profile_rows / profile_records."""
+
+    def test_transposes_ragged_rows(self):
+        rows = [("PN-1", 2, "extra"), ("PN-2",), ("PN-3", 5)]
+
+        part, qty, missing = profile_rows(rows, ["PN", "QTD", "OBS"])[:3]
+
+        assert (part.unique_count, part.null_count, part.is_likely_key) == (3, 0, True)
+        assert (qty.null_count, qty.data_type(), qty.inferred_type) == (1, "number", "integer")
+        assert missing.null_ratio == pytest.approx(2 / 3)
+        assert missing.sample_values == ["extra"]
+
+    def test_counts_agree_with_classify_value(self):
+        values = [7, 7.0, 1e20, float("inf"), True, "7", " 7 ", "7,0", "2026-01-15", "x", None, ""]
+
+        profile = profile_column("mix", values)
+
+        expected = {cls: 0 for cls in ("integer", "decimal", "date", "text")}
+        for value in values:
+            if classify_value(value):
+                expected[classify_value(value)] += 1
+        assert profile.type_counts == expected
+        assert profile.unique_count == 8    # 7, "7" and " 7 " share their text
+
+    def test_empty_rows_still_profile_every_header(self):
+        profiles = profile_rows([], ["A", "B"])
+
+        assert [(p.name, p.row_count, p.data_type()) for p in profiles] == [("A", 0, "text"), ("B", 0, "text")]
+
+    def test_records_and_type_confidence(self):
+        records = [{"valor": "10,5"}, {"valor": "10,50"}, {"valor": "7"}, {"valor": "n/d"}, {"outro": 1}]
+
+        profile = profile_records(records, ["valor"], sample_size=2)[0]
+
+        assert profile.inferred_type == "decimal"
+        assert profile.type_confidence == pytest.approx(3 / 4)    # integers are valid decimals
+        assert profile.sample_values == ["10,5", "10,50"]
+        assert profile.data_type(threshold=0.8) == "mixed"
+        assert profile.data_type(threshold=0.7, fallback="text") == "number"
+
+
+class TestCallSites:
+    """The analyzers keep their vocabularies on top of the shared profiler."""
+
+    def test_sheet_analyzer_wrappers(self):
+        assert sheet_analyzer.detect_data_type(["1", "2", "abc"]) == "mixed"
+        assert sheet_analyzer.detect_data_type(["C9200-24P", "C9300-48T"]) == "text"
+        assert sheet_analyzer._detect_data_type(["01/02/2026", "03/04/2026"]) == "date"
+
+    def test_csv_analysis_uses_profiles(self):
+        content = b"part_number;serial;quantidade\nC9200-24P;SN1;1\nC9200-24P;SN2;\n"
+
+        sheet = sheet_analyzer._analyze_csv(content, "lote.csv").sheets[0]
+        part, serial, qty = sheet.columns
+
+        assert (part.data_type, part.unique_count, part.is_likely_key) == ("text", 1, False)
+        assert serial.is_likely_key is True
+        assert (qty.data_type, qty.null_count) == ("number", 1)
+
+    def test_swarm_column_info(self):
+        from swarm.tools.analysis_tools import _column_info, _infer_type
+
+        info = _column_info(profile_column("data", ["2026-01-01", "2026-01-02", ""], 1))
+
+        assert info == {
+            "name": "data", "inferred_type": "date", "sample_values": ["2026-01-01"],
+            "null_count": 1, "unique_count": 2, "confidence": 1.0,
+        }
+        assert _infer_type("15") == "integer"
+        assert _infer_type(None) == "unknown"
+
+
+class TestPandasBackend:
+    """Vectorized and pure-Python profiles agree."""
+
+    def test_pandas_matches_python(self):
+        pd = pytest.importorskip("pandas")
+        values = [
+            1, 2.5, "3", " 4,5 ", "R$ 10,00", "2026-01-15", "15/01/2026", "C9200-24P",
+            None, "", float("nan"), "abc", "abc",
+        ] * 50
+
+        expected = column_profiler._profile_python("c", values, 5)
+        actual = column_profiler._profile_pandas(pd, "c", values, 5)
+
+        assert actual == expected
@@ -0,0 +1,285 @@
+# =============================================================================
+# Tests for Compliance Audit Engine
+# =============================================================================
+# Unit tests for tools/compliance_audit.py (used by sga_audit_compliance).
+#
+# These tests verify:
+# - Rule compilation and versioning
+# - Chunk evaluation per rule (approval, high value, locations, warnings)
+# - Bounded accumulator and recommendations
+# - Audit passes stay below the 30s Lambda/Gateway timeouts and the run is
+#   created (run_id known) before any movement is streamed
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_compliance_audit.py -v
+# =============================================================================
+
+import sys
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+import tools.postgres_client as postgres_client
+from tools.gateway_adapter import GatewayPostgresAdapter
+from tools.postgres_client import SGAPostgresClient
+
+from tools.compliance_audit import (
+    AuditAccumulator,
+    FINDING_BULK_QUANTITY,
+    FINDING_CROSS_PROJECT,
+    FINDING_DISCARD,
+    FINDING_HIGH_VALUE,
+    FINDING_LATE_APPROVAL,
+    FINDING_MISSING_APPROVAL,
+    FINDING_OFF_HOURS,
+    FINDING_RESTRICTED_LOCATION,
+    SEVERITY_NON_COMPLIANT,
+    build_recommendations,
+    compile_rules,
+    evaluate_chunk,
+)
+
+
+# =============================================================================
+# Fixtures
+# =============================================================================
+
+APPROVAL_MATRIX = {
+    "ENTRY": {"default": "INVENTORY_OPERATOR", "high_value": "INVENTORY_MANAGER", "threshold": 5000.0},
+    "EXIT": {"default": "INVENTORY_OPERATOR", "high_value": "INVENTORY_MANAGER", "threshold": 5000.0},
+    "TRANSFER": {"default": "INVENTORY_OPERATOR", "cross_project": "OPERATIONS_MANAGER"},
+    "ADJUSTMENT": {"default": "INVENTORY_MANAGER", "always_required": True},
+    "DISCARD": {"default": "DIRECTOR", "always_required": True},
+}
+
+WEEKDAY_NOON = datetime(2026, 10, 14, 12, 0, tzinfo=timezone.utc)  # Wednesday
+
+
+@pytest.fixture
+def rules():
+    """Compiled rules with the default policy constants."""
+    return compile_rules(
+        APPROVAL_MATRIX,
+        restricted_locations={"COFRE", "QUARENTENA"},
+        discard_locations={"DESCARTE"},
+        high_value_threshold=5000.0,
+    )
+
+
+def movement(**overrides):
+    """A compliant baseline movement."""
+    row = {
+        "movement_id": "m-1",
+        "movement_type": "ENTRADA",
+        "movement_date": WEEKDAY_NOON,
+        "quantity": 1,
+        "source_location": None,
+        "destination_location": "01",
+        "project_code": "P-1",
+        "destination_project": None,
+        "total_value": 100,
+        "approved_by": None,
+        "approved_at": None,
+        "created_by": "operator",
+    }
+    row.update(overrides)
+    return row
+
+
+def codes(findings):
+    return {f["finding_code"] for f in findings}
+
+
+# =============================================================================
+# Tests for compile_rules
+# =============================================================================
+
+class TestCompileRules:
+    """Tests for rule compilation."""
+
+    def test_maps_movement_types_to_operations(self, rules):
+        """Test that sga.movement_type values resolve to matrix operations."""
+        assert rules["by_type"]["AJUSTE_NEGATIVO"]["always_required"] is True
+        assert rules["by_type"]["SAIDA"]["high_value_threshold"] == 5000.0
+        assert rules["by_type"]["TRANSFERENCIA"]["cross_project_role"] == "OPERATIONS_MANAGER"
+
+    def test_version_is_stable_and_content_addressed(self, rules):
+        """Test that the version changes only when the policy changes."""
+        same = compile_rules(
+            APPROVAL_MATRIX,
+            restricted_locations={"QUARENTENA", "COFRE"},
+            discard_locations={"DESCARTE"},
+            high_value_threshold=5000.0,
+        )
+        changed = compile_rules(APPROVAL_MATRIX, bulk_quantity_threshold=10)
+        assert same["version"] == rules["version"]
+        assert changed["version"] != rules["version"]
+
+
+# =============================================================================
+# Tests for evaluate_chunk
+# =============================================================================
+
+class TestEvaluateChunk:
+    """Tests for columnar chunk evaluation."""
+
+    def test_empty_chunk(self, rules):
+        """Test that an empty chunk yields zero counts."""
+        findings, counts = evaluate_chunk([], rules)
+        assert findings == []
+        assert counts["total"] == 0
+
+    def test_compliant_movement(self, rules):
+        """Test that a routine movement has no findings."""
+        findings, counts = evaluate_chunk([movement()], rules)
+        assert findings == []
+        assert counts == {"total": 1, "compliant": 1, "non_compliant": 0, "warnings": 0}
+
+    def test_non_compliant_rules(self, rules):
+        """Test each non-compliant rule on its own row."""
+        rows = [
+            movement(movement_id="adj", movement_type="AJUSTE_POSITIVO"),
+            movement(movement_id="hv", total_value="7500.00"),
+            movement(movement_id="rl", destination_location="COFRE"),
+            movement(movement_id="dc", movement_type="SAIDA", destination_location="DESCARTE"),
+            movement(movement_id="cp", movement_type="TRANSFERENCIA", destination_project="P-2"),
+        ]
+        findings, counts = evaluate_chunk(rows, rules)
+
+        by_movement = {}
+        for finding in findings:
+            by_movement.setdefault(finding["movement_id"], set()).add(finding["finding_code"])
+
+        assert FINDING_MISSING_APPROVAL in by_movement["adj"]
+        assert FINDING_HIGH_VALUE in by_movement["hv"]
+        assert FINDING_RESTRICTED_LOCATION in by_movement["rl"]
+        assert FINDING_DISCARD in by_movement["dc"]
+        assert FINDING_CROSS_PROJECT in by_movement["cp"]
+        assert counts["non_compliant"] == 5
+        assert all(f["severity"] == SEVERITY_NON_COMPLIANT for f in findings)
+
+    def test_approval_clears_violations(self, rules):
+        """Test that an approved movement is not flagged as non-compliant."""
+        row = movement(
+            movement_type="AJUSTE_POSITIVO",
+            total_value=9000,
+            destination_location="COFRE",
+            approved_by="manager",
+            approved_at=WEEKDAY_NOON,
+        )
+        findings, counts = evaluate_chunk([row], rules)
+        assert findings == []
+        assert counts["compliant"] == 1
+
+    def test_warnings(self, rules):
+        """Test late approval, off-hours and bulk quantity warnings."""
+        saturday_night = datetime(2026, 10, 17, 23, 0, tzinfo=timezone.utc)
+        rows = [
+            movement(movement_id="late", approved_by="m", approved_at="2026-10-15T09:00:00Z"),
+            movement(movement_id="night", movement_date=saturday_night.isoformat()),
+            movement(movement_id="bulk", quantity=-120),
+        ]
+        findings, counts = evaluate_chunk(rows, rules)
+
+        assert codes(findings) == {FINDING_LATE_APPROVAL, FINDING_OFF_HOURS, FINDING_BULK_QUANTITY}
+        assert counts == {"total": 3, "compliant": 0, "non_compliant": 0, "warnings": 3}
+
+
+# =============================================================================
+# Tests for AuditAccumulator
+# =============================================================================
+
+class TestAuditAccumulator:
+    """Tests for the bounded accumulator."""
+
+    def test_sample_is_bounded_and_prefers_non_compliant(self, rules):
+        """Test that the sample keeps non-compliant findings over warnings."""
+        accumulator = AuditAccumulator(sample_limit=2)
+        warnings = [movement(movement_id=f"w{i}", quantity=100) for i in range(3)]
+        violations = [movement(movement_id="v", movement_type="AJUSTE_POSITIVO")]
+
+        accumulator.add(*evaluate_chunk(warnings, rules))
+        accumulator.add(*evaluate_chunk(violations, rules))
+
+        assert len(accumulator.sample) == 2
+        assert any(f["severity"] == SEVERITY_NON_COMPLIANT for f in accumulator.sample)
+        assert accumulator.counts["total"] == 4
+        assert accumulator.findings_by_code[FINDING_BULK_QUANTITY] == 3
+
+    def test_recommendations_ordered_by_frequency(self):
+        """Test that recommendations follow finding frequency."""
+        recommendations = build_recommendations({
+            FINDING_OFF_HOURS: 1,
+            FINDING_MISSING_APPROVAL: 5,
+            "UNKNOWN": 3,
+        })
+        assert len(recommendations) == 2
+        assert "(5 ocorrência(s))" in recommendations[0]
+
+
+# =============================================================================
+# Tests for Invocation Budget and Resumable Runs
+# =============================================================================
+
+class TestAuditInvocation:
+    """Tests for the gateway/Lambda contract of sga_audit_compliance."""
+
+    @pytest.mark.asyncio
+    async def test_pass_budget_and_timeout_below_lambda_timeout(self):
+        """Test that a pass never asks for more than the Lambda can run."""
+        mcp = MagicMock()
+        mcp.call_tool_async = AsyncMock(return_value={"success": True, "status": "RUNNING"})
+        adapter = GatewayPostgresAdapter(mcp)
+
+        await adapter.audit_compliance(rules={"version": "v1"}, run_id="r1", max_seconds=240)
+
+        kwargs = mcp.call_tool_async.await_args.kwargs
+        assert kwargs["arguments"]["max_seconds"] <= 20
+        assert kwargs["arguments"]["max_seconds"] < kwargs["timeout"] < 30
+
+    @pytest.mark.asyncio
+    async def test_start_creates_run_without_rules_payload(self):
+        """Test that the start call only sends the rules version."""
+        mcp = MagicMock()
+        mcp.call_tool_async = AsyncMock(return_value={"success": True, "run_id": "r1"})
+        adapter = GatewayPostgresAdapter(mcp)
+
+        result = await adapter.start_compliance_audit(rules_version="v1", start_date="2026-01-01")
+
+        assert result["run_id"] == "r1"
+        kwargs = mcp.call_tool_async.await_args.kwargs
+        assert kwargs["tool_name"] == "SGAPostgresTools___sga_start_compliance_audit"
+        assert kwargs["arguments"] == {"rules_version": "v1", "start_date": "2026-01-01"}
+
+    def test_lambda_clamps_max_seconds(self, monkeypatch, rules):
+        """Test that the Lambda handler caps the budget of a pass."""
+        from tools import postgres_tools_lambda
+
+        captured = {}
+        monkeypatch.setitem(sys.modules, "postgres_client", postgres_client)
+        monkeypatch.setattr(SGAPostgresClient, "__init__", lambda self: None)
+        monkeypatch.setattr(
+            SGAPostgresClient, "run_compliance_audit",
+            lambda self, **kwargs: captured.update(kwargs) or {"success": True},
+        )
+
+        postgres_tools_lambda.handle_audit_compliance({"rules": rules, "max_seconds": 240})
+
+        assert captured["max_seconds"] == postgres_tools_lambda.MAX_AUDIT_SECONDS <= 20
+
+    def test_new_run_is_created_before_streaming(self, monkeypatch, rules):
+        """Test that the run row exists even if streaming fails."""
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        client._get_connection = MagicMock()
+        client._execute_query = MagicMock(return_value=[{
+            "run_id": "r1", "status": "RUNNING", "period_start": None, "period_end": None,
+            "location_code": None, "project_code": None, "checkpoint_movement_date": None,
+        }])
+        client._connect = MagicMock(side_effect=ConnectionError("timeout"))
+
+        with pytest.raises(ConnectionError):
+            client.run_compliance_audit(rules=rules)
+
+        insert = client._execute_query.call_args_list[0].args[0]
+        assert "INSERT INTO sga.compliance_audit_runs" in insert
+        client._get_connection.return_value.commit.assert_called_once()
@@ -132,6 +132,144 @@ class TestAnalyzeErrorTool:
                 assert result["success"] is True
 
 
+class TestAnalyzeErrorCache:
+    """Tests for concurrent evidence gathering and the signature cache."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        from agents.specialists.debug.tools.analyze_error import clear_analysis_cache
+
+        clear_analysis_cache()
+        yield
+        clear_analysis_cache()
+
+    @pytest.mark.asyncio
+    async def test_lookups_run_concurrently(self):
+        """Memory and documentation lookups overlap instead of running in sequence."""
+        import asyncio
+
+        running = {"now": 0, "peak": 0}
+
+        async def slow_lookup(result, **kwargs):
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.05)
+            running["now"] -= 1
+            return result
+
+        async def memory(**kwargs):
+            return await slow_lookup({"success": True, "patterns": []}, **kwargs)
+
+        async def docs(**kwargs):
+            return await slow_lookup({"success": True, "results": [{"title": "doc"}]}, **kwargs)
+
+        with patch("agents.specialists.debug.tools.query_memory_patterns.query_memory_patterns_tool", side_effect=memory):
+            with patch("agents.specialists.debug.tools.search_documentation.search_documentation_tool", side_effect=docs):
+                from agents.specialists.debug.tools.analyze_error import analyze_error_tool
+
+                result = await analyze_error_tool(
+                    error_type="TimeoutError",
+                    message="Gateway timed out",
+                    operation="call_gateway",
+                )
+
+        assert running["peak"] == 2
+        assert result["documentation_links"] == [{"title": "doc"}]
+        assert result["cache_hit"] is False
+
+    @pytest.mark.asyncio
+    async def test_lookup_timeout_is_independent(self):
+        """A hanging documentation search does not lose memory patterns."""
+        import asyncio
+
+        async def docs(**kwargs):
+            await asyncio.sleep(10)
+
+        memory = AsyncMock(return_value={"success": True, "patterns": [{"pattern_id": "p1", "resolution": "retry"}]})
+
+        with patch("agents.specialists.debug.tools.query_memory_patterns.query_memory_patterns_tool", memory):
+            with patch("agents.specialists.debug.tools.search_documentation.search_documentation_tool", side_effect=docs):
+                with patch("agents.specialists.debug.tools.analyze_error.DOCS_LOOKUP_TIMEOUT", 0.05):
+                    from agents.specialists.debug.tools.analyze_error import analyze_error_tool, get_analysis_cache_stats
+
+                    result = await analyze_error_tool(
+                        error_type="ValueError",
+                        message="Hanging docs",
+                        operation="op",
+                    )
+
+        assert result["similar_patterns"][0]["pattern_id"] == "p1"
+        assert result["documentation_links"] == []
+        # Degraded analyses are not cached
+        assert get_analysis_cache_stats()["entries"] == 0
+
+    @pytest.mark.asyncio
+    async def test_repeated_signature_served_from_cache(self):
+        """Identical errors reuse the cached analysis."""
+        memory = AsyncMock(return_value={"success": True, "patterns": []})
+        docs = AsyncMock(return_value={"success": True, "results": []})
+
+        with patch("agents.specialists.debug.tools.query_memory_patterns.query_memory_patterns_tool", memory):
+            with patch("agents.specialists.debug.tools.search_documentation.search_documentation_tool", docs):
+                from agents.specialists.debug.tools.analyze_error import analyze_error_tool, get_analysis_cache_stats
+
+                first = await analyze_error_tool(error_type="KeyError", message="missing id 1", operation="op")
+                second = await analyze_error_tool(error_type="KeyError", message="missing id 2", operation="op")
+
+        assert memory.await_count == 1
+        assert docs.await_count == 1
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert get_analysis_cache_stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_concurrent_identical_errors_single_flight(self):
+        """A storm of identical errors triggers a single analysis."""
+        import asyncio
+
+        async def memory(**kwargs):
+            await asyncio.sleep(0.05)
+            return {"success": True, "patterns": []}
+
+        memory_mock = AsyncMock(side_effect=memory)
+        docs = AsyncMock(return_value={"success": True, "results": []})
+
+        with patch("agents.specialists.debug.tools.query_memory_patterns.query_memory_patterns_tool", memory_mock):
+            with patch("agents.specialists.debug.tools.search_documentation.search_documentation_tool", docs):
+                from agents.specialists.debug.tools.analyze_error import analyze_error_tool, get_analysis_cache_stats
+
+                results = await asyncio.gather(*[
+                    analyze_error_tool(error_type="TimeoutError", message=f"timeout after {i}s", operation="op")
+                    for i in range(50)
+                ])
+
+        assert memory_mock.await_count == 1
+        assert all(r["success"] for r in results)
+        assert sum(1 for r in results if r["cache_hit"]) == 49
+        stats = get_analysis_cache_stats()
+        assert stats["coalesced"] == 49
+        assert stats["hit_rate"] == pytest.approx(49 / 50)
+
+    @pytest.mark.asyncio
+    async def test_cached_result_respects_recoverable_override(self):
+        """Callers overriding recoverable get a consistent suggested action."""
+        memory = AsyncMock(return_value={"success": True, "patterns": []})
+        docs = AsyncMock(return_value={"success": True, "results": []})
+
+        with patch("agents.specialists.debug.tools.query_memory_patterns.query_memory_patterns_tool", memory):
+            with patch("agents.specialists.debug.tools.search_documentation.search_documentation_tool", docs):
+                from agents.specialists.debug.tools.analyze_error import analyze_error_tool
+
+                await analyze_error_tool(error_type="ValueError", message="bad", operation="op")
+                result = await analyze_error_tool(
+                    error_type="ValueError", message="bad", operation="op", recoverable=True,
+                )
+
+        assert result["cache_hit"] is True
+        assert result["recoverable"] is True
+        assert result["suggested_action"] == "retry"
+
+
 # =============================================================================
 # Tests for search_documentation Tool
 # =============================================================================
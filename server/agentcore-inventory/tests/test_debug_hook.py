@@ -9,6 +9,7 @@
 # - Circuit breaker integration
 # - Timeout handling
 # - Graceful degradation when Debug Agent is unavailable
+# - Background enrichment with dedup, rate limiting and sync tools
 #
 # Run: cd server/agentcore-inventory && python -m pytest tests/test_debug_hook.py -v
 # =============================================================================
@@ -82,6 +83,20 @@ def mock_a2a_client():
     return client
 
 
+@pytest.fixture(autouse=True)
+def isolated_enrichment(monkeypatch):
+    """Fresh dedup/rate-limit state; audit log publishing is mocked."""
+    from collections import deque
+    from shared.hooks import debug_hook as module
+
+    monkeypatch.setattr(module, "_signatures_seen", {})
+    monkeypatch.setattr(module, "_recent_enrichments", deque())
+    monkeypatch.setattr(module, "_gate_stats", {"duplicates": 0, "rate_limited": 0, "published": 0})
+    publish = MagicMock(return_value=True)
+    monkeypatch.setattr("shared.audit_emitter.emit_agent_event", publish)
+    return publish
+
+
 @pytest.fixture
 def debug_hook(mock_a2a_client):
     """Create DebugHook with mocked dependencies."""
@@ -210,6 +225,7 @@ class TestToolErrorInterception:
         event = MockAfterToolCallEvent(tool_name="failing_tool", error=error)
 
         await debug_hook._on_tool_end(event)
+        await debug_hook.flush()
 
         # A2A client should be called
         mock_a2a_client.invoke_agent.assert_called_once()
@@ -271,6 +287,7 @@ class TestInvocationErrorInterception:
         )
 
         await debug_hook._on_invocation_end(event)
+        await debug_hook.flush()
 
         # Should call A2A client
         mock_a2a_client.invoke_agent.assert_called_once()
@@ -528,3 +545,88 @@ class TestStackTraceExtraction:
         error.__traceback__ = None
         trace = debug_hook._get_stack_trace(error)
         assert trace is None
+
+
+# =============================================================================
+# Tests for Background Enrichment
+# =============================================================================
+
+class TestBackgroundEnrichment:
+    """Tests for queued, deduplicated, rate-limited enrichment."""
+
+    @pytest.mark.asyncio
+    async def test_tool_error_does_not_wait_for_debug_agent(self, debug_hook, mock_a2a_client):
+        """Test that the callback returns before the Debug Agent answers."""
+        async def slow_invoke(*args, **kwargs):
+            await asyncio.sleep(0.3)
+            return MockA2AResult(success=True, response={"analysis": {}})
+
+        mock_a2a_client.invoke_agent = AsyncMock(side_effect=slow_invoke)
+        event = MockAfterToolCallEvent(tool_name="failing_tool", error=ValueError("boom"))
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await debug_hook._on_tool_end(event)
+        assert loop.time() - started < 0.1
+
+        assert await debug_hook.flush() is True
+        mock_a2a_client.invoke_agent.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_result_published_to_session(self, debug_hook, isolated_enrichment):
+        """Test that the analysis is attached to the session audit log."""
+        await debug_hook._dispatch(
+            ValueError("boom"), "failing_tool", "tool_call", {"session_id": "sess_1"}
+        )
+        await debug_hook.flush()
+
+        args = isolated_enrichment.call_args.args
+        assert args[0] == "debug" and args[3] == "sess_1"
+        assert args[4]["operation"] == "failing_tool"
+        assert "debug_analysis" in args[4]
+        assert debug_hook.get_enrichment_stats()["published"] == 1
+
+    @pytest.mark.asyncio
+    async def test_same_signature_is_deduplicated(self, debug_hook, mock_a2a_client):
+        """Test that errors differing only in ids share one enrichment."""
+        first = await debug_hook._dispatch(KeyError("part 12345 not found"), "get_part", "tool_call")
+        second = await debug_hook._dispatch(KeyError("part 67890 not found"), "get_part", "tool_call")
+        await debug_hook.flush()
+
+        assert first["reason"] == "queued"
+        assert second["reason"] == "duplicate"
+        mock_a2a_client.invoke_agent.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_rate_limit(self, debug_hook, mock_a2a_client):
+        """Test that enrichments beyond rate_per_minute are skipped."""
+        debug_hook.rate_per_minute = 2
+
+        reasons = [
+            (await debug_hook._dispatch(ValueError("x"), f"tool_{i}", "tool_call"))["reason"]
+            for i in range(4)
+        ]
+        await debug_hook.flush()
+
+        assert reasons == ["queued", "queued", "rate_limited", "rate_limited"]
+        assert mock_a2a_client.invoke_agent.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_sync_tool_is_enriched_inline(self, debug_hook, mock_a2a_client):
+        """Test that configured tools keep the inline enrichment result."""
+        debug_hook.sync_tools = {"critical_tool"}
+
+        result = await debug_hook._dispatch(ValueError("boom"), "critical_tool", "tool_call")
+
+        assert result["enriched"] is True
+        mock_a2a_client.invoke_agent.assert_called_once()
+
+    def test_sync_tools_from_environment(self):
+        """Test DEBUG_HOOK_SYNC_TOOLS parsing."""
+        import os
+
+        with patch.dict(os.environ, {"DEBUG_HOOK_SYNC_TOOLS": "a, b"}):
+            with patch("shared.hooks.debug_hook.CircuitBreaker"):
+                from shared.hooks.debug_hook import DebugHook
+
+                assert DebugHook().sync_tools == {"a", "b"}
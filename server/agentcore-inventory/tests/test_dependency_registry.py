@@ -0,0 +1,304 @@
+# =============================================================================
+# Tests for Dependency Registry
+# =============================================================================
+# Unit tests for shared/dependency_registry.py (adaptive concurrency limits,
+# wait queue, load shedding, circuit breaker, latency histograms).
+#
+# These tests verify:
+# - The limit grows under flat latency and shrinks on latency growth/failures
+# - Plain AIMD limits ignore task-dependent latency and shrink on failures only
+# - Saturated dependencies shed immediately or after the queue timeout
+# - A queued call waits at least its own timeout for a slot
+# - Queued sync and async callers are handed slots in order
+# - The circuit breaker opens on failures; 4xx errors are not failures
+# - guarded() and guarded_httpx_transport() wrap calls
+# - A2A delegations to one agent run concurrently inside the guard
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_dependency_registry.py -v
+# =============================================================================
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from shared.dependency_registry import (
+    AdaptiveLimit,
+    Dependency,
+    DependencySaturatedError,
+    DependencyUnavailableError,
+    LatencyHistogram,
+    get_dependency_registry,
+    guarded,
+    guarded_httpx_transport,
+    is_server_failure,
+)
+
+
+def http_error(status):
+    error = Exception(f"HTTP {status}")
+    error.response = SimpleNamespace(status_code=status)
+    return error
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles_are_bucket_bounds(self):
+        histogram = LatencyHistogram([10, 100, 1000])
+        for ms in [1, 2, 3, 4, 5, 6, 7, 8, 50, 5000]:
+            histogram.observe(ms)
+
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(90) == 100
+        assert histogram.percentile(100) == float("inf")
+        assert histogram.to_dict()["buckets"] == {"le_10": 8, "le_100": 1, "le_1000": 0, "inf": 1}
+
+
+class TestAdaptiveLimit:
+    """Tests for AdaptiveLimit."""
+
+    def test_grows_while_saturated_with_flat_latency(self):
+        limit = AdaptiveLimit(initial=4, maximum=100)
+        for _ in range(100):
+            limit.on_success(10, in_flight=limit.current)
+
+        assert limit.current > 4
+
+    def test_does_not_grow_when_underused(self):
+        limit = AdaptiveLimit(initial=10)
+        for _ in range(100):
+            limit.on_success(10, in_flight=1)
+
+        assert limit.current == 10
+
+    def test_shrinks_on_latency_growth_and_failure(self):
+        limit = AdaptiveLimit(initial=32, tolerance=2.0)
+        limit.on_success(10, in_flight=1)
+        limit.on_success(80, in_flight=1)  # 4x baseline -> gradient 0.5
+        assert limit.current == 16
+
+        limit.on_failure()
+        assert limit.current == 11
+
+    def test_plain_aimd_ignores_task_dependent_latency(self):
+        """Test that mixed fast/slow tools at low concurrency keep the limit."""
+        latencies_ms = [900, 25000, 3000, 12000, 1500, 20000, 950, 8000]
+        gradient = AdaptiveLimit(initial=16)
+        plain = AdaptiveLimit(initial=16, tolerance=None)
+        for i in range(40):
+            gradient.on_success(latencies_ms[i % len(latencies_ms)], in_flight=1 + i % 3)
+            plain.on_success(latencies_ms[i % len(latencies_ms)], in_flight=1 + i % 3)
+
+        assert gradient.current == 1
+        assert plain.current == 16
+
+        plain.on_failure()
+        assert plain.current == 11
+
+
+class TestSaturation:
+    """Tests for the wait queue and load shedding."""
+
+    def test_sheds_immediately_when_queue_full(self):
+        dependency = Dependency("test", initial_limit=1, max_limit=1, max_queue=0)
+        holding, release = threading.Event(), threading.Event()
+
+        def hold():
+            with dependency.guard():
+                holding.set()
+                release.wait(2)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait(2)
+
+        started = time.perf_counter()
+        with pytest.raises(DependencySaturatedError, match="saturada"):
+            with dependency.guard():
+                pass
+        assert time.perf_counter() - started < 0.1
+
+        release.set()
+        thread.join()
+        assert dependency.get_stats()["shed"] == 1
+
+    def test_queue_timeout_sheds(self):
+        dependency = Dependency("test", initial_limit=1, max_limit=1, queue_timeout=0.05)
+        with dependency.guard():
+            with pytest.raises(DependencySaturatedError):
+                with dependency.guard():
+                    pass
+        assert dependency.get_stats()["waiting"] == 0
+
+    def test_queue_waits_for_call_timeout(self):
+        dependency = Dependency("test", initial_limit=1, max_limit=1, queue_timeout=0.01)
+        holding = threading.Event()
+
+        def hold():
+            with dependency.guard():
+                holding.set()
+                time.sleep(0.1)
+
+        thread = threading.Thread(target=hold)
+        thread.start()
+        holding.wait(2)
+
+        with dependency.guard(wait_timeout=2):
+            pass
+        thread.join()
+        stats = dependency.get_stats()
+        assert (stats["successes"], stats["queued"], stats["shed"]) == (2, 1, 0)
+
+    @pytest.mark.asyncio
+    async def test_queued_async_callers_run_one_at_a_time(self):
+        dependency = Dependency("test", initial_limit=1, max_limit=1)
+        active, peak = 0, 0
+
+        async def call(i):
+            nonlocal active, peak
+            async with dependency.guard_async():
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.02)
+                active -= 1
+            return i
+
+        assert await asyncio.gather(*(call(i) for i in range(5))) == [0, 1, 2, 3, 4]
+        stats = dependency.get_stats()
+        assert peak == 1
+        assert (stats["successes"], stats["queued"], stats["in_flight"]) == (5, 4, 0)
+
+    @pytest.mark.asyncio
+    async def test_sync_waiter_gets_slot_freed_by_async_caller(self):
+        dependency = Dependency("test", initial_limit=1, max_limit=1)
+
+        def sync_call():
+            with dependency.guard():
+                return "done"
+
+        async with dependency.guard_async():
+            waiter = asyncio.get_running_loop().run_in_executor(None, sync_call)
+            await asyncio.sleep(0.05)
+            assert dependency.get_stats()["waiting"] == 1
+
+        assert await waiter == "done"
+        stats = dependency.get_stats()
+        assert (stats["successes"], stats["queued"], stats["in_flight"]) == (2, 1, 0)
+
+
+class TestCircuitBreaker:
+    """Tests for breaker integration."""
+
+    def test_opens_after_failures(self):
+        dependency = Dependency("test", failure_threshold=2, reset_timeout=60)
+
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                with dependency.guard():
+                    raise RuntimeError("down")
+
+        with pytest.raises(DependencyUnavailableError):
+            with dependency.guard():
+                pass
+        stats = dependency.get_stats()
+        assert (stats["circuit"], stats["rejected_open"], stats["in_flight"]) == ("open", 1, 0)
+
+    def test_client_errors_do_not_count(self):
+        dependency = Dependency("test", failure_threshold=1)
+
+        with pytest.raises(Exception):
+            with dependency.guard(is_server_failure):
+                raise http_error(404)
+
+        assert dependency.get_stats()["circuit"] == "closed"
+        assert is_server_failure(http_error(429)) and is_server_failure(http_error(503))
+        assert is_server_failure(ConnectionError())
+
+
+class TestWrappers:
+    """Tests for guarded() and guarded_httpx_transport()."""
+
+    @pytest.mark.asyncio
+    async def test_guarded_sync_and_async(self):
+        @guarded("test:decorated-sync")
+        def sync_call(x):
+            return x * 2
+
+        @guarded("test:decorated-async")
+        async def async_call(x):
+            return x * 3
+
+        assert sync_call(2) == 4
+        assert await async_call(2) == 6
+        stats = get_dependency_registry().get_stats()
+        assert stats["test:decorated-sync"]["successes"] == 1
+        assert stats["test:decorated-async"]["latency"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_guarded_waits_for_timeout_argument(self):
+        name = "test:decorated-timeout"
+
+        @guarded(name, timeout_arg="timeout", initial_limit=1, max_limit=1, queue_timeout=0.01)
+        async def call(x, timeout=2.0):
+            return x
+
+        async with get_dependency_registry().get(name).guard_async():
+            waiter = asyncio.ensure_future(call(1))
+            await asyncio.sleep(0.1)
+
+        assert await waiter == 1
+        assert get_dependency_registry().get_stats()[name]["shed"] == 0
+
+    @pytest.mark.asyncio
+    async def test_httpx_transport_counts_server_errors(self, monkeypatch):
+        async def handle(self, request):
+            return httpx.Response(503 if request.url.path == "/down" else 200)
+
+        monkeypatch.setattr(httpx.AsyncHTTPTransport, "handle_async_request", handle)
+        name = "test:httpx"
+        async with httpx.AsyncClient(transport=guarded_httpx_transport(lambda r: f"{name}:{r.url.host}")) as client:
+            assert (await client.get("http://carrier.example/ok")).status_code == 200
+            assert (await client.get("http://carrier.example/down")).status_code == 503
+
+        stats = get_dependency_registry().get_stats()[f"{name}:carrier.example"]
+        assert (stats["successes"], stats["failures"]) == (1, 1)
+
+
+class TestA2AGuard:
+    """A2A delegations hold a guard slot without blocking the event loop."""
+
+    @pytest.mark.asyncio
+    async def test_delegations_overlap(self, monkeypatch):
+        import shared.a2a_client as a2a_client
+
+        agent_id = next(iter(a2a_client.RUNTIME_IDS))
+        # Both calls must be inside invoke_agent_runtime at the same time
+        barrier = threading.Barrier(2, timeout=5)
+
+        class FakeBody:
+            def read(self):
+                return b'{"jsonrpc": "2.0", "result": {}}'
+
+        class FakeRuntime:
+            def invoke_agent_runtime(self, **kwargs):
+                barrier.wait()
+                return {"response": FakeBody()}
+
+        monkeypatch.setattr(
+            a2a_client, "_get_boto3",
+            lambda: SimpleNamespace(client=lambda *args, **kwargs: FakeRuntime()),
+        )
+        client = a2a_client.A2AClient(use_discovery=False)
+
+        results = await asyncio.gather(
+            client.invoke_agent(agent_id, {"action": "ping"}),
+            client.invoke_agent(agent_id, {"action": "ping"}),
+        )
+
+        assert [r.error for r in results] == [None, None]
+        stats = get_dependency_registry().get_stats()[f"a2a:{agent_id}"]
+        assert stats["successes"] >= 2
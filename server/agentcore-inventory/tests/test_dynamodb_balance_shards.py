@@ -0,0 +1,233 @@
+# =============================================================================
+# Tests for Sharded Balance Counters
+# =============================================================================
+# Unit tests for SGADynamoDBClient.update_balance/get_balance/compact_balance
+# (tools/dynamodb_client.py) against an in-memory table stand-in.
+#
+# These tests verify:
+# - Cold balances keep the single-item layout
+# - Hot keys (write rate or throttling) switch to shard items
+# - get_balance sums base + shards
+# - Compaction folds shards into the base without changing the balance
+# - Background compaction does not depend on free bulk pool workers
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_dynamodb_balance_shards.py -v
+# =============================================================================
+
+import re
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from tools import dynamodb_client
+from tools.dynamodb_client import HotKeyDetector, SGADynamoDBClient
+
+TABLE = "test-inventory"
+
+
+class ThrottleError(Exception):
+    def __init__(self):
+        super().__init__("throttled")
+        self.response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+
+
+class FakeTable:
+    """
+    In-memory table supporting the expressions used for balances:
+    "SET updated_at = :now ADD a :a, b :b", if_not_exists(shard_count),
+    batch_get_item and transact_write_items.
+    """
+
+    def __init__(self):
+        self.items = {}
+        self.writes = {}
+        self.throttle_pks = set()
+        self.lock = threading.Lock()
+        self.meta = SimpleNamespace(client=self)
+
+    def get_item(self, Key):
+        item = self.items.get((Key["PK"], Key["SK"]))
+        return {"Item": dict(item)} if item else {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ReturnValues=None, **_):
+        key = (Key["PK"], Key["SK"])
+        if Key["PK"] in self.throttle_pks:
+            raise ThrottleError()
+        with self.lock:
+            self.writes[Key["PK"]] = self.writes.get(Key["PK"], 0) + 1
+            item = self.items.setdefault(key, {"PK": key[0], "SK": key[1]})
+            if "if_not_exists(shard_count" in UpdateExpression:
+                item.setdefault("shard_count", ExpressionAttributeValues[":n"])
+                return {"Attributes": {"shard_count": item["shard_count"]}}
+            adds = UpdateExpression.split(" ADD ", 1)[1]
+            for name, placeholder in re.findall(r"(\w+) (:\w+)", adds):
+                item[name] = item.get(name, 0) + ExpressionAttributeValues[placeholder]
+            return {}
+
+    def batch_get_item(self, RequestItems):
+        keys = RequestItems[TABLE]["Keys"]
+        found = [dict(self.items[(k["PK"], k["SK"])]) for k in keys if (k["PK"], k["SK"]) in self.items]
+        return {"Responses": {TABLE: found}}
+
+    def transact_write_items(self, TransactItems):
+        for entry in TransactItems:
+            update = entry["Update"]
+            self.update_item(update["Key"], update["UpdateExpression"], update["ExpressionAttributeValues"])
+
+    def balance_items(self):
+        return {k: v for k, v in self.items.items() if k[0].startswith("BALANCE#")}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    table = FakeTable()
+    monkeypatch.setattr(dynamodb_client, "_get_thread_dynamodb_resource", lambda: table)
+    monkeypatch.setattr(dynamodb_client, "_sharded_balances", {})
+    monkeypatch.setattr(dynamodb_client, "_balance_compacted_at", {})
+    monkeypatch.setattr(dynamodb_client, "_balance_hot_keys", HotKeyDetector(1, 1))
+    monkeypatch.setattr(dynamodb_client, "BALANCE_SHARD_COUNT", 4)
+    monkeypatch.setattr(dynamodb_client, "BALANCE_COMPACT_INTERVAL_SECONDS", 3600)
+    instance = SGADynamoDBClient(table_name=TABLE)
+    instance._table = table
+    return instance, table
+
+
+class TestHotKeyDetector:
+    """Tests for HotKeyDetector."""
+
+    def test_threshold_within_window(self):
+        detector = HotKeyDetector(threshold_per_second=2, window_seconds=5)
+        assert [detector.record("k") for _ in range(10)] == [False] * 9 + [True]
+        assert detector.record("other") is False
+
+
+class TestShardedBalance:
+    """Tests for sharded update_balance/get_balance."""
+
+    def test_cold_balance_uses_single_item(self, client, monkeypatch):
+        instance, table = client
+        monkeypatch.setattr(dynamodb_client, "_balance_hot_keys", HotKeyDetector(1000, 60))
+
+        assert instance.update_balance("LOC", "PN", 5) is True
+        assert instance.update_balance("LOC", "PN", 2, is_reservation=True) is True
+
+        assert list(table.balance_items()) == [("BALANCE#LOC#PN", "METADATA")]
+        balance = instance.get_balance("LOC", "PN")
+        assert (balance["total"], balance["available"], balance["reserved"]) == (5, 3, 2)
+
+    def test_hot_balance_spreads_writes_over_shards(self, client):
+        """Test that a hot key writes to shard items and reads sum them."""
+        instance, table = client
+
+        for i in range(40):
+            assert instance.update_balance("LOC", "PN", 1, shard_key=f"MOV-{i}")
+
+        base = table.items[("BALANCE#LOC#PN", "METADATA")]
+        assert base["shard_count"] == 4
+        shard_writes = [table.writes.get(f"BALANCE#LOC#PN#SHARD#{i}", 0) for i in range(4)]
+        assert sum(shard_writes) == 40 and min(shard_writes) > 0
+
+        balance = instance.get_balance("LOC", "PN")
+        assert (balance["total"], balance["available"]) == (40, 40)
+
+    def test_other_process_reads_shards_from_base_flag(self, client, monkeypatch):
+        """Test that a reader that never wrote the key still sums the shards."""
+        instance, _ = client
+        for _ in range(10):
+            instance.update_balance("LOC", "PN", 3)
+
+        monkeypatch.setattr(dynamodb_client, "_sharded_balances", {})
+        assert instance.get_balance("LOC", "PN")["total"] == 30
+
+    def test_throttled_write_switches_to_shards(self, client, monkeypatch):
+        instance, table = client
+        monkeypatch.setattr(dynamodb_client, "_balance_hot_keys", HotKeyDetector(1000, 60))
+        table.throttle_pks.add("BALANCE#LOC#PN")
+        table.items[("BALANCE#LOC#PN", "METADATA")] = {"PK": "BALANCE#LOC#PN", "SK": "METADATA", "total": 7}
+        original_update = table.update_item
+
+        def update_item(Key, UpdateExpression, **kwargs):
+            # The shard_count flag write itself is not throttled
+            if "shard_count" in UpdateExpression:
+                table.throttle_pks.discard(Key["PK"])
+                try:
+                    return original_update(Key, UpdateExpression, **kwargs)
+                finally:
+                    table.throttle_pks.add(Key["PK"])
+            return original_update(Key, UpdateExpression, **kwargs)
+
+        table.update_item = update_item
+
+        assert instance.update_balance("LOC", "PN", 1) is True
+        assert instance.get_balance("LOC", "PN")["total"] == 8
+
+    def test_sharding_off(self, client, monkeypatch):
+        instance, table = client
+        monkeypatch.setattr(dynamodb_client, "BALANCE_SHARDING", "off")
+
+        for _ in range(10):
+            instance.update_balance("LOC", "PN", 1)
+
+        assert list(table.balance_items()) == [("BALANCE#LOC#PN", "METADATA")]
+
+
+class TestCompaction:
+    """Tests for compact_balance."""
+
+    def test_compaction_preserves_balance(self, client):
+        instance, table = client
+        for i in range(20):
+            instance.update_balance("LOC", "PN", 2, project_id="P1", shard_key=str(i))
+        instance.update_balance("LOC", "PN", 5, project_id="P1", is_reservation=True)
+
+        before = instance.get_balance("LOC", "PN", "P1")
+        result = instance.compact_balance("LOC", "PN", "P1")
+        after = instance.get_balance("LOC", "PN", "P1")
+
+        assert result["shards"] == 4 and result["compacted"] > 0 and result["conflicts"] == 0
+        assert before == after
+        assert (after["total"], after["available"], after["reserved"]) == (40, 35, 5)
+        base = table.items[("BALANCE#LOC#PN", "PROJ#P1")]
+        assert base["total"] == 40
+        assert all(
+            item.get("total", 0) == 0
+            for (pk, _), item in table.balance_items().items() if "#SHARD#" in pk
+        )
+
+    def test_compact_hot_balances(self, client):
+        instance, _ = client
+        for _ in range(5):
+            instance.update_balance("LOC", "PN-A", 1)
+            instance.update_balance("LOC", "PN-B", 1)
+
+        assert instance.compact_hot_balances()["balances"] == 2
+
+    def test_background_compaction_with_busy_bulk_pool(self, client, monkeypatch):
+        """Test that compactions finish while every bulk worker is blocked."""
+        instance, table = client
+        monkeypatch.setattr(dynamodb_client, "BALANCE_COMPACT_INTERVAL_SECONDS", 0)
+        release = threading.Event()
+        executor = dynamodb_client._get_bulk_executor()
+        blockers = [executor.submit(release.wait, 5) for _ in range(dynamodb_client.BULK_WORKERS)]
+
+        def compacted():
+            shards = [item for (pk, _), item in table.balance_items().items() if "#SHARD#" in pk]
+            return shards and all(item.get("total", 0) == 0 for item in shards)
+
+        try:
+            for pn in ("PN-A", "PN-B", "PN-C", "PN-D"):
+                for i in range(5):
+                    instance.update_balance("LOC", pn, 1, shard_key=str(i))
+
+            deadline = time.monotonic() + 2
+            while not compacted() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert compacted()
+        finally:
+            release.set()
+            for blocker in blockers:
+                blocker.result()
+
+        assert all(instance.get_balance("LOC", pn)["total"] == 5 for pn in ("PN-A", "PN-B", "PN-C", "PN-D"))
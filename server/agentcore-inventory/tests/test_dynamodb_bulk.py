@@ -0,0 +1,192 @@
+# =============================================================================
+# Tests for SGADynamoDBClient Bulk I/O
+# =============================================================================
+# Unit tests for batch_write/batch_get/bulk_put/bulk_get
+# (tools/dynamodb_client.py) against an in-memory DynamoDB stand-in that
+# injects throttling.
+#
+# These tests verify:
+# - Unprocessed items/keys are retried until written or read
+# - Throttling exceptions are retried and counted
+# - Chunks run concurrently, bulk_put consumes generators lazily
+# - Items still unprocessed after the last attempt are reported as failed
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_dynamodb_bulk.py -v
+# =============================================================================
+
+import threading
+import time
+
+import pytest
+
+from tools import dynamodb_client
+from tools.dynamodb_client import SGADynamoDBClient
+
+TABLE = "test-inventory"
+
+
+class ThrottleError(Exception):
+    def __init__(self):
+        super().__init__("throttled")
+        self.response = {"Error": {"Code": "ProvisionedThroughputExceededException"}}
+
+
+class FakeDynamoDB:
+    """
+    In-memory stand-in for the batch APIs of a DynamoDB resource.
+
+    Each request processes at most `capacity` items/keys and returns the
+    rest as unprocessed; the first `throttle_calls` requests raise.
+    """
+
+    def __init__(self, capacity=100, throttle_calls=0, delay=0.0):
+        self.capacity = capacity
+        self.throttle_calls = throttle_calls
+        self.delay = delay
+        self.items = {}
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def _enter(self):
+        with self.lock:
+            self.calls += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            throttled = self.throttle_calls > 0
+            self.throttle_calls -= throttled
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if throttled:
+            raise ThrottleError()
+
+    def batch_write_item(self, RequestItems):
+        self._enter()
+        requests = RequestItems[TABLE]
+        assert len(requests) <= 25
+        keys = [(r["PutRequest"]["Item"]["PK"], r["PutRequest"]["Item"]["SK"]) for r in requests]
+        assert len(set(keys)) == len(keys), "duplicate keys in one batch"
+        for request in requests[:self.capacity]:
+            item = request["PutRequest"]["Item"]
+            with self.lock:
+                self.items[(item["PK"], item["SK"])] = dict(item)
+        rest = requests[self.capacity:]
+        return {"UnprocessedItems": {TABLE: rest} if rest else {}}
+
+    def batch_get_item(self, RequestItems):
+        self._enter()
+        keys = RequestItems[TABLE]["Keys"]
+        assert len(keys) <= 100
+        found = [self.items[(k["PK"], k["SK"])] for k in keys[:self.capacity]
+                 if (k["PK"], k["SK"]) in self.items]
+        rest = keys[self.capacity:]
+        return {
+            "Responses": {TABLE: found},
+            "UnprocessedKeys": {TABLE: {"Keys": rest}} if rest else {},
+        }
+
+
+@pytest.fixture
+def fake(monkeypatch):
+    db = FakeDynamoDB()
+    monkeypatch.setattr(dynamodb_client, "_get_thread_dynamodb_resource", lambda: db)
+    monkeypatch.setattr(dynamodb_client, "_backoff", lambda attempt: None)
+    return db
+
+
+def make_items(count):
+    return [{"PK": f"ASSET#{i}", "SK": "METADATA", "n": i} for i in range(count)]
+
+
+class TestBulkPut:
+    """Tests for bulk_put/batch_write."""
+
+    def test_unprocessed_items_are_retried(self, fake):
+        """Test that partially processed batches are resent until written."""
+        fake.capacity = 10
+        client = SGADynamoDBClient(table_name=TABLE)
+
+        stats = client.bulk_put(make_items(60))
+
+        assert stats["success"] is True
+        assert stats["items_written"] == 60 and len(fake.items) == 60
+        # 3 chunks (25, 25, 10): 3 + 3 + 1 requests
+        assert stats["batches"] == 7 and stats["retries"] == 4
+        assert client.last_bulk_stats is stats
+
+    def test_throttling_is_retried(self, fake):
+        fake.throttle_calls = 3
+        client = SGADynamoDBClient(table_name=TABLE)
+
+        assert client.batch_write(make_items(50)) is True
+        assert client.last_bulk_stats["throttles"] == 3
+        assert len(fake.items) == 50
+
+    def test_gives_up_after_max_attempts(self, fake, monkeypatch):
+        """Test that items never processed make the call fail."""
+        monkeypatch.setattr(dynamodb_client, "BULK_MAX_ATTEMPTS", 2)
+        fake.capacity = 5
+        client = SGADynamoDBClient(table_name=TABLE)
+
+        stats = client.bulk_put(make_items(25))
+
+        assert stats["success"] is False
+        assert stats["items_written"] == 10 and stats["items_failed"] == 15
+        assert client.batch_write(make_items(25)) is False
+
+    def test_streams_generator_with_concurrent_chunks(self, fake):
+        """Test lazy consumption and more than one request in flight."""
+        fake.delay = 0.02
+        consumed = []
+
+        def generate():
+            for item in make_items(200):
+                consumed.append(item["n"])
+                yield item
+
+        stats = SGADynamoDBClient(table_name=TABLE).bulk_put(generate())
+
+        assert stats["items_written"] == 200 and len(consumed) == 200
+        assert fake.peak > 1
+        assert all("updated_at" in item for item in fake.items.values())
+
+    def test_duplicate_keys_keep_last(self, fake):
+        items = [{"PK": "A", "SK": "METADATA", "v": 1}, {"PK": "A", "SK": "METADATA", "v": 2}]
+
+        stats = SGADynamoDBClient(table_name=TABLE).bulk_put(items)
+
+        assert stats["items"] == 1 and stats["success"] is True
+        assert fake.items[("A", "METADATA")]["v"] == 2
+
+
+class TestBulkGet:
+    """Tests for bulk_get/batch_get."""
+
+    def test_unprocessed_keys_are_retried(self, fake):
+        fake.items = {(i["PK"], i["SK"]): i for i in make_items(250)}
+        fake.capacity = 40
+        fake.throttle_calls = 1
+        keys = [{"PK": f"ASSET#{i}", "SK": "METADATA"} for i in range(250)]
+
+        items, stats = SGADynamoDBClient(table_name=TABLE).bulk_get(keys + keys[:5])
+
+        assert sorted(i["n"] for i in items) == list(range(250))
+        assert stats["keys"] == 250 and stats["keys_failed"] == 0
+        assert stats["throttles"] == 1 and stats["success"] is True
+
+    def test_batch_get_returns_found_items(self, fake):
+        fake.items = {("A", "METADATA"): {"PK": "A", "SK": "METADATA"}}
+
+        items = SGADynamoDBClient(table_name=TABLE).batch_get(
+            [{"PK": "A", "SK": "METADATA"}, {"PK": "B", "SK": "METADATA"}]
+        )
+
+        assert items == [{"PK": "A", "SK": "METADATA"}]
+
+    def test_empty_input(self, fake):
+        client = SGADynamoDBClient(table_name=TABLE)
+        assert client.batch_get([]) == []
+        assert client.batch_write([]) is True
+        assert fake.calls == 0
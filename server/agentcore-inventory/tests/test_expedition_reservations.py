@@ -0,0 +1,642 @@
+# =============================================================================
+# Tests for Expedition Stock Verification, Reservations and Completion
+# =============================================================================
+# Unit tests for the expedition verify_stock / process_expedition /
+# separation / complete_expedition tools (agents/specialists/expedition/tools/)
+# and SGAPostgresClient.get_expedition_stock / create_reservations /
+# complete_expedition.
+#
+# These tests verify:
+# - A whole expedition is verified with one sga_get_expedition_stock call
+# - Lines of the same PN share a balance; a serial is used once
+# - All verified items are reserved with one sga_create_reservations call
+#   and a rejected reservation marks the expedition FAILED
+# - The expedition record is stored in DynamoDB and separation is guarded
+#   by the expedition status
+# - Completion ships every item with one sga_complete_expedition call and
+#   marks the expedition COMPLETED only from the status it was read with
+# - create_reservations validates before writing and rolls back on error
+# - Reservation rows, RESERVA movements and reserved serials in one
+#   transaction; completion releases them and ships the stock in one
+#   transaction, once (needs SGA_TEST_DSN)
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_expedition_reservations.py -v
+#      SGA_TEST_DSN=postgresql://... enables the database tests
+# =============================================================================
+
+import os
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tools.gateway_adapter import GatewayPostgresAdapter
+from tools.postgres_client import SGAPostgresClient
+
+TEST_DSN = os.environ.get("SGA_TEST_DSN")
+PREFIX = "SGAPostgresTools___"
+
+
+class FakeGateway:
+    """Stock of PN-Q (10 available at 01) and serialized PN-S assets."""
+
+    def __init__(self):
+        self.calls = []
+        self.reservation_result = None
+        self.completion_result = None
+        self.assets = {
+            "SN-1": {"serial_number": "SN-1", "part_number": "PN-S", "location_id": "02", "status": "IN_STOCK"},
+            "SN-2": {"serial_number": "SN-2", "part_number": "PN-S", "location_id": "02", "status": "IN_STOCK"},
+            "SN-R": {"serial_number": "SN-R", "part_number": "PN-S", "location_id": "02", "status": "RESERVED"},
+            "SN-Q": {"serial_number": "SN-Q", "part_number": "PN-Q", "location_id": "01", "status": "IN_STOCK"},
+        }
+
+    async def call(self, tool_name, arguments, **_):
+        tool = tool_name.replace(PREFIX, "")
+        self.calls.append((tool, arguments))
+        if tool == "sga_get_expedition_stock":
+            pns = {
+                "PN-Q": {"part_number": "PN-Q", "description": "Cabo", "is_serialized": False},
+                "PN-S": {"part_number": "PN-S", "description": "Modem", "is_serialized": True},
+            }
+            return {
+                "project": {"project_id": "P1"} if arguments.get("project_id") in (None, "P1") else None,
+                "part_numbers": [pns[pn] for pn in arguments["part_numbers"] if pn in pns],
+                "assets": [self.assets[s] for s in arguments.get("serial_numbers", []) if s in self.assets],
+                "balances": [
+                    {"part_number": "PN-Q", "location_id": "01", "project_id": "P1", "quantity_available": 10},
+                ],
+            }
+        if tool == "sga_create_reservations":
+            return self.reservation_result or {
+                "success": True,
+                "reservation_ids": [f"R{i}" for i in range(len(arguments["reservations"]))],
+            }
+        if tool == "sga_complete_expedition":
+            return self.completion_result or {
+                "success": True,
+                "movement_ids": ["M1", "M2"],
+                "shipped_quantity": 300,
+            }
+        raise AssertionError(f"unexpected tool {tool}")
+
+    def tools(self):
+        return [tool for tool, _ in self.calls]
+
+
+@pytest.fixture
+def gateway():
+    return FakeGateway()
+
+
+@pytest.fixture
+def adapter(gateway):
+    mcp = MagicMock()
+    mcp.call_tool_async = AsyncMock(side_effect=gateway.call)
+    return GatewayPostgresAdapter(mcp)
+
+
+@pytest.fixture
+def verify_stock(specialist_tools, adapter, monkeypatch):
+    module = specialist_tools("expedition", "verify_stock")
+    monkeypatch.setattr(module, "_get_db_adapter", lambda: adapter)
+    return module
+
+
+@pytest.fixture
+def expedition(specialist_tools, verify_stock, adapter, inventory_table, monkeypatch):
+    module = specialist_tools("expedition", "process_expedition")
+    client, _ = inventory_table
+    monkeypatch.setattr(module, "_get_db", lambda: client)
+    monkeypatch.setattr(module, "_get_db_adapter", lambda: adapter)
+    return module
+
+
+async def process(expedition, items, project_id="P1"):
+    return await expedition.process_expedition_tool(
+        chamado_id="CH-1",
+        project_id=project_id,
+        items=items,
+        destination_client="Cliente",
+        destination_address="Rua 1",
+    )
+
+
+class TestVerifyStock:
+    """Tests for verify_stock_many / verify_stock_item."""
+
+    @pytest.mark.asyncio
+    async def test_one_read_for_the_whole_expedition(self, verify_stock, gateway):
+        items = [{"pn_id": "PN-Q", "quantity": 1} for _ in range(150)]
+        items += [{"pn_id": "PN-S", "serial": s} for s in ("SN-1", "SN-2", "SN-R", "SN-1", "SN-X", "SN-Q")]
+
+        results = await verify_stock.verify_stock_many(items, project_id="P1")
+
+        assert gateway.tools() == ["sga_get_expedition_stock"]
+        _, arguments = gateway.calls[0]
+        assert arguments["part_numbers"] == ["PN-Q", "PN-S"]
+        assert arguments["location_id"] == "01" and arguments["project_id"] == "P1"
+        # Shared balance of 10: the first 10 lines fit, the rest do not
+        assert sum(r["available"] for r in results[:150]) == 10
+        assert "Disponivel: 0" in results[10]["reason"]
+        serial_results = results[150:]
+        assert [r["available"] for r in serial_results] == [True, True, False, False, False, False]
+        assert serial_results[0]["location_id"] == "02"
+        assert "RESERVED" in serial_results[2]["reason"]
+        assert "repetido" in serial_results[3]["reason"]
+        assert "nao encontrado" in serial_results[4]["reason"]
+        assert "outro part number" in serial_results[5]["reason"]
+
+    @pytest.mark.asyncio
+    async def test_single_item_uses_the_same_read(self, verify_stock, gateway):
+        result = await verify_stock.verify_stock_tool("PN-Z")
+
+        assert result["success"] is True and result["available"] is False
+        assert "PN-Z" in result["reason"]
+        assert gateway.tools() == ["sga_get_expedition_stock"]
+
+    @pytest.mark.asyncio
+    async def test_gateway_error_marks_items_unavailable(self, verify_stock, monkeypatch):
+        async def failing(tool_name, arguments, **_):
+            return {"error": "connection reset"}
+        mcp = MagicMock()
+        mcp.call_tool_async = AsyncMock(side_effect=failing)
+        monkeypatch.setattr(verify_stock, "_get_db_adapter", lambda: GatewayPostgresAdapter(mcp))
+
+        results = await verify_stock.verify_stock_many([{"pn_id": "PN-Q"}, {"pn_id": "PN-S"}])
+
+        assert results == [{"available": False, "reason": "connection reset"}] * 2
+
+
+class TestProcessExpedition:
+    """Tests for process_expedition_tool."""
+
+    @pytest.mark.asyncio
+    async def test_reserves_all_items_in_one_call(self, expedition, gateway, inventory_table):
+        client, _ = inventory_table
+        items = [
+            {"pn_id": "PN-Q", "quantity": 4},
+            {"pn_id": "PN-S", "serial": "SN-1"},
+            {"pn_id": "PN-Q", "quantity": 7},
+            {"pn_id": "PN-Q", "quantity": 2, "serial": "ignored"},
+        ]
+
+        result = await process(expedition, items)
+
+        assert result["success"] is True and result["status"] == "PENDING_SEPARATION"
+        assert gateway.tools() == ["sga_get_expedition_stock", "sga_create_reservations"]
+        _, arguments = gateway.calls[1]
+        assert arguments["expedition_id"] == result["expedition_id"]
+        assert arguments["project_id"] == "P1"
+        assert arguments["reservations"] == [
+            {"part_number": "PN-Q", "quantity": 4, "location_id": "01", "serial_number": None},
+            {"part_number": "PN-S", "quantity": 1, "location_id": "02", "serial_number": "SN-1"},
+            {"part_number": "PN-Q", "quantity": 2, "location_id": "01", "serial_number": None},
+        ]
+        assert [i["quantity"] for i in result["unavailable_items"]] == [7]
+
+        stored = client.get_expedition(result["expedition_id"])
+        assert stored["status"] == "PENDING_SEPARATION"
+        assert stored["reservation_ids"] == ["R0", "R1", "R2"]
+        assert len(stored["sap_data"]) == 3
+
+    @pytest.mark.asyncio
+    async def test_unknown_project(self, expedition, gateway, inventory_table):
+        _, table = inventory_table
+
+        result = await process(expedition, [{"pn_id": "PN-Q"}], project_id="P9")
+
+        assert result["success"] is False and "P9" in result["error"]
+        assert gateway.tools() == ["sga_get_expedition_stock"]
+        assert table.items == {}
+
+    @pytest.mark.asyncio
+    async def test_rejected_reservation_fails_the_expedition(self, expedition, gateway, inventory_table):
+        """Test stock taken between verification and reservation."""
+        client, _ = inventory_table
+        gateway.reservation_result = {
+            "success": False,
+            "error": "1 line(s) cannot be reserved",
+            "unavailable": [{"line": 1, "reason": "serial status RESERVED"}],
+        }
+
+        result = await process(expedition, [{"pn_id": "PN-Q"}, {"pn_id": "PN-S", "serial": "SN-2"}])
+
+        assert result["success"] is False and result["status"] == "FAILED"
+        assert [i.get("serial") for i in result["unavailable_items"]] == ["SN-2"]
+        stored = client.get_expedition(result["expedition_id"])
+        assert stored["status"] == "FAILED"
+        assert stored["reservation_error"] == "1 line(s) cannot be reserved"
+
+
+class TestSeparation:
+    """Tests for confirm_separation_tool and get_expedition_tool."""
+
+    @pytest.fixture
+    def separation(self, specialist_tools, inventory_table, monkeypatch):
+        module = specialist_tools("expedition", "separation")
+        client, _ = inventory_table
+        monkeypatch.setattr(module, "_get_db", lambda: client)
+        client.put_expedition({"expedition_id": "EXP_1", "status": "PENDING_SEPARATION", "items": []})
+        return module
+
+    @pytest.mark.asyncio
+    async def test_confirm_and_read_back(self, separation, expedition, inventory_table):
+        client, _ = inventory_table
+
+        result = await separation.confirm_separation_tool("EXP_1", [{"pn_id": "PN-Q"}], {"weight_kg": 1.5})
+        again = await separation.confirm_separation_tool("EXP_1", [], {})
+        stored = await expedition.get_expedition_tool("EXP_1")
+
+        assert result["success"] is True
+        assert again["success"] is False and "SEPARATED" in again["error"]
+        assert stored["expedition"]["status"] == "SEPARATED"
+        assert stored["expedition"]["package_info"] == {"weight_kg": 1.5}
+
+
+class TestCompleteExpedition:
+    """Tests for complete_expedition_tool."""
+
+    @pytest.fixture
+    def completion(self, specialist_tools, adapter, inventory_table, monkeypatch):
+        module = specialist_tools("expedition", "complete_expedition")
+        client, _ = inventory_table
+        monkeypatch.setattr(module, "_get_db", lambda: client)
+        monkeypatch.setattr(module, "_get_db_adapter", lambda: adapter)
+        client.put_expedition({
+            "expedition_id": "EXP_1",
+            "status": "SEPARATED",
+            "destination_client": "Cliente",
+            "items": [{"pn_id": "PN-Q", "quantity": 1} for _ in range(300)],
+        })
+        return module
+
+    @staticmethod
+    async def complete(completion, expedition_id="EXP_1"):
+        return await completion.complete_expedition_tool(expedition_id, "123", "0" * 44, "Correios", "BR1")
+
+    @pytest.mark.asyncio
+    async def test_ships_all_items_in_one_call(self, completion, gateway, inventory_table):
+        client, table = inventory_table
+        table.calls.clear()
+
+        result = await self.complete(completion)
+
+        assert result["success"] is True and result["movements_created"] == ["M1", "M2"]
+        assert gateway.tools() == ["sga_complete_expedition"]
+        _, arguments = gateway.calls[0]
+        assert arguments == {
+            "expedition_id": "EXP_1", "nf_number": "123", "nf_key": "0" * 44, "carrier": "Correios",
+            "tracking_code": "BR1", "destination": "Cliente", "completed_by": "system",
+        }
+        assert table.calls == ["get_item", "update_item"]
+        stored = client.get_expedition("EXP_1")
+        assert stored["status"] == "COMPLETED" and stored["movements"] == ["M1", "M2"]
+
+    @pytest.mark.asyncio
+    async def test_failed_shipment_keeps_the_status(self, completion, gateway, inventory_table):
+        client, _ = inventory_table
+        gateway.completion_result = {"success": False, "error": "No active reservations for expedition: EXP_1"}
+
+        result = await self.complete(completion)
+
+        assert result == {"success": False, "error": "No active reservations for expedition: EXP_1"}
+        assert client.get_expedition("EXP_1")["status"] == "SEPARATED"
+
+    @pytest.mark.asyncio
+    async def test_invalid_status_does_not_ship(self, completion, gateway, inventory_table):
+        client, _ = inventory_table
+        client.update_expedition("EXP_1", {"status": "COMPLETED"})
+
+        result = await self.complete(completion)
+
+        assert result["success"] is False and "COMPLETED" in result["error"]
+        assert gateway.calls == []
+
+    @pytest.mark.asyncio
+    async def test_status_changed_during_completion(self, completion, gateway, inventory_table, monkeypatch):
+        """Test that the status update is conditioned on the status read."""
+        client, _ = inventory_table
+        ship = gateway.call
+
+        async def ship_and_cancel(tool_name, arguments, **kwargs):
+            client.update_expedition("EXP_1", {"status": "CANCELLED"})
+            return await ship(tool_name, arguments, **kwargs)
+
+        monkeypatch.setattr(gateway, "call", ship_and_cancel)
+        mcp = MagicMock()
+        mcp.call_tool_async = AsyncMock(side_effect=gateway.call)
+        monkeypatch.setattr(completion, "_get_db_adapter", lambda: GatewayPostgresAdapter(mcp))
+
+        result = await self.complete(completion)
+
+        assert result["success"] is False and "alterada" in result["error"]
+        assert result["movements_created"] == ["M1", "M2"]
+        assert client.get_expedition("EXP_1")["status"] == "CANCELLED"
+
+
+class TestPostgresExpeditionQueries:
+    """Tests for the batched SGAPostgresClient expedition reads."""
+
+    def test_stock_is_read_with_any_queries(self):
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        executed = []
+
+        def execute(query, params=None, fetch_all=True):
+            executed.append((query, params))
+            return []
+
+        client._execute_query = execute
+
+        stock = client.get_expedition_stock(["PN-A", "PN-B", "PN-A"], ["SN-1"], "01", "P1")
+
+        assert stock == {"project": None, "part_numbers": [], "assets": [], "balances": []}
+        assert len(executed) == 4
+        assert "part_number = ANY(%s)" in executed[1][0] and executed[1][1] == (["PN-A", "PN-B"],)
+        assert "serial_number = ANY(%s)" in executed[2][0]
+        assert executed[3][1] == (["01"], ["PN-A", "PN-B"], ["P1"])
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.executed.append((query, params))
+        self._rows = self.conn.results.pop(0)
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+class TestCreateReservations:
+    """Tests for create_reservations validation (no writes on failure)."""
+
+    REFS = {"project_id": "proj-1", "part_numbers": {"PN-Q": "pn-q", "PN-S": "pn-s"}, "locations": {"01": "loc-1"}}
+
+    def make_client(self, *results):
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        conn = FakeConnection(*results)
+        client._get_connection = lambda: conn
+        return client, conn
+
+    def test_invalid_lines_roll_back_before_writes(self):
+        assets = [
+            {"asset_id": "a-1", "serial_number": "SN-1", "part_number_id": "pn-s",
+             "location_id": "loc-2", "project_id": "proj-1", "status": "RESERVED"},
+        ]
+        balances = [{"part_number_id": "pn-q", "location_id": "loc-1", "project_id": "proj-1", "quantity_available": 5}]
+        client, conn = self.make_client([self.REFS], assets, balances)
+
+        result = client.create_reservations("EXP_1", [
+            {"part_number": "PN-Q", "quantity": 3, "location_id": "01"},
+            {"part_number": "PN-Q", "quantity": 3, "location_id": "01"},
+            {"part_number": "PN-S", "serial_number": "SN-1"},
+            {"part_number": "PN-X", "quantity": 1, "location_id": "01"},
+        ], project_id="P1")
+
+        assert result["success"] is False
+        assert [(u["line"], u["reason"]) for u in result["unavailable"]] == [
+            (0, "insufficient stock (available 5, requested 6)"),
+            (1, "insufficient stock (available 5, requested 6)"),
+            (2, "serial status RESERVED"),
+            (3, "part number not found: PN-X"),
+        ]
+        assert len(conn.executed) == 3
+        assert "FOR UPDATE" in conn.executed[1][0] and "FOR UPDATE OF b" in conn.executed[2][0]
+        assert conn.rolled_back and not conn.committed
+
+    def test_unknown_project(self):
+        client, conn = self.make_client([dict(self.REFS, project_id=None)])
+
+        result = client.create_reservations("EXP_1", [{"part_number": "PN-Q", "location_id": "01"}], project_id="P9")
+
+        assert result == {"success": False, "error": "Project not found: P9"}
+        assert conn.rolled_back
+
+
+# =============================================================================
+# Database tests
+# =============================================================================
+
+class SavepointConnection:
+    """Connection for the client that never commits the test transaction."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        conn.execute("SAVEPOINT client")
+
+    def cursor(self):
+        return self.conn.cursor()
+
+    def commit(self):
+        self.conn.execute("RELEASE SAVEPOINT client")
+        self.conn.execute("SAVEPOINT client")
+
+    def rollback(self):
+        self.conn.execute("ROLLBACK TO SAVEPOINT client")
+
+
+@pytest.fixture
+def pg_stock():
+    """
+    A project, location and two part numbers: PN-Q with 10 units and PN-S
+    with two serials (SN-1, SN-2). Everything is rolled back afterwards.
+    """
+    psycopg = pytest.importorskip("psycopg")
+    from psycopg.rows import dict_row
+
+    tag = uuid.uuid4().hex[:8].upper()
+    codes = {name: f"T{tag}-{name}" for name in ("P", "L", "PN-Q", "PN-S", "SN-1", "SN-2")}
+
+    with psycopg.connect(TEST_DSN, row_factory=dict_row) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO sga.projects (project_code, project_name, client_name) "
+                "VALUES (%s, 'Teste', 'Cliente') RETURNING project_id",
+                (codes["P"],),
+            )
+            project = cur.fetchone()["project_id"]
+            cur.execute(
+                "INSERT INTO sga.locations (location_code, location_name, location_type) "
+                "VALUES (%s, 'Deposito', 'WAREHOUSE') RETURNING location_id",
+                (codes["L"],),
+            )
+            location = cur.fetchone()["location_id"]
+            cur.execute(
+                "INSERT INTO sga.part_numbers (part_number, description, is_serialized) "
+                "VALUES (%s, 'Cabo', FALSE), (%s, 'Modem', TRUE) RETURNING part_number_id",
+                (codes["PN-Q"], codes["PN-S"]),
+            )
+            pn_q, pn_s = (row["part_number_id"] for row in cur.fetchall())
+            cur.execute(
+                "INSERT INTO sga.movements "
+                "(movement_type, part_number_id, quantity, destination_location_id, project_id, created_by) "
+                "VALUES ('ENTRADA', %s, 10, %s, %s, 'test'), ('ENTRADA', %s, 2, %s, %s, 'test')",
+                (pn_q, location, project, pn_s, location, project),
+            )
+            cur.execute(
+                "INSERT INTO sga.assets (serial_number, part_number_id, project_id, location_id) "
+                "VALUES (%s, %s, %s, %s), (%s, %s, %s, %s)",
+                (codes["SN-1"], pn_s, project, location, codes["SN-2"], pn_s, project, location),
+            )
+
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        client._get_connection = lambda: SavepointConnection(conn)
+        yield client, conn, codes
+        conn.rollback()
+
+
+def balances(conn, codes):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT pn.part_number, b.quantity_total, b.quantity_reserved "
+            "FROM sga.balances b JOIN sga.part_numbers pn USING (part_number_id) "
+            "WHERE pn.part_number = ANY(%s) ORDER BY pn.part_number",
+            ([codes["PN-Q"], codes["PN-S"]],),
+        )
+        return {row["part_number"]: (row["quantity_total"], row["quantity_reserved"]) for row in cur.fetchall()}
+
+
+def asset_statuses(conn, codes):
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT serial_number, status::text AS status FROM sga.assets WHERE serial_number = ANY(%s)",
+            ([codes["SN-1"], codes["SN-2"]],),
+        )
+        return {row["serial_number"]: row["status"] for row in cur.fetchall()}
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="SGA_TEST_DSN not set")
+class TestReservationTransaction:
+    """create_reservations against a real database (rolled back)."""
+
+    def test_reserves_lines_movements_and_serials(self, pg_stock):
+        client, conn, codes = pg_stock
+
+        stock = client.get_expedition_stock(
+            [codes["PN-Q"], codes["PN-S"]], [codes["SN-1"]], codes["L"], codes["P"],
+        )
+        result = client.create_reservations("EXP_T1", [
+            {"part_number": codes["PN-Q"], "quantity": 4, "location_id": codes["L"]},
+            {"part_number": codes["PN-Q"], "quantity": 3, "location_id": codes["L"]},
+            {"part_number": codes["PN-S"], "serial_number": codes["SN-1"]},
+        ], project_id=codes["P"], reserved_by="test")
+
+        assert stock["project"]["project_id"] == codes["P"]
+        assert {b["part_number"]: b["quantity_available"] for b in stock["balances"]} == {
+            codes["PN-Q"]: 10, codes["PN-S"]: 2,
+        }
+        assert result["success"] is True
+        assert len(result["reservation_ids"]) == 3
+        assert len(result["movement_ids"]) == 2         # one RESERVA per balance
+        assert balances(conn, codes) == {codes["PN-Q"]: (10, 7), codes["PN-S"]: (2, 1)}
+        assert asset_statuses(conn, codes) == {codes["SN-1"]: "RESERVED", codes["SN-2"]: "IN_STOCK"}
+
+    def test_rejection_writes_nothing(self, pg_stock):
+        client, conn, codes = pg_stock
+
+        result = client.create_reservations("EXP_T2", [
+            {"part_number": codes["PN-S"], "serial_number": codes["SN-2"]},
+            {"part_number": codes["PN-Q"], "quantity": 11, "location_id": codes["L"]},
+        ], project_id=codes["P"])
+
+        assert result["success"] is False
+        assert [u["line"] for u in result["unavailable"]] == [1]
+        assert balances(conn, codes) == {codes["PN-Q"]: (10, 0), codes["PN-S"]: (2, 0)}
+        assert asset_statuses(conn, codes)[codes["SN-2"]] == "IN_STOCK"
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT COUNT(*) AS n FROM sga.reservations WHERE metadata->>'expedition_id' = 'EXP_T2'"
+            )
+            assert cur.fetchone()["n"] == 0
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="SGA_TEST_DSN not set")
+class TestCompletionTransaction:
+    """complete_expedition against a real database (rolled back)."""
+
+    def reserve(self, client, codes, expedition_id):
+        result = client.create_reservations(expedition_id, [
+            {"part_number": codes["PN-Q"], "quantity": 4, "location_id": codes["L"]},
+            {"part_number": codes["PN-Q"], "quantity": 3, "location_id": codes["L"]},
+            {"part_number": codes["PN-S"], "serial_number": codes["SN-1"]},
+        ], project_id=codes["P"], reserved_by="test")
+        assert result["success"] is True
+
+    def test_releases_and_ships_in_one_transaction(self, pg_stock):
+        client, conn, codes = pg_stock
+        expedition_id = f"EXP_{codes['P']}"
+        self.reserve(client, codes, expedition_id)
+
+        result = client.complete_expedition(
+            expedition_id, "123", nf_key="0" * 44, carrier="Correios", completed_by="test",
+        )
+
+        assert result["success"] is True and result["already_completed"] is False
+        assert len(result["movement_ids"]) == 2         # one EXPEDIÇÃO per balance
+        assert (result["released_reservations"], result["shipped_quantity"], result["shipped_serials"]) == (3, 8, 1)
+        assert balances(conn, codes) == {codes["PN-Q"]: (3, 0), codes["PN-S"]: (1, 0)}
+        assert asset_statuses(conn, codes) == {codes["SN-1"]: "IN_TRANSIT", codes["SN-2"]: "IN_STOCK"}
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT movement_type::text AS type, nf_number, metadata->>'carrier' AS carrier "
+                "FROM sga.movements WHERE movement_id = ANY(%s::uuid[])",
+                (result["movement_ids"],),
+            )
+            assert {(r["type"], r["nf_number"], r["carrier"]) for r in cur.fetchall()} == {
+                ("EXPEDIÇÃO", "123", "Correios"),
+            }
+            cur.execute(
+                "SELECT COUNT(*) AS n FROM sga.reservations "
+                "WHERE metadata->>'expedition_id' = %s AND is_active",
+                (expedition_id,),
+            )
+            assert cur.fetchone()["n"] == 0
+
+    def test_retry_does_not_ship_twice(self, pg_stock):
+        client, conn, codes = pg_stock
+        expedition_id = f"EXP_{codes['P']}"
+        self.reserve(client, codes, expedition_id)
+
+        first = client.complete_expedition(expedition_id, "123")
+        retry = client.complete_expedition(expedition_id, "123")
+
+        assert retry["success"] is True and retry["already_completed"] is True
+        assert sorted(retry["movement_ids"]) == sorted(first["movement_ids"])
+        assert balances(conn, codes) == {codes["PN-Q"]: (3, 0), codes["PN-S"]: (1, 0)}
+
+    def test_without_reservations_writes_nothing(self, pg_stock):
+        client, conn, codes = pg_stock
+
+        result = client.complete_expedition(f"EXP_{codes['P']}", "123")
+
+        assert result["success"] is False and "No active reservations" in result["error"]
+        assert balances(conn, codes) == {codes["PN-Q"]: (10, 0), codes["PN-S"]: (2, 0)}
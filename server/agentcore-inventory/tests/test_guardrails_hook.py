@@ -0,0 +1,231 @@
+# =============================================================================
+# Tests for Guardrails Hook
+# =============================================================================
+# Unit tests for GuardrailsHook (shared/hooks/guardrails_hook.py) with a fake
+# bedrock-runtime client. Input checks run on a real Strands Agent with a stub
+# model, so they follow the order in which Strands fires its hook events.
+#
+# These tests verify:
+# - Shadow mode evaluates in the background without blocking the callback
+# - Verdicts are cached by content hash with a TTL
+# - Long content is chunked and evaluated in parallel
+# - Enforce mode blocks the current prompt before the model call, on every turn
+# - Enforce mode never evaluates earlier replies or tool results as input
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_guardrails_hook.py -v
+# =============================================================================
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from strands import Agent, tool
+from strands.models import Model
+
+from shared.hooks.guardrails_hook import GuardrailsHook, GuardrailViolationError
+
+
+class FakeBedrock:
+    """Intervenes when the text contains "proibido"."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+        self.inputs = []
+        self.lock = threading.Lock()
+
+    def apply_guardrail(self, guardrailIdentifier, guardrailVersion, source, content):
+        text = content[0]["text"]["text"]
+        with self.lock:
+            self.calls.append(text)
+            if source == "INPUT":
+                self.inputs.append(text)
+        time.sleep(self.delay)
+        if "proibido" in text:
+            return {"action": "GUARDRAIL_INTERVENED", "assessments": [{"topic": "x"}]}
+        return {"action": "NONE"}
+
+
+def make_hook(bedrock, **kwargs):
+    hook = GuardrailsHook(guardrail_id="gr-1", **kwargs)
+    hook._bedrock_client = bedrock
+    return hook
+
+
+class StubModel(Model):
+    """Replies with fixed text; a None reply calls the lookup tool instead."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies) or ["ok"]
+        self.calls = 0
+
+    def update_config(self, **model_config):
+        pass
+
+    def get_config(self):
+        return {}
+
+    async def structured_output(self, output_model, prompt, system_prompt=None, **kwargs):
+        raise NotImplementedError
+        yield
+
+    async def stream(self, messages, tool_specs=None, system_prompt=None, **kwargs):
+        reply = self.replies[min(self.calls, len(self.replies) - 1)]
+        self.calls += 1
+        yield {"messageStart": {"role": "assistant"}}
+        if reply is None:
+            yield {"contentBlockStart": {"start": {"toolUse": {"toolUseId": f"t{self.calls}", "name": "lookup"}}}}
+            yield {"contentBlockDelta": {"delta": {"toolUse": {"input": "{}"}}}}
+            yield {"contentBlockStop": {}}
+            yield {"messageStop": {"stopReason": "tool_use"}}
+            return
+        yield {"contentBlockStart": {"start": {}}}
+        yield {"contentBlockDelta": {"delta": {"text": reply}}}
+        yield {"contentBlockStop": {}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+
+@tool
+def lookup() -> str:
+    """Return a fixed tool result."""
+    return "resultado proibido"
+
+
+def make_agent(hook, model):
+    return Agent(model=model, tools=[lookup], hooks=[hook], callback_handler=None)
+
+
+def user_message(text):
+    return SimpleNamespace(message={"role": "user", "content": [{"text": text}]})
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestShadowMode:
+    """Tests for background evaluation in shadow mode."""
+
+    @pytest.mark.asyncio
+    async def test_input_evaluation_does_not_block(self):
+        bedrock = FakeBedrock(delay=0.3)
+        hook = make_hook(bedrock)
+        agent = make_agent(hook, StubModel("ok"))
+
+        started = time.perf_counter()
+        await agent.invoke_async("texto proibido")
+        assert time.perf_counter() - started < 0.2
+
+        assert wait_for(lambda: hook.get_stats()["evaluations"] == 2)
+        assert hook.get_stats()["interventions"] == 1
+        assert bedrock.inputs == ["texto proibido"]
+
+    @pytest.mark.asyncio
+    async def test_output_evaluation_does_not_block(self):
+        bedrock = FakeBedrock(delay=0.3)
+        hook = make_hook(bedrock)
+        event = SimpleNamespace(result=SimpleNamespace(message={"content": [{"text": "resposta"}]}))
+
+        started = time.perf_counter()
+        await hook._evaluate_output(event)
+        assert time.perf_counter() - started < 0.1
+        assert wait_for(lambda: hook.get_stats()["evaluations"] == 1)
+
+    def test_queue_is_bounded(self):
+        bedrock = FakeBedrock(delay=0.2)
+        hook = make_hook(bedrock, max_pending=2)
+
+        for i in range(5):
+            hook._evaluate_input(user_message(f"mensagem {i}"))
+
+        assert hook.get_stats()["dropped"] == 3
+
+
+class TestVerdictCache:
+    """Tests for content-hash verdict caching."""
+
+    def test_identical_content_is_evaluated_once(self):
+        bedrock = FakeBedrock()
+        hook = make_hook(bedrock)
+
+        assert hook._evaluate_content("olá", "INPUT") is True
+        assert hook._evaluate_content("olá", "INPUT") is True
+        hook._evaluate_content("olá", "OUTPUT")
+
+        assert len(bedrock.calls) == 2
+        assert hook.get_stats()["cache_hits"] == 1
+
+    def test_expired_verdict_is_reevaluated(self):
+        bedrock = FakeBedrock()
+        hook = make_hook(bedrock, cache_ttl=0)
+
+        hook._evaluate_content("olá")
+        hook._evaluate_content("olá")
+
+        assert len(bedrock.calls) == 2
+
+
+class TestChunking:
+    """Tests for parallel chunk evaluation."""
+
+    def test_long_content_chunks_run_in_parallel(self):
+        bedrock = FakeBedrock(delay=0.1)
+        hook = make_hook(bedrock, shadow_mode=False, chunk_chars=100)
+        content = "a" * 350 + "proibido"
+
+        started = time.perf_counter()
+        assert hook._evaluate_content(content, "OUTPUT") is False
+        elapsed = time.perf_counter() - started
+
+        assert len(bedrock.calls) == 4
+        assert sum(len(c) for c in bedrock.calls) == len(content)
+        assert elapsed < 0.3
+        stats = hook.get_stats()
+        assert stats["chunks"] == 4 and stats["latency_ms"]["max"] >= 100
+
+
+class TestEnforceMode:
+    """Tests for blocking in enforce mode."""
+
+    @pytest.mark.asyncio
+    async def test_first_prompt_blocks_model_call(self):
+        model = StubModel("ok")
+        agent = make_agent(make_hook(FakeBedrock(delay=0.05), shadow_mode=False), model)
+
+        with pytest.raises(GuardrailViolationError) as exc_info:
+            await agent.invoke_async("pedido proibido")
+
+        assert exc_info.value.source == "INPUT"
+        assert exc_info.value.assessments == [{"topic": "x"}]
+        assert model.calls == 0
+
+    @pytest.mark.asyncio
+    async def test_later_turn_checks_its_own_prompt(self):
+        bedrock = FakeBedrock()
+        model = StubModel("ok")
+        agent = make_agent(make_hook(bedrock, shadow_mode=False), model)
+
+        await agent.invoke_async("pedido normal")
+        with pytest.raises(GuardrailViolationError):
+            await agent.invoke_async("pedido proibido")
+
+        # The first reply is never evaluated as input
+        assert bedrock.inputs == ["pedido normal", "pedido proibido"]
+        assert model.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_tool_results_are_not_checked_as_input(self):
+        bedrock = FakeBedrock()
+        model = StubModel(None, "ok")
+        agent = make_agent(make_hook(bedrock, shadow_mode=False), model)
+
+        result = await agent.invoke_async("pedido normal")
+
+        # Two model calls, one input check; the tool result is not user input
+        assert model.calls == 2
+        assert bedrock.inputs == ["pedido normal"]
+        assert str(result).strip() == "ok"
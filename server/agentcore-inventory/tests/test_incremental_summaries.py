@@ -0,0 +1,387 @@
+# =============================================================================
+# Tests for Incremental Dashboard Summaries
+# =============================================================================
+# Database tests for schema/010_incremental_summaries.sql (trigger-maintained
+# inventory_summary, location_utilization_summary and pending_tasks_summary)
+# and SGAPostgresClient.list_inventory, which reads inventory_summary.
+#
+# These tests verify:
+# - Movements (ENTRADA, SAIDA, RESERVA, LIBERACAO), balance updates and
+#   deletes keep inventory_summary equal to the old mv_inventory_summary
+#   query (004)
+# - Asset inserts, updates and deletes keep location_utilization_summary
+#   equal to the old mv_location_utilization query
+# - Pending entry inserts, updates and deletes keep pending_tasks_summary
+#   equal to the old mv_pending_tasks_dashboard query
+# - Part number and location changes (renames, deactivation) are applied
+# - check_dashboard_summaries reports no difference after every change, and
+#   reports and repairs a corrupted summary row
+# - list_inventory returns the current summary without a refresh
+#
+# Movements are immutable (003), so deletes are exercised on balances,
+# assets and pending entries.
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_incremental_summaries.py -v
+#      SGA_TEST_DSN=postgresql://... enables the database tests
+# =============================================================================
+
+import os
+import uuid
+
+import pytest
+
+from tools.postgres_client import SGAPostgresClient
+
+TEST_DSN = os.environ.get("SGA_TEST_DSN")
+
+pytestmark = pytest.mark.skipif(not TEST_DSN, reason="SGA_TEST_DSN not set")
+
+# mv_inventory_summary / mv_location_utilization / mv_pending_tasks_dashboard
+# as defined in 004_materialized_views.sql
+OLD_INVENTORY_SUMMARY = """
+    SELECT
+        l.location_id, l.location_code, l.location_name,
+        pn.part_number_id, pn.part_number, pn.description, pn.category,
+        COALESCE(b.quantity_total, 0) AS quantity_total,
+        COALESCE(b.quantity_reserved, 0) AS quantity_reserved,
+        COALESCE(b.quantity_total, 0) - COALESCE(b.quantity_reserved, 0) AS quantity_available,
+        pn.min_stock_level,
+        CASE
+            WHEN COALESCE(b.quantity_total, 0) - COALESCE(b.quantity_reserved, 0) <= 0 THEN 'OUT_OF_STOCK'
+            WHEN COALESCE(b.quantity_total, 0) - COALESCE(b.quantity_reserved, 0) <= pn.min_stock_level THEN 'LOW_STOCK'
+            ELSE 'IN_STOCK'
+        END AS stock_status,
+        b.last_movement_at,
+        b.last_count_at
+    FROM sga.balances b
+    JOIN sga.locations l ON b.location_id = l.location_id
+    JOIN sga.part_numbers pn ON b.part_number_id = pn.part_number_id
+    WHERE l.is_active = TRUE
+      AND pn.is_active = TRUE
+"""
+
+OLD_LOCATION_UTILIZATION = """
+    SELECT
+        l.location_id, l.location_code, l.location_name, l.location_type,
+        COUNT(DISTINCT a.asset_id) AS total_assets,
+        COUNT(DISTINCT a.part_number_id) AS unique_parts,
+        COUNT(DISTINCT a.project_id) AS projects_stored,
+        SUM(CASE WHEN a.status = 'IN_STOCK' THEN 1 ELSE 0 END) AS available_assets,
+        SUM(CASE WHEN a.status = 'RESERVED' THEN 1 ELSE 0 END) AS reserved_assets,
+        MAX(a.last_movement_at) AS last_activity
+    FROM sga.locations l
+    LEFT JOIN sga.assets a ON l.location_id = a.location_id AND a.is_active = TRUE
+    WHERE l.is_active = TRUE
+    GROUP BY l.location_id, l.location_code, l.location_name, l.location_type
+"""
+
+OLD_PENDING_TASKS = """
+    SELECT
+        pe.status, pe.source_type::text AS source_type,
+        COUNT(*) AS entry_count,
+        SUM(pe.total_items) AS total_items,
+        MIN(pe.created_at) AS oldest_entry,
+        AVG(EXTRACT(EPOCH FROM (NOW() - pe.created_at)) / 3600) AS avg_age_hours
+    FROM sga.pending_entries pe
+    WHERE pe.status IN ('PENDING', 'PROCESSING')
+    GROUP BY pe.status, pe.source_type
+"""
+
+INVENTORY_COLUMNS = """
+    location_id, location_code, location_name, part_number_id, part_number,
+    description, category, quantity_total, quantity_reserved, quantity_available,
+    min_stock_level, stock_status, last_movement_at, last_count_at
+"""
+
+
+@pytest.fixture
+def db():
+    """
+    Two locations, a project and three part numbers (PN-B serialized), all
+    rolled back afterwards.
+    """
+    psycopg = pytest.importorskip("psycopg")
+    from psycopg.rows import dict_row
+
+    tag = uuid.uuid4().hex[:8].upper()
+    codes = {name: f"T{tag}-{name}" for name in ("P", "L1", "L2", "PN-A", "PN-B", "PN-C")}
+
+    with psycopg.connect(TEST_DSN, row_factory=dict_row) as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                "INSERT INTO sga.projects (project_code, project_name, client_name) "
+                "VALUES (%s, 'Teste', 'Cliente') RETURNING project_id",
+                (codes["P"],),
+            )
+            ids = {"P": cur.fetchone()["project_id"]}
+            for name in ("L1", "L2"):
+                cur.execute(
+                    "INSERT INTO sga.locations (location_code, location_name, location_type) "
+                    "VALUES (%s, %s, 'WAREHOUSE') RETURNING location_id",
+                    (codes[name], f"Deposito {name}"),
+                )
+                ids[name] = cur.fetchone()["location_id"]
+            for name, serialized in (("PN-A", False), ("PN-B", True), ("PN-C", False)):
+                cur.execute(
+                    "INSERT INTO sga.part_numbers (part_number, description, is_serialized, min_stock_level) "
+                    "VALUES (%s, %s, %s, 3) RETURNING part_number_id",
+                    (codes[name], f"Peca {name}", serialized),
+                )
+                ids[name] = cur.fetchone()["part_number_id"]
+
+        yield conn, codes, ids
+        conn.rollback()
+
+
+def fetch(conn, query, params=None):
+    with conn.cursor() as cur:
+        cur.execute(query, params)
+        return cur.fetchall()
+
+
+def movement(conn, ids, movement_type, pn, quantity, source=None, destination=None):
+    fetch(
+        conn,
+        "INSERT INTO sga.movements (movement_type, part_number_id, quantity, "
+        "source_location_id, destination_location_id, project_id, created_by) "
+        "VALUES (%s, %s, %s, %s, %s, %s, 'test') RETURNING movement_id",
+        (movement_type, ids[pn], quantity, source and ids[source], destination and ids[destination], ids["P"]),
+    )
+
+
+def assert_consistent(conn):
+    """Summaries equal the old view queries and the nightly check finds nothing."""
+    order = " ORDER BY location_id, part_number_id"
+    assert fetch(conn, f"SELECT {INVENTORY_COLUMNS} FROM sga.inventory_summary" + order) == \
+        fetch(conn, f"SELECT {INVENTORY_COLUMNS} FROM ({OLD_INVENTORY_SUMMARY}) old" + order)
+
+    assert fetch(conn, "SELECT * FROM sga.mv_location_utilization ORDER BY location_id") == \
+        fetch(conn, f"SELECT * FROM ({OLD_LOCATION_UTILIZATION}) old ORDER BY location_id")
+
+    order = " ORDER BY status, source_type"
+    current = fetch(conn, "SELECT status, source_type::text AS source_type, entry_count, total_items, "
+                          "oldest_entry, avg_age_hours FROM sga.mv_pending_tasks_dashboard" + order)
+    old = fetch(conn, f"SELECT * FROM ({OLD_PENDING_TASKS}) old" + order)
+    assert [{k: v for k, v in row.items() if k != "avg_age_hours"} for row in current] == \
+        [{k: v for k, v in row.items() if k != "avg_age_hours"} for row in old]
+    for row, old_row in zip(current, old):
+        assert float(row["avg_age_hours"]) == pytest.approx(float(old_row["avg_age_hours"]), abs=1e-6)
+
+    reports = fetch(conn, "SELECT * FROM sga.check_dashboard_summaries()")
+    assert len(reports) == 3
+    for report in reports:
+        assert (report["missing_rows"], report["extra_rows"], report["mismatched_rows"]) == (0, 0, 0), report
+
+
+def inventory_row(conn, codes, location, pn):
+    rows = fetch(
+        conn,
+        "SELECT * FROM sga.inventory_summary WHERE location_code = %s AND part_number = %s",
+        (codes[location], codes[pn]),
+    )
+    return rows[0] if rows else None
+
+
+def utilization(conn, codes, location):
+    rows = fetch(conn, "SELECT * FROM sga.location_utilization_summary WHERE location_code = %s", (codes[location],))
+    return rows[0] if rows else None
+
+
+class TestInventorySummary:
+    """inventory_summary follows movements and balance changes."""
+
+    def test_movements_update_the_summary(self, db):
+        conn, codes, ids = db
+        # New locations are in location_utilization_summary right away
+        assert utilization(conn, codes, "L1")["total_assets"] == 0
+
+        movement(conn, ids, "ENTRADA", "PN-A", 10, destination="L1")
+        movement(conn, ids, "ENTRADA", "PN-C", 2, destination="L2")
+        assert inventory_row(conn, codes, "L1", "PN-A")["quantity_total"] == 10
+        assert inventory_row(conn, codes, "L2", "PN-C")["stock_status"] == "LOW_STOCK"
+        assert_consistent(conn)
+
+        movement(conn, ids, "SAIDA", "PN-A", 4, source="L1")
+        movement(conn, ids, "RESERVA", "PN-A", 3, source="L1")
+        row = inventory_row(conn, codes, "L1", "PN-A")
+        assert (row["quantity_total"], row["quantity_reserved"], row["quantity_available"]) == (6, 3, 3)
+        assert row["stock_status"] == "LOW_STOCK"
+        assert_consistent(conn)
+
+        movement(conn, ids, "LIBERACAO", "PN-A", 3, source="L1")
+        movement(conn, ids, "TRANSFERENCIA", "PN-A", 6, source="L1", destination="L2")
+        assert inventory_row(conn, codes, "L1", "PN-A")["stock_status"] == "OUT_OF_STOCK"
+        assert inventory_row(conn, codes, "L2", "PN-A")["quantity_total"] == 6
+        assert_consistent(conn)
+
+    def test_balance_updates_and_deletes(self, db):
+        conn, codes, ids = db
+        movement(conn, ids, "ENTRADA", "PN-A", 10, destination="L1")
+        movement(conn, ids, "ENTRADA", "PN-C", 5, destination="L1")
+
+        fetch(
+            conn,
+            "UPDATE sga.balances SET quantity_total = 1, last_count_at = NOW() "
+            "WHERE part_number_id = %s RETURNING balance_id",
+            (ids["PN-A"],),
+        )
+        assert inventory_row(conn, codes, "L1", "PN-A")["stock_status"] == "LOW_STOCK"
+        assert_consistent(conn)
+
+        fetch(conn, "DELETE FROM sga.balances WHERE part_number_id = %s RETURNING balance_id", (ids["PN-C"],))
+        assert inventory_row(conn, codes, "L1", "PN-C") is None
+        assert_consistent(conn)
+
+    def test_part_number_and_location_changes(self, db):
+        conn, codes, ids = db
+        movement(conn, ids, "ENTRADA", "PN-A", 10, destination="L1")
+        movement(conn, ids, "ENTRADA", "PN-C", 10, destination="L2")
+
+        fetch(
+            conn,
+            "UPDATE sga.part_numbers SET description = 'Renomeada', min_stock_level = 20 "
+            "WHERE part_number_id = %s RETURNING part_number_id",
+            (ids["PN-A"],),
+        )
+        row = inventory_row(conn, codes, "L1", "PN-A")
+        assert (row["description"], row["stock_status"]) == ("Renomeada", "LOW_STOCK")
+        assert_consistent(conn)
+
+        fetch(conn, "UPDATE sga.locations SET is_active = FALSE WHERE location_id = %s RETURNING location_id",
+              (ids["L2"],))
+        assert inventory_row(conn, codes, "L2", "PN-C") is None
+        assert utilization(conn, codes, "L2") is None
+        assert_consistent(conn)
+
+        fetch(conn, "UPDATE sga.part_numbers SET is_active = FALSE WHERE part_number_id = %s RETURNING part_number_id",
+              (ids["PN-A"],))
+        assert inventory_row(conn, codes, "L1", "PN-A") is None
+        assert_consistent(conn)
+
+
+class TestLocationUtilization:
+    """location_utilization_summary follows asset changes."""
+
+    def test_asset_inserts_updates_and_deletes(self, db):
+        conn, codes, ids = db
+        assets = fetch(
+            conn,
+            "INSERT INTO sga.assets (serial_number, part_number_id, project_id, location_id) "
+            "SELECT %s || '-SN-' || g, %s, %s, %s FROM generate_series(1, 4) g RETURNING asset_id",
+            (codes["PN-B"], ids["PN-B"], ids["P"], ids["L1"]),
+        )
+        row = utilization(conn, codes, "L1")
+        assert (row["total_assets"], row["available_assets"], row["unique_parts"]) == (4, 4, 1)
+        assert_consistent(conn)
+
+        asset_ids = [a["asset_id"] for a in assets]
+        fetch(conn, "UPDATE sga.assets SET status = 'RESERVED' WHERE asset_id = ANY(%s) RETURNING asset_id",
+              (asset_ids[:2],))
+        fetch(conn, "UPDATE sga.assets SET location_id = %s, last_movement_at = NOW() "
+                    "WHERE asset_id = %s RETURNING asset_id", (ids["L2"], asset_ids[3]))
+        fetch(conn, "UPDATE sga.assets SET is_active = FALSE WHERE asset_id = %s RETURNING asset_id",
+              (asset_ids[2],))
+        row = utilization(conn, codes, "L1")
+        assert (row["total_assets"], row["available_assets"], row["reserved_assets"]) == (2, 0, 2)
+        assert utilization(conn, codes, "L2")["total_assets"] == 1
+        assert_consistent(conn)
+
+        fetch(conn, "DELETE FROM sga.assets WHERE asset_id = ANY(%s) RETURNING asset_id", (asset_ids,))
+        assert utilization(conn, codes, "L1")["total_assets"] == 0
+        assert utilization(conn, codes, "L2")["total_assets"] == 0
+        assert_consistent(conn)
+
+    def test_serialized_movements_update_assets_and_summary(self, db):
+        """Test the movement_items trigger (014) feeding the summary."""
+        conn, codes, ids = db
+        movement(conn, ids, "ENTRADA", "PN-B", 2, destination="L1")
+        assets = fetch(
+            conn,
+            "INSERT INTO sga.assets (serial_number, part_number_id, project_id, location_id) "
+            "SELECT %s || '-SN-' || g, %s, %s, %s FROM generate_series(1, 2) g RETURNING asset_id, serial_number",
+            (codes["PN-B"], ids["PN-B"], ids["P"], ids["L1"]),
+        )
+        transfer = fetch(
+            conn,
+            "INSERT INTO sga.movements (movement_type, part_number_id, quantity, source_location_id, "
+            "destination_location_id, project_id, created_by) "
+            "VALUES ('TRANSFERENCIA', %s, 2, %s, %s, %s, 'test') RETURNING movement_id",
+            (ids["PN-B"], ids["L1"], ids["L2"], ids["P"]),
+        )[0]["movement_id"]
+        fetch(
+            conn,
+            "INSERT INTO sga.movement_items (movement_id, asset_id, serial_number) "
+            "SELECT %s, asset_id, serial_number FROM sga.assets WHERE asset_id = ANY(%s) RETURNING movement_item_id",
+            (transfer, [a["asset_id"] for a in assets]),
+        )
+
+        assert utilization(conn, codes, "L1")["total_assets"] == 0
+        assert utilization(conn, codes, "L2")["total_assets"] == 2
+        assert inventory_row(conn, codes, "L2", "PN-B")["quantity_total"] == 2
+        assert_consistent(conn)
+
+
+class TestPendingTasks:
+    """pending_tasks_summary follows pending entry changes."""
+
+    def test_entry_inserts_updates_and_deletes(self, db):
+        conn, codes, ids = db
+        entries = fetch(
+            conn,
+            "INSERT INTO sga.pending_entries (source_type, status, total_items, nf_number, created_at) "
+            "SELECT 'NF_XML', 'PENDING', g, %s, NOW() - g * INTERVAL '1 hour' "
+            "FROM generate_series(1, 3) g RETURNING entry_id",
+            (codes["P"],),
+        )
+        assert_consistent(conn)
+
+        entry_ids = [e["entry_id"] for e in entries]
+        fetch(conn, "UPDATE sga.pending_entries SET status = 'PROCESSING' WHERE entry_id = %s RETURNING entry_id",
+              (entry_ids[0],))
+        fetch(conn, "UPDATE sga.pending_entries SET status = 'COMPLETED' WHERE entry_id = %s RETURNING entry_id",
+              (entry_ids[1],))
+        assert_consistent(conn)
+
+        fetch(conn, "DELETE FROM sga.pending_entries WHERE entry_id = ANY(%s) RETURNING entry_id", (entry_ids,))
+        assert_consistent(conn)
+
+
+class TestConsistencyCheck:
+    """check_dashboard_summaries detects and repairs drift."""
+
+    def test_reports_and_repairs_a_corrupted_row(self, db):
+        conn, codes, ids = db
+        movement(conn, ids, "ENTRADA", "PN-A", 10, destination="L1")
+        fetch(
+            conn,
+            "UPDATE sga.inventory_summary SET quantity_total = 99 WHERE part_number_id = %s RETURNING part_number_id",
+            (ids["PN-A"],),
+        )
+        fetch(conn, "DELETE FROM sga.location_utilization_summary WHERE location_id = %s RETURNING location_id",
+              (ids["L2"],))
+
+        reports = {r["summary_name"]: r for r in fetch(conn, "SELECT * FROM sga.check_dashboard_summaries(TRUE)")}
+
+        assert reports["inventory_summary"]["mismatched_rows"] == 1
+        assert reports["inventory_summary"]["repaired"] is True
+        assert reports["location_utilization_summary"]["missing_rows"] == 1
+        assert reports["pending_tasks_summary"]["repaired"] is False
+        assert inventory_row(conn, codes, "L1", "PN-A")["quantity_total"] == 10
+        assert_consistent(conn)
+
+
+class TestListInventory:
+    """list_inventory reads the summary without a refresh."""
+
+    def test_reads_current_summary(self, db):
+        conn, codes, ids = db
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        client._get_connection = lambda: conn
+
+        movement(conn, ids, "ENTRADA", "PN-A", 10, destination="L1")
+        before = client.list_inventory({"location_id": codes["L1"]})
+        movement(conn, ids, "SAIDA", "PN-A", 8, source="L1")
+        after = client.list_inventory({"location_id": codes["L1"], "part_number": codes["PN-A"]})
+
+        assert [i["quantity_total"] for i in before["items"]] == [10]
+        assert [(i["quantity_total"], i["stock_status"]) for i in after["items"]] == [(2, "LOW_STOCK")]
@@ -0,0 +1,99 @@
+# =============================================================================
+# Tests for LazyGeminiModel Cold Start
+# =============================================================================
+# Unit tests for agents/utils.py model bootstrap.
+#
+# These tests verify:
+# - Concurrent first requests initialize the model exactly once
+# - Process-wide registry shares instances per (model_id, params)
+# - Background prewarm and cold-start timings
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_lazy_gemini_model.py -v
+# =============================================================================
+
+import asyncio
+import time
+
+import pytest
+
+import agents.utils as utils
+
+
+class FakeGeminiModel:
+    """Stand-in for GeminiModel with a slow constructor."""
+
+    instances = 0
+
+    def __init__(self, model_id, params):
+        FakeGeminiModel.instances += 1
+        self.model_id = model_id
+        self.params = params
+        time.sleep(0.05)
+
+    async def stream(self, *args, **kwargs):
+        yield {"messageStart": {"role": "assistant"}}
+        yield {"messageStop": {"stopReason": "end_turn"}}
+
+
+@pytest.fixture(autouse=True)
+def fake_gemini(monkeypatch):
+    """Isolate the registry and replace GeminiModel."""
+    FakeGeminiModel.instances = 0
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setattr(utils, "GeminiModel", FakeGeminiModel)
+    monkeypatch.setattr(utils, "_model_registry", {})
+    monkeypatch.setattr(utils, "_model_init_locks", {})
+
+
+class TestLazyGeminiModel:
+    """Tests for lazy initialization, registry and prewarm."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_requests_initialize_once(self):
+        """Test that racing first requests build a single model."""
+        model = utils.create_gemini_model("compliance")
+
+        async def first_request():
+            return [event async for event in model.stream([])]
+
+        results = await asyncio.gather(*(first_request() for _ in range(10)))
+
+        assert FakeGeminiModel.instances == 1
+        assert all(len(events) == 2 for events in results)
+
+    def test_registry_shares_instances_by_config(self):
+        """Test that identical model configs share one GeminiModel."""
+        a = utils.create_gemini_model("compliance")
+        b = utils.create_gemini_model("compliance")
+        c = utils.create_gemini_model("observation")
+
+        assert a._ensure_model() is b._ensure_model()
+        assert c._ensure_model() is not a._ensure_model()
+        assert FakeGeminiModel.instances == 2
+
+    @pytest.mark.asyncio
+    async def test_prewarm_records_timings(self):
+        """Test that prewarm initializes off the request path and exposes timings."""
+        model = utils.create_gemini_model("debug")
+        assert model.is_ready is False
+
+        await model.prewarm()
+        assert model.is_ready is True
+        assert model.timings["initialized_by"] == "prewarm"
+        assert model.timings["init_ms"] >= 0
+
+        _ = [event async for event in model.stream([])]
+        assert model.timings["first_token_ms"] is not None
+        assert model.timings["cold_start_to_first_token_ms"] >= model.timings["ready_after_ms"]
+
+    @pytest.mark.asyncio
+    async def test_prewarm_failure_is_not_raised(self, monkeypatch):
+        """Test that a failed prewarm leaves initialization to the first request."""
+        def fail(*args, **kwargs):
+            raise RuntimeError("SSM unavailable")
+
+        monkeypatch.setattr(utils, "get_shared_gemini_model", fail)
+        model = utils.create_gemini_model("learning")
+
+        await model.prewarm()
+        assert model.is_ready is False
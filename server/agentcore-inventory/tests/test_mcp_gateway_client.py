@@ -0,0 +1,194 @@
+# =============================================================================
+# Tests for MCPGatewayClient Transport
+# =============================================================================
+# Unit tests for tools/mcp_gateway_client.py and the async
+# GatewayPostgresAdapter (tools/gateway_adapter.py) against a local stub
+# gateway (HTTP/1.1 keep-alive, JSON-RPC 2.0).
+#
+# These tests verify:
+# - Sync and async calls reuse pooled connections
+# - JSON-RPC batches are one request, matched to calls by id
+# - Rejected batches fall back to single calls
+# - Adapter methods are coroutines over call_tool_async
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_mcp_gateway_client.py -v
+# =============================================================================
+
+import json
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tools.gateway_adapter import GatewayPostgresAdapter
+from tools.mcp_gateway_client import MCPGatewayClient
+
+
+def tool_response(request):
+    """Echo the tool name and arguments; tool "fail" returns an MCP error."""
+    if request["params"]["name"] == "fail":
+        return {"jsonrpc": "2.0", "id": request["id"], "error": {"message": "boom"}}
+    text = json.dumps({"tool": request["params"]["name"], **request["params"]["arguments"]})
+    return {"jsonrpc": "2.0", "id": request["id"], "result": {"content": [{"type": "text", "text": text}]}}
+
+
+class StubGateway(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, accept_batches=True):
+        super().__init__(("127.0.0.1", 0), StubHandler)
+        self.accept_batches = accept_batches
+        self.connections = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/mcp"
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        # Headers and body are written separately; avoid Nagle/delayed-ACK stalls
+        self.request.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert self.headers["Authorization"].startswith("AWS4-HMAC-SHA256")
+        with self.server.lock:
+            self.server.requests += 1
+        if isinstance(body, list):
+            if not self.server.accept_batches:
+                return self._send(400, {"error": {"message": "batch not supported"}})
+            return self._send(200, [tool_response(r) for r in reversed(body)])
+        return self._send(200, tool_response(body))
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def gateway():
+    server = StubGateway()
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(gateway, monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    instance = MCPGatewayClient(gateway_url=gateway.url, region="us-east-2")
+    yield instance
+    instance.close()
+
+
+class TestPooledTransport:
+    """Tests for connection reuse."""
+
+    def test_sync_calls_reuse_connection(self, client, gateway):
+        for i in range(5):
+            assert client.call_tool("sga_get_balance", {"n": i}) == {"tool": "sga_get_balance", "n": i}
+
+        assert gateway.requests == 5
+        assert gateway.connections == 1
+
+    @pytest.mark.asyncio
+    async def test_async_calls_reuse_connection(self, client, gateway):
+        for i in range(5):
+            result = await client.call_tool_async("sga_get_balance", {"n": i})
+            assert result["n"] == i
+        await client.aclose()
+
+        assert gateway.connections == 1
+
+    def test_mcp_error_raises(self, client):
+        with pytest.raises(Exception, match="MCP error: boom"):
+            client.call_tool("fail", {})
+
+
+class TestBatch:
+    """Tests for JSON-RPC batches."""
+
+    def test_batch_is_one_request_in_call_order(self, client, gateway):
+        results = client.call_tools_batch([("a", {"n": 1}), ("b", {"n": 2}), ("c", {"n": 3})])
+
+        assert [r["tool"] for r in results] == ["a", "b", "c"]
+        assert gateway.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_async_batch_with_errors(self, client, gateway):
+        results = await client.call_tools_batch_async(
+            [("a", {}), ("fail", {})], return_exceptions=True
+        )
+        await client.aclose()
+
+        assert results[0] == {"tool": "a"}
+        assert isinstance(results[1], Exception)
+        assert gateway.requests == 1
+
+    def test_rejected_batch_falls_back(self, client, gateway):
+        """Test single calls after a 400, and that the batch is not retried."""
+        gateway.accept_batches = False
+
+        first = client.call_tools_batch([("a", {}), ("b", {})])
+        second = client.call_tools_batch([("c", {}), ("d", {})])
+
+        assert [r["tool"] for r in first + second] == ["a", "b", "c", "d"]
+        # 1 rejected batch + 2 singles, then 2 singles
+        assert gateway.requests == 5
+
+    @pytest.mark.asyncio
+    async def test_async_rejected_batch_falls_back(self, client, gateway):
+        gateway.accept_batches = False
+
+        results = await client.call_tools_batch_async([("a", {}), ("b", {})])
+        await client.aclose()
+
+        assert [r["tool"] for r in results] == ["a", "b"]
+        assert client._batch_supported is False
+
+
+class TestAsyncAdapter:
+    """Tests for GatewayPostgresAdapter over call_tool_async."""
+
+    @pytest.mark.asyncio
+    async def test_methods_await_async_transport(self):
+        mcp = MagicMock()
+        mcp.call_tool_async = AsyncMock(return_value={"items": [{"serial_number": "SN1"}]})
+        adapter = GatewayPostgresAdapter(mcp)
+
+        items = await adapter.search_assets("SN1")
+
+        assert items == [{"serial_number": "SN1"}]
+        mcp.call_tool.assert_not_called()
+        assert mcp.call_tool_async.await_args.kwargs["tool_name"] == "SGAPostgresTools___sga_search_assets"
+
+    @pytest.mark.asyncio
+    async def test_call_batch_prefixes_tools(self):
+        mcp = MagicMock()
+        mcp.call_tools_batch_async = AsyncMock(return_value=[{}, {}])
+        adapter = GatewayPostgresAdapter(mcp)
+
+        await adapter.call_batch([("sga_get_balance", {"part_number": "A"}), ("sga_get_balance", {"part_number": "B"})])
+
+        calls = mcp.call_tools_batch_async.await_args.args[0]
+        assert [name for name, _ in calls] == ["SGAPostgresTools___sga_get_balance"] * 2
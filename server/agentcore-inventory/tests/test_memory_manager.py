@@ -5,7 +5,7 @@
 #
 # These tests verify:
 # - Memory observation (observe, observe_facts, observe_episodes, observe_global)
-# - Memory learning (learn, learn_fact, learn_inference, learn_episode)
+# - Memory learning (learn, learn_fact, learn_facts, learn_inference, learn_episode)
 # - GENESIS_KERNEL metadata (Veritas classification, Hebbian weights)
 # - AWS AgentCore Memory SDK integration (mocked)
 #
@@ -265,6 +265,17 @@ class TestMemoryManagerLearn:
         # Verify event was created
         mock_memory_client.create_event.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_learn_facts_batches_events(self, mock_memory_manager, mock_memory_client):
+        """Test learn_facts writes one event per FACTS_PER_EVENT facts."""
+        from shared.memory_manager import FACTS_PER_EVENT
+
+        facts = [f"Column 'C{i}' → field 'f{i}'" for i in range(FACTS_PER_EVENT + 5)]
+        event_ids = await mock_memory_manager.learn_facts(facts, category="column_mapping")
+
+        assert event_ids == ["evt_mock_123", "evt_mock_123"]
+        assert mock_memory_client.create_event.call_count == 2
+
     @pytest.mark.asyncio
     async def test_learn_inference_has_lower_weight(self, mock_memory_manager, mock_memory_client):
         """Test learn_inference uses lower emotional weight than facts."""
@@ -0,0 +1,172 @@
+# =============================================================================
+# Tests for Keyset Pagination
+# =============================================================================
+# Unit tests for tools/pagination.py and the keyset mode of
+# SGAPostgresClient.list_inventory / get_movements.
+#
+# These tests verify:
+# - Opaque cursors round-trip and are bound to list + filters
+# - Keyset pages seek past the last row and report has_more/next_cursor
+# - Optional totals (planner estimate, cached count)
+# - Offset API unchanged
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_pagination.py -v
+# =============================================================================
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+import pytest
+
+from tools.pagination import (
+    CountCache,
+    InvalidCursorError,
+    count_cache,
+    decode_cursor,
+    encode_cursor,
+    plan_row_estimate,
+)
+from tools.postgres_client import SGAPostgresClient
+
+
+class FakeClient:
+    """Captures queries; answers from a scripted list of results."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.executed = []
+
+    def __call__(self, query, params=None):
+        self.executed.append((query, params))
+        return self.responses.pop(0) if self.responses else []
+
+
+@pytest.fixture
+def make_client():
+    def factory(*responses):
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        client._execute_query = FakeClient(*responses)
+        return client
+    return factory
+
+
+def inventory_rows(count, start=0):
+    return [
+        {"part_number": f"PN{i:03d}", "location_code": "L01", "quantity_total": i}
+        for i in range(start, start + count)
+    ]
+
+
+class TestCursor:
+    """Tests for cursor encoding."""
+
+    def test_round_trip_with_datetime_and_uuid(self):
+        """Test that sort keys survive encoding."""
+        when = datetime(2026, 10, 1, 12, 0, tzinfo=timezone.utc)
+        movement_id = UUID("12345678-1234-5678-1234-567812345678")
+        cursor = encode_cursor("movements", [when, movement_id], {"movement_type": "SAIDA"})
+
+        position = decode_cursor(cursor, "movements", {"movement_type": "SAIDA"})
+        assert position == [when.isoformat(), str(movement_id)]
+        assert "=" not in cursor
+
+    def test_cursor_bound_to_filters_and_kind(self):
+        """Test that a cursor cannot be replayed with other filters or lists."""
+        cursor = encode_cursor("inventory", ["PN1", "L01"], {"status": "LOW_STOCK"})
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "inventory", {"status": "IN_STOCK"})
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "movements", {"status": "LOW_STOCK"})
+
+    def test_malformed_cursor(self):
+        """Test that garbage is rejected as InvalidCursorError."""
+        with pytest.raises(InvalidCursorError):
+            decode_cursor("not-a-cursor!", "inventory")
+
+
+class TestKeysetInventory:
+    """Tests for list_inventory keyset mode."""
+
+    def test_first_page_fetches_limit_plus_one(self, make_client):
+        """Test has_more detection and next_cursor of the last row."""
+        client = make_client(inventory_rows(3))
+        page = client.list_inventory(limit=2, pagination="keyset")
+
+        query, params = client._execute_query.executed[0]
+        assert "ORDER BY part_number, location_code LIMIT %s" in query
+        assert "OFFSET" not in query and "COUNT(*)" not in query
+        assert params == (3,)
+        assert [r["part_number"] for r in page["items"]] == ["PN000", "PN001"]
+        assert page["has_more"] is True
+        assert decode_cursor(page["next_cursor"], "inventory", {}) == ["PN001", "L01"]
+
+    def test_next_page_seeks_past_cursor(self, make_client):
+        """Test that the cursor becomes a row-value seek predicate."""
+        cursor = encode_cursor("inventory", ["PN001", "L01"], {"location_id": "L01"})
+        client = make_client(inventory_rows(1, start=2))
+        page = client.list_inventory(filters={"location_id": "L01"}, limit=2, cursor=cursor)
+
+        query, params = client._execute_query.executed[0]
+        assert "(part_number, location_code) > (%s, %s)" in query
+        assert params == ("L01", "PN001", "L01", 3)
+        assert page["has_more"] is False
+        assert page["next_cursor"] is None
+
+    def test_estimated_total_uses_explain(self, make_client):
+        """Test that total_mode=estimate reads the planner estimate."""
+        plan = [{"QUERY PLAN": [{"Plan": {"Plan Rows": 12345}}]}]
+        client = make_client(inventory_rows(1), plan)
+        page = client.list_inventory(pagination="keyset", total_mode="estimate")
+
+        assert client._execute_query.executed[1][0].startswith("EXPLAIN (FORMAT JSON)")
+        assert page["total"] == 12345
+        assert page["total_mode"] == "estimate"
+
+    def test_cached_total_counts_once(self, make_client):
+        """Test that cached totals are reused across pages."""
+        count_cache.clear()
+        client = make_client(inventory_rows(1), [{"total": 42}], inventory_rows(1))
+        first = client.list_inventory(pagination="keyset", total_mode="cached")
+        second = client.list_inventory(pagination="keyset", total_mode="cached")
+
+        assert first["total"] == second["total"] == 42
+        assert len(client._execute_query.executed) == 3
+
+    def test_offset_api_unchanged(self, make_client):
+        """Test the backwards-compatible offset mode."""
+        client = make_client([{"total": 5}], inventory_rows(2))
+        page = client.list_inventory(limit=2, offset=2)
+
+        assert "LIMIT %s OFFSET %s" in client._execute_query.executed[1][0]
+        assert page["total"] == 5 and page["offset"] == 2 and page["has_more"] is True
+        assert "next_cursor" not in page
+
+
+class TestKeysetMovements:
+    """Tests for get_movements keyset paging."""
+
+    def test_movements_seek_on_date_and_id(self, make_client):
+        """Test descending seek on (movement_date, movement_id)."""
+        cursor = encode_cursor("movements", ["2026-10-01T12:00:00+00:00", "m-1"], {})
+        client = make_client([{"movement_id": "m-0", "movement_date": "2026-10-01"}])
+        page = client.get_movements(cursor=cursor, limit=10)
+
+        query, params = client._execute_query.executed[0]
+        assert "(m.movement_date, m.movement_id) < (%s::timestamptz, %s::uuid)" in query
+        assert "ORDER BY m.movement_date DESC, m.movement_id DESC" in query
+        assert params[-3:] == ("2026-10-01T12:00:00+00:00", "m-1", 11)
+        assert page["count"] == 1 and page["next_cursor"] is None
+
+
+class TestTotals:
+    """Tests for total helpers."""
+
+    def test_plan_row_estimate(self):
+        assert plan_row_estimate([{"QUERY PLAN": '[{"Plan": {"Plan Rows": 7}}]'}]) == 7
+        assert plan_row_estimate([]) is None
+
+    def test_count_cache_expires(self):
+        cache = CountCache(ttl_seconds=0)
+        cache.put("k", 1)
+        assert cache.get("k") is None
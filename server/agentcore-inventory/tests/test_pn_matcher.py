@@ -0,0 +1,81 @@
+# =============================================================================
+# Tests for Part Number Matcher
+# =============================================================================
+# Unit tests for tools/pn_matcher.py (used by data_import match_rows_to_pn).
+#
+# These tests verify:
+# - Exact PN lookup with normalization
+# - Description shortlist + rescoring
+# - Warm-container cache keyed by catalog version
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_pn_matcher.py -v
+# =============================================================================
+
+import pytest
+
+from tools.pn_matcher import (
+    PartNumberMatcher,
+    catalog_version,
+    clear_matcher_cache,
+    get_matcher,
+    normalize_description,
+)
+
+
+CATALOG = [
+    {"part_number": "SW-2960-24", "description": "Switch Cisco Catalyst 2960 24 portas"},
+    {"part_number": "RT-HX-5G", "description": "Roteador Huawei 5G dual band"},
+    {"part_number": "CB-CAT6-5M", "description": "Cabo de rede CAT6 5 metros"},
+    {"part_number": "FT-48V", "description": "Fonte de alimentação 48V"},
+]
+
+
+@pytest.fixture
+def matcher():
+    return PartNumberMatcher(CATALOG)
+
+
+class TestPartNumberMatcher:
+    """Tests for exact and approximate matching."""
+
+    def test_exact_match_is_case_and_whitespace_insensitive(self, matcher):
+        """Test normalized exact PN lookup."""
+        assert matcher.match_exact("  sw-2960-24 ") == "SW-2960-24"
+        assert matcher.match_exact("UNKNOWN") is None
+        assert matcher.match_exact("") is None
+
+    def test_description_match_with_typos(self, matcher):
+        """Test that a misspelled description still finds its PN."""
+        pn, score = matcher.match_description("SWITCH CISCO CATALIST 2960 24 PORTAS")
+        assert pn == "SW-2960-24"
+        assert score >= 0.8
+
+    def test_accents_are_ignored(self, matcher):
+        """Test accent-insensitive description matching."""
+        pn, score = matcher.match_description("fonte de alimentacao 48v")
+        assert pn == "FT-48V"
+        assert score == pytest.approx(1.0)
+
+    def test_unrelated_description_scores_low(self, matcher):
+        """Test that unrelated text is not matched with high confidence."""
+        _, score = matcher.match_description("xyzzy")
+        assert score < 0.8
+
+    def test_normalize_description(self):
+        """Test description normalization."""
+        assert normalize_description("  Fonte-de ALIMENTAÇÃO (48V) ") == "fonte de alimentacao 48v"
+
+
+class TestMatcherCache:
+    """Tests for the catalog-version cache."""
+
+    def test_matcher_reused_until_catalog_changes(self):
+        """Test that the index is rebuilt only for a new catalog version."""
+        clear_matcher_cache()
+        first = get_matcher(CATALOG)
+        again = get_matcher([dict(p) for p in CATALOG])
+        changed = get_matcher(CATALOG + [{"part_number": "NEW", "description": "Novo item"}])
+
+        assert first is again
+        assert changed is not first
+        assert first.version == catalog_version(CATALOG)
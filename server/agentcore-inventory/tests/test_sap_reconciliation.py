@@ -0,0 +1,283 @@
+# =============================================================================
+# Tests for Set-Based SAP Reconciliation
+# =============================================================================
+# Unit tests for tools/sap_reconciliation.py and the "set" mode of
+# SGAPostgresClient.reconcile_with_sap, plus an end-to-end check against
+# schema/013_sap_reconciliation.sql.
+#
+# These tests verify:
+# - CSV header mapping, header splitting of streamed chunks, COPY options
+# - Inline rows are COPYed and classified in one transaction
+# - Stored runs are paged with keyset cursors
+# - Legacy full mode unchanged
+# - FULL OUTER JOIN classification (needs SGA_TEST_DSN)
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_sap_reconciliation.py -v
+#      SGA_TEST_DSN=postgresql://... enables the database test
+# =============================================================================
+
+import os
+from decimal import Decimal
+
+import pytest
+
+from tools import sap_reconciliation
+from tools.pagination import decode_cursor
+from tools.postgres_client import SGAPostgresClient
+
+TEST_DSN = os.environ.get("SGA_TEST_DSN")
+
+
+class FakeCopy:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write_row(self, row):
+        self.cursor.copied.append(row)
+
+    def write(self, data):
+        self.cursor.copied.append(data)
+
+
+class FakeCursor:
+    """Records statements; fetch results come from a scripted list."""
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.copied = conn.copied
+        self._last = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.executed.append((query, params))
+        self._last = self.conn.results.pop(0) if "SELECT" in query or "RETURNING" in query else None
+
+    def copy(self, statement):
+        self.conn.executed.append((statement, None))
+        return FakeCopy(self)
+
+    def fetchone(self):
+        return self._last[0]
+
+    def fetchall(self):
+        return self._last
+
+
+class FakeConnection:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+        self.copied = []
+        self.committed = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        pass
+
+
+def run_row(**overrides):
+    row = {
+        "run_id": "0f0f0f0f-0000-0000-0000-000000000001",
+        "status": "COMPLETED",
+        "source": "inline",
+        "total_rows": 4,
+        "invalid_rows": 1,
+        "matches_count": 1,
+        "discrepancies_count": 1,
+        "sap_only_count": 1,
+        "sga_only_count": 2,
+        "sap_total_quantity": Decimal("30"),
+        "sga_total_quantity": Decimal("25"),
+    }
+    row.update(overrides)
+    return row
+
+
+@pytest.fixture
+def client():
+    instance = SGAPostgresClient.__new__(SGAPostgresClient)
+    instance.queries = []
+    instance.query_results = []
+
+    def execute(query, params=None):
+        instance.queries.append((query, params))
+        return instance.query_results.pop(0) if instance.query_results else []
+
+    instance._execute_query = execute
+    return instance
+
+
+class TestHelpers:
+    """Tests for the pure helpers."""
+
+    def test_header_aliases_and_accents(self):
+        """Test that SAP/pt-BR header names map to fields."""
+        header = ["\ufeffMaterial", "Depósito", "Quantidade", "Projeto"]
+        assert sap_reconciliation.map_csv_header(header) == {
+            "part_number": 0, "location_code": 1, "quantity": 2, "project_code": 3,
+        }
+
+    def test_header_requires_part_number_and_quantity(self):
+        with pytest.raises(ValueError):
+            sap_reconciliation.map_csv_header(["material", "deposito"])
+
+    def test_split_header_across_chunks(self):
+        """Test that the header may span chunk boundaries."""
+        header, rest = sap_reconciliation.split_header([b"part_num", b"ber;qty\r\nPN1;", b"2\n"])
+        assert header == b"part_number;qty"
+        assert b"".join(rest) == b"PN1;2\n"
+
+    def test_copy_options_validation(self):
+        assert sap_reconciliation.copy_options(";", "LATIN1") == \
+            "FORMAT csv, DELIMITER ';', ENCODING 'LATIN1'"
+        with pytest.raises(ValueError):
+            sap_reconciliation.copy_options(";;", "UTF8")
+        with pytest.raises(ValueError):
+            sap_reconciliation.copy_options(",", "UTF8'; DROP")
+
+    def test_parse_s3_uri(self):
+        assert sap_reconciliation.parse_s3_uri("s3://bucket/sap-exports/a.csv") == \
+            ("bucket", "sap-exports/a.csv")
+        with pytest.raises(ValueError):
+            sap_reconciliation.parse_s3_uri("https://bucket/a.csv")
+
+    def test_reconcile_sql_without_location_compares_part_numbers(self):
+        """Test that exports without a location column join on part number only."""
+        sql = sap_reconciliation.reconcile_sql({"part_number": 0, "quantity": 1})
+        assert "FULL OUTER JOIN sga_balances" in sql
+        assert "l.location_code AS location_key" not in sql
+
+
+class TestSetMode:
+    """Tests for reconcile_with_sap(mode="set")."""
+
+    def test_new_run_copies_rows_and_returns_first_page(self, client):
+        """Test one transaction: COPY, one join, counts; then a line page."""
+        conn = FakeConnection(
+            [{"total_rows": 4, "invalid_rows": 1}],
+            [
+                {"category": "match", "keys": 1, "sap_quantity": 10, "sga_quantity": 10},
+                {"category": "discrepancy", "keys": 1, "sap_quantity": 15, "sga_quantity": 5},
+                {"category": "sap_only", "keys": 1, "sap_quantity": 5, "sga_quantity": 0},
+                {"category": "sga_only", "keys": 2, "sap_quantity": 0, "sga_quantity": 10},
+            ],
+            [run_row()],
+        )
+        client._get_connection = lambda: conn
+        client.query_results = [[{"line_no": 1, "category": "discrepancy"}]]
+
+        sap_data = [
+            {"part_number": "PN1", "quantity": 10, "location_code": "L01"},
+            {"part_number": "PN2", "quantity": 15, "location_code": "L01"},
+        ]
+        result = client.reconcile_with_sap(sap_data=sap_data, mode="set", limit=1)
+
+        statements = [q for q, _ in conn.executed]
+        assert any("CREATE TEMP TABLE sap_import" in q and "ON COMMIT DROP" in q for q in statements)
+        assert any(q.startswith("COPY sap_import") for q in statements)
+        assert sum("FULL OUTER JOIN" in q for q in statements) == 1
+        assert conn.copied == [("PN1", "L01", None, "10"), ("PN2", "L01", None, "15")]
+        assert conn.committed
+
+        update_params = conn.executed[-1][1]
+        assert update_params[:6] == (4, 1, 1, 1, 1, 2)
+        assert update_params[6:8] == (30, 25)
+
+        assert result["mode"] == "set"
+        assert result["summary"]["accuracy_percentage"] == round(1 / 3 * 100, 2)
+        assert result["items"] == [{"line_no": 1, "category": "discrepancy"}]
+        assert "matches" not in result
+
+    def test_page_of_existing_run(self, client):
+        """Test that run_id pages stored lines with a category-bound cursor."""
+        client.query_results = [
+            [run_row()],
+            [{"line_no": 3, "category": "sga_only"}, {"line_no": 5, "category": "sga_only"}],
+        ]
+        result = client.reconcile_with_sap(run_id=run_row()["run_id"], category="sga_only", limit=1)
+
+        query, params = client.queries[1]
+        assert "category = %s" in query and "ORDER BY line_no LIMIT %s" in query
+        assert params == (run_row()["run_id"], "sga_only", 2)
+        assert result["has_more"] is True
+        assert decode_cursor(
+            result["next_cursor"], "sap_reconciliation",
+            {"run_id": run_row()["run_id"], "category": "sga_only"},
+        ) == [3]
+
+    def test_unknown_run(self, client):
+        client.query_results = [[]]
+        result = client.reconcile_with_sap(run_id="0f0f0f0f-0000-0000-0000-00000000ffff")
+        assert result["success"] is False
+
+    def test_invalid_category(self, client):
+        with pytest.raises(ValueError):
+            client.reconcile_with_sap(run_id="x", category="match")
+
+
+class TestFullMode:
+    """Tests for the legacy in-memory mode."""
+
+    def test_full_mode_returns_every_row(self, client):
+        client.query_results = [[
+            {"part_number": "PN1", "location_code": "L01", "project_code": None, "sga_quantity": 10},
+        ]]
+        result = client.reconcile_with_sap([{"part_number": "PN1", "location_code": "L01", "quantity": 10}])
+
+        assert len(result["matches"]) == 1
+        assert result["summary"]["accuracy_percentage"] == 100
+
+
+@pytest.mark.skipif(not TEST_DSN, reason="SGA_TEST_DSN not set")
+class TestReconcileJoin:
+    """The reconcile statement against a real database (rolled back)."""
+
+    def test_classification(self):
+        psycopg = pytest.importorskip("psycopg")
+        from psycopg.rows import dict_row
+
+        with psycopg.connect(TEST_DSN, row_factory=dict_row) as conn:
+            with conn.cursor() as cur:
+                cur.execute(
+                    "INSERT INTO sga.sap_reconciliation_runs (source) VALUES ('inline') RETURNING run_id"
+                )
+                run_id = str(cur.fetchone()["run_id"])
+                cur.execute(sap_reconciliation.staging_table_sql(4))
+                with cur.copy("COPY sap_import (col_0, col_1, col_2, col_3) FROM STDIN") as copy:
+                    copy.write_row(("TEST-SAP-ONLY-PN", "TEST-LOC", None, "3"))
+                    copy.write_row(("TEST-SAP-ONLY-PN", "TEST-LOC", None, "2"))
+                    copy.write_row(("", "TEST-LOC", None, "1"))
+
+                cur.execute(sap_reconciliation.row_counts_sql(sap_reconciliation.INLINE_COLUMNS))
+                assert cur.fetchone() == {"total_rows": 3, "invalid_rows": 1}
+
+                cur.execute(
+                    sap_reconciliation.reconcile_sql(sap_reconciliation.INLINE_COLUMNS),
+                    {"run_id": run_id},
+                )
+                categories = {row["category"]: row for row in cur.fetchall()}
+                assert categories["sap_only"]["keys"] >= 1
+
+                cur.execute(
+                    "SELECT sap_quantity, variance FROM sga.sap_reconciliation_lines "
+                    "WHERE run_id = %s AND part_number = 'TEST-SAP-ONLY-PN'",
+                    (run_id,),
+                )
+                assert cur.fetchone() == {"sap_quantity": 5, "variance": -5}
+            conn.rollback()
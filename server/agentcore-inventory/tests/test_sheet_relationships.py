@@ -0,0 +1,151 @@
+# =============================================================================
+# Tests for Value-Based Sheet Relationships and Master-Detail Join
+# =============================================================================
+# Unit tests for tools/column_sketch.py, value-overlap relationship
+# detection in tools/sheet_analyzer.py and tools/sheet_join.py, using
+# workbooks built in memory with openpyxl.
+#
+# These tests verify:
+# - Sketches estimate distinct counts and containment
+# - Relationships are found from shared values even when column names differ
+# - Low-coverage numeric columns (quantities) do not win over real keys
+# - The streaming join merges, keeps orphans and renames clashing columns
+# - extract_data_with_gemini joins sheets when mappings span both
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_sheet_relationships.py -v
+# =============================================================================
+
+import io
+
+import pytest
+from openpyxl import Workbook
+
+import tools.sheet_analyzer as sheet_analyzer
+from tools.column_sketch import MIN_CONTAINMENT, ColumnSketch, find_value_overlaps
+from tools.gemini_text_analyzer import _extract_xlsx_rows
+from tools.sheet_analyzer import SheetRelationship, analyze_workbook
+from tools.sheet_join import JoinStats, plan_master_detail_join, stream_joined_rows
+
+
+def make_workbook(sheets):
+    wb = Workbook()
+    wb.remove(wb.active)
+    for name, rows in sheets.items():
+        ws = wb.create_sheet(name)
+        for row in rows:
+            ws.append(row)
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.fixture(autouse=True)
+def legacy_column_patterns(monkeypatch):
+    # The schema-aware matcher needs the MCP Gateway; use COLUMN_PATTERNS
+    monkeypatch.setattr(sheet_analyzer, "_get_schema_matcher", lambda: None)
+
+
+@pytest.fixture
+def master_detail_xlsx():
+    master = [["Codigo", "Descricao", "Qtd"]] + [
+        [f"PN-{i:04d}", f"Equipamento {i}", 3] for i in range(200)
+    ]
+    detail = [["Ref Equipamento", "Descricao", "Numero"]] + [
+        [f"pn-{i % 150:04d}", f"obs {n}", f"SN{n:06d}"] for n, i in enumerate(range(450))
+    ]
+    detail.append(["PN-9999", "sem cadastro", "SN999999"])
+    return make_workbook({"Plan1": master, "Plan2": detail})
+
+
+class TestColumnSketch:
+    """Tests for ColumnSketch."""
+
+    def test_distinct_and_containment(self):
+        keys, refs = ColumnSketch(5000), ColumnSketch(20000)
+        for i in range(5000):
+            keys.add(f"PN-{i}")
+        for i in range(20000):
+            refs.add(f" pn-{i % 2000} ")
+
+        assert keys.uniqueness() > 0.95
+        assert refs.distinct() == pytest.approx(2000, rel=0.1)
+        assert refs.containment_in(keys) > 0.95
+        # Full sample for the estimate; the early stop only has to reject
+        assert keys.containment_in(refs, early_stop=0) == pytest.approx(0.4, abs=0.15)
+        assert keys.containment_in(refs) < MIN_CONTAINMENT
+
+    def test_excel_numbers_match_text(self):
+        numbers, text = ColumnSketch(), ColumnSketch()
+        for i in range(50):
+            numbers.add(float(i))
+            text.add(str(i))
+
+        assert text.containment_in(numbers) == 1.0
+        assert text.jaccard(numbers) == 1.0
+
+    def test_quantity_column_does_not_beat_real_key(self):
+        line_no, part, qty, ref = (ColumnSketch(1000) for _ in range(4))
+        for i in range(1000):
+            line_no.add(i + 1)
+            part.add(f"PN-{i}")
+        for i in range(3000):
+            qty.add(i % 5 + 1)
+            ref.add(f"PN-{i % 900}")
+
+        overlaps = find_value_overlaps([
+            ("Itens", "Linha", line_no), ("Itens", "PN", part),
+            ("Seriais", "Qtd", qty), ("Seriais", "PN", ref),
+        ])
+
+        assert len(overlaps) == 1
+        assert (overlaps[0].parent_column, overlaps[0].child_column) == ("PN", "PN")
+
+
+class TestValueRelationships:
+    """Tests for value-overlap detection in analyze_workbook."""
+
+    def test_detects_one_to_many_from_values(self, master_detail_xlsx):
+        analysis = analyze_workbook(master_detail_xlsx, "lote.xlsx")
+
+        rel = analysis.relationships[0]
+        assert rel.relationship_type == SheetRelationship.ONE_TO_MANY
+        assert rel.evidence == "value_overlap"
+        assert (rel.sheet1, rel.sheet2, rel.join_columns) == ("Plan1", "Plan2", [("Codigo", "Ref Equipamento")])
+        assert rel.confidence >= 0.8
+        assert analysis.recommended_strategy == "merge_items_serials"
+        assert analysis.sheets[1].merge_target == "Plan1"
+
+    def test_without_sketches_falls_back_to_names(self, master_detail_xlsx):
+        analysis = analyze_workbook(master_detail_xlsx, "lote.xlsx", sketch_columns=False)
+
+        assert all(rel.evidence == "column_names" for rel in analysis.relationships)
+
+
+class TestStreamingJoin:
+    """Tests for sheet_join."""
+
+    def test_merges_master_and_detail_rows(self, master_detail_xlsx):
+        plan = plan_master_detail_join(analyze_workbook(master_detail_xlsx, "lote.xlsx"))
+        stats = JoinStats()
+
+        rows = list(stream_joined_rows(master_detail_xlsx, plan, stats=stats))
+
+        assert rows[0] == {"Codigo": "PN-0000", "Descricao": "Equipamento 0", "Qtd": 3,
+                           "Plan2.Descricao": "obs 0", "Numero": "SN000000"}
+        assert (stats.matched_rows, stats.orphan_detail_rows, stats.unmatched_master_rows) == (450, 1, 50)
+        assert len(rows) == 450 + 1 + 50
+        assert {"Codigo": "PN-9999", "Plan2.Descricao": "sem cadastro", "Numero": "SN999999"} in rows
+
+    def test_extraction_joins_when_mappings_span_sheets(self, master_detail_xlsx):
+        rows, errors = _extract_xlsx_rows(
+            master_detail_xlsx, {"Codigo": "part_number", "Numero": "serial_number"}, max_rows=10
+        )
+
+        assert errors == []
+        assert len(rows) == 10
+        assert rows[0] == {"part_number": "PN-0000", "serial_number": "SN000000"}
+
+    def test_extraction_reads_active_sheet_otherwise(self, master_detail_xlsx):
+        rows, _ = _extract_xlsx_rows(master_detail_xlsx, {"Codigo": "part_number"}, max_rows=5000)
+
+        assert len(rows) == 200
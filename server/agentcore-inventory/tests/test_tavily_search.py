@@ -0,0 +1,190 @@
+# =============================================================================
+# Tests for Tavily Search Caching, Rate Limiting and Concurrency
+# =============================================================================
+# Unit tests for tools/search_cache.py and TavilyGatewayAdapter.search /
+# research_equipment (tools/tavily_gateway.py) with a fake MCP client.
+#
+# These tests verify:
+# - Cache keys normalize the query and domain order
+# - SQLite hits, S3 hits (promoted to SQLite) and freshness expiry
+# - The rate limiter enforces the daily credit budget and 432 responses
+# - research_equipment searches document types concurrently
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_tavily_search.py -v
+# =============================================================================
+
+import io
+import threading
+import time
+
+import pytest
+
+from tools.search_cache import QuotaRateLimiter, SearchResultCache, cache_key
+from tools.tavily_gateway import SearchDepth, TavilyGatewayAdapter
+
+
+class FakeMCPClient:
+    """Returns one result per query after a fixed delay."""
+
+    def __init__(self, delay=0.0, error=None):
+        self.delay = delay
+        self.error = error
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def call_tool(self, tool_name, arguments, timeout=None):
+        with self.lock:
+            self.calls.append(arguments)
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return {"results": [{"url": f"https://cisco.com/{arguments['query']}", "title": "t",
+                             "content": "c", "score": 0.9}]}
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+
+    def get_object(self, Bucket, Key):
+        if Key not in self.objects:
+            error = Exception("NoSuchKey")
+            error.response = {"Error": {"Code": "NoSuchKey"}}
+            raise error
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def put_object(self, Bucket, Key, Body, ContentType=None):
+        self.objects[Key] = Body
+
+
+@pytest.fixture
+def s3():
+    return FakeS3()
+
+
+@pytest.fixture
+def cache(tmp_path, s3):
+    return SearchResultCache(path=str(tmp_path / "cache.sqlite3"), bucket="test-bucket", s3_client=s3)
+
+
+def make_adapter(client, cache, limiter=None):
+    return TavilyGatewayAdapter(client, cache=cache, rate_limiter=limiter or QuotaRateLimiter(1000, 1000))
+
+
+class TestCacheKey:
+    """Tests for cache_key."""
+
+    def test_normalizes_query_and_domains(self):
+        assert cache_key("Cisco  C9200 Datasheet", ["cisco.com", "b.com"], search_depth="advanced") == \
+            cache_key("cisco c9200 datasheet", ["B.com", "cisco.com"], search_depth="advanced")
+
+    def test_options_change_key(self):
+        assert cache_key("q", ["a.com"], max_results=3) != cache_key("q", ["a.com"], max_results=5)
+        assert cache_key("q", ["a.com"]) != cache_key("q", None)
+
+
+class TestSearchResultCache:
+    """Tests for the SQLite and S3 tiers."""
+
+    def test_s3_hit_is_promoted_to_local(self, tmp_path, s3, cache):
+        cache.put("k", [{"url": "u"}])
+
+        other = SearchResultCache(path=str(tmp_path / "other.sqlite3"), bucket="test-bucket", s3_client=s3)
+        assert other.get("k") == [{"url": "u"}]
+        assert other.get("k") == [{"url": "u"}]
+        assert (other.stats["s3_hits"], other.stats["local_hits"]) == (1, 1)
+
+    def test_stale_entries_are_ignored(self, cache, s3):
+        cache.put("k", [{"url": "u"}])
+        cache.ttl_seconds = 0
+
+        assert cache.get("k") is None
+        assert cache.stats["misses"] == 1
+
+
+class TestAdapterSearch:
+    """Tests for TavilyGatewayAdapter.search with cache and limiter."""
+
+    def test_repeated_search_uses_cache(self, cache):
+        client = FakeMCPClient()
+        adapter = make_adapter(client, cache)
+
+        first = adapter.search("Cisco C9200 datasheet", include_domains=["cisco.com"])
+        second = adapter.search("cisco   c9200 DATASHEET", include_domains=["cisco.com"])
+
+        assert first == second and len(first) == 1
+        assert len(client.calls) == 1
+
+    def test_failed_search_is_not_cached(self, cache):
+        client = FakeMCPClient(error=RuntimeError("down"))
+        adapter = make_adapter(client, cache)
+
+        assert adapter.search("q") == []
+        assert adapter.search("q") == []
+        assert len(client.calls) == 2
+
+    def test_daily_budget_skips_searches(self, cache):
+        client = FakeMCPClient()
+        limiter = QuotaRateLimiter(rate_per_second=1000, burst=1000, daily_credit_budget=4)
+        adapter = make_adapter(client, cache, limiter)
+
+        results = [adapter.search(f"q{i}", search_depth=SearchDepth.ADVANCED) for i in range(3)]
+
+        assert [len(r) for r in results] == [1, 1, 0]
+        assert len(client.calls) == 2
+        # Cached results are still served after the budget is spent
+        assert len(adapter.search("q0", search_depth=SearchDepth.ADVANCED)) == 1
+
+    def test_plan_limit_response_exhausts_budget(self, cache):
+        error = RuntimeError("432")
+        error.response = type("Response", (), {"status_code": 432})()
+        client = FakeMCPClient(error=error)
+        limiter = QuotaRateLimiter(1000, 1000)
+        adapter = make_adapter(client, cache, limiter)
+
+        adapter.search("a")
+        adapter.search("b")
+
+        assert len(client.calls) == 1
+        assert limiter.get_stats()["exhausted"] is True
+
+
+class TestQuotaRateLimiter:
+    """Tests for the token bucket."""
+
+    def test_rate_is_enforced_after_burst(self):
+        limiter = QuotaRateLimiter(rate_per_second=50, burst=2)
+
+        started = time.perf_counter()
+        assert all(limiter.acquire() for _ in range(5))
+        # 3 tokens beyond the burst at 50/s
+        assert time.perf_counter() - started >= 0.05
+
+    def test_gives_up_after_max_wait(self):
+        limiter = QuotaRateLimiter(rate_per_second=0.1, burst=1, max_wait_seconds=0.01)
+
+        assert limiter.acquire() is True
+        assert limiter.acquire() is False
+
+
+class TestResearchEquipment:
+    """Tests for concurrent document-type searches."""
+
+    def test_doc_types_run_concurrently(self, cache):
+        client = FakeMCPClient(delay=0.2)
+        adapter = make_adapter(client, cache)
+
+        started = time.perf_counter()
+        research = adapter.research_equipment("C9200-24P", manufacturer="Cisco")
+        elapsed = time.perf_counter() - started
+
+        assert len(client.calls) == 3
+        assert elapsed < 0.5
+        assert research["datasheet"].url.endswith("datasheet")
+        assert research["manual"].url.endswith("manual")
+        assert research["specifications"]["url"].endswith("specifications")
+        assert {c["include_domains"][0] for c in client.calls} == {"cisco.com"}
+
+        # Second import of the same equipment is served from cache
+        adapter.research_equipment("C9200-24P", manufacturer="Cisco")
+        assert len(client.calls) == 3
@@ -0,0 +1,259 @@
+# =============================================================================
+# Tests for Bulk Asset Transfer
+# =============================================================================
+# Unit tests for SGAPostgresClient.transfer_assets (tools/postgres_client.py)
+# and the estoque_control create_transfer_tool that calls it.
+#
+# These tests verify:
+# - Serials are read and locked with one query and validated before writes
+# - A valid transfer is one movement + one set-based movement_items insert,
+#   committed together
+# - Invalid serials roll back without writing anything
+# - create_transfer_tool moves serials with one sga_transfer_assets call and
+#   quantities with one TRANSFERENCIA movement
+#
+# Run: cd server/agentcore-inventory && python -m pytest tests/test_transfer_assets.py -v
+# =============================================================================
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tools.gateway_adapter import GatewayPostgresAdapter
+from tools.postgres_client import SGAPostgresClient
+
+REFS = {
+    "part_number_id": "pn-1",
+    "source_id": "loc-src",
+    "destination_id": "loc-dst",
+    "project_id": None,
+}
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.rowcount = 0
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, query, params=None):
+        self.conn.executed.append((query, params))
+        if query.lstrip().startswith("INSERT INTO sga.movement_items"):
+            self.rowcount = len(params[1])
+            self._rows = []
+        else:
+            self._rows = self.conn.results.pop(0)
+
+    def fetchone(self):
+        return self._rows[0]
+
+    def fetchall(self):
+        return self._rows
+
+
+class FakeConnection:
+    def __init__(self, *results):
+        self.results = list(results)
+        self.executed = []
+        self.committed = False
+        self.rolled_back = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+def asset(serial, location_id="loc-src", part_number_id="pn-1", status="IN_STOCK"):
+    return {
+        "asset_id": f"a-{serial}",
+        "serial_number": serial,
+        "part_number_id": part_number_id,
+        "location_id": location_id,
+        "status": status,
+    }
+
+
+@pytest.fixture
+def make_client():
+    def factory(*results):
+        client = SGAPostgresClient.__new__(SGAPostgresClient)
+        conn = FakeConnection(*results)
+        client._get_connection = lambda: conn
+        return client, conn
+    return factory
+
+
+class TestTransferAssets:
+    """Tests for transfer_assets."""
+
+    def test_moves_all_serials_in_one_transaction(self, make_client):
+        """Test batched read, one movement and one items insert, then commit."""
+        serials = [f"SN{i:04d}" for i in range(300)]
+        movement = {"movement_id": "mv-1", "movement_date": datetime(2026, 10, 18, tzinfo=timezone.utc)}
+        client, conn = make_client([REFS], [asset(s) for s in serials], [movement])
+
+        result = client.transfer_assets("PN-1", "SRC", "DST", serials + ["SN0000"])
+
+        assert result["success"] is True
+        assert result["quantity"] == 300
+        assert len(conn.executed) == 4
+        lock_query, lock_params = conn.executed[1]
+        assert "serial_number = ANY(%s)" in lock_query and "FOR UPDATE" in lock_query
+        assert lock_params == (serials,)
+        assert "'TRANSFERENCIA'" in conn.executed[2][0]
+        assert conn.executed[2][1][1] == 300
+        assert conn.committed and not conn.rolled_back
+
+    def test_invalid_serials_abort_before_writes(self, make_client):
+        """Test that one bad serial rejects the whole transfer."""
+        client, conn = make_client(
+            [REFS],
+            [
+                asset("SN1"),
+                asset("SN2", location_id="loc-other"),
+                asset("SN3", part_number_id="pn-2"),
+                asset("SN4", status="INSTALLED"),
+            ],
+        )
+
+        result = client.transfer_assets("PN-1", "SRC", "DST", ["SN1", "SN2", "SN3", "SN4", "SN5"])
+
+        assert result["success"] is False
+        assert [i["serial_number"] for i in result["invalid_serials"]] == ["SN2", "SN3", "SN4", "SN5"]
+        assert result["invalid_serials"][-1]["reason"] == "not found"
+        assert len(conn.executed) == 2
+        assert conn.rolled_back and not conn.committed
+
+    def test_unknown_location(self, make_client):
+        client, conn = make_client([dict(REFS, destination_id=None)])
+
+        result = client.transfer_assets("PN-1", "SRC", "NOPE", ["SN1"])
+
+        assert result == {"success": False, "error": "Location not found: NOPE"}
+        assert conn.rolled_back
+
+    def test_serials_required(self, make_client):
+        client, _ = make_client()
+        with pytest.raises(ValueError):
+            client.transfer_assets("PN-1", "SRC", "DST", [])
+
+
+BALANCE = {"found": True, "summary": {"total_quantity": 500, "total_reserved": 0, "total_available": 500}}
+
+
+@pytest.fixture
+def transfer_tool(specialist_tools, monkeypatch):
+    """create_transfer_tool with the gateway mocked and no restricted locations."""
+    transfer = specialist_tools("estoque_control", "transfer")
+    responses = {"SGAPostgresTools___sga_get_balance": BALANCE}
+
+    async def call_tool_async(tool_name, arguments, **kwargs):
+        return responses[tool_name]
+
+    mcp = MagicMock()
+    mcp.call_tool_async = AsyncMock(side_effect=call_tool_async)
+    monkeypatch.setattr(transfer, "_db_adapter", GatewayPostgresAdapter(mcp))
+    monkeypatch.setattr(transfer, "_get_location", AsyncMock(return_value=None))
+    return transfer, mcp, responses
+
+
+def called_tools(mcp):
+    return [call.kwargs["tool_name"].split("___")[1] for call in mcp.call_tool_async.call_args_list]
+
+
+class TestCreateTransferTool:
+    """Tests for create_transfer_tool (estoque_control)."""
+
+    @pytest.mark.asyncio
+    async def test_serials_move_in_one_gateway_call(self, transfer_tool):
+        transfer, mcp, responses = transfer_tool
+        serials = [f"SN{i:04d}" for i in range(300)]
+        responses["SGAPostgresTools___sga_transfer_assets"] = {
+            "success": True, "movement_id": "mv-1", "quantity": 300,
+        }
+
+        result = await transfer.create_transfer_tool(
+            part_number="PN-1", quantity=300, source_location_id="SRC",
+            destination_location_id="DST", project_id="PRJ", serial_numbers=serials,
+            requested_by="ana",
+        )
+
+        assert result["success"] is True
+        assert result["movement_id"] == "mv-1"
+        assert called_tools(mcp) == ["sga_get_balance", "sga_transfer_assets"]
+        arguments = mcp.call_tool_async.call_args.kwargs["arguments"]
+        assert arguments["serial_numbers"] == serials
+        assert (arguments["project_id"], arguments["requested_by"]) == ("PRJ", "ana")
+
+    @pytest.mark.asyncio
+    async def test_invalid_serials_are_reported(self, transfer_tool):
+        transfer, mcp, responses = transfer_tool
+        invalid = [{"serial_number": "SN2", "reason": "not at source location"}]
+        responses["SGAPostgresTools___sga_transfer_assets"] = {
+            "success": False, "error": "1 serial(s) cannot be transferred", "invalid_serials": invalid,
+        }
+
+        result = await transfer.create_transfer_tool(
+            part_number="PN-1", quantity=2, source_location_id="SRC",
+            destination_location_id="DST", project_id="PRJ", serial_numbers=["SN1", "SN2"],
+        )
+
+        assert result["success"] is False
+        assert result["data"]["invalid_serials"] == invalid
+
+    @pytest.mark.asyncio
+    async def test_duplicate_serials_rejected_before_writes(self, transfer_tool):
+        transfer, mcp, _ = transfer_tool
+
+        result = await transfer.create_transfer_tool(
+            part_number="PN-1", quantity=2, source_location_id="SRC",
+            destination_location_id="DST", project_id="PRJ", serial_numbers=["SN1", "SN1"],
+        )
+
+        assert result["success"] is False
+        assert result["data"]["invalid_serials"][0]["serial_number"] == "SN1"
+        assert called_tools(mcp) == ["sga_get_balance"]
+
+    @pytest.mark.asyncio
+    async def test_quantity_transfer_is_one_movement(self, transfer_tool):
+        transfer, mcp, responses = transfer_tool
+        responses["SGAPostgresTools___sga_create_movement"] = {"success": True, "movement_id": "mv-2"}
+
+        result = await transfer.create_transfer_tool(
+            part_number="PN-1", quantity=40, source_location_id="SRC",
+            destination_location_id="DST", project_id="PRJ",
+        )
+
+        assert result["movement_id"] == "mv-2"
+        assert called_tools(mcp) == ["sga_get_balance", "sga_create_movement"]
+        arguments = mcp.call_tool_async.call_args.kwargs["arguments"]
+        assert (arguments["movement_type"], arguments["quantity"]) == ("TRANSFERENCIA", 40)
+
+    @pytest.mark.asyncio
+    async def test_restricted_destination_waits_for_approval(self, transfer_tool, monkeypatch):
+        transfer, mcp, _ = transfer_tool
+        monkeypatch.setattr(transfer, "_get_location", AsyncMock(return_value={"restricted": True}))
+        monkeypatch.setattr(transfer, "_create_hil_task", AsyncMock(return_value="task-1"))
+        store = AsyncMock()
+        monkeypatch.setattr(transfer, "_store_movement", store)
+
+        result = await transfer.create_transfer_tool(
+            part_number="PN-1", quantity=1, source_location_id="SRC",
+            destination_location_id="COFRE", project_id="PRJ", serial_numbers=["SN1"],
+        )
+
+        assert (result["requires_hil"], result["hil_task_id"]) == (True, "task-1")
+        assert store.await_args.args[0]["status"] == "PENDING_APPROVAL"
+        assert called_tools(mcp) == ["sga_get_balance"]
@@ -0,0 +1,341 @@
+# =============================================================================
+# File Artifact and Analysis Result Caches for Smart Import
+# =============================================================================
+# Every HIL round of the Gemini analysis used to download the file from S3,
+# decode it and rebuild the prompt sample again, and execute_import downloads
+# the same object once more for extraction.
+#
+# FileArtifactCache - per-session, in-memory. Holds the raw bytes of an S3
+#   object with its ETag and SHA-256, plus anything derived from them
+#   (decoded prompt samples, parsed sheet structure) via artifact.derive().
+#   Later fetches send a conditional GET (IfNoneMatch=<etag>), so an
+#   unchanged object costs one round trip and no body transfer. Bounded by
+#   total bytes (LRU) and idle TTL.
+#
+# AnalysisResultCache - in-memory, content-addressed. Keyed by (file SHA-256,
+#   prompt version, schema/memory context, normalized user responses and
+#   comments), so an identical round returns without calling Gemini.
+#
+# Environment:
+#   ANALYSIS_ARTIFACT_CACHE_MB      total raw bytes kept (default 64)
+#   ANALYSIS_ARTIFACT_TTL_SECONDS   idle lifetime of an artifact (default 1800)
+#   ANALYSIS_RESULT_CACHE_SIZE      cached analysis results (default 256)
+#   ANALYSIS_RESULT_TTL_SECONDS     lifetime of a cached result (default 1800)
+#
+# Usage:
+#   from tools.analysis_cache import (
+#       analysis_cache_key, get_artifact_cache, get_result_cache,
+#   )
+#
+#   artifact = get_artifact_cache().fetch(s3, bucket, key, session_id)
+#   sample = artifact.derive(("sample", 50), lambda: extract(artifact.content))
+#
+#   cache_key = analysis_cache_key(artifact.sha256, schema_context, ...)
+#   result = get_result_cache().get(cache_key)
+# =============================================================================
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_CACHE_MB = float(os.environ.get("ANALYSIS_ARTIFACT_CACHE_MB", "64"))
+ARTIFACT_TTL_SECONDS = float(os.environ.get("ANALYSIS_ARTIFACT_TTL_SECONDS", "1800"))
+RESULT_CACHE_SIZE = int(os.environ.get("ANALYSIS_RESULT_CACHE_SIZE", "256"))
+RESULT_TTL_SECONDS = float(os.environ.get("ANALYSIS_RESULT_TTL_SECONDS", "1800"))
+
+# Error codes botocore reports for a 304 on a conditional GetObject
+NOT_MODIFIED_CODES = {"304", "NotModified"}
+
+
+# =============================================================================
+# File Artifacts
+# =============================================================================
+
+@dataclass
+class FileArtifact:
+    """Raw bytes of one S3 object plus values derived from them."""
+
+    bucket: str
+    key: str
+    etag: Optional[str]
+    sha256: str
+    content: bytes
+    fetched_at: float = field(default_factory=time.time)
+    _derived: Dict[Hashable, Any] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def size(self) -> int:
+        return len(self.content)
+
+    def derive(self, name: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Value computed once per artifact (e.g. ("sample", 50) -> prompt text).
+
+        Args:
+            name: Hashable identifier of the derived value
+            build: Zero-argument callable producing it
+
+        Returns:
+            The cached or freshly built value
+        """
+        with self._lock:
+            if name in self._derived:
+                return self._derived[name]
+        value = build()
+        with self._lock:
+            return self._derived.setdefault(name, value)
+
+
+def _error_code(error: Exception) -> Optional[str]:
+    response = getattr(error, "response", None)
+    if isinstance(response, dict):
+        return str(response.get("Error", {}).get("Code"))
+    return None
+
+
+class FileArtifactCache:
+    """
+    Per-session cache of S3 objects, revalidated by ETag.
+
+    Example:
+        cache = FileArtifactCache(max_bytes=64 * 1024 * 1024)
+        artifact = cache.fetch(s3, "bucket", "uploads/file.csv", session_id)
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = int(ARTIFACT_CACHE_MB * 1024 * 1024),
+        ttl_seconds: float = ARTIFACT_TTL_SECONDS,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Tuple[str, str, str], FileArtifact]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "changed": 0, "evicted": 0}
+
+    def fetch(self, s3: Any, bucket: str, key: str, session_id: Optional[str] = None) -> FileArtifact:
+        """
+        Object bytes from cache or S3.
+
+        A cached artifact is revalidated with a conditional GET, so an object
+        overwritten under the same key is downloaded again.
+
+        Args:
+            s3: boto3 S3 client
+            bucket: Bucket name
+            key: Object key (already normalized by the caller)
+            session_id: Import session owning the artifact
+
+        Returns:
+            FileArtifact for the current object version
+        """
+        entry_key = (session_id or "", bucket, key)
+        cached = self._lookup(entry_key)
+
+        request = {"Bucket": bucket, "Key": key}
+        if cached is not None and cached.etag:
+            request["IfNoneMatch"] = cached.etag
+        try:
+            response = s3.get_object(**request)
+        except Exception as e:
+            if cached is not None and _error_code(e) in NOT_MODIFIED_CODES:
+                with self._lock:
+                    self.stats["hits"] += 1
+                    cached.fetched_at = time.time()
+                return cached
+            raise
+
+        content = response["Body"].read()
+        artifact = FileArtifact(
+            bucket=bucket,
+            key=key,
+            etag=response.get("ETag"),
+            sha256=hashlib.sha256(content).hexdigest(),
+            content=content,
+        )
+        with self._lock:
+            self.stats["changed" if cached is not None else "misses"] += 1
+        self._store(entry_key, artifact)
+        return artifact
+
+    def _lookup(self, entry_key: Tuple[str, str, str]) -> Optional[FileArtifact]:
+        with self._lock:
+            artifact = self._entries.get(entry_key)
+            if artifact is None:
+                return None
+            if time.time() - artifact.fetched_at > self.ttl_seconds:
+                self._remove(entry_key)
+                return None
+            self._entries.move_to_end(entry_key)
+            return artifact
+
+    def _store(self, entry_key: Tuple[str, str, str], artifact: FileArtifact) -> None:
+        if artifact.size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(entry_key)
+            self._entries[entry_key] = artifact
+            self._bytes += artifact.size
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.stats["evicted"] += 1
+
+    def _remove(self, entry_key: Tuple[str, str, str]) -> None:
+        artifact = self._entries.pop(entry_key, None)
+        if artifact is not None:
+            self._bytes -= artifact.size
+
+    def drop_session(self, session_id: str) -> int:
+        """Forget every artifact of a session. Returns how many were dropped."""
+        with self._lock:
+            keys = [k for k in self._entries if k[0] == session_id]
+            for entry_key in keys:
+                self._remove(entry_key)
+        return len(keys)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries), "bytes": self._bytes}
+
+
+# =============================================================================
+# Analysis Results
+# =============================================================================
+
+def _fingerprint(text: Optional[str]) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def _normalize_text(value: Any) -> str:
+    return " ".join(str(value).split()) if value is not None else ""
+
+
+def normalize_user_responses(user_responses: Optional[List[Dict[str, Any]]]) -> List[List[str]]:
+    """
+    Canonical form of HIL responses: whitespace collapsed, sorted by question.
+
+    Answers keep their case - they often name source columns.
+    """
+    normalized = [
+        [
+            _normalize_text(response.get("question_id")),
+            _normalize_text(response.get("field")),
+            _normalize_text(response.get("answer")),
+        ]
+        for response in user_responses or []
+    ]
+    return sorted(normalized)
+
+
+def analysis_cache_key(
+    file_sha256: str,
+    schema_context: Optional[str],
+    memory_context: Optional[str],
+    user_responses: Optional[List[Dict[str, Any]]],
+    user_comments: Optional[str],
+    version: str = "",
+) -> str:
+    """
+    Result cache key for one analysis round.
+
+    Args:
+        file_sha256: SHA-256 of the file bytes
+        schema_context: Target schema description (hashed)
+        memory_context: Learned patterns (hashed)
+        user_responses: HIL responses (normalized)
+        user_comments: Free-text instructions (whitespace collapsed)
+        version: Prompt/model version - bump to invalidate old results
+
+    Returns:
+        Hex SHA-256 of the canonical request
+    """
+    canonical = {
+        "file": file_sha256,
+        "version": version,
+        "schema": _fingerprint(schema_context),
+        "memory": _fingerprint(memory_context),
+        "responses": normalize_user_responses(user_responses),
+        "comments": _normalize_text(user_comments),
+    }
+    payload = json.dumps(canonical, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisResultCache:
+    """
+    LRU + TTL cache of successful analysis results.
+
+    Results are deep-copied on the way in and out, so callers may mutate them.
+    """
+
+    def __init__(self, max_entries: int = RESULT_CACHE_SIZE, ttl_seconds: float = RESULT_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry[0] > self.ttl_seconds:
+                self._entries.pop(key, None)
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            result = entry[1]
+        return copy.deepcopy(result)
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        if self.max_entries <= 0:
+            return
+        stored = copy.deepcopy(result)
+        with self._lock:
+            self._entries[key] = (time.time(), stored)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {**self.stats, "entries": len(self._entries)}
+
+
+# =============================================================================
+# Process-wide Instances
+# =============================================================================
+
+_artifact_cache: Optional[FileArtifactCache] = None
+_result_cache: Optional[AnalysisResultCache] = None
+_instances_lock = threading.Lock()
+
+
+def get_artifact_cache() -> FileArtifactCache:
+    """Per-container file artifact cache (singleton)."""
+    global _artifact_cache
+    with _instances_lock:
+        if _artifact_cache is None:
+            _artifact_cache = FileArtifactCache()
+        return _artifact_cache
+
+
+def get_result_cache() -> AnalysisResultCache:
+    """Per-container analysis result cache (singleton)."""
+    global _result_cache
+    with _instances_lock:
+        if _result_cache is None:
+            _result_cache = AnalysisResultCache()
+        return _result_cache
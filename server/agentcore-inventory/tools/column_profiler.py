@@ -0,0 +1,323 @@
+# =============================================================================
+# Column Profiler - One Columnar Pass per Column for Type and Statistics
+# =============================================================================
+# Smart Import and the swarm file analyst both profile spreadsheet columns
+# (type, nulls, cardinality, key-likelihood, samples). This module does it
+# once for every caller:
+#
+# 1. Transpose rows into column arrays once (zip in C, not per-cell indexing)
+# 2. Count values per column in C (collections.Counter), then classify each
+#    distinct value once into integer / decimal / date / text - spreadsheet
+#    columns repeat values, and native ints/floats skip the regexes
+# 3. Derive every caller's type vocabulary from those counts:
+#    - profile.data_type()      -> "number" / "date" / "text" / "mixed"
+#    - profile.inferred_type    -> "integer" / "decimal" / "date" / "string"
+#
+# When pandas is installed, large columns are classified with vectorized
+# string methods (str.strip / str.fullmatch / nunique); otherwise the
+# pure-Python path above is used. Both backends use the same regexes and
+# produce the same profile.
+#
+# Environment:
+#   COLUMN_PROFILER_BACKEND     "auto" (default), "python" or "pandas"
+#   COLUMN_PROFILER_MIN_ROWS    smallest column worth vectorizing (default 2000)
+#
+# Usage:
+#   from tools.column_profiler import profile_rows
+#
+#   profiles = profile_rows(data_rows, headers, sample_size=5)
+#   for profile in profiles:
+#       profile.data_type(threshold=0.7), profile.unique_count, ...
+# =============================================================================
+
+import logging
+import math
+import os
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from itertools import zip_longest
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+BACKEND = os.environ.get("COLUMN_PROFILER_BACKEND", "auto")
+MIN_VECTORIZED_ROWS = int(os.environ.get("COLUMN_PROFILER_MIN_ROWS", "2000"))
+
+# Currency symbols and spaces are ignored when checking for numbers
+NUMBER_NOISE_PATTERN = r"R\$|\$|\s"
+INTEGER_PATTERN = r"[+-]?\d+"
+# 1.5 / 1,5 / .5 / 1e-3, with optional thousands groups (1.234,56 / 1,234.56)
+DECIMAL_PATTERN = r"[+-]?(?:\d{1,3}(?:[.,]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d*)?|[.,]\d+)(?:[eE][+-]?\d+)?"
+# ISO (2026-01-15), DD/MM/YYYY, DD-MM-YY...; a time part may follow
+DATE_PATTERN = r"\d{4}-\d{1,2}-\d{1,2}|\d{1,2}[/-]\d{1,2}[/-]\d{2,4}"
+
+_NUMBER_NOISE = re.compile(NUMBER_NOISE_PATTERN)
+_INTEGER = re.compile(INTEGER_PATTERN)
+_DECIMAL = re.compile(DECIMAL_PATTERN)
+_DATE = re.compile(DATE_PATTERN)
+
+VALUE_CLASSES = ("integer", "decimal", "date", "text")
+
+
+@dataclass
+class ColumnProfile:
+    """Type counts and statistics of one column."""
+    name: str
+    row_count: int
+    null_count: int
+    unique_count: int
+    sample_values: List[str]
+    type_counts: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def non_null_count(self) -> int:
+        return self.row_count - self.null_count
+
+    @property
+    def null_ratio(self) -> float:
+        return self.null_count / self.row_count if self.row_count else 0.0
+
+    @property
+    def is_likely_key(self) -> bool:
+        """Every non-empty value is distinct (and there is more than one)."""
+        return self.unique_count > 1 and self.unique_count == self.non_null_count
+
+    def data_type(self, threshold: float = 0.7, fallback: str = "mixed") -> str:
+        """
+        Predominant type as "number", "date" or "text".
+
+        Args:
+            threshold: Minimum share of non-empty values for a type to win
+            fallback: Returned when no type reaches the threshold
+
+        Returns:
+            "number", "date", "text" or fallback ("text" for empty columns)
+        """
+        non_null = self.non_null_count
+        if not non_null:
+            return "text"
+        counts = self.type_counts
+        shares = {
+            "number": (counts["integer"] + counts["decimal"]) / non_null,
+            "date": counts["date"] / non_null,
+            "text": counts["text"] / non_null,
+        }
+        for dtype, share in shares.items():
+            if share >= threshold:
+                return dtype
+        return fallback
+
+    @property
+    def inferred_type(self) -> str:
+        """Most frequent class as "integer", "decimal", "date" or "string"."""
+        if not self.non_null_count:
+            return "unknown"
+        best = max(VALUE_CLASSES, key=lambda cls: self.type_counts[cls])
+        return "string" if best == "text" else best
+
+    @property
+    def type_confidence(self) -> float:
+        """Share of non-empty values compatible with inferred_type."""
+        non_null = self.non_null_count
+        if not non_null:
+            return 0.0
+        counts = self.type_counts
+        matching = {
+            "integer": counts["integer"],
+            "decimal": counts["integer"] + counts["decimal"],  # integers are valid decimals
+            "date": counts["date"],
+            "string": non_null,
+        }[self.inferred_type]
+        return matching / non_null
+
+
+# =============================================================================
+# Value Classification
+# =============================================================================
+
+def _is_null(value: Any) -> bool:
+    # float("nan") != itself; pandas also treats it as missing
+    return value is None or value != value
+
+
+def classify_value(value: Any) -> Optional[str]:
+    """
+    Class of a single value: "integer", "decimal", "date", "text" or None (empty).
+    """
+    if _is_null(value):
+        return None
+    text = str(value).strip()
+    if not text:
+        return None
+    number = _NUMBER_NOISE.sub("", text)
+    if _INTEGER.fullmatch(number):
+        return "integer"
+    if _DECIMAL.fullmatch(number):
+        return "decimal"
+    if _DATE.match(text):
+        return "date"
+    return "text"
+
+
+def _profile_python(name: str, values: Sequence[Any], sample_size: int) -> ColumnProfile:
+    # Count raw values in C first (keyed by type so 1 and 1.0 stay apart),
+    # then classify each distinct value once. Native ints and floats (Excel
+    # cells) are classified by type; only strings go through the regexes.
+    raw_counts = Counter(zip(map(type, values), values))
+    counts = dict.fromkeys(VALUE_CLASSES, 0)
+    classes: Dict[str, str] = {}
+    noise_sub, integer_match, decimal_match, date_match = (
+        _NUMBER_NOISE.sub, _INTEGER.fullmatch, _DECIMAL.fullmatch, _DATE.match,
+    )
+
+    for (kind, value), count in raw_counts.items():
+        if kind is int:
+            text, value_class = str(value), "integer"
+        elif kind is float:
+            if value != value:
+                continue
+            text, value_class = str(value), "decimal" if math.isfinite(value) else "text"
+        else:
+            if value is None:
+                continue
+            text = str(value).strip()
+            if not text:
+                continue
+            value_class = classes.get(text)
+            if value_class is None:
+                number = noise_sub("", text)
+                if integer_match(number):
+                    value_class = "integer"
+                elif decimal_match(number):
+                    value_class = "decimal"
+                elif date_match(text):
+                    value_class = "date"
+                else:
+                    value_class = "text"
+        classes[text] = value_class
+        counts[value_class] += count
+
+    samples: List[str] = []
+    for value in values:
+        if len(samples) >= sample_size:
+            break
+        if value is None or value != value:
+            continue
+        text = str(value).strip()
+        if text:
+            samples.append(text)
+
+    non_null = sum(counts.values())
+    return ColumnProfile(
+        name=name,
+        row_count=len(values),
+        null_count=len(values) - non_null,
+        unique_count=len(classes),
+        sample_values=samples,
+        type_counts=counts,
+    )
+
+
+def _profile_pandas(pd: Any, name: str, values: Sequence[Any], sample_size: int) -> ColumnProfile:
+    series = pd.Series(values, dtype=object)
+    text = series[series.notna()].astype(str).str.strip()
+    text = text[text != ""]
+
+    number = text.str.replace(NUMBER_NOISE_PATTERN, "", regex=True)
+    is_integer = number.str.fullmatch(INTEGER_PATTERN)
+    is_decimal = ~is_integer & number.str.fullmatch(DECIMAL_PATTERN)
+    is_date = ~is_integer & ~is_decimal & text.str.match(DATE_PATTERN)
+
+    integer, decimal, date = int(is_integer.sum()), int(is_decimal.sum()), int(is_date.sum())
+    return ColumnProfile(
+        name=name,
+        row_count=len(values),
+        null_count=len(values) - len(text),
+        unique_count=int(text.nunique()),
+        sample_values=text.head(sample_size).tolist(),
+        type_counts={
+            "integer": integer,
+            "decimal": decimal,
+            "date": date,
+            "text": len(text) - integer - decimal - date,
+        },
+    )
+
+
+# =============================================================================
+# Backend Selection
+# =============================================================================
+
+_pandas_module: Any = None
+
+
+def _get_pandas() -> Optional[Any]:
+    """pandas if installed and allowed by COLUMN_PROFILER_BACKEND (lazy import)."""
+    global _pandas_module
+    if BACKEND == "python":
+        return None
+    if _pandas_module is None:
+        try:
+            import pandas
+            _pandas_module = pandas
+        except ImportError:
+            if BACKEND == "pandas":
+                logger.warning("[ColumnProfiler] pandas not installed, using pure Python")
+            _pandas_module = False
+    return _pandas_module or None
+
+
+def profile_column(name: str, values: Sequence[Any], sample_size: int = 5) -> ColumnProfile:
+    """
+    Profile one column.
+
+    Args:
+        name: Column name
+        values: Every value of the column (None/"" count as empty)
+        sample_size: Number of non-empty sample values to keep
+
+    Returns:
+        ColumnProfile
+    """
+    pd = _get_pandas()
+    if pd is not None and (BACKEND == "pandas" or len(values) >= MIN_VECTORIZED_ROWS):
+        return _profile_pandas(pd, name, values, sample_size)
+    return _profile_python(name, values, sample_size)
+
+
+def profile_rows(
+    rows: Iterable[Sequence[Any]],
+    headers: Sequence[str],
+    sample_size: int = 5,
+) -> List[ColumnProfile]:
+    """
+    Profile positional rows (tuples/lists), one profile per header.
+
+    Rows are transposed once; short rows are padded with None and cells
+    beyond the last header are ignored.
+    """
+    rows = list(rows)
+    width = len(headers)
+    if rows:
+        columns = list(zip_longest(*rows, fillvalue=None))[:width]
+    else:
+        columns = []
+    columns += [(None,) * len(rows)] * (width - len(columns))
+    return [
+        profile_column(header, column, sample_size)
+        for header, column in zip(headers, columns)
+    ]
+
+
+def profile_records(
+    records: Iterable[Dict[str, Any]],
+    headers: Sequence[str],
+    sample_size: int = 5,
+) -> List[ColumnProfile]:
+    """Profile dict rows (JSON objects, extracted tables), one profile per header."""
+    records = [r if isinstance(r, dict) else {} for r in records]
+    return [
+        profile_column(header, [record.get(header) for record in records], sample_size)
+        for header in headers
+    ]
@@ -0,0 +1,302 @@
+# =============================================================================
+# Column Value Sketches - Cardinality and Overlap Without Keeping Values
+# =============================================================================
+# Multi-sheet workbooks (ITEMS + SERIALS, ...) are related through columns
+# that share values, not through column names. Keeping every value of every
+# column to compare them does not scale to 200k-row workbooks, so each
+# column is summarized while the sheet is streamed:
+#
+# - HyperLogLog: distinct count estimate (8192 registers, ~1% error, so a
+#   unique key column stays well above MIN_KEY_UNIQUENESS)
+# - Bottom-k MinHash: the k smallest value hashes, a uniform sample of the
+#   distinct values shared by every column (same hash function)
+# - Bloom filter: membership, sized from the sheet's row count
+#
+# The containment of column A in column B ("how many of A's values exist in
+# B") is estimated by probing B's Bloom filter with A's MinHash sample, which
+# works even when B is 1000x larger than A. find_value_overlaps() only probes
+# near-unique (key-like) parent columns and stops early on misses.
+#
+# Hashes come from Python's hash(), so sketches are only comparable inside
+# one process - they are never persisted.
+#
+# Usage:
+#   from tools.column_sketch import ColumnSketch, find_value_overlaps
+#
+#   sketch = ColumnSketch(capacity=ws.max_row)
+#   for value in column_values:
+#       sketch.add(value)
+#
+#   overlaps = find_value_overlaps([
+#       ("ITENS", "PN", items_pn_sketch),
+#       ("SERIAIS", "PART NUMBER", serials_pn_sketch),
+#   ])
+# =============================================================================
+
+import heapq
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+MASK64 = (1 << 64) - 1
+
+HLL_PRECISION = 13
+MINHASH_SIZE = 128
+BLOOM_BITS_PER_ITEM = 10
+BLOOM_HASHES = 3
+BLOOM_MIN_BITS = 1 << 12
+BLOOM_MAX_BITS = 1 << 23  # 1 MB per column
+DEFAULT_CAPACITY = 10_000
+
+# Share of a parent column's values that must be distinct to be a join key
+MIN_KEY_UNIQUENESS = 0.95
+# Share of the child column's values that must exist in the parent
+MIN_CONTAINMENT = 0.8
+# Sample hashes probed before giving up on a column pair
+EARLY_STOP_PROBES = 16
+
+
+def normalize_key(value: Any) -> Optional[str]:
+    """
+    Canonical text of a cell for value comparison.
+
+    1234.0 (Excel numbers) and "1234" compare equal; case and surrounding
+    whitespace are ignored. Empty cells return None.
+    """
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    text = str(value).strip().upper()
+    return text or None
+
+
+def key_hash(key: str) -> int:
+    """Unsigned 64-bit hash of a normalized key."""
+    return hash(key) & MASK64
+
+
+# =============================================================================
+# Sketch Primitives
+# =============================================================================
+
+class HyperLogLog:
+    """Distinct-count estimator over 64-bit hashes."""
+
+    def __init__(self, precision: int = HLL_PRECISION):
+        self.precision = precision
+        self.size = 1 << precision
+        self.registers = bytearray(self.size)
+        self._shift = 64 - precision
+        self._rest_mask = (1 << self._shift) - 1
+
+    def add_hash(self, h: int) -> None:
+        index = h >> self._shift
+        rank = self._shift - (h & self._rest_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def estimate(self) -> float:
+        m = self.size
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small-range correction (linear counting)
+            estimate = m * math.log(m / zeros)
+        return estimate
+
+
+class BloomFilter:
+    """Bit-array membership filter over 64-bit hashes (double hashing)."""
+
+    hashes = BLOOM_HASHES
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        bits = BLOOM_MIN_BITS
+        while bits < capacity * BLOOM_BITS_PER_ITEM and bits < BLOOM_MAX_BITS:
+            bits <<= 1
+        self.bits = bits
+        self._mask = bits - 1
+        self._array = bytearray(bits >> 3)
+
+    def add_hash(self, h: int) -> None:
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        array, mask = self._array, self._mask
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) & mask
+            array[pos >> 3] |= 1 << (pos & 7)
+
+    def contains_hash(self, h: int) -> bool:
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        array, mask = self._array, self._mask
+        for i in range(self.hashes):
+            pos = (h1 + i * h2) & mask
+            if not array[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    def false_positive_rate(self) -> float:
+        filled = int.from_bytes(self._array, "little").bit_count() / self.bits
+        return filled ** self.hashes
+
+
+class ColumnSketch:
+    """
+    HyperLogLog + bottom-k MinHash + Bloom filter of one column's values.
+
+    Args:
+        capacity: Expected number of values (sizes the Bloom filter)
+        k: MinHash sample size
+    """
+
+    def __init__(self, capacity: Optional[int] = None, k: int = MINHASH_SIZE):
+        self.k = k
+        self.non_null = 0
+        self.hll = HyperLogLog()
+        self.bloom = BloomFilter(capacity or DEFAULT_CAPACITY)
+        self._heap: List[int] = []     # negated hashes (max-heap of the k smallest)
+        self._mins: set = set()
+
+    def add(self, value: Any) -> None:
+        if value is None:
+            return
+        if isinstance(value, float) and value.is_integer():
+            value = int(value)
+        key = str(value).strip().upper()
+        if key:
+            self.add_hash(hash(key) & MASK64)
+
+    def add_hash(self, h: int) -> None:
+        # HyperLogLog and Bloom updates are inlined: this runs once per cell
+        self.non_null += 1
+
+        hll = self.hll
+        index = h >> hll._shift
+        rank = hll._shift - (h & hll._rest_mask).bit_length() + 1
+        if rank > hll.registers[index]:
+            hll.registers[index] = rank
+
+        bloom = self.bloom
+        array, mask = bloom._array, bloom._mask
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        for pos in (h1 & mask, (h1 + h2) & mask, (h1 + 2 * h2) & mask):
+            array[pos >> 3] |= 1 << (pos & 7)
+
+        if h in self._mins:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, -h)
+            self._mins.add(h)
+        elif h < -self._heap[0]:
+            self._mins.discard(-heapq.heapreplace(self._heap, -h))
+            self._mins.add(h)
+
+    def distinct(self) -> float:
+        """Distinct values (exact below k, HyperLogLog above)."""
+        if len(self._mins) < self.k:
+            return float(len(self._mins))
+        return self.hll.estimate()
+
+    def uniqueness(self) -> float:
+        """Distinct values / non-empty values (1.0 for a key column)."""
+        if not self.non_null:
+            return 0.0
+        return min(1.0, self.distinct() / self.non_null)
+
+    def sample_hashes(self) -> List[int]:
+        return sorted(self._mins)
+
+    def containment_in(self, other: "ColumnSketch", early_stop: int = EARLY_STOP_PROBES) -> float:
+        """
+        Estimated share of this column's distinct values present in other.
+
+        Probes other's Bloom filter with this column's MinHash sample and
+        corrects for the filter's false positive rate.
+        """
+        sample = self.sample_hashes()
+        if not sample:
+            return 0.0
+        found = 0
+        for i, h in enumerate(sample, 1):
+            found += other.bloom.contains_hash(h)
+            if i == early_stop and found < i * MIN_CONTAINMENT / 2:
+                sample = sample[:i]
+                break
+        fpr = other.bloom.false_positive_rate()
+        if fpr >= 1.0:
+            return 0.0
+        return max(0.0, (found / len(sample) - fpr) / (1 - fpr))
+
+    def jaccard(self, other: "ColumnSketch") -> float:
+        """Bottom-k estimate of |A ∩ B| / |A ∪ B|."""
+        union = heapq.nsmallest(self.k, self._mins | other._mins)
+        if not union:
+            return 0.0
+        both = sum(1 for h in union if h in self._mins and h in other._mins)
+        return both / len(union)
+
+
+# =============================================================================
+# Relationship Candidates
+# =============================================================================
+
+@dataclass
+class ValueOverlap:
+    """Evidence that child_column values reference parent_column (a key)."""
+    parent_sheet: str
+    parent_column: str
+    child_sheet: str
+    child_column: str
+    containment: float        # share of child values found in the parent
+    coverage: float           # share of parent keys referenced by the child
+    child_uniqueness: float   # ~1.0 -> one-to-one, lower -> one-to-many
+    confidence: float
+
+
+def find_value_overlaps(
+    columns: List[Tuple[str, str, ColumnSketch]],
+    min_containment: float = MIN_CONTAINMENT,
+    min_key_uniqueness: float = MIN_KEY_UNIQUENESS,
+) -> List[ValueOverlap]:
+    """
+    Best parent-key / child-column pair for each pair of sheets.
+
+    Args:
+        columns: (sheet name, column name, sketch) for every sketched column
+        min_containment: Minimum share of child values found in the parent
+        min_key_uniqueness: Minimum uniqueness of a parent (key) column
+
+    Returns:
+        One ValueOverlap per related sheet pair, highest confidence first
+    """
+    usable = [c for c in columns if c[2].distinct() >= 2]
+    parents = [c for c in usable if c[2].uniqueness() >= min_key_uniqueness]
+
+    best: Dict[Tuple[str, str], ValueOverlap] = {}
+    for parent_sheet, parent_column, parent in parents:
+        parent_distinct = parent.distinct()
+        for child_sheet, child_column, child in usable:
+            if child_sheet == parent_sheet:
+                continue
+            containment = child.containment_in(parent)
+            if containment < min_containment:
+                continue
+            coverage = min(1.0, containment * child.distinct() / parent_distinct)
+            overlap = ValueOverlap(
+                parent_sheet=parent_sheet,
+                parent_column=parent_column,
+                child_sheet=child_sheet,
+                child_column=child_column,
+                containment=round(containment, 3),
+                coverage=round(coverage, 3),
+                child_uniqueness=round(child.uniqueness(), 3),
+                # Low coverage means the child is a small-value column (e.g.
+                # quantities) that happens to fall inside a numeric key range
+                confidence=round(containment * (0.6 + 0.4 * coverage), 3),
+            )
+            pair = tuple(sorted((parent_sheet, child_sheet)))
+            if pair not in best or overlap.confidence > best[pair].confidence:
+                best[pair] = overlap
+
+    return sorted(best.values(), key=lambda o: o.confidence, reverse=True)
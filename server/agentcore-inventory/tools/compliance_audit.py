@@ -0,0 +1,361 @@
+# =============================================================================
+# Compliance Audit Engine - SGA Inventory Module
+# =============================================================================
+# Evaluates historical movements against the compliance approval matrix.
+#
+# Design:
+# - The approval matrix (APPROVAL_REQUIREMENTS) is compiled ONCE into a
+#   JSON-serializable lookup table keyed by movement_type. The compiled table
+#   travels to the PostgreSQL tools Lambda as a tool argument, so policy
+#   stays owned by the ComplianceAgent while evaluation runs next to the data.
+# - Movements are evaluated in chunks, column by column: each chunk is
+#   transposed once and every rule is a single pass over its columns
+#   (no per-row dict lookups of the policy).
+# - AuditAccumulator keeps only counters and a bounded sample of findings,
+#   so memory stays constant regardless of the audited period.
+#
+# This module is pure Python (no AWS/DB imports) and is bundled with the
+# PostgreSQL tools Lambda alongside postgres_client.py.
+#
+# Author: Faiston NEXO Team
+# Updated: October 2026 - Streaming compliance audit
+# =============================================================================
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+# Columns produced by the movement stream (SGAPostgresClient.run_compliance_audit)
+AUDIT_COLUMNS = (
+    "movement_id",
+    "movement_type",
+    "movement_date",
+    "quantity",
+    "source_location",
+    "destination_location",
+    "project_code",
+    "destination_project",
+    "total_value",
+    "approved_by",
+    "approved_at",
+    "created_by",
+)
+
+# sga.movement_type -> APPROVAL_REQUIREMENTS operation
+OPERATION_BY_MOVEMENT_TYPE = {
+    "ENTRADA": "ENTRY",
+    "REVERSA": "ENTRY",
+    "SAIDA": "EXIT",
+    "EXPEDIÇÃO": "EXIT",
+    "EXPEDICAO": "EXIT",
+    "TRANSFERENCIA": "TRANSFER",
+    "AJUSTE_POSITIVO": "ADJUSTMENT",
+    "AJUSTE_NEGATIVO": "ADJUSTMENT",
+    "RESERVA": "RESERVATION",
+    "LIBERACAO": "RESERVATION",
+}
+
+# Finding severities
+SEVERITY_NON_COMPLIANT = "non_compliant"
+SEVERITY_WARNING = "warning"
+
+# Finding codes
+FINDING_MISSING_APPROVAL = "MISSING_APPROVAL"
+FINDING_HIGH_VALUE = "HIGH_VALUE_UNAPPROVED"
+FINDING_RESTRICTED_LOCATION = "RESTRICTED_LOCATION_UNAPPROVED"
+FINDING_CROSS_PROJECT = "CROSS_PROJECT_UNAPPROVED"
+FINDING_DISCARD = "DISCARD_UNAPPROVED"
+FINDING_LATE_APPROVAL = "LATE_APPROVAL"
+FINDING_OFF_HOURS = "OFF_HOURS"
+FINDING_BULK_QUANTITY = "BULK_QUANTITY"
+
+FINDING_MESSAGES = {
+    FINDING_MISSING_APPROVAL: "Operação exige aprovação e não possui aprovador registrado",
+    FINDING_HIGH_VALUE: "Operação de valor alto sem aprovação",
+    FINDING_RESTRICTED_LOCATION: "Movimentação em local restrito sem aprovação",
+    FINDING_CROSS_PROJECT: "Operação cross-project sem aprovação",
+    FINDING_DISCARD: "Descarte sem aprovação de Diretor",
+    FINDING_LATE_APPROVAL: "Aprovação registrada após a movimentação",
+    FINDING_OFF_HOURS: "Movimentação fora do horário comercial",
+    FINDING_BULK_QUANTITY: "Quantidade elevada em uma única movimentação",
+}
+
+FINDING_RECOMMENDATIONS = {
+    FINDING_MISSING_APPROVAL: "Revisar o fluxo HIL: ajustes, descartes e perdas devem ser aprovados antes da execução.",
+    FINDING_HIGH_VALUE: "Exigir aprovação de gerente para operações acima do limite de valor.",
+    FINDING_RESTRICTED_LOCATION: "Bloquear movimentações em locais restritos sem aprovação prévia.",
+    FINDING_CROSS_PROJECT: "Exigir aprovação para transferências e reservas entre projetos.",
+    FINDING_DISCARD: "Descartes devem ter aprovação de Diretor registrada.",
+    FINDING_LATE_APPROVAL: "Aprovações retroativas indicam execução antes da autorização.",
+    FINDING_OFF_HOURS: "Auditar movimentações fora do horário comercial.",
+    FINDING_BULK_QUANTITY: "Considerar dividir movimentações de grande volume.",
+}
+
+
+# =============================================================================
+# Rule Compilation
+# =============================================================================
+
+def compile_rules(
+    approval_requirements: Dict[str, Dict[str, Any]],
+    restricted_locations: Iterable[str] = (),
+    discard_locations: Iterable[str] = ("DESCARTE",),
+    high_value_threshold: Optional[float] = None,
+    bulk_quantity_threshold: int = 50,
+    business_hours: Tuple[int, int] = (8, 18),
+) -> Dict[str, Any]:
+    """
+    Compile the approval matrix into a movement_type lookup table.
+
+    Args:
+        approval_requirements: APPROVAL_REQUIREMENTS matrix (operation -> rules)
+        restricted_locations: Location codes that require approval
+        discard_locations: Location codes that represent discard
+        high_value_threshold: Fallback value threshold when the matrix has none
+        bulk_quantity_threshold: Quantity that raises a bulk warning
+        business_hours: (start_hour, end_hour) in UTC
+
+    Returns:
+        JSON-serializable compiled rules with a content version hash
+    """
+    by_type: Dict[str, Dict[str, Any]] = {}
+    for movement_type, operation in OPERATION_BY_MOVEMENT_TYPE.items():
+        requirement = approval_requirements.get(operation, {})
+        threshold = requirement.get("threshold")
+        if threshold is None and "high_value" in requirement:
+            threshold = high_value_threshold
+        by_type[movement_type] = {
+            "operation": operation,
+            "always_required": bool(requirement.get("always_required", False)),
+            "default_role": requirement.get("default", "INVENTORY_OPERATOR"),
+            "high_value_threshold": threshold,
+            "high_value_role": requirement.get("high_value"),
+            "restricted_role": requirement.get("restricted_location"),
+            "cross_project_role": requirement.get("cross_project"),
+        }
+
+    discard = approval_requirements.get("DISCARD", {})
+    compiled = {
+        "by_type": by_type,
+        "restricted_locations": sorted(set(restricted_locations)),
+        "discard_locations": sorted(set(discard_locations)),
+        "discard_role": discard.get("default", "DIRECTOR"),
+        "bulk_quantity_threshold": bulk_quantity_threshold,
+        "business_hours": list(business_hours),
+    }
+    compiled["version"] = hashlib.sha256(
+        json.dumps(compiled, sort_keys=True).encode()
+    ).hexdigest()[:12]
+    return compiled
+
+
+# =============================================================================
+# Chunk Evaluation
+# =============================================================================
+
+def _as_datetime(value: Any) -> Optional[datetime]:
+    """Coerce a movement timestamp (datetime or ISO string) to datetime."""
+    if value is None or isinstance(value, datetime):
+        return value
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _as_float(value: Any) -> Optional[float]:
+    """Coerce a numeric value (Decimal, str, number) to float."""
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def evaluate_chunk(
+    rows: List[Dict[str, Any]],
+    rules: Dict[str, Any],
+) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Evaluate a chunk of movements against compiled rules.
+
+    The chunk is transposed once into columns; each rule is then a single
+    pass over the columns it needs.
+
+    Args:
+        rows: Movement rows (keys from AUDIT_COLUMNS)
+        rules: Output of compile_rules()
+
+    Returns:
+        Tuple of (findings, counts). counts has total, compliant,
+        non_compliant and warnings (operations with warnings only).
+    """
+    n = len(rows)
+    if n == 0:
+        return [], {"total": 0, "compliant": 0, "non_compliant": 0, "warnings": 0}
+
+    col = {name: [row.get(name) for row in rows] for name in AUDIT_COLUMNS}
+
+    by_type = rules["by_type"]
+    restricted = frozenset(rules.get("restricted_locations", ()))
+    discard = frozenset(rules.get("discard_locations", ()))
+    bulk_threshold = rules.get("bulk_quantity_threshold", 50)
+    hours_start, hours_end = rules.get("business_hours", (8, 18))
+
+    empty_rule: Dict[str, Any] = {}
+    rule_col = [by_type.get(str(t), empty_rule) for t in col["movement_type"]]
+    approved = [bool(a) for a in col["approved_by"]]
+    dates = [_as_datetime(d) for d in col["movement_date"]]
+    source = col["source_location"]
+    dest = col["destination_location"]
+
+    # (finding_code, severity, required_role) per row, per rule
+    hits: List[List[Tuple[str, str, Optional[str]]]] = [[] for _ in range(n)]
+
+    # Rule: always_required operations must be approved
+    for i, (rule, ok) in enumerate(zip(rule_col, approved)):
+        if rule.get("always_required") and not ok:
+            hits[i].append((FINDING_MISSING_APPROVAL, SEVERITY_NON_COMPLIANT, rule.get("default_role")))
+
+    # Rule: high value threshold
+    for i, (rule, value, ok) in enumerate(zip(rule_col, col["total_value"], approved)):
+        threshold = rule.get("high_value_threshold")
+        if threshold is None or ok:
+            continue
+        amount = _as_float(value)
+        if amount is not None and amount >= threshold:
+            hits[i].append((FINDING_HIGH_VALUE, SEVERITY_NON_COMPLIANT, rule.get("high_value_role")))
+
+    # Rule: restricted locations
+    if restricted:
+        for i, (rule, src, dst, ok) in enumerate(zip(rule_col, source, dest, approved)):
+            if ok or not (src in restricted or dst in restricted):
+                continue
+            role = rule.get("restricted_role") or "INVENTORY_MANAGER"
+            hits[i].append((FINDING_RESTRICTED_LOCATION, SEVERITY_NON_COMPLIANT, role))
+
+    # Rule: discard destinations
+    if discard:
+        discard_role = rules.get("discard_role", "DIRECTOR")
+        for i, (dst, ok) in enumerate(zip(dest, approved)):
+            if dst in discard and not ok:
+                hits[i].append((FINDING_DISCARD, SEVERITY_NON_COMPLIANT, discard_role))
+
+    # Rule: cross-project operations
+    for i, (rule, proj, dest_proj, ok) in enumerate(
+        zip(rule_col, col["project_code"], col["destination_project"], approved)
+    ):
+        role = rule.get("cross_project_role")
+        if role and not ok and proj and dest_proj and proj != dest_proj:
+            hits[i].append((FINDING_CROSS_PROJECT, SEVERITY_NON_COMPLIANT, role))
+
+    # Warning: approval recorded after the movement
+    for i, (moved_at, approved_at) in enumerate(zip(dates, col["approved_at"])):
+        approved_dt = _as_datetime(approved_at)
+        if moved_at is not None and approved_dt is not None and approved_dt > moved_at:
+            hits[i].append((FINDING_LATE_APPROVAL, SEVERITY_WARNING, None))
+
+    # Warning: weekend or outside business hours
+    for i, moved_at in enumerate(dates):
+        if moved_at is None:
+            continue
+        if moved_at.weekday() >= 5 or not (hours_start <= moved_at.hour < hours_end):
+            hits[i].append((FINDING_OFF_HOURS, SEVERITY_WARNING, None))
+
+    # Warning: bulk quantity
+    for i, qty in enumerate(col["quantity"]):
+        if qty is not None and abs(int(qty)) >= bulk_threshold:
+            hits[i].append((FINDING_BULK_QUANTITY, SEVERITY_WARNING, None))
+
+    findings: List[Dict[str, Any]] = []
+    counts = {"total": n, "compliant": 0, "non_compliant": 0, "warnings": 0}
+    for i, row_hits in enumerate(hits):
+        if not row_hits:
+            counts["compliant"] += 1
+            continue
+        if any(severity == SEVERITY_NON_COMPLIANT for _, severity, _ in row_hits):
+            counts["non_compliant"] += 1
+        else:
+            counts["warnings"] += 1
+        moved_at = dates[i]
+        for code, severity, role in row_hits:
+            findings.append({
+                "movement_id": str(col["movement_id"][i]),
+                "movement_type": col["movement_type"][i],
+                "movement_date": moved_at.isoformat() if moved_at else None,
+                "finding_code": code,
+                "severity": severity,
+                "required_role": role,
+                "message": FINDING_MESSAGES[code],
+            })
+
+    return findings, counts
+
+
+# =============================================================================
+# Bounded Accumulator
+# =============================================================================
+
+class AuditAccumulator:
+    """
+    Constant-memory aggregate of an audit run.
+
+    Holds counters, per-code totals and the first `sample_limit`
+    non-compliant findings (then warnings) for the report.
+    """
+
+    def __init__(self, sample_limit: int = 50):
+        """
+        Initialize AuditAccumulator.
+
+        Args:
+            sample_limit: Maximum findings kept for the report
+        """
+        self.sample_limit = sample_limit
+        self.counts = {"total": 0, "compliant": 0, "non_compliant": 0, "warnings": 0}
+        self.findings_by_code: Dict[str, int] = {}
+        self.sample: List[Dict[str, Any]] = []
+
+    def add(self, findings: List[Dict[str, Any]], counts: Dict[str, int]) -> None:
+        """Merge one evaluated chunk."""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+        for finding in findings:
+            code = finding["finding_code"]
+            self.findings_by_code[code] = self.findings_by_code.get(code, 0) + 1
+            if len(self.sample) < self.sample_limit:
+                self.sample.append(finding)
+            elif finding["severity"] == SEVERITY_NON_COMPLIANT:
+                # Prefer non-compliant findings over warnings in the sample
+                for idx, kept in enumerate(self.sample):
+                    if kept["severity"] != SEVERITY_NON_COMPLIANT:
+                        self.sample[idx] = finding
+                        break
+
+    def recommendations(self) -> List[str]:
+        """Recommendations for the finding codes seen, most frequent first."""
+        return build_recommendations(self.findings_by_code)
+
+
+def build_recommendations(findings_by_code: Dict[str, int]) -> List[str]:
+    """
+    Map finding counts to recommendations (most frequent first).
+
+    Args:
+        findings_by_code: finding_code -> occurrences
+
+    Returns:
+        List of recommendation strings
+    """
+    ordered = sorted(findings_by_code.items(), key=lambda kv: kv[1], reverse=True)
+    return [
+        f"{FINDING_RECOMMENDATIONS[code]} ({count} ocorrência(s))"
+        for code, count in ordered
+        if code in FINDING_RECOMMENDATIONS and count > 0
+    ]
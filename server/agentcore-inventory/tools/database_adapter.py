@@ -50,6 +50,10 @@ class InventoryFilters:
     status: Optional[AssetStatus] = None
     limit: int = 100
     offset: int = 0
+    # Keyset pagination: pass the previous page's next_cursor
+    cursor: Optional[str] = None
+    pagination: Optional[str] = None  # offset (default) or keyset
+    total_mode: Optional[str] = None  # none, estimate, cached (keyset)
 
 
 @dataclass
@@ -61,6 +65,8 @@ class MovementFilters:
     project_id: Optional[str] = None
     location_id: Optional[str] = None
     limit: int = 100
+    cursor: Optional[str] = None
+    total_mode: Optional[str] = None  # none, estimate, cached
 
 
 @dataclass
@@ -131,7 +137,8 @@ class DatabaseAdapter(ABC):
         self,
         query: str,
         search_type: str = "all",
-        limit: int = 50
+        limit: int = 50,
+        mode: str = "contains"
     ) -> List[Dict[str, Any]]:
         """
         Search assets by serial number, part number, or description.
@@ -140,6 +147,7 @@ class DatabaseAdapter(ABC):
             query: Search term
             search_type: Type of search (serial, part_number, description, all)
             limit: Maximum results to return
+            mode: contains, prefix, or ranked (results include score)
 
         Returns:
             List of matching assets
@@ -223,8 +231,14 @@ class DatabaseAdapter(ABC):
     @abstractmethod
     async def reconcile_with_sap(
         self,
-        sap_data: List[Dict[str, Any]],
-        include_serials: bool = False
+        sap_data: Optional[List[Dict[str, Any]]] = None,
+        include_serials: bool = False,
+        mode: str = "full",
+        s3_uri: Optional[str] = None,
+        run_id: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 500
     ) -> Dict[str, Any]:
         """
         Compare SGA inventory with SAP export data.
@@ -232,6 +246,12 @@ class DatabaseAdapter(ABC):
         Args:
             sap_data: List of SAP items to compare
             include_serials: Whether to include serial number comparison
+            mode: "full" (every row) or "set" (summary + paged lines)
+            s3_uri: SAP CSV export in S3 instead of sap_data (set mode)
+            run_id: Existing set-mode run to page through
+            category: Only discrepancy, sap_only or sga_only lines
+            cursor: Opaque cursor from next_cursor
+            limit: Lines per page (set mode)
 
         Returns:
             Dict with comparison results and divergences
@@ -6,20 +6,88 @@
 # Features:
 # - Single-table design with PK/SK pattern
 # - GSI queries for common access patterns
-# - Atomic balance updates
-# - Batch operations for efficiency
+# - Atomic balance updates (write-sharded counters for hot balances)
+# - Batch operations for efficiency (parallel chunks, unprocessed-item retry)
 # - Audit trail integration
 #
 # CRITICAL: Lazy imports for cold start optimization (<30s limit)
 # =============================================================================
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, Iterable, List, Optional, Tuple
 from datetime import datetime, timedelta
+from decimal import Decimal
 import os
+import random
+import threading
+import time
+import zlib
 
 # Lazy imports - boto3 imported only when needed
 _dynamodb_resource = None
 _dynamodb_client = None
+_thread_local = threading.local()
+_bulk_executor = None
+_bulk_executor_lock = threading.Lock()
+_compaction_executor = None
+
+# =============================================================================
+# Bulk I/O Settings
+# =============================================================================
+
+# DynamoDB API limits per request
+BATCH_WRITE_SIZE = 25
+BATCH_GET_SIZE = 100
+
+# Concurrent batch requests per bulk call (shared thread pool)
+BULK_WORKERS = int(os.environ.get("DYNAMODB_BULK_WORKERS", "4"))
+
+# Attempts per chunk for unprocessed items / throttling (1 = no retry)
+BULK_MAX_ATTEMPTS = int(os.environ.get("DYNAMODB_BULK_MAX_ATTEMPTS", "8"))
+BULK_BACKOFF_BASE_SECONDS = 0.05
+BULK_BACKOFF_MAX_SECONDS = 2.0
+
+# =============================================================================
+# Sharded Balance Counters
+# =============================================================================
+# A hot balance (e.g. central depot during a large import) is spread over
+# BALANCE_SHARD_COUNT shard items with their own partition keys:
+#
+#   PK=BALANCE#{loc}#{pn}           SK=METADATA|PROJ#{p}   base (shard_count=N)
+#   PK=BALANCE#{loc}#{pn}#SHARD#{i} SK=METADATA|PROJ#{p}   deltas, i in [0, N)
+#
+# The balance is always base + sum(shards), so writers that do not know a
+# key is sharded (other containers) can keep writing to the base item.
+# Compaction folds shard values into the base in one transaction per shard.
+# Background compactions run on their own thread and read the shards inline:
+# a task on the bulk pool that waits on bulk pool futures can deadlock it.
+#
+# BALANCE_SHARDING: auto (shard keys detected as hot), always, off
+
+BALANCE_SHARDING = os.environ.get("BALANCE_SHARDING", "auto").lower()
+BALANCE_SHARD_COUNT = int(os.environ.get("BALANCE_SHARD_COUNT", "10"))
+BALANCE_HOT_WRITES_PER_SECOND = float(os.environ.get("BALANCE_HOT_WRITES_PER_SECOND", "20"))
+BALANCE_HOT_WINDOW_SECONDS = float(os.environ.get("BALANCE_HOT_WINDOW_SECONDS", "10"))
+BALANCE_COMPACT_INTERVAL_SECONDS = float(os.environ.get("BALANCE_COMPACT_INTERVAL_SECONDS", "60"))
+
+THROTTLE_ERROR_CODES = frozenset({
+    "ProvisionedThroughputExceededException",
+    "ThrottlingException",
+    "RequestLimitExceeded",
+})
+
+# TransactWriteItems cancellation reasons worth retrying ("None" marks the
+# entries that did not cause the cancellation)
+RETRYABLE_CANCELLATION_CODES = frozenset({
+    "None",
+    "TransactionConflict",
+    "ThrottlingError",
+    "ProvisionedThroughputExceeded",
+})
+
+
+def _get_endpoint_url() -> Optional[str]:
+    """DynamoDB endpoint override (e.g. DynamoDB Local), None for AWS."""
+    return os.environ.get("DYNAMODB_ENDPOINT_URL") or None
 
 
 def _get_dynamodb_resource():
@@ -33,7 +101,9 @@ def _get_dynamodb_resource():
     if _dynamodb_resource is None:
         import boto3
         # Explicitly set region to ensure consistency across all environments
-        _dynamodb_resource = boto3.resource("dynamodb", region_name="us-east-2")
+        _dynamodb_resource = boto3.resource(
+            "dynamodb", region_name="us-east-2", endpoint_url=_get_endpoint_url()
+        )
     return _dynamodb_resource
 
 
@@ -48,10 +118,157 @@ def _get_dynamodb_client():
     if _dynamodb_client is None:
         import boto3
         # Explicitly set region to ensure consistency across all environments
-        _dynamodb_client = boto3.client("dynamodb", region_name="us-east-2")
+        _dynamodb_client = boto3.client(
+            "dynamodb", region_name="us-east-2", endpoint_url=_get_endpoint_url()
+        )
     return _dynamodb_client
 
 
+def _get_thread_dynamodb_resource():
+    """
+    Get a DynamoDB resource owned by the calling thread.
+
+    boto3 resources are not thread-safe, so bulk worker threads each build
+    their own from a private session.
+
+    Returns:
+        boto3 DynamoDB resource
+    """
+    resource = getattr(_thread_local, "resource", None)
+    if resource is None:
+        import boto3
+        resource = boto3.session.Session().resource(
+            "dynamodb", region_name="us-east-2", endpoint_url=_get_endpoint_url()
+        )
+        _thread_local.resource = resource
+    return resource
+
+
+def _get_bulk_executor():
+    """
+    Get the thread pool shared by bulk reads and writes.
+
+    Returns:
+        ThreadPoolExecutor with BULK_WORKERS threads
+    """
+    global _bulk_executor
+    if _bulk_executor is None:
+        with _bulk_executor_lock:
+            if _bulk_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _bulk_executor = ThreadPoolExecutor(
+                    max_workers=max(1, BULK_WORKERS),
+                    thread_name_prefix="dynamodb-bulk",
+                )
+    return _bulk_executor
+
+
+def _get_compaction_executor():
+    """
+    Get the single thread that runs background balance compactions.
+
+    Returns:
+        ThreadPoolExecutor with one thread
+    """
+    global _compaction_executor
+    if _compaction_executor is None:
+        with _bulk_executor_lock:
+            if _compaction_executor is None:
+                from concurrent.futures import ThreadPoolExecutor
+                _compaction_executor = ThreadPoolExecutor(
+                    max_workers=1,
+                    thread_name_prefix="dynamodb-compact",
+                )
+    return _compaction_executor
+
+
+def _is_throttle(error: Exception) -> bool:
+    """True for DynamoDB throttling errors (retried like unprocessed items)."""
+    code = getattr(error, "response", {}).get("Error", {}).get("Code")
+    return code in THROTTLE_ERROR_CODES
+
+
+def _backoff(attempt: int) -> None:
+    """Sleep with exponential backoff and full jitter before retry `attempt`."""
+    delay = min(BULK_BACKOFF_MAX_SECONDS, BULK_BACKOFF_BASE_SECONDS * (2 ** attempt))
+    time.sleep(random.uniform(0, delay))
+
+
+def _item_key(item: Dict[str, Any]) -> Tuple[Any, Any]:
+    return item.get("PK"), item.get("SK")
+
+
+def _to_dynamo(obj: Any) -> Any:
+    """Recursively convert floats to Decimal (DynamoDB rejects float)."""
+    if isinstance(obj, float):
+        return Decimal(str(obj))
+    if isinstance(obj, dict):
+        return {k: _to_dynamo(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_to_dynamo(v) for v in obj]
+    return obj
+
+
+def _from_dynamo(obj: Any) -> Any:
+    """Recursively convert Decimal back to int/float."""
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, dict):
+        return {k: _from_dynamo(v) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_from_dynamo(v) for v in obj]
+    return obj
+
+
+class HotKeyDetector:
+    """
+    Per-process write-rate tracker over fixed time windows.
+
+    A key is hot once it receives threshold_per_second * window_seconds
+    writes within one window.
+
+    Example:
+        detector = HotKeyDetector(threshold_per_second=20, window_seconds=10)
+        if detector.record("BALANCE#LOC#PN"):
+            ...  # switch to sharded writes
+    """
+
+    MAX_TRACKED_KEYS = 10000
+
+    def __init__(self, threshold_per_second: float, window_seconds: float):
+        self.limit = max(1, int(threshold_per_second * window_seconds))
+        self.window_seconds = window_seconds
+        self._windows: Dict[Any, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: Any) -> bool:
+        """Count one write; True if the key is hot in the current window."""
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= self.window_seconds:
+                if len(self._windows) >= self.MAX_TRACKED_KEYS:
+                    self._prune(now)
+                window = [now, 0]
+                self._windows[key] = window
+            window[1] += 1
+            return window[1] >= self.limit
+
+    def _prune(self, now: float) -> None:
+        expired = [k for k, w in self._windows.items() if now - w[0] >= self.window_seconds]
+        for key in expired or list(self._windows):
+            del self._windows[key]
+
+
+# Process-wide sharding state, shared by all client instances
+_balance_hot_keys = HotKeyDetector(BALANCE_HOT_WRITES_PER_SECOND, BALANCE_HOT_WINDOW_SECONDS)
+_sharded_balances: Dict[Tuple[str, str], int] = {}
+_balance_compacted_at: Dict[Tuple[str, str], float] = {}
+_sharded_balances_lock = threading.Lock()
+
+BALANCE_FIELDS = ("total", "available", "reserved")
+
+
 # =============================================================================
 # Table Names from Environment
 # =============================================================================
@@ -106,6 +323,8 @@ class SGADynamoDBClient:
         """
         self._table_name = table_name or _get_inventory_table()
         self._table = None
+        # Stats of the most recent bulk_put/bulk_get (batch_write/batch_get)
+        self.last_bulk_stats: Optional[Dict[str, Any]] = None
 
     @property
     def table(self):
@@ -187,6 +406,7 @@ class SGADynamoDBClient:
         sk: str,
         updates: Dict[str, Any],
         conditions: Optional[str] = None,
+        expected: Optional[Dict[str, Any]] = None,
     ) -> bool:
         """
         Update specific attributes of an item.
@@ -196,6 +416,8 @@ class SGADynamoDBClient:
             sk: Sort key value
             updates: Dict of attribute_name -> new_value
             conditions: Optional condition expression
+            expected: Optional attribute_name -> value the item must
+                currently have (ANDed with conditions)
 
         Returns:
             True if successful
@@ -213,10 +435,11 @@ class SGADynamoDBClient:
                 expr_names[attr_name] = key
                 expr_values[attr_value] = value
 
-            # Add updated_at
-            update_parts.append("#updated = :updated")
-            expr_names["#updated"] = "updated_at"
-            expr_values[":updated"] = datetime.utcnow().isoformat() + "Z"
+            # Add updated_at (unless set by the caller; paths must not overlap)
+            if "updated_at" not in updates:
+                update_parts.append("#updated = :updated")
+                expr_names["#updated"] = "updated_at"
+                expr_values[":updated"] = datetime.utcnow().isoformat() + "Z"
 
             update_expr = "SET " + ", ".join(update_parts)
 
@@ -227,8 +450,14 @@ class SGADynamoDBClient:
                 "ExpressionAttributeValues": expr_values,
             }
 
-            if conditions:
-                params["ConditionExpression"] = conditions
+            condition_parts = [conditions] if conditions else []
+            for i, (key, value) in enumerate((expected or {}).items()):
+                expr_names[f"#exp{i}"] = key
+                expr_values[f":exp{i}"] = value
+                condition_parts.append(f"#exp{i} = :exp{i}")
+
+            if condition_parts:
+                params["ConditionExpression"] = " AND ".join(condition_parts)
 
             self.table.update_item(**params)
             return True
@@ -330,70 +559,197 @@ class SGADynamoDBClient:
         """
         Batch get multiple items.
 
+        Chunks run concurrently and unprocessed keys are retried; see
+        bulk_get() for per-call stats.
+
         Args:
             keys: List of {"PK": pk, "SK": sk} dicts
 
         Returns:
             List of found items
         """
-        if not keys:
-            return []
-
-        try:
-            # DynamoDB limit: 100 items per batch
-            all_items = []
-            for i in range(0, len(keys), 100):
-                batch = keys[i:i+100]
-                response = _get_dynamodb_resource().batch_get_item(
-                    RequestItems={
-                        self._table_name: {
-                            "Keys": batch
-                        }
-                    }
-                )
-                items = response.get("Responses", {}).get(self._table_name, [])
-                all_items.extend(items)
-
-            return all_items
-        except Exception as e:
-            print(f"[DynamoDB] batch_get error: {e}")
-            return []
+        items, _ = self.bulk_get(keys)
+        return items
 
     def batch_write(self, items: List[Dict[str, Any]]) -> bool:
         """
         Batch write multiple items.
 
+        Chunks run concurrently and unprocessed items are retried; see
+        bulk_put() for per-call stats.
+
         Args:
             items: List of items to write (each must have PK and SK)
 
         Returns:
             True if all successful
         """
-        if not items:
-            return True
+        return self.bulk_put(items)["success"]
 
-        try:
-            now = datetime.utcnow().isoformat() + "Z"
+    def bulk_put(self, items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write items with parallel BatchWriteItem requests.
+
+        Items are consumed lazily (generators are fine) in chunks of 25,
+        with at most 2 * BULK_WORKERS chunks in flight. UnprocessedItems
+        and throttling errors are retried with exponential backoff and
+        jitter, up to BULK_MAX_ATTEMPTS per chunk. A repeated PK/SK inside
+        a chunk keeps the last item (DynamoDB rejects duplicates).
+
+        Args:
+            items: Iterable of items (each must have PK and SK)
+
+        Returns:
+            Stats dict: success, items, items_written, items_failed,
+            batches, retries, throttles, elapsed_ms
+        """
+        from concurrent.futures import FIRST_COMPLETED, wait
 
-            # DynamoDB limit: 25 items per batch
-            for i in range(0, len(items), 25):
-                batch = items[i:i+25]
-                request_items = []
+        started = time.monotonic()
+        stats = {"items": 0, "items_written": 0, "items_failed": 0,
+                 "batches": 0, "retries": 0, "throttles": 0}
+        executor = _get_bulk_executor()
+        max_in_flight = 2 * max(1, BULK_WORKERS)
+        in_flight = set()
 
-                for item in batch:
-                    if "created_at" not in item:
-                        item["created_at"] = now
-                    item["updated_at"] = now
-                    request_items.append({"PutRequest": {"Item": item}})
+        def collect(done):
+            for future in done:
+                for name, value in future.result().items():
+                    stats[name] += value
 
-                _get_dynamodb_resource().batch_write_item(
-                    RequestItems={self._table_name: request_items}
+        now = datetime.utcnow().isoformat() + "Z"
+        chunk: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for item in items:
+            if "created_at" not in item:
+                item["created_at"] = now
+            item["updated_at"] = now
+            chunk[_item_key(item)] = item
+            if len(chunk) < BATCH_WRITE_SIZE:
+                continue
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            stats["items"] += len(chunk)
+            in_flight.add(executor.submit(self._write_chunk, list(chunk.values())))
+            chunk = {}
+        if chunk:
+            stats["items"] += len(chunk)
+            in_flight.add(executor.submit(self._write_chunk, list(chunk.values())))
+        collect(wait(in_flight)[0])
+
+        stats["success"] = stats["items_failed"] == 0
+        stats["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+        self.last_bulk_stats = stats
+        if not stats["success"]:
+            print(f"[DynamoDB] bulk_put incomplete: {stats}")
+        return stats
+
+    def _write_chunk(self, items: List[Dict[str, Any]]) -> Dict[str, int]:
+        """Write one chunk (<= 25 items), retrying unprocessed items."""
+        stats = {"items_written": 0, "items_failed": 0,
+                 "batches": 0, "retries": 0, "throttles": 0}
+        pending = [{"PutRequest": {"Item": item}} for item in items]
+        resource = _get_thread_dynamodb_resource()
+
+        for attempt in range(BULK_MAX_ATTEMPTS):
+            if attempt:
+                stats["retries"] += 1
+                _backoff(attempt)
+            stats["batches"] += 1
+            try:
+                response = resource.batch_write_item(
+                    RequestItems={self._table_name: pending}
                 )
+            except Exception as e:
+                if _is_throttle(e):
+                    stats["throttles"] += 1
+                    continue
+                print(f"[DynamoDB] batch_write error: {e}")
+                break
+            unprocessed = response.get("UnprocessedItems", {}).get(self._table_name, [])
+            stats["items_written"] += len(pending) - len(unprocessed)
+            pending = unprocessed
+            if not pending:
+                break
+
+        stats["items_failed"] = len(pending)
+        return stats
+
+    def bulk_get(
+        self,
+        keys: Iterable[Dict[str, str]],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+        """
+        Read items with parallel BatchGetItem requests.
 
-            return True
-        except Exception as e:
-            print(f"[DynamoDB] batch_write error: {e}")
-            return False
+        Duplicate keys are requested once. UnprocessedKeys and throttling
+        errors are retried with exponential backoff and jitter, up to
+        BULK_MAX_ATTEMPTS per chunk. Result order is not guaranteed.
+
+        Args:
+            keys: Iterable of {"PK": pk, "SK": sk} dicts
+
+        Returns:
+            Tuple of (found items, stats dict: success, keys, items_found,
+            keys_failed, batches, retries, throttles, elapsed_ms)
+        """
+        started = time.monotonic()
+        unique = list({_item_key(key): key for key in keys}.values())
+        stats = {"keys": len(unique), "items_found": 0, "keys_failed": 0,
+                 "batches": 0, "retries": 0, "throttles": 0}
+
+        executor = _get_bulk_executor()
+        futures = [
+            executor.submit(self._get_chunk, unique[i:i + BATCH_GET_SIZE])
+            for i in range(0, len(unique), BATCH_GET_SIZE)
+        ]
+        all_items: List[Dict[str, Any]] = []
+        for future in futures:
+            items, chunk_stats = future.result()
+            all_items.extend(items)
+            for name, value in chunk_stats.items():
+                stats[name] += value
+
+        stats["items_found"] = len(all_items)
+        stats["success"] = stats["keys_failed"] == 0
+        stats["elapsed_ms"] = round((time.monotonic() - started) * 1000, 1)
+        self.last_bulk_stats = stats
+        if not stats["success"]:
+            print(f"[DynamoDB] bulk_get incomplete: {stats}")
+        return all_items, stats
+
+    def _get_chunk(
+        self,
+        keys: List[Dict[str, str]],
+    ) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """Read one chunk (<= 100 keys), retrying unprocessed keys."""
+        stats = {"keys_failed": 0, "batches": 0, "retries": 0, "throttles": 0}
+        items: List[Dict[str, Any]] = []
+        pending = keys
+        resource = _get_thread_dynamodb_resource()
+
+        for attempt in range(BULK_MAX_ATTEMPTS):
+            if attempt:
+                stats["retries"] += 1
+                _backoff(attempt)
+            stats["batches"] += 1
+            try:
+                response = resource.batch_get_item(
+                    RequestItems={self._table_name: {"Keys": pending}}
+                )
+            except Exception as e:
+                if _is_throttle(e):
+                    stats["throttles"] += 1
+                    continue
+                print(f"[DynamoDB] batch_get error: {e}")
+                break
+            items.extend(response.get("Responses", {}).get(self._table_name, []))
+            pending = response.get("UnprocessedKeys", {}).get(self._table_name, {}).get("Keys", [])
+            if not pending:
+                break
+
+        stats["keys_failed"] = len(pending)
+        return items, stats
 
     # =========================================================================
     # Asset Operations
@@ -490,6 +846,16 @@ class SGADynamoDBClient:
     # Balance Operations
     # =========================================================================
 
+    @staticmethod
+    def _balance_key(
+        location_id: str,
+        pn_id: str,
+        project_id: Optional[str] = None,
+    ) -> Tuple[str, str]:
+        pk = f"BALANCE#{location_id}#{pn_id}"
+        sk = f"PROJ#{project_id}" if project_id else "METADATA"
+        return pk, sk
+
     def get_balance(
         self,
         location_id: str,
@@ -499,6 +865,10 @@ class SGADynamoDBClient:
         """
         Get balance for a part number at a location.
 
+        Sharded balances are summed from the base item and its shards. When
+        this process already knows the key is sharded, that is one
+        BatchGetItem; otherwise the base item is read first.
+
         Args:
             location_id: Location identifier
             pn_id: Part number identifier
@@ -507,29 +877,29 @@ class SGADynamoDBClient:
         Returns:
             Balance dict with total, available, reserved
         """
-        pk = f"BALANCE#{location_id}#{pn_id}"
-        sk = f"PROJ#{project_id}" if project_id else "METADATA"
-
-        item = self.get_item(pk, sk)
-
-        if item:
-            return {
-                "total": item.get("total", 0),
-                "available": item.get("available", 0),
-                "reserved": item.get("reserved", 0),
-                "location_id": location_id,
-                "pn_id": pn_id,
-                "project_id": project_id,
-            }
+        pk, sk = self._balance_key(location_id, pn_id, project_id)
+        shard_count = _sharded_balances.get((pk, sk), 0)
+
+        if shard_count:
+            items = self.batch_get(self._balance_shard_keys(pk, sk, shard_count, with_base=True))
+            base = next((i for i in items if i["PK"] == pk), None)
+            if base and int(base.get("shard_count", 0)) > shard_count:
+                items += self.batch_get(self._balance_shard_keys(
+                    pk, sk, int(base["shard_count"]), start=shard_count,
+                ))
+        else:
+            base = self.get_item(pk, sk)
+            items = [base] if base else []
+            if base and base.get("shard_count"):
+                items += self.batch_get(self._balance_shard_keys(pk, sk, int(base["shard_count"])))
 
-        return {
-            "total": 0,
-            "available": 0,
-            "reserved": 0,
+        balance = {field: sum(item.get(field, 0) for item in items) for field in BALANCE_FIELDS}
+        balance.update({
             "location_id": location_id,
             "pn_id": pn_id,
             "project_id": project_id,
-        }
+        })
+        return balance
 
     def update_balance(
         self,
@@ -538,59 +908,210 @@ class SGADynamoDBClient:
         delta: int,
         project_id: Optional[str] = None,
         is_reservation: bool = False,
+        shard_key: Optional[str] = None,
     ) -> bool:
         """
         Atomically update balance for a part number.
 
+        Hot balances (see BALANCE_SHARDING) are written to one of their
+        shard items. A throttled write to an unsharded balance marks it hot
+        and is retried once on a shard.
+
         Args:
             location_id: Location identifier
             pn_id: Part number identifier
             delta: Change in quantity (positive or negative)
             project_id: Optional project
             is_reservation: If True, updates reserved instead of total
+            shard_key: Optional value hashed to pick the shard (e.g. the
+                movement ID); a random shard is used otherwise
 
         Returns:
             True if successful
         """
-        pk = f"BALANCE#{location_id}#{pn_id}"
-        sk = f"PROJ#{project_id}" if project_id else "METADATA"
+        pk, sk = self._balance_key(location_id, pn_id, project_id)
+        if is_reservation:
+            deltas = {"reserved": delta, "available": -delta}
+        else:
+            deltas = {"total": delta, "available": delta}
 
         try:
-            if is_reservation:
-                # Update reserved quantity
-                self.table.update_item(
-                    Key={"PK": pk, "SK": sk},
-                    UpdateExpression="""
-                        SET reserved = if_not_exists(reserved, :zero) + :delta,
-                            available = if_not_exists(available, :zero) - :delta,
-                            updated_at = :now
-                    """,
-                    ExpressionAttributeValues={
-                        ":delta": delta,
-                        ":zero": 0,
-                        ":now": datetime.utcnow().isoformat() + "Z",
-                    },
-                )
-            else:
-                # Update total and available
-                self.table.update_item(
-                    Key={"PK": pk, "SK": sk},
-                    UpdateExpression="""
-                        SET total = if_not_exists(total, :zero) + :delta,
-                            available = if_not_exists(available, :zero) + :delta,
-                            updated_at = :now
-                    """,
-                    ExpressionAttributeValues={
-                        ":delta": delta,
-                        ":zero": 0,
-                        ":now": datetime.utcnow().isoformat() + "Z",
-                    },
-                )
+            hot = BALANCE_SHARDING == "always" or (
+                BALANCE_SHARDING == "auto" and _balance_hot_keys.record((pk, sk))
+            )
+            shard_count = self._balance_shard_count(pk, sk, hot)
+            try:
+                self._add_balance(self._balance_write_pk(pk, shard_count, shard_key), sk, deltas)
+            except Exception as e:
+                if shard_count or BALANCE_SHARDING == "off" or not _is_throttle(e):
+                    raise
+                shard_count = self._balance_shard_count(pk, sk, hot=True)
+                self._add_balance(self._balance_write_pk(pk, shard_count, shard_key), sk, deltas)
+
+            if shard_count:
+                self._schedule_balance_compaction(pk, sk)
             return True
         except Exception as e:
             print(f"[DynamoDB] update_balance error: {e}")
             return False
 
+    def compact_balance(
+        self,
+        location_id: str,
+        pn_id: str,
+        project_id: Optional[str] = None,
+    ) -> Dict[str, int]:
+        """
+        Fold the shard values of a sharded balance into its base item.
+
+        Each non-zero shard is moved with one transaction (ADD -v to the
+        shard, ADD +v to the base), so concurrent shard writes are never
+        lost. Shards whose transaction conflicts are left for next time.
+
+        Args:
+            location_id: Location identifier
+            pn_id: Part number identifier
+            project_id: Optional project
+
+        Returns:
+            Dict with shards, compacted and conflicts counts
+        """
+        pk, sk = self._balance_key(location_id, pn_id, project_id)
+        return self._compact_balance_key(pk, sk)
+
+    def compact_hot_balances(self) -> Dict[str, int]:
+        """
+        Compact every balance this process knows to be sharded.
+
+        Returns:
+            Dict with balances, compacted and conflicts counts
+        """
+        totals = {"balances": 0, "compacted": 0, "conflicts": 0}
+        for pk, sk in list(_sharded_balances):
+            result = self._compact_balance_key(pk, sk)
+            totals["balances"] += 1
+            totals["compacted"] += result["compacted"]
+            totals["conflicts"] += result["conflicts"]
+        return totals
+
+    @staticmethod
+    def _balance_shard_keys(
+        pk: str,
+        sk: str,
+        shard_count: int,
+        start: int = 0,
+        with_base: bool = False,
+    ) -> List[Dict[str, str]]:
+        keys = [{"PK": pk, "SK": sk}] if with_base else []
+        keys += [{"PK": f"{pk}#SHARD#{i}", "SK": sk} for i in range(start, shard_count)]
+        return keys
+
+    @staticmethod
+    def _balance_write_pk(pk: str, shard_count: int, shard_key: Optional[str]) -> str:
+        if not shard_count:
+            return pk
+        if shard_key is None:
+            shard = random.randrange(shard_count)
+        else:
+            shard = zlib.crc32(shard_key.encode()) % shard_count
+        return f"{pk}#SHARD#{shard}"
+
+    def _balance_shard_count(self, pk: str, sk: str, hot: bool) -> int:
+        """Shard count of a balance; marks it sharded when it turns hot."""
+        shard_count = _sharded_balances.get((pk, sk), 0)
+        if shard_count or not hot:
+            return shard_count
+
+        # Other containers may have sharded it already with another count
+        response = self.table.update_item(
+            Key={"PK": pk, "SK": sk},
+            UpdateExpression="SET shard_count = if_not_exists(shard_count, :n)",
+            ExpressionAttributeValues={":n": max(1, BALANCE_SHARD_COUNT)},
+            ReturnValues="UPDATED_NEW",
+        )
+        shard_count = int(response["Attributes"]["shard_count"])
+        with _sharded_balances_lock:
+            _sharded_balances[(pk, sk)] = shard_count
+            _balance_compacted_at.setdefault((pk, sk), time.monotonic())
+        print(f"[DynamoDB] Balance {pk} {sk} is hot, writing to {shard_count} shards")
+        return shard_count
+
+    def _add_balance(self, pk: str, sk: str, deltas: Dict[str, int]) -> None:
+        names = list(deltas)
+        self.table.update_item(
+            Key={"PK": pk, "SK": sk},
+            UpdateExpression=(
+                "SET updated_at = :now ADD "
+                + ", ".join(f"{name} :{name}" for name in names)
+            ),
+            ExpressionAttributeValues={
+                **{f":{name}": deltas[name] for name in names},
+                ":now": datetime.utcnow().isoformat() + "Z",
+            },
+        )
+
+    def _schedule_balance_compaction(self, pk: str, sk: str) -> None:
+        """Compact in the background at most every BALANCE_COMPACT_INTERVAL_SECONDS."""
+        now = time.monotonic()
+        with _sharded_balances_lock:
+            if now - _balance_compacted_at.get((pk, sk), now) < BALANCE_COMPACT_INTERVAL_SECONDS:
+                return
+            _balance_compacted_at[(pk, sk)] = now
+        _get_compaction_executor().submit(self._compact_balance_key, pk, sk)
+
+    def _compact_balance_key(self, pk: str, sk: str) -> Dict[str, int]:
+        result = {"shards": 0, "compacted": 0, "conflicts": 0}
+        try:
+            shard_count = _sharded_balances.get((pk, sk), 0)
+            if not shard_count:
+                base = self.get_item(pk, sk) or {}
+                shard_count = int(base.get("shard_count", 0))
+            result["shards"] = shard_count
+            if not shard_count:
+                return result
+
+            # Read inline (not bulk_get): this may run on a pool thread
+            shards: List[Dict[str, Any]] = []
+            keys = self._balance_shard_keys(pk, sk, shard_count)
+            for i in range(0, len(keys), BATCH_GET_SIZE):
+                shards.extend(self._get_chunk(keys[i:i + BATCH_GET_SIZE])[0])
+
+            now = datetime.utcnow().isoformat() + "Z"
+            client = self.table.meta.client
+            for shard in shards:
+                values = {f: shard.get(f, 0) for f in BALANCE_FIELDS if shard.get(f, 0)}
+                if not values:
+                    continue
+                add = ", ".join(f"{f} :{f}" for f in values)
+                try:
+                    client.transact_write_items(TransactItems=[
+                        {"Update": {
+                            "TableName": self._table_name,
+                            "Key": {"PK": shard["PK"], "SK": sk},
+                            "UpdateExpression": f"SET updated_at = :now ADD {add}",
+                            "ExpressionAttributeValues": {
+                                **{f":{f}": -v for f, v in values.items()}, ":now": now,
+                            },
+                        }},
+                        {"Update": {
+                            "TableName": self._table_name,
+                            "Key": {"PK": pk, "SK": sk},
+                            "UpdateExpression": f"SET updated_at = :now ADD {add}",
+                            "ExpressionAttributeValues": {
+                                **{f":{f}": v for f, v in values.items()}, ":now": now,
+                            },
+                        }},
+                    ])
+                    result["compacted"] += 1
+                except Exception as e:
+                    code = getattr(e, "response", {}).get("Error", {}).get("Code")
+                    if code != "TransactionCanceledException" and not _is_throttle(e):
+                        raise
+                    result["conflicts"] += 1
+        except Exception as e:
+            print(f"[DynamoDB] compact_balance error: {e}")
+        return result
+
     # =========================================================================
     # Movement Operations
     # =========================================================================
@@ -786,6 +1307,345 @@ class SGADynamoDBClient:
 
         return hil_client.put_item(item)
 
+    # =========================================================================
+    # Inventory Campaign Operations
+    # =========================================================================
+    # PK=CAMPAIGN#{campaign_id}  SK=METADATA                      campaign
+    # PK=CAMPAIGN#{campaign_id}  SK=ITEM#{location_id}#{pn}       count item
+    # PK=CAMPAIGN#{campaign_id}  SK=DIVERGENCE#{divergence_id}    divergence
+    #
+    # Count items share the campaign partition, so a campaign's items are
+    # one paginated query. Floats are stored as Decimal and read back as
+    # int/float.
+
+    @staticmethod
+    def _campaign_key(campaign_id: str) -> Dict[str, str]:
+        return {"PK": f"CAMPAIGN#{campaign_id}", "SK": "METADATA"}
+
+    @staticmethod
+    def _count_item_key(campaign_id: str, part_number: str, location_id: str) -> Dict[str, str]:
+        return {"PK": f"CAMPAIGN#{campaign_id}", "SK": f"ITEM#{location_id}#{part_number}"}
+
+    def put_campaign(self, campaign: Dict[str, Any]) -> bool:
+        """
+        Create or replace a campaign record.
+
+        Args:
+            campaign: Campaign dict with campaign_id
+
+        Returns:
+            True if successful
+        """
+        item = {
+            **_to_dynamo(campaign),
+            **self._campaign_key(campaign["campaign_id"]),
+            "entity_type": "CAMPAIGN",
+        }
+        return self.put_item(item)
+
+    def get_campaign(self, campaign_id: str) -> Optional[Dict[str, Any]]:
+        """Get a campaign record (None if not found)."""
+        key = self._campaign_key(campaign_id)
+        item = self.get_item(key["PK"], key["SK"])
+        return _from_dynamo(item) if item else None
+
+    def update_campaign(
+        self,
+        campaign_id: str,
+        updates: Dict[str, Any],
+        expected_status: Optional[str] = None,
+    ) -> bool:
+        """
+        Update attributes of an existing campaign.
+
+        Args:
+            campaign_id: Campaign ID
+            updates: Dict of attribute_name -> new_value
+            expected_status: Only update while the campaign has this status
+
+        Returns:
+            True if successful (False if the campaign does not exist or
+            its status is not expected_status)
+        """
+        key = self._campaign_key(campaign_id)
+        return self.update_item(
+            key["PK"], key["SK"], _to_dynamo(updates),
+            conditions="attribute_exists(PK)",
+            expected={"status": expected_status} if expected_status else None,
+        )
+
+    def put_count_items(self, items: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Write count items with parallel BatchWriteItem requests (bulk_put).
+
+        Args:
+            items: Count items, each with campaign_id, part_number and
+                location_id
+
+        Returns:
+            bulk_put stats dict (success, items_written, items_failed, ...)
+        """
+        return self.bulk_put(
+            {
+                **_to_dynamo(item),
+                **self._count_item_key(item["campaign_id"], item["part_number"], item["location_id"]),
+                "entity_type": "COUNT_ITEM",
+            }
+            for item in items
+        )
+
+    def get_count_item(
+        self,
+        campaign_id: str,
+        part_number: str,
+        location_id: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Get one count item (None if not found)."""
+        key = self._count_item_key(campaign_id, part_number, location_id)
+        item = self.get_item(key["PK"], key["SK"])
+        return _from_dynamo(item) if item else None
+
+    def get_count_items(
+        self,
+        campaign_id: str,
+        keys: Iterable[Tuple[str, str]],
+    ) -> List[Dict[str, Any]]:
+        """
+        Get count items with parallel BatchGetItem requests (bulk_get).
+
+        Args:
+            campaign_id: Campaign ID
+            keys: (part_number, location_id) pairs
+
+        Returns:
+            Found count items (order not guaranteed)
+
+        Raises:
+            RuntimeError: If keys are still unprocessed after the retries
+        """
+        items, stats = self.bulk_get(
+            self._count_item_key(campaign_id, part_number, location_id)
+            for part_number, location_id in keys
+        )
+        if not stats["success"]:
+            raise RuntimeError(f"{stats['keys_failed']} count items could not be read")
+        return [_from_dynamo(item) for item in items]
+
+    def update_count_item_with_counters(
+        self,
+        campaign_id: str,
+        part_number: str,
+        location_id: str,
+        updates: Dict[str, Any],
+        counter_deltas: Dict[str, int],
+        expected_status: Optional[str] = None,
+    ) -> bool:
+        """
+        Update a count item and the campaign counters in one transaction.
+
+        The item update is conditioned on the item's current status, so
+        two counts of the same item cannot both apply their counter
+        deltas; the deltas are ADDed to the campaign record.
+
+        Args:
+            campaign_id: Campaign ID
+            part_number: Part number of the item
+            location_id: Location of the item
+            updates: Dict of attribute_name -> new_value for the item
+            counter_deltas: Campaign counter -> increment (e.g.
+                counted_items, divergent_items); zeros are skipped
+            expected_status: Status the item must still have
+
+        Concurrent counts of one campaign all ADD to its record, so
+        DynamoDB cancels overlapping transactions (TransactionConflict);
+        those are retried with backoff, up to BULK_MAX_ATTEMPTS.
+
+        Returns:
+            True if applied, False if the item condition failed (item
+            missing or its status changed)
+
+        Raises:
+            Exception: Any other DynamoDB error, a missing campaign, or
+            conflicts still cancelling the transaction after the retries
+        """
+        now = datetime.utcnow().isoformat() + "Z"
+        names = {"#updated": "updated_at"}
+        values: Dict[str, Any] = {":updated": now}
+        assignments = ["#updated = :updated"]
+        for i, (key, value) in enumerate(_to_dynamo(updates).items()):
+            names[f"#attr{i}"] = key
+            values[f":val{i}"] = value
+            assignments.append(f"#attr{i} = :val{i}")
+
+        condition = "attribute_exists(PK)"
+        if expected_status:
+            names["#expected"] = "status"
+            values[":expected"] = expected_status
+            condition += " AND #expected = :expected"
+
+        transact_items = [{"Update": {
+            "TableName": self._table_name,
+            "Key": self._count_item_key(campaign_id, part_number, location_id),
+            "UpdateExpression": "SET " + ", ".join(assignments),
+            "ConditionExpression": condition,
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+        }}]
+
+        deltas = {name: delta for name, delta in counter_deltas.items() if delta}
+        if deltas:
+            transact_items.append({"Update": {
+                "TableName": self._table_name,
+                "Key": self._campaign_key(campaign_id),
+                "UpdateExpression": (
+                    "SET updated_at = :now ADD "
+                    + ", ".join(f"{name} :{name}" for name in deltas)
+                ),
+                "ConditionExpression": "attribute_exists(PK)",
+                "ExpressionAttributeValues": {
+                    **{f":{name}": delta for name, delta in deltas.items()},
+                    ":now": now,
+                },
+            }})
+
+        client = self.table.meta.client
+        for attempt in range(max(1, BULK_MAX_ATTEMPTS)):
+            if attempt:
+                _backoff(attempt)
+            try:
+                client.transact_write_items(TransactItems=transact_items)
+                return True
+            except Exception as e:
+                response = getattr(e, "response", {})
+                if response.get("Error", {}).get("Code") != "TransactionCanceledException":
+                    if _is_throttle(e):
+                        continue
+                    raise
+                # One reason per TransactItems entry, the count item first
+                reasons = [r.get("Code") for r in response.get("CancellationReasons", [])]
+                if not reasons or reasons[0] == "ConditionalCheckFailed":
+                    print(f"[DynamoDB] count item {campaign_id} {location_id}/{part_number} not updated: {e}")
+                    return False
+                if not set(reasons) <= RETRYABLE_CANCELLATION_CODES:
+                    raise
+        raise RuntimeError(
+            f"Count item {campaign_id} {location_id}/{part_number}: transaction "
+            f"still cancelled after {BULK_MAX_ATTEMPTS} attempts"
+        )
+
+    def put_divergence(self, divergence: Dict[str, Any]) -> bool:
+        """
+        Store a count divergence under its campaign.
+
+        Args:
+            divergence: Divergence dict with divergence_id and campaign_id
+
+        Returns:
+            True if successful
+        """
+        item = {
+            **_to_dynamo(divergence),
+            "PK": f"CAMPAIGN#{divergence['campaign_id']}",
+            "SK": f"DIVERGENCE#{divergence['divergence_id']}",
+            "entity_type": "DIVERGENCE",
+        }
+        return self.put_item(item)
+
+    def get_campaign_items(
+        self,
+        campaign_id: str,
+        status: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get every count item of a campaign, following pagination.
+
+        Unlike query_pk, errors are raised: callers decide campaign state
+        from the complete item list.
+
+        Args:
+            campaign_id: Campaign ID
+            status: Optional count status filter
+
+        Returns:
+            List of count items
+        """
+        params: Dict[str, Any] = {
+            "KeyConditionExpression": "PK = :pk AND begins_with(SK, :sk)",
+            "ExpressionAttributeValues": {":pk": f"CAMPAIGN#{campaign_id}", ":sk": "ITEM#"},
+        }
+        if status:
+            params["FilterExpression"] = "#status = :status"
+            params["ExpressionAttributeNames"] = {"#status": "status"}
+            params["ExpressionAttributeValues"][":status"] = status
+
+        items: List[Dict[str, Any]] = []
+        while True:
+            response = self.table.query(**params)
+            items.extend(_from_dynamo(item) for item in response.get("Items", []))
+            if "LastEvaluatedKey" not in response:
+                return items
+            params["ExclusiveStartKey"] = response["LastEvaluatedKey"]
+
+    # =========================================================================
+    # Expedition Operations
+    # =========================================================================
+    # PK=EXPEDITION#{expedition_id}  SK=METADATA    expedition record
+    #
+    # Stock, reservations and movements of an expedition live in PostgreSQL;
+    # this record holds the request, SAP data and workflow status.
+
+    @staticmethod
+    def _expedition_key(expedition_id: str) -> Dict[str, str]:
+        return {"PK": f"EXPEDITION#{expedition_id}", "SK": "METADATA"}
+
+    def put_expedition(self, expedition: Dict[str, Any]) -> bool:
+        """
+        Create or replace an expedition record.
+
+        Args:
+            expedition: Expedition dict with expedition_id
+
+        Returns:
+            True if successful
+        """
+        item = {
+            **_to_dynamo(expedition),
+            **self._expedition_key(expedition["expedition_id"]),
+            "entity_type": "EXPEDITION",
+        }
+        return self.put_item(item)
+
+    def get_expedition(self, expedition_id: str) -> Optional[Dict[str, Any]]:
+        """Get an expedition record (None if not found)."""
+        key = self._expedition_key(expedition_id)
+        item = self.get_item(key["PK"], key["SK"])
+        return _from_dynamo(item) if item else None
+
+    def update_expedition(
+        self,
+        expedition_id: str,
+        updates: Dict[str, Any],
+        expected_status: Optional[str] = None,
+    ) -> bool:
+        """
+        Update attributes of an existing expedition.
+
+        Args:
+            expedition_id: Expedition ID
+            updates: Dict of attribute_name -> new_value
+            expected_status: Only update while the expedition has this status
+
+        Returns:
+            True if successful (False if the expedition does not exist or
+            its status is not expected_status)
+        """
+        key = self._expedition_key(expedition_id)
+        return self.update_item(
+            key["PK"], key["SK"], _to_dynamo(updates),
+            conditions="attribute_exists(PK)",
+            expected={"status": expected_status} if expected_status else None,
+        )
+
     # =========================================================================
     # Part Number Lookup Operations (PN Matching)
     # =========================================================================
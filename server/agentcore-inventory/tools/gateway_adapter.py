@@ -18,11 +18,12 @@ Authentication:
 Author: Faiston NEXO Team
 Date: January 2026
 Updated: January 2026 - Sync client with SigV4 auth
+Updated: October 2026 - Async methods over the pooled Gateway transport
 """
 
 import logging
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from tools.database_adapter import (
     DatabaseAdapter,
@@ -36,6 +37,11 @@ from tools.mcp_gateway_client import MCPGatewayClient
 
 logger = logging.getLogger(__name__)
 
+# The Postgres tools Lambda and the Gateway HTTP call time out after 30s:
+# audit passes get a 20s budget and the HTTP call waits for the last chunk
+AUDIT_PASS_SECONDS = 20.0
+AUDIT_CALL_TIMEOUT_SECONDS = 28
+
 
 class GatewayPostgresAdapter(DatabaseAdapter):
     """
@@ -48,8 +54,9 @@ class GatewayPostgresAdapter(DatabaseAdapter):
     - Response parsing
     - Error handling and logging
 
-    Note: All methods are SYNCHRONOUS. The MCPGatewayClient uses SigV4
-    signing and the requests library for HTTP calls.
+    All methods are async (as declared by DatabaseAdapter) and use the
+    client's pooled async transport, so they never block the event loop.
+    Independent calls can share one round trip via call_batch().
 
     Attributes:
         TARGET_PREFIX: MCP target name for PostgreSQL tools
@@ -94,7 +101,31 @@ class GatewayPostgresAdapter(DatabaseAdapter):
         """
         return {k: v for k, v in data.items() if v is not None}
 
-    def list_inventory(
+    async def call_batch(
+        self,
+        calls: List[Tuple[str, Dict[str, Any]]],
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Run several PostgreSQL tools in one Gateway round trip.
+
+        Uses a JSON-RPC batch, or concurrent single calls if the Gateway
+        does not accept batches.
+
+        Args:
+            calls: (base tool name, arguments) pairs,
+                e.g. [("sga_get_balance", {"part_number": "PN-1"}), ...]
+            return_exceptions: Return per-call errors instead of raising
+
+        Returns:
+            Raw tool results in the order of calls
+        """
+        return await self._client.call_tools_batch_async(
+            [(self._tool_name(tool), arguments) for tool, arguments in calls],
+            return_exceptions=return_exceptions,
+        )
+
+    async def list_inventory(
         self,
         filters: Optional[InventoryFilters] = None
     ) -> Dict[str, Any]:
@@ -112,16 +143,19 @@ class GatewayPostgresAdapter(DatabaseAdapter):
                 "status": filters.status.value if filters.status else None,
                 "limit": filters.limit,
                 "offset": filters.offset,
+                "cursor": filters.cursor,
+                "pagination": filters.pagination,
+                "total_mode": filters.total_mode,
             })
 
         logger.debug(f"list_inventory with filters: {arguments}")
 
-        return self._client.call_tool(
+        return await self._client.call_tool_async(
             tool_name=self._tool_name("sga_list_inventory"),
             arguments=arguments
         )
 
-    def get_balance(
+    async def get_balance(
         self,
         part_number: str,
         location_id: Optional[str] = None,
@@ -140,31 +174,35 @@ class GatewayPostgresAdapter(DatabaseAdapter):
 
         logger.debug(f"get_balance for: {part_number}")
 
-        return self._client.call_tool(
+        return await self._client.call_tool_async(
             tool_name=self._tool_name("sga_get_balance"),
             arguments=arguments
         )
 
-    def search_assets(
+    async def search_assets(
         self,
         query: str,
         search_type: str = "all",
-        limit: int = 50
+        limit: int = 50,
+        mode: str = "contains"
     ) -> List[Dict[str, Any]]:
         """
         Search assets by serial number, part number, or description.
 
+        mode="ranked" returns best matches first with score and matched_on.
+
         Calls: SGAPostgresTools___sga_search_assets
         """
         arguments = {
             "query": query,
             "search_type": search_type,
             "limit": limit,
+            "mode": mode,
         }
 
         logger.debug(f"search_assets: query='{query}', type={search_type}")
 
-        result = self._client.call_tool(
+        result = await self._client.call_tool_async(
             tool_name=self._tool_name("sga_search_assets"),
             arguments=arguments
         )
@@ -172,7 +210,7 @@ class GatewayPostgresAdapter(DatabaseAdapter):
         # Return items list from result
         return result.get("items", []) if isinstance(result, dict) else result
 
-    def get_asset_timeline(
+    async def get_asset_timeline(
         self,
         identifier: str,
         identifier_type: str = "serial_number",
@@ -191,20 +229,37 @@ class GatewayPostgresAdapter(DatabaseAdapter):
 
         logger.debug(f"get_asset_timeline: {identifier_type}={identifier}")
 
-        result = self._client.call_tool(
+        result = await self._client.call_tool_async(
             tool_name=self._tool_name("sga_get_asset_timeline"),
             arguments=arguments
         )
 
         return result.get("events", []) if isinstance(result, dict) else result
 
-    def get_movements(
+    async def get_movements(
         self,
         filters: Optional[MovementFilters] = None
     ) -> List[Dict[str, Any]]:
         """
         List movements with filters.
 
+        Calls: SGAPostgresTools___sga_get_movements
+        """
+        result = await self.get_movements_page(filters)
+        if not isinstance(result, dict):
+            return result
+        return result.get("items", result.get("movements", []))
+
+    async def get_movements_page(
+        self,
+        filters: Optional[MovementFilters] = None
+    ) -> Dict[str, Any]:
+        """
+        One keyset page of movements (newest first).
+
+        Returns the full tool result: items, has_more and next_cursor
+        (set filters.cursor to it for the next page).
+
         Calls: SGAPostgresTools___sga_get_movements
         """
         arguments = {}
@@ -216,18 +271,18 @@ class GatewayPostgresAdapter(DatabaseAdapter):
                 "project_id": filters.project_id,
                 "location_id": filters.location_id,
                 "limit": filters.limit,
+                "cursor": filters.cursor,
+                "total_mode": filters.total_mode,
             })
 
         logger.debug(f"get_movements with filters: {arguments}")
 
-        result = self._client.call_tool(
+        return await self._client.call_tool_async(
             tool_name=self._tool_name("sga_get_movements"),
             arguments=arguments
         )
 
-        return result.get("movements", []) if isinstance(result, dict) else result
-
-    def get_pending_tasks(
+    async def get_pending_tasks(
         self,
         task_type: Optional[str] = None,
         priority: Optional[str] = None,
@@ -248,14 +303,14 @@ class GatewayPostgresAdapter(DatabaseAdapter):
 
         logger.debug(f"get_pending_tasks: {arguments}")
 
-        result = self._client.call_tool(
+        result = await self._client.call_tool_async(
             tool_name=self._tool_name("sga_get_pending_tasks"),
             arguments=arguments
         )
 
         return result.get("tasks", []) if isinstance(result, dict) else result
 
-    def create_movement(
+    async def create_movement(
         self,
         movement_data: MovementData
     ) -> Dict[str, Any]:
@@ -282,38 +337,353 @@ class GatewayPostgresAdapter(DatabaseAdapter):
             f"part={movement_data.part_number}, qty={movement_data.quantity}"
         )
 
-        return self._client.call_tool(
+        return await self._client.call_tool_async(
             tool_name=self._tool_name("sga_create_movement"),
             arguments=arguments
         )
 
-    def reconcile_with_sap(
+    async def transfer_assets(
         self,
-        sap_data: List[Dict[str, Any]],
-        include_serials: bool = False
+        part_number: str,
+        source_location_id: str,
+        destination_location_id: str,
+        serial_numbers: List[str],
+        project_id: Optional[str] = None,
+        reason: Optional[str] = None,
+        requested_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Move serialized assets between locations in one transaction.
+
+        Serials are validated up front; either all move (one movement,
+        both balances, all assets) or nothing is written.
+
+        Calls: SGAPostgresTools___sga_transfer_assets
+
+        Returns:
+            Movement info, or success False with invalid_serials
+        """
+        arguments = self._clean_none_values({
+            "part_number": part_number,
+            "source_location_id": source_location_id,
+            "destination_location_id": destination_location_id,
+            "serial_numbers": serial_numbers,
+            "project_id": project_id,
+            "reason": reason,
+            "requested_by": requested_by,
+        })
+
+        logger.info(
+            f"transfer_assets: {len(serial_numbers)} serials of {part_number}, "
+            f"{source_location_id} -> {destination_location_id}"
+        )
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_transfer_assets"),
+            arguments=arguments
+        )
+
+    # =========================================================================
+    # Inventory Campaign Methods
+    # =========================================================================
+
+    async def get_balances_by_locations(
+        self,
+        location_ids: List[str],
+        part_numbers: Optional[List[str]] = None,
+        project_ids: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Get the balances of many locations with one query.
+
+        Calls: SGAPostgresTools___sga_get_balances_by_locations
+
+        Returns:
+            Dict with balances (part_number, location_id, project_id,
+            quantity_total/reserved/available)
+        """
+        arguments = self._clean_none_values({
+            "location_ids": location_ids,
+            "part_numbers": part_numbers,
+            "project_ids": project_ids,
+        })
+
+        logger.info(f"get_balances_by_locations: {len(location_ids)} locations")
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_get_balances_by_locations"),
+            arguments=arguments
+        )
+
+    async def get_serials_for_balances(
+        self,
+        keys: List[Tuple[str, str]],
+    ) -> Dict[str, Any]:
+        """
+        Get the countable serials of many (part_number, location) pairs.
+
+        Calls: SGAPostgresTools___sga_get_serials_for_balances
+
+        Returns:
+            Dict with serials: [{part_number, location_id, serials}]
+        """
+        arguments = {
+            "keys": [{"part_number": pn, "location_id": loc} for pn, loc in keys],
+        }
+
+        logger.info(f"get_serials_for_balances: {len(keys)} balances")
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_get_serials_for_balances"),
+            arguments=arguments
+        )
+
+    # =========================================================================
+    # Expedition Methods
+    # =========================================================================
+
+    async def get_expedition_stock(
+        self,
+        part_numbers: List[str],
+        serial_numbers: Optional[List[str]] = None,
+        location_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Read the stock of a whole expedition in one call.
+
+        Calls: SGAPostgresTools___sga_get_expedition_stock
+
+        Returns:
+            Dict with project, part_numbers, assets and balances
+        """
+        arguments = self._clean_none_values({
+            "part_numbers": part_numbers,
+            "serial_numbers": serial_numbers or None,
+            "location_id": location_id,
+            "project_id": project_id,
+        })
+
+        logger.info(
+            f"get_expedition_stock: {len(part_numbers)} part numbers, "
+            f"{len(serial_numbers or [])} serials"
+        )
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_get_expedition_stock"),
+            arguments=arguments
+        )
+
+    async def create_reservations(
+        self,
+        expedition_id: str,
+        reservations: List[Dict[str, Any]],
+        project_id: Optional[str] = None,
+        reserved_by: Optional[str] = None,
+        ttl_hours: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Reserve every line of an expedition in one transaction.
+
+        Either all lines are reserved (reservation rows, RESERVA movements,
+        reserved serials) or nothing is written.
+
+        Calls: SGAPostgresTools___sga_create_reservations
+
+        Returns:
+            reservation_ids and movement_ids, or success False with the
+            unavailable lines
+        """
+        arguments = self._clean_none_values({
+            "expedition_id": expedition_id,
+            "reservations": reservations,
+            "project_id": project_id,
+            "reserved_by": reserved_by,
+            "ttl_hours": ttl_hours,
+        })
+
+        logger.info(f"create_reservations: {expedition_id}, {len(reservations)} lines")
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_create_reservations"),
+            arguments=arguments
+        )
+
+    async def complete_expedition(
+        self,
+        expedition_id: str,
+        nf_number: str,
+        nf_key: Optional[str] = None,
+        carrier: Optional[str] = None,
+        tracking_code: Optional[str] = None,
+        destination: Optional[str] = None,
+        completed_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Ship every reserved line of an expedition in one transaction.
+
+        Releases the reservations and writes the LIBERACAO and EXPEDIÇÃO
+        movements (balances and serials follow through the triggers).
+        Retrying a completed expedition returns its movements again.
+
+        Calls: SGAPostgresTools___sga_complete_expedition
+
+        Returns:
+            movement_ids, or success False if nothing is reserved
+        """
+        arguments = self._clean_none_values({
+            "expedition_id": expedition_id,
+            "nf_number": nf_number,
+            "nf_key": nf_key,
+            "carrier": carrier,
+            "tracking_code": tracking_code,
+            "destination": destination,
+            "completed_by": completed_by,
+        })
+
+        logger.info(f"complete_expedition: {expedition_id}, NF {nf_number}")
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_complete_expedition"),
+            arguments=arguments
+        )
+
+    async def reconcile_with_sap(
+        self,
+        sap_data: Optional[List[Dict[str, Any]]] = None,
+        include_serials: bool = False,
+        mode: str = "full",
+        s3_uri: Optional[str] = None,
+        run_id: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 500,
+        csv_delimiter: str = ",",
+        csv_encoding: str = "UTF8"
     ) -> Dict[str, Any]:
         """
         Compare SGA inventory with SAP export data.
 
+        With s3_uri or mode="set" the export is reconciled in the database
+        and only summary counts plus one page of non-matching lines come
+        back; pass run_id and next_cursor to read further pages.
+
         Calls: SGAPostgresTools___sga_reconcile_sap
         """
-        arguments = {
-            "sap_data": sap_data,
+        arguments: Dict[str, Any] = {
             "include_serials": include_serials,
+            "mode": mode,
+            "limit": limit,
         }
+        if sap_data:
+            arguments["sap_data"] = sap_data
+        if s3_uri:
+            arguments["s3_uri"] = s3_uri
+            arguments["csv_delimiter"] = csv_delimiter
+            arguments["csv_encoding"] = csv_encoding
+        if run_id:
+            arguments["run_id"] = run_id
+        if category:
+            arguments["category"] = category
+        if cursor:
+            arguments["cursor"] = cursor
 
-        logger.info(f"reconcile_with_sap: {len(sap_data)} items")
+        logger.info(
+            f"reconcile_with_sap: mode={mode}, items={len(sap_data or [])}, "
+            f"s3_uri={s3_uri}, run_id={run_id}"
+        )
 
-        return self._client.call_tool(
+        return await self._client.call_tool_async(
             tool_name=self._tool_name("sga_reconcile_sap"),
             arguments=arguments
         )
 
+    # =========================================================================
+    # Compliance Audit Methods
+    # =========================================================================
+
+    async def start_compliance_audit(
+        self,
+        rules_version: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        location_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        requested_by: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Create a compliance audit run before any movement is evaluated.
+
+        Calls: SGAPostgresTools___sga_start_compliance_audit
+
+        Returns:
+            Dict with run_id (pass it to audit_compliance)
+        """
+        arguments = self._clean_none_values({
+            "rules_version": rules_version,
+            "start_date": start_date,
+            "end_date": end_date,
+            "location_id": location_id,
+            "project_id": project_id,
+            "requested_by": requested_by,
+        })
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_start_compliance_audit"),
+            arguments=arguments
+        )
+
+    async def audit_compliance(
+        self,
+        rules: Dict[str, Any],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        location_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        requested_by: Optional[str] = None,
+        max_seconds: float = AUDIT_PASS_SECONDS,
+        sample_limit: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run (or resume) a streaming compliance audit.
+
+        Calls: SGAPostgresTools___sga_audit_compliance
+
+        max_seconds is capped at AUDIT_PASS_SECONDS so a pass always ends
+        before the Lambda timeout; the HTTP call waits slightly longer.
+
+        Returns:
+            Run summary; status RUNNING means call again with run_id
+        """
+        arguments = self._clean_none_values({
+            "rules": rules,
+            "start_date": start_date,
+            "end_date": end_date,
+            "location_id": location_id,
+            "project_id": project_id,
+            "run_id": run_id,
+            "requested_by": requested_by,
+            "max_seconds": min(max_seconds, AUDIT_PASS_SECONDS),
+            "sample_limit": sample_limit,
+        })
+
+        logger.info(
+            f"audit_compliance: period={start_date}..{end_date}, "
+            f"location={location_id}, project={project_id}, run_id={run_id}"
+        )
+
+        return await self._client.call_tool_async(
+            tool_name=self._tool_name("sga_audit_compliance"),
+            arguments=arguments,
+            timeout=AUDIT_CALL_TIMEOUT_SECONDS,
+        )
+
     # =========================================================================
     # Schema Evolution Methods (Dynamic Column Creation)
     # =========================================================================
 
-    def create_column_safe(
+    async def create_column_safe(
         self,
         table_name: str,
         column_name: str,
@@ -371,7 +741,7 @@ class GatewayPostgresAdapter(DatabaseAdapter):
             f"column={column_name}, type={column_type}, user={requested_by}"
         )
 
-        return self._client.call_tool(
+        return await self._client.call_tool_async(
             tool_name=self._tool_name("sga_create_column"),
             arguments=arguments
         )
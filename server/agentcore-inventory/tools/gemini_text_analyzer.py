@@ -32,6 +32,11 @@ _s3_client = None
 S3_BUCKET = "faiston-one-sga-documents-prod"
 AWS_REGION = "us-east-2"
 
+GEMINI_MODEL = "gemini-2.5-pro"
+# Bump when INVENTORY_ANALYSIS_PROMPT or result post-processing changes,
+# so cached analyses from the previous prompt are not reused
+ANALYSIS_PROMPT_VERSION = "1"
+
 
 def _get_genai_client():
     """
@@ -151,11 +156,11 @@ REGRAS CRITICAS DE OUTPUT (BUG-021 v6):
 
 PROIBIDO (quebra o sistema):
 ```json
-{"success": true}
+{{"success": true}}
 ```
 
 OBRIGATORIO (JSON puro):
-{"success": true}
+{{"success": true}}
 
 JSON DE RESPOSTA:
 
@@ -309,10 +314,21 @@ Campos:
 # File Content Extraction
 # =============================================================================
 
+def _decode_text(content: bytes) -> tuple:
+    """Decode as UTF-8, falling back to Latin-1. Returns (text, encoding)."""
+    try:
+        return content.decode("utf-8"), "utf-8"
+    except UnicodeDecodeError:
+        return content.decode("latin-1"), "latin-1"
+
+
 def _extract_csv_content(content: bytes, max_rows: int = 50) -> str:
     """
     Extract CSV content as text for Gemini analysis.
 
+    Only the header and sampled rows are decoded; the total line count
+    comes from counting newlines in the raw bytes.
+
     Args:
         content: Raw CSV bytes
         max_rows: Max rows to sample (for prompt efficiency)
@@ -320,25 +336,24 @@ def _extract_csv_content(content: bytes, max_rows: int = 50) -> str:
     Returns:
         CSV text with headers + sample rows
     """
-    # Detect encoding
-    try:
-        text = content.decode("utf-8")
-        encoding = "utf-8"
-    except UnicodeDecodeError:
-        text = content.decode("latin-1")
-        encoding = "latin-1"
-
-    lines = text.strip().split('\n')
+    body = content.strip()
+    total_lines = body.count(b"\n") + 1
+
+    # Find the end of header + max_rows lines ("\n" never occurs inside a
+    # UTF-8 or Latin-1 multibyte character, so cutting there is safe)
+    end = -1
+    for _ in range(max_rows + 1):
+        end = body.find(b"\n", end + 1)
+        if end < 0:
+            break
 
-    # Take header + sample rows
-    if len(lines) > max_rows + 1:
-        sample_lines = lines[:1] + lines[1:max_rows + 1]
-        sample_text = '\n'.join(sample_lines)
-        sample_text += f"\n\n[... mais {len(lines) - max_rows - 1} linhas ...]"
+    if end < 0:
+        sample_text, encoding = _decode_text(content)
     else:
-        sample_text = text
+        sample_text, encoding = _decode_text(body[:end])
+        sample_text += f"\n\n[... mais {total_lines - max_rows - 1} linhas ...]"
 
-    return f"Encoding: {encoding}\nTotal linhas: {len(lines)}\n\n{sample_text}"
+    return f"Encoding: {encoding}\nTotal linhas: {total_lines}\n\n{sample_text}"
 
 
 def _extract_xlsx_content(content: bytes, max_rows: int = 50) -> str:
@@ -519,6 +534,41 @@ def _format_user_responses(user_responses: List[Dict[str, Any]]) -> str:
 # Main Analysis Functions
 # =============================================================================
 
+def _load_file(s3_key: str, session_id: Optional[str] = None):
+    """
+    File artifact for an S3 key, shared by every HIL round and extraction.
+
+    The key is NFC-normalized to match how files were uploaded (prevents
+    NoSuchKey errors with Portuguese characters like Ç, Ã, Õ).
+    """
+    import unicodedata
+    from tools.analysis_cache import get_artifact_cache
+
+    normalized_key = unicodedata.normalize("NFC", s3_key)
+    return get_artifact_cache().fetch(_get_s3_client(), S3_BUCKET, normalized_key, session_id)
+
+
+def _extract_prompt_content(artifact, file_type: str, max_rows: int = 50) -> str:
+    """Prompt sample for a file, built once per artifact."""
+    extractors = {
+        "csv": _extract_csv_content,
+        "xlsx": _extract_xlsx_content,
+        "xls": _extract_xls_content,
+    }
+    return artifact.derive(
+        ("prompt_content", file_type, max_rows),
+        lambda: extractors[file_type](artifact.content, max_rows),
+    )
+
+
+def _file_type(filename: str) -> Optional[str]:
+    filename_lower = filename.lower()
+    for file_type in ("csv", "xlsx", "xls"):
+        if filename_lower.endswith(f".{file_type}"):
+            return file_type
+    return None
+
+
 async def analyze_file_with_gemini(
     s3_key: str,
     schema_context: str = None,
@@ -526,6 +576,7 @@ async def analyze_file_with_gemini(
     user_responses: List[Dict[str, Any]] = None,
     user_comments: str = None,
     analysis_round: int = 1,
+    session_id: str = None,
 ) -> Dict[str, Any]:
     """
     Analyze file from S3 using Gemini Pro (AI-First with AGI-like behavior).
@@ -533,9 +584,10 @@ async def analyze_file_with_gemini(
     This is the main entry point for AI-First file analysis with iterative HIL.
 
     Flow (Multi-Round AGI Loop):
-    1. Download file from S3
-    2. Extract text content (CSV as-is, XLSX to JSON)
+    1. Download file from S3 (revalidated by ETag on later rounds)
+    2. Extract text content (CSV sample, XLSX to JSON) - once per file
     3. Send to Gemini with schema + memory + user_responses + user_comments
+       (skipped when an identical round was already analyzed)
     4. Return analysis with mappings, confidence, and questions
     5. If user responds, call again with responses for RE-ANALYSIS
 
@@ -547,6 +599,7 @@ async def analyze_file_with_gemini(
                         Format: [{"question_id": "q1", "answer": "Numero de Serie"}]
         user_comments: Free-text instructions/feedback from user
         analysis_round: Current round number (1 = first analysis, 2+ = re-analysis)
+        session_id: Import session (scopes the file artifact cache)
 
     Returns:
         {
@@ -569,15 +622,9 @@ async def analyze_file_with_gemini(
         logger.info(f"[GeminiTextAnalyzer] Re-analysis with {len(user_responses)} user responses")
 
     try:
-        # 1. Download file from S3
-        import unicodedata
-
-        s3 = _get_s3_client()
-        # NFC normalize S3 key to match how files were uploaded
-        # Prevents NoSuchKey errors with Portuguese characters (Ç, Ã, Õ)
-        normalized_key = unicodedata.normalize("NFC", s3_key)
-        response = s3.get_object(Bucket=S3_BUCKET, Key=normalized_key)
-        content = response["Body"].read()
+        # 1. Download file from S3 (or reuse this session's copy)
+        artifact = _load_file(s3_key, session_id)
+        content = artifact.content
 
         # =====================================================================
         # BUG-021 FIX: File size validation (prevent Gemini timeout on huge files)
@@ -604,25 +651,34 @@ async def analyze_file_with_gemini(
             }
 
         filename = s3_key.split("/")[-1] if "/" in s3_key else s3_key
-        filename_lower = filename.lower()
-
-        # 2. Extract text content based on file type
-        if filename_lower.endswith(".csv"):
-            file_content = _extract_csv_content(content)
-            file_type = "csv"
-        elif filename_lower.endswith(".xlsx"):
-            file_content = _extract_xlsx_content(content)
-            file_type = "xlsx"
-        elif filename_lower.endswith(".xls"):
-            file_content = _extract_xls_content(content)
-            file_type = "xls"
-        else:
+        file_type = _file_type(filename)
+        if file_type is None:
             return {
                 "success": False,
                 "error": f"Formato nao suportado: {filename}",
                 "file_type": "unknown",
             }
 
+        # Identical round (same file bytes, context and answers) -> cached result
+        from tools.analysis_cache import analysis_cache_key, get_result_cache
+
+        result_key = analysis_cache_key(
+            artifact.sha256,
+            schema_context=schema_context or DEFAULT_SCHEMA_CONTEXT,
+            memory_context=memory_context,
+            user_responses=user_responses,
+            user_comments=user_comments,
+            version=f"{ANALYSIS_PROMPT_VERSION}:{GEMINI_MODEL}",
+        )
+        cached = get_result_cache().get(result_key)
+        if cached is not None:
+            logger.info(f"[GeminiTextAnalyzer] Round {analysis_round} served from result cache")
+            cached.update(filename=filename, s3_key=s3_key, analysis_round=analysis_round)
+            return cached
+
+        # 2. Extract text content based on file type
+        file_content = _extract_prompt_content(artifact, file_type)
+
         # 3. Build prompt with context (AGI-like: includes user responses)
         user_responses_text = _format_user_responses(user_responses)
         user_comments_text = user_comments or "Nenhum comentario adicional."
@@ -644,7 +700,7 @@ async def analyze_file_with_gemini(
 
         client = _get_genai_client()
         response = client.models.generate_content(
-            model="gemini-2.5-pro",
+            model=GEMINI_MODEL,
             contents=prompt,
             config=genai_types.GenerateContentConfig(
                 response_mime_type="application/json",
@@ -688,6 +744,7 @@ async def analyze_file_with_gemini(
         # CRITICAL: Ensure success is explicitly set for successful parse
         # (Gemini may omit this field even though prompt requests it)
         result["success"] = True
+        get_result_cache().put(result_key, result)
 
         logger.info(
             f"[GeminiTextAnalyzer] Round {analysis_round} complete: "
@@ -712,6 +769,7 @@ async def extract_data_with_gemini(
     column_mappings: Dict[str, str],
     target_schema: str = None,
     max_rows: int = 5000,
+    session_id: str = None,
 ) -> Dict[str, Any]:
     """
     Extract and transform data from file using Gemini (AI-First).
@@ -724,6 +782,7 @@ async def extract_data_with_gemini(
         column_mappings: Validated mappings {source_column: target_field}
         target_schema: Target table schema
         max_rows: Maximum rows to extract
+        session_id: Import session (reuses the file downloaded for analysis)
 
     Returns:
         {
@@ -739,26 +798,19 @@ async def extract_data_with_gemini(
         # For extraction, we need the full data (not just sample)
         # Use traditional parsing here since Gemini has context limits
         # The AI-First part was the ANALYSIS, extraction is mechanical
-        import unicodedata
-
-        s3 = _get_s3_client()
-        # NFC normalize S3 key to match how files were uploaded
-        # Prevents NoSuchKey errors with Portuguese characters (Ç, Ã, Õ)
-        normalized_key = unicodedata.normalize("NFC", s3_key)
-        response = s3.get_object(Bucket=S3_BUCKET, Key=normalized_key)
-        content = response["Body"].read()
+        content = _load_file(s3_key, session_id).content
 
         filename = s3_key.split("/")[-1] if "/" in s3_key else s3_key
-        filename_lower = filename.lower()
+        file_type = _file_type(filename)
 
         rows = []
         errors = []
 
-        if filename_lower.endswith(".csv"):
+        if file_type == "csv":
             rows, errors = _extract_csv_rows(content, column_mappings, max_rows)
-        elif filename_lower.endswith(".xlsx"):
+        elif file_type == "xlsx":
             rows, errors = _extract_xlsx_rows(content, column_mappings, max_rows)
-        elif filename_lower.endswith(".xls"):
+        elif file_type == "xls":
             rows, errors = _extract_xls_rows(content, column_mappings, max_rows)
         else:
             return {
@@ -798,11 +850,7 @@ def _extract_csv_rows(
     """Extract and transform CSV rows using mappings."""
     import csv as csv_module
 
-    # Detect encoding
-    try:
-        text = content.decode("utf-8")
-    except UnicodeDecodeError:
-        text = content.decode("latin-1")
+    text, _ = _decode_text(content)
 
     # Detect delimiter
     sample = text[:4096]
@@ -854,6 +902,14 @@ def _extract_xlsx_rows(
 
     headers = [str(h) if h else f"Column_{i}" for i, h in enumerate(headers)]
 
+    # Mapped columns outside the active sheet -> master-detail workbook
+    # (e.g. ITEMS + SERIALS): join the sheets instead of reading one
+    if len(wb.sheetnames) > 1 and not set(column_mappings) <= set(headers):
+        joined_rows = _joined_xlsx_rows(content)
+        if joined_rows is not None:
+            rows_iter = joined_rows
+            headers = None
+
     rows = []
     errors = []
 
@@ -863,10 +919,13 @@ def _extract_xlsx_rows(
 
         try:
             # Build row dict
-            row_dict = {}
-            for j, val in enumerate(row_values):
-                if j < len(headers):
-                    row_dict[headers[j]] = val
+            if headers is None:
+                row_dict = row_values
+            else:
+                row_dict = {}
+                for j, val in enumerate(row_values):
+                    if j < len(headers):
+                        row_dict[headers[j]] = val
 
             # Transform using mappings
             transformed = {}
@@ -879,10 +938,28 @@ def _extract_xlsx_rows(
         except Exception as e:
             errors.append({"row": i + 2, "error": str(e)})
 
+    if headers is None:
+        rows_iter.close()  # stops the join early if max_rows was reached
     wb.close()
     return rows, errors
 
 
+def _joined_xlsx_rows(content: bytes):
+    """Streamed master-detail rows of a workbook, or None if no join applies."""
+    from tools.sheet_analyzer import analyze_workbook
+    from tools.sheet_join import plan_master_detail_join, stream_joined_rows
+
+    plan = plan_master_detail_join(analyze_workbook(content, "workbook.xlsx", max_sample_rows=5))
+    if plan is None:
+        return None
+
+    logger.info(
+        f"[GeminiTextAnalyzer] Joining '{plan.master_sheet}'.{plan.master_key} x "
+        f"'{plan.detail_sheet}'.{plan.detail_key} (confidence {plan.confidence:.2f})"
+    )
+    return stream_joined_rows(content, plan)
+
+
 def _extract_xls_rows(
     content: bytes,
     column_mappings: Dict[str, str],
@@ -955,6 +1032,7 @@ async def re_analyze_with_responses(
     schema_context: str = None,
     memory_context: str = None,
     previous_round: int = 1,
+    session_id: str = None,
 ) -> Dict[str, Any]:
     """
     Re-analyze file with user responses (AGI-like multi-round).
@@ -969,6 +1047,7 @@ async def re_analyze_with_responses(
         schema_context: PostgreSQL schema
         memory_context: Learned patterns
         previous_round: Previous round number
+        session_id: Import session (reuses the downloaded file)
 
     Returns:
         Updated analysis with adjusted mappings and potentially new questions
@@ -980,6 +1059,7 @@ async def re_analyze_with_responses(
         user_responses=user_responses,
         user_comments=user_comments,
         analysis_round=previous_round + 1,
+        session_id=session_id,
     )
 
 
@@ -14,9 +14,14 @@ Architecture:
 Key Features:
 - Uses SigV4 signing with IAM credentials (auto-refreshed)
 - Supports tool discovery via list_tools()
-- Supports tool invocation via call_tool()
+- Supports tool invocation via call_tool() (sync) and call_tool_async()
+- Keep-alive connection pools (requests.Session / httpx.AsyncClient, HTTP/2
+  when the h2 package is installed) so calls reuse TCP+TLS connections
+- JSON-RPC batch requests (call_tools_batch) with automatic fallback to
+  concurrent single calls when the Gateway rejects batches
 - Caches tool list for performance
-- Sync-first design for simplicity (avoids async complexity)
+- Adaptive concurrency limit + circuit breaker per container
+  (shared/dependency_registry.py, dependency "mcp_gateway")
 
 Reference:
 - https://docs.aws.amazon.com/bedrock-agentcore/latest/devguide/gateway-inbound-auth.html
@@ -25,20 +30,45 @@ Reference:
 Author: Faiston NEXO Team
 Date: January 2026
 Updated: January 2026 - SigV4 auth (AWS Best Practice)
+Updated: October 2026 - Pooled sync/async transport, JSON-RPC batches
 """
 
+import asyncio
+import itertools
 import json
 import logging
 import os
-from typing import Any, Dict, List, Optional
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import boto3
 import requests
 from botocore.auth import SigV4Auth
 from botocore.awsrequest import AWSRequest
 
+from shared.dependency_registry import guarded, is_server_failure
+
 logger = logging.getLogger(__name__)
 
+# Keep-alive connections per client (sync pool and async pool each)
+POOL_SIZE = int(os.environ.get("MCP_GATEWAY_POOL_SIZE", "16"))
+
+# JSON-RPC batches: "auto" tries them and falls back if rejected, "off" never
+BATCH_MODE = os.environ.get("MCP_GATEWAY_BATCH", "auto").lower()
+
+# Status codes meaning "this endpoint does not accept batch bodies"
+_BATCH_REJECTED_STATUS = frozenset({400, 404, 405, 415, 422})
+
+ToolCall = Tuple[str, Dict[str, Any]]
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
 
 class MCPGatewayClient:
     """
@@ -59,6 +89,13 @@ class MCPGatewayClient:
             "SGAPostgresTools___sga_get_balance",  # 3 underscores
             {"part_number": "PN-001"}
         )
+
+        # Async call, and several tools in one round trip
+        result = await client.call_tool_async("SGAPostgresTools___sga_get_balance", {...})
+        results = await client.call_tools_batch_async([
+            ("SGAPostgresTools___sga_get_balance", {"part_number": "PN-001"}),
+            ("SGAPostgresTools___sga_get_balance", {"part_number": "PN-002"}),
+        ])
         ```
 
     Attributes:
@@ -66,6 +103,8 @@ class MCPGatewayClient:
         _region: AWS region for SigV4 signing
         _session: boto3 Session for credential management
         _tools_cache: Cached list of available tools
+        _http: Pooled requests.Session (keep-alive) for sync calls
+        _async_http: Pooled httpx.AsyncClient for async calls
     """
 
     # Service name for SigV4 signing
@@ -88,6 +127,12 @@ class MCPGatewayClient:
         self._region = region or os.environ.get("AWS_REGION", "us-east-2")
         self._session = boto3.Session()
         self._tools_cache: Optional[List[Dict]] = None
+        self._ids = itertools.count(1)
+        self._http: Optional[requests.Session] = None
+        self._http_lock = threading.Lock()
+        self._async_http = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._batch_supported = BATCH_MODE != "off"
 
         logger.info(
             f"[MCPGatewayClient] Initialized with IAM auth (SigV4) "
@@ -121,7 +166,7 @@ class MCPGatewayClient:
         self,
         method: str,
         url: str,
-        payload: Dict[str, Any]
+        payload: Any
     ) -> Dict[str, str]:
         """
         Sign HTTP request with AWS SigV4 for AgentCore Gateway.
@@ -129,13 +174,20 @@ class MCPGatewayClient:
         Args:
             method: HTTP method (POST, GET, etc.)
             url: Full request URL
-            payload: Request body as dictionary
+            payload: Request body (dict, or list for JSON-RPC batches)
 
         Returns:
             Dictionary of signed headers to include in request
         """
-        body = json.dumps(payload)
+        return self._sign_body(method, url, json.dumps(payload))
 
+    def _sign_body(self, method: str, url: str, body: str) -> Dict[str, str]:
+        """
+        Sign an already serialized body.
+
+        The signature covers the body hash, so every request is signed
+        and the exact signed bytes must be sent.
+        """
         # Create AWS request object
         request = AWSRequest(
             method=method,
@@ -155,70 +207,130 @@ class MCPGatewayClient:
 
         return dict(request.headers)
 
-    def call_tool(
-        self,
-        tool_name: str,
-        arguments: Dict[str, Any],
-        timeout: int = 30
-    ) -> Dict[str, Any]:
-        """
-        Invoke a tool via Gateway using MCP protocol (JSON-RPC 2.0).
-
-        Per AWS docs (gateway-using-mcp-call.html):
-        - Method: tools/call
-        - Tool name format: {TargetName}___{tool_name} (THREE underscores)
-        - Response contains content array with results
-
-        Args:
-            tool_name: Full tool name (e.g., "SGAPostgresTools___sga_get_balance")
-            arguments: Tool arguments as dictionary
-            timeout: Request timeout in seconds (default 30)
-
-        Returns:
-            Tool execution result parsed from response content
-
-        Raises:
-            requests.HTTPError: If Gateway returns error status
-            ValueError: If response cannot be parsed
-            Exception: If MCP error in response
-        """
-        payload = {
-            "jsonrpc": "2.0",
-            "id": f"call-{tool_name}-{id(arguments)}",
-            "method": "tools/call",
-            "params": {
-                "name": tool_name,
-                "arguments": arguments
-            }
-        }
-
-        logger.debug(f"[MCPGatewayClient] Calling tool: {tool_name}")
-
-        # Sign and execute request
-        headers = self._sign_request("POST", self._gateway_url, payload)
-
+    # =========================================================================
+    # Connection Pools
+    # =========================================================================
+
+    def _get_http(self) -> requests.Session:
+        """Pooled keep-alive session for sync calls (thread-safe)."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    session = requests.Session()
+                    adapter = requests.adapters.HTTPAdapter(
+                        pool_connections=1, pool_maxsize=POOL_SIZE
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    self._http = session
+        return self._http
+
+    def _get_async_http(self):
+        """Pooled httpx.AsyncClient for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._async_http is None or self._async_loop is not loop:
+            import httpx
+            # A client bound to a previous (closed) loop cannot be reused
+            self._async_http = httpx.AsyncClient(
+                http2=_http2_available(),
+                limits=httpx.Limits(
+                    max_connections=POOL_SIZE,
+                    max_keepalive_connections=POOL_SIZE,
+                ),
+            )
+            self._async_loop = loop
+        return self._async_http
+
+    def close(self) -> None:
+        """Close the sync connection pool."""
+        if self._http is not None:
+            self._http.close()
+            self._http = None
+
+    async def aclose(self) -> None:
+        """Close both connection pools."""
+        self.close()
+        if self._async_http is not None:
+            await self._async_http.aclose()
+            self._async_http = None
+            self._async_loop = None
+
+    # =========================================================================
+    # Transport
+    # =========================================================================
+
+    @guarded("mcp_gateway", is_failure=is_server_failure, timeout_arg="timeout", latency_tolerance=None)
+    def _post(self, payload: Any, timeout: float, label: str) -> Any:
+        """POST a signed JSON-RPC body over the sync pool; returns parsed JSON."""
+        body = json.dumps(payload)
+        headers = self._sign_body("POST", self._gateway_url, body)
         try:
-            response = requests.post(
+            response = self._get_http().post(
                 self._gateway_url,
                 headers=headers,
-                json=payload,
+                data=body.encode(),
                 timeout=timeout
             )
             response.raise_for_status()
-
         except requests.exceptions.HTTPError as e:
             logger.error(
-                f"[MCPGatewayClient] HTTP error calling {tool_name}: "
+                f"[MCPGatewayClient] HTTP error calling {label}: "
                 f"{e.response.status_code} - {e.response.text}"
             )
             raise
         except requests.exceptions.RequestException as e:
-            logger.error(f"[MCPGatewayClient] Request failed for {tool_name}: {e}")
+            logger.error(f"[MCPGatewayClient] Request failed for {label}: {e}")
             raise
+        return response.json()
 
-        # Parse JSON-RPC response
-        result = response.json()
+    @guarded("mcp_gateway", is_failure=is_server_failure, timeout_arg="timeout", latency_tolerance=None)
+    async def _post_async(self, payload: Any, timeout: float, label: str) -> Any:
+        """POST a signed JSON-RPC body over the async pool; returns parsed JSON."""
+        import httpx
 
+        body = json.dumps(payload)
+        headers = self._sign_body("POST", self._gateway_url, body)
+        try:
+            response = await self._get_async_http().post(
+                self._gateway_url,
+                headers=headers,
+                content=body.encode(),
+                timeout=timeout
+            )
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"[MCPGatewayClient] HTTP error calling {label}: "
+                f"{e.response.status_code} - {e.response.text}"
+            )
+            raise
+        except httpx.HTTPError as e:
+            logger.error(f"[MCPGatewayClient] Request failed for {label}: {e}")
+            raise
+        return response.json()
+
+    # =========================================================================
+    # Tool Calls
+    # =========================================================================
+
+    def _tool_payload(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": f"call-{tool_name}-{next(self._ids)}",
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments
+            }
+        }
+
+    def _parse_tool_result(self, tool_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract the tool result from a JSON-RPC response.
+
+        Raises:
+            Exception: If MCP error in response
+        """
         # Check for JSON-RPC error
         if "error" in result:
             error = result["error"]
@@ -247,6 +359,171 @@ class MCPGatewayClient:
         logger.debug(f"[MCPGatewayClient] Returning raw result for {tool_name}")
         return result.get("result", {})
 
+    def call_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Invoke a tool via Gateway using MCP protocol (JSON-RPC 2.0).
+
+        Per AWS docs (gateway-using-mcp-call.html):
+        - Method: tools/call
+        - Tool name format: {TargetName}___{tool_name} (THREE underscores)
+        - Response contains content array with results
+
+        Blocking; from async code use call_tool_async().
+
+        Args:
+            tool_name: Full tool name (e.g., "SGAPostgresTools___sga_get_balance")
+            arguments: Tool arguments as dictionary
+            timeout: Request timeout in seconds (default 30)
+
+        Returns:
+            Tool execution result parsed from response content
+
+        Raises:
+            requests.HTTPError: If Gateway returns error status
+            ValueError: If response cannot be parsed
+            Exception: If MCP error in response
+        """
+        logger.debug(f"[MCPGatewayClient] Calling tool: {tool_name}")
+        result = self._post(self._tool_payload(tool_name, arguments), timeout, tool_name)
+        return self._parse_tool_result(tool_name, result)
+
+    async def call_tool_async(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        timeout: int = 30
+    ) -> Dict[str, Any]:
+        """
+        Async version of call_tool() (does not block the event loop).
+
+        Raises:
+            httpx.HTTPStatusError: If Gateway returns error status
+            Exception: If MCP error in response
+        """
+        logger.debug(f"[MCPGatewayClient] Calling tool (async): {tool_name}")
+        result = await self._post_async(self._tool_payload(tool_name, arguments), timeout, tool_name)
+        return self._parse_tool_result(tool_name, result)
+
+    def _batch_results(
+        self,
+        calls: Sequence[ToolCall],
+        payloads: List[Dict[str, Any]],
+        response: Any,
+        return_exceptions: bool,
+    ) -> List[Any]:
+        """Match batch responses to calls by id (order is not guaranteed)."""
+        by_id = {item.get("id"): item for item in response if isinstance(item, dict)}
+        results: List[Any] = []
+        for (tool_name, _), payload in zip(calls, payloads):
+            item = by_id.get(payload["id"])
+            try:
+                if item is None:
+                    raise Exception(f"MCP error: no response for {tool_name} in batch")
+                results.append(self._parse_tool_result(tool_name, item))
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+        return results
+
+    def _batch_rejected(self, error: Optional[Exception], response: Any) -> bool:
+        """True (and batching disabled) if the Gateway does not accept batches."""
+        if error is not None:
+            status = getattr(getattr(error, "response", None), "status_code", None)
+            if status not in _BATCH_REJECTED_STATUS:
+                return False
+        elif isinstance(response, list):
+            return False
+        logger.warning("[MCPGatewayClient] Gateway rejected JSON-RPC batch, using single calls")
+        self._batch_supported = False
+        return True
+
+    def call_tools_batch(
+        self,
+        calls: Sequence[ToolCall],
+        timeout: int = 30,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """
+        Invoke several tools in one JSON-RPC batch request.
+
+        Falls back to concurrent single calls over the pool if the Gateway
+        rejects batches (remembered for the client's lifetime).
+
+        Args:
+            calls: (tool_name, arguments) pairs
+            timeout: Request timeout in seconds
+            return_exceptions: Put per-call errors in the result list instead
+                of raising the first one (like asyncio.gather)
+
+        Returns:
+            Results in the order of calls
+        """
+        if not calls:
+            return []
+        if self._batch_supported and len(calls) > 1:
+            payloads = [self._tool_payload(name, args) for name, args in calls]
+            error, response = None, None
+            try:
+                response = self._post(payloads, timeout, f"batch of {len(calls)}")
+            except requests.exceptions.HTTPError as e:
+                error = e
+            if not self._batch_rejected(error, response):
+                if error is not None:
+                    raise error
+                return self._batch_results(calls, payloads, response, return_exceptions)
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        def call(pair: ToolCall) -> Any:
+            try:
+                return self.call_tool(pair[0], pair[1], timeout)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return e
+
+        with ThreadPoolExecutor(max_workers=min(len(calls), POOL_SIZE)) as pool:
+            return list(pool.map(call, calls))
+
+    async def call_tools_batch_async(
+        self,
+        calls: Sequence[ToolCall],
+        timeout: int = 30,
+        return_exceptions: bool = False,
+    ) -> List[Any]:
+        """Async version of call_tools_batch()."""
+        import httpx
+
+        if not calls:
+            return []
+        if self._batch_supported and len(calls) > 1:
+            payloads = [self._tool_payload(name, args) for name, args in calls]
+            error, response = None, None
+            try:
+                response = await self._post_async(payloads, timeout, f"batch of {len(calls)}")
+            except httpx.HTTPStatusError as e:
+                error = e
+            if not self._batch_rejected(error, response):
+                if error is not None:
+                    raise error
+                return self._batch_results(calls, payloads, response, return_exceptions)
+
+        semaphore = asyncio.Semaphore(POOL_SIZE)
+
+        async def call(pair: ToolCall) -> Any:
+            async with semaphore:
+                return await self.call_tool_async(pair[0], pair[1], timeout)
+
+        return await asyncio.gather(
+            *(call(pair) for pair in calls), return_exceptions=return_exceptions
+        )
+
     def list_tools(self, use_cache: bool = True) -> List[Dict]:
         """
         List all available tools from Gateway.
@@ -274,17 +551,7 @@ class MCPGatewayClient:
                 "params": {"cursor": cursor} if cursor else {}
             }
 
-            headers = self._sign_request("POST", self._gateway_url, payload)
-
-            response = requests.post(
-                self._gateway_url,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
-            response.raise_for_status()
-
-            result = response.json()
+            result = self._post(payload, 30, "tools/list")
 
             if "error" in result:
                 raise Exception(f"MCP error: {result['error']}")
@@ -0,0 +1,157 @@
+"""
+Keyset Pagination Helpers for SGA PostgreSQL Tools.
+
+Opaque cursors and optional totals for SGAPostgresClient list methods
+(list_inventory, get_movements). Packaged with the SGA PostgreSQL Lambda.
+
+Cursor:
+    URL-safe base64 of {"v": version, "k": kind, "p": position, "f": filters}
+    where position holds the sort key of the last row returned and filters
+    is a fingerprint of the filters the cursor was issued for. A cursor
+    used with other filters (or another list) is rejected.
+
+Totals (keyset mode):
+    none      - no count
+    estimate  - planner row estimate (EXPLAIN), no scan
+    cached    - exact COUNT(*) cached per query + params for a short TTL
+
+Author: Faiston NEXO Team
+Date: October 2026
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+CURSOR_VERSION = 1
+
+TOTAL_MODES = ("none", "estimate", "cached")
+
+# Exact counts cached in the warm Lambda container
+COUNT_CACHE_TTL_SECONDS = int(os.environ.get("COUNT_CACHE_TTL_SECONDS", "60"))
+COUNT_CACHE_SIZE = 256
+
+
+class InvalidCursorError(ValueError):
+    """Cursor is malformed or was issued for another list / filter set."""
+
+
+def filters_fingerprint(filters: Optional[Dict[str, Any]]) -> str:
+    """Short stable hash of a filter dict."""
+    payload = json.dumps(filters or {}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:12]
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def encode_cursor(kind: str, position: List[Any], filters: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Encode an opaque cursor.
+
+    Args:
+        kind: List the cursor belongs to (e.g. "inventory", "movements")
+        position: Sort key values of the last returned row
+        filters: Filters of the current request
+
+    Returns:
+        Cursor string
+    """
+    payload = {
+        "v": CURSOR_VERSION,
+        "k": kind,
+        "p": [_json_value(v) for v in position],
+        "f": filters_fingerprint(filters),
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, filters: Optional[Dict[str, Any]] = None) -> List[Any]:
+    """
+    Decode and validate a cursor.
+
+    Returns:
+        Sort key values of the last row of the previous page
+
+    Raises:
+        InvalidCursorError: Malformed cursor, other list, or other filters
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {e}") from e
+
+    if not isinstance(payload, dict) or payload.get("v") != CURSOR_VERSION:
+        raise InvalidCursorError("Invalid cursor version")
+    if payload.get("k") != kind:
+        raise InvalidCursorError(f"Cursor belongs to '{payload.get('k')}', not '{kind}'")
+    if payload.get("f") != filters_fingerprint(filters):
+        raise InvalidCursorError("Cursor was issued for different filters")
+    if not isinstance(payload.get("p"), list):
+        raise InvalidCursorError("Invalid cursor position")
+    return payload["p"]
+
+
+def plan_row_estimate(plan_result: List[Dict[str, Any]]) -> Optional[int]:
+    """Top-level row estimate from an EXPLAIN (FORMAT JSON) result row."""
+    try:
+        plan = plan_result[0]["QUERY PLAN"]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+class CountCache:
+    """Small TTL cache of exact counts keyed by query + params."""
+
+    def __init__(self, ttl_seconds: int = COUNT_CACHE_TTL_SECONDS, max_size: int = COUNT_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(query: str, params: tuple) -> str:
+        return hashlib.sha256(f"{query}|{json.dumps(params, default=str)}".encode()).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[int, float]]:
+        """(count, age_seconds) or None when missing/expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, count = entry
+            age = time.monotonic() - stored_at
+            if age >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            return count, age
+
+    def put(self, key: str, count: int) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_size:
+                oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest]
+            self._entries[key] = (time.monotonic(), count)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+count_cache = CountCache()
@@ -0,0 +1,235 @@
+"""
+Part Number Matcher for SGA Inventory.
+
+Reusable matcher for import rows against the PN catalog, built once per
+catalog version and cached in the warm container.
+
+Index:
+1. Exact: normalized PN (trimmed, uppercased) -> catalog PN hash map
+2. Approximate: character trigram TF-IDF inverted index over descriptions.
+   A query scores only the postings of its grams (very common grams are
+   skipped), shortlists the top candidates by cosine similarity and then
+   rescores the shortlist with SequenceMatcher (same score as before).
+
+Complexity per row: O(postings of its rare grams + shortlist x len^2)
+instead of O(catalog x len^2).
+
+Author: Faiston NEXO Team
+Date: October 2026
+"""
+
+import hashlib
+import logging
+import math
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from difflib import SequenceMatcher
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# Configuration
+# =============================================================================
+
+# Character n-gram size for the description index
+NGRAM_SIZE = 3
+
+# Candidates rescored with SequenceMatcher per query
+SHORTLIST_SIZE = 8
+
+# Grams present in more than this fraction of descriptions are skipped at
+# query time (low IDF, long postings) unless the query has no rarer gram
+MAX_GRAM_DOC_FRACTION = 0.05
+
+# Catalog versions kept in the warm-container cache
+MATCHER_CACHE_SIZE = 2
+
+
+# =============================================================================
+# Normalization
+# =============================================================================
+
+def normalize_pn(value: Any) -> str:
+    """Normalize a part number for exact lookup."""
+    return str(value).strip().upper() if value is not None else ""
+
+
+def normalize_description(value: Any) -> str:
+    """Lowercase, strip accents and collapse non-alphanumerics to spaces."""
+    text = unicodedata.normalize("NFKD", str(value or ""))
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    return re.sub(r"[^a-z0-9]+", " ", text).strip()
+
+
+def _grams(text: str) -> Dict[str, int]:
+    """Character n-gram term frequencies of a normalized text."""
+    padded = f" {text} "
+    counts: Dict[str, int] = {}
+    for i in range(len(padded) - NGRAM_SIZE + 1):
+        gram = padded[i:i + NGRAM_SIZE]
+        counts[gram] = counts.get(gram, 0) + 1
+    return counts
+
+
+def catalog_version(parts: Iterable[Dict[str, Any]]) -> str:
+    """Content hash of the catalog (part_number + description)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(str(part.get("part_number", "")).encode())
+        digest.update(b"\x1f")
+        digest.update(str(part.get("description", "")).encode())
+        digest.update(b"\x1e")
+    return digest.hexdigest()[:16]
+
+
+# =============================================================================
+# Matcher
+# =============================================================================
+
+class PartNumberMatcher:
+    """
+    Exact PN map plus trigram TF-IDF index over catalog descriptions.
+
+    Immutable after construction, safe to share across requests.
+    """
+
+    def __init__(self, parts: List[Dict[str, Any]], version: Optional[str] = None):
+        """
+        Build the indexes.
+
+        Args:
+            parts: Catalog rows with part_number and description
+            version: Catalog version (computed when omitted)
+        """
+        self.version = version or catalog_version(parts)
+        self.size = len(parts)
+
+        self._by_pn: Dict[str, str] = {}
+        for part in parts:
+            pn = part.get("part_number")
+            if pn:
+                self._by_pn.setdefault(normalize_pn(pn), pn)
+
+        # Descriptions (normalized) and their PNs
+        self._doc_pn: List[str] = []
+        self._doc_text: List[str] = []
+        doc_grams: List[Dict[str, int]] = []
+        for part in parts:
+            text = normalize_description(part.get("description"))
+            if not text or not part.get("part_number"):
+                continue
+            self._doc_pn.append(part["part_number"])
+            self._doc_text.append(text)
+            doc_grams.append(_grams(text))
+
+        n_docs = len(doc_grams)
+        doc_freq: Dict[str, int] = {}
+        for grams in doc_grams:
+            for gram in grams:
+                doc_freq[gram] = doc_freq.get(gram, 0) + 1
+
+        self._idf = {g: math.log((1 + n_docs) / (1 + df)) + 1.0 for g, df in doc_freq.items()}
+        self._doc_freq = doc_freq
+        self._max_df = max(1, int(MAX_GRAM_DOC_FRACTION * n_docs))
+
+        # Inverted index: gram -> [(doc_id, normalized weight)]
+        self._postings: Dict[str, List[Tuple[int, float]]] = {}
+        for doc_id, grams in enumerate(doc_grams):
+            weights = {g: tf * self._idf[g] for g, tf in grams.items()}
+            norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+            for gram, weight in weights.items():
+                self._postings.setdefault(gram, []).append((doc_id, weight / norm))
+
+    def match_exact(self, pn_value: Any) -> Optional[str]:
+        """Catalog PN for a row PN (normalized), or None."""
+        if pn_value is None or pn_value == "":
+            return None
+        return self._by_pn.get(normalize_pn(pn_value))
+
+    def shortlist(self, description: str, limit: int = SHORTLIST_SIZE) -> List[int]:
+        """Doc ids of the top candidates by trigram TF-IDF cosine."""
+        grams = _grams(description)
+        known = [g for g in grams if g in self._postings]
+        if not known:
+            return []
+
+        selective = [g for g in known if self._doc_freq[g] <= self._max_df]
+        if not selective:
+            # Only common grams: use the rarest few
+            selective = sorted(known, key=lambda g: self._doc_freq[g])[:3]
+
+        scores: Dict[int, float] = {}
+        for gram in selective:
+            q_weight = grams[gram] * self._idf[gram]
+            for doc_id, d_weight in self._postings[gram]:
+                scores[doc_id] = scores.get(doc_id, 0.0) + q_weight * d_weight
+
+        if len(scores) <= limit:
+            return list(scores)
+        return sorted(scores, key=scores.__getitem__, reverse=True)[:limit]
+
+    def match_description(self, description: Any) -> Tuple[Optional[str], float]:
+        """
+        Best catalog PN for a description.
+
+        Returns:
+            (part_number, SequenceMatcher ratio) of the best shortlisted
+            candidate, or (None, 0) when nothing is similar.
+        """
+        text = normalize_description(description)
+        if not text:
+            return None, 0
+
+        best_match, best_score = None, 0.0
+        for doc_id in self.shortlist(text):
+            score = SequenceMatcher(None, text, self._doc_text[doc_id]).ratio()
+            if score > best_score:
+                best_score = score
+                best_match = self._doc_pn[doc_id]
+        return best_match, best_score
+
+
+# =============================================================================
+# Warm-Container Cache
+# =============================================================================
+
+_cache_lock = threading.Lock()
+_matcher_cache: "OrderedDict[str, PartNumberMatcher]" = OrderedDict()
+
+
+def get_matcher(parts: List[Dict[str, Any]], version: Optional[str] = None) -> PartNumberMatcher:
+    """
+    Matcher for a catalog, reused while the catalog version is unchanged.
+
+    Args:
+        parts: Catalog rows
+        version: Catalog version if known (content hash otherwise)
+
+    Returns:
+        Cached or newly built PartNumberMatcher
+    """
+    version = version or catalog_version(parts)
+    with _cache_lock:
+        matcher = _matcher_cache.get(version)
+        if matcher is not None:
+            _matcher_cache.move_to_end(version)
+            return matcher
+
+    matcher = PartNumberMatcher(parts, version=version)
+    logger.info(f"[pn_matcher] Built index for {matcher.size} parts (version {version})")
+
+    with _cache_lock:
+        _matcher_cache[version] = matcher
+        while len(_matcher_cache) > MATCHER_CACHE_SIZE:
+            _matcher_cache.popitem(last=False)
+    return matcher
+
+
+def clear_matcher_cache() -> None:
+    """Drop cached matchers."""
+    with _cache_lock:
+        _matcher_cache.clear()
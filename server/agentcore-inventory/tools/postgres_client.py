@@ -23,13 +23,42 @@ import json
 import logging
 import os
 import re
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, date
 import boto3
 
+try:
+    from pagination import TOTAL_MODES, count_cache, decode_cursor, encode_cursor, plan_row_estimate
+except ImportError:
+    from tools.pagination import TOTAL_MODES, count_cache, decode_cursor, encode_cursor, plan_row_estimate
+
+try:
+    import sap_reconciliation
+except ImportError:
+    from tools import sap_reconciliation
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# search_assets options
+ASSET_SEARCH_TYPES = ("serial", "part_number", "description", "all")
+ASSET_SEARCH_MODES = ("contains", "prefix", "ranked")
+
+# Asset statuses that cannot be moved by transfer_assets
+TRANSFER_BLOCKED_STATUSES = ("IN_TRANSIT", "INSTALLED", "DISPOSED")
+
+# Asset statuses that are not physically at their location (not counted)
+UNCOUNTED_ASSET_STATUSES = ("IN_TRANSIT", "INSTALLED", "DISPOSED")
+
+# Hours until expedition reservations expire (sga.release_expired_reservations)
+EXPEDITION_RESERVATION_TTL_HOURS = 72
+
+
+def like_prefix(term: str) -> str:
+    """Lowercased LIKE prefix pattern with wildcards escaped (same as sga.like_prefix)."""
+    escaped = term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
+
 
 class SGAPostgresClient:
     """
@@ -94,7 +123,24 @@ class SGAPostgresClient:
 
     def _get_connection(self):
         """
-        Get or create a database connection.
+        Get or create the shared database connection.
+
+        Returns:
+            psycopg connection object
+        """
+        if self._connection is not None and not self._connection.closed:
+            return self._connection
+
+        self._connection = self._connect()
+        return self._connection
+
+    def _connect(self):
+        """
+        Open a new database connection.
+
+        Used directly (instead of _get_connection) when an operation needs a
+        dedicated connection, e.g. a server-side cursor that must stay open
+        while results are committed on the shared connection.
 
         Connection modes:
         1. DIRECT_CONNECT=true: Connect directly to Aurora with password (bootstrap)
@@ -104,9 +150,6 @@ class SGAPostgresClient:
         Returns:
             psycopg connection object
         """
-        if self._connection is not None and not self._connection.closed:
-            return self._connection
-
         try:
             import psycopg
             from psycopg.rows import dict_row
@@ -119,7 +162,7 @@ class SGAPostgresClient:
                 host = creds.get("host")  # Use Aurora cluster endpoint
                 logger.info(f"Connecting directly to Aurora at {host}")
 
-                self._connection = psycopg.connect(
+                connection = psycopg.connect(
                     host=host,
                     port=creds.get("port", self._port),
                     user=creds.get("username"),
@@ -143,7 +186,7 @@ class SGAPostgresClient:
                     Region=self._region
                 )
 
-                self._connection = psycopg.connect(
+                connection = psycopg.connect(
                     host=host,
                     port=self._port,
                     user=user,
@@ -159,7 +202,7 @@ class SGAPostgresClient:
                 # Note: RDS Proxy must be configured to accept password auth
                 host = self._proxy_endpoint or creds.get("host")
 
-                self._connection = psycopg.connect(
+                connection = psycopg.connect(
                     host=host,
                     port=creds.get("port", self._port),
                     user=creds.get("username"),
@@ -170,7 +213,7 @@ class SGAPostgresClient:
                 )
                 logger.info("Connected to PostgreSQL via password auth")
 
-            return self._connection
+            return connection
 
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
@@ -235,25 +278,37 @@ class SGAPostgresClient:
         self,
         filters: Optional[Dict[str, Any]] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None,
+        pagination: str = "offset",
+        total_mode: str = "none"
     ) -> Dict[str, Any]:
         """
         List inventory with optional filters.
 
+        Two pagination modes:
+        - offset (default): LIMIT/OFFSET with an exact total on every page
+        - keyset (pagination="keyset" or a cursor): seeks past the last
+          (part_number, location_code) of the previous page; cost does not
+          grow with depth. Pass next_cursor back as cursor until it is None.
+
         Args:
             filters: Dictionary of filter conditions
             limit: Maximum number of results
-            offset: Pagination offset
+            offset: Pagination offset (offset mode)
+            cursor: Opaque cursor from a previous keyset page
+            pagination: offset or keyset
+            total_mode: Keyset mode total: none, estimate (planner) or cached
 
         Returns:
             Dictionary with items and pagination info
         """
         filters = filters or {}
 
-        # Build query using materialized view for performance
+        # Trigger-maintained summary table (current, no refresh lag)
         query = """
             SELECT *
-            FROM sga.mv_inventory_summary
+            FROM sga.inventory_summary
             WHERE 1=1
         """
         params = []
@@ -270,6 +325,21 @@ class SGAPostgresClient:
             query += " AND stock_status = %s"
             params.append(filters["status"])
 
+        if cursor or pagination == "keyset":
+            result = self._keyset_page(
+                kind="inventory",
+                query=query,
+                params=params,
+                filters=filters,
+                cursor=cursor,
+                seek="(part_number, location_code) > (%s, %s)",
+                order_by="part_number, location_code",
+                key_columns=("part_number", "location_code"),
+                limit=limit,
+            )
+            result.update(self._optional_total(query, params, total_mode))
+            return result
+
         # Get total count
         count_query = f"SELECT COUNT(*) as total FROM ({query}) AS subq"
         count_result = self._execute_query(count_query, tuple(params))
@@ -289,6 +359,77 @@ class SGAPostgresClient:
             "has_more": (offset + len(items)) < total
         }
 
+    def _keyset_page(
+        self,
+        kind: str,
+        query: str,
+        params: List[Any],
+        filters: Dict[str, Any],
+        cursor: Optional[str],
+        seek: str,
+        order_by: str,
+        key_columns: Tuple[str, ...],
+        limit: int
+    ) -> Dict[str, Any]:
+        """
+        Fetch one keyset page of a filtered query.
+
+        Reads limit + 1 rows to know whether another page exists; the
+        cursor encodes the key_columns of the last returned row.
+        """
+        params = list(params)
+        if cursor:
+            query += f" AND {seek}"
+            params.extend(decode_cursor(cursor, kind, filters))
+
+        query += f" ORDER BY {order_by} LIMIT %s"
+        params.append(limit + 1)
+
+        rows = self._execute_query(query, tuple(params))
+        has_more = len(rows) > limit
+        items = rows[:limit]
+
+        next_cursor = None
+        if has_more and items:
+            next_cursor = encode_cursor(kind, [items[-1][c] for c in key_columns], filters)
+
+        return {
+            "items": items,
+            "count": len(items),
+            "limit": limit,
+            "pagination": "keyset",
+            "has_more": has_more,
+            "next_cursor": next_cursor,
+        }
+
+    def _optional_total(self, query: str, params: List[Any], mode: str) -> Dict[str, Any]:
+        """
+        Total for keyset pages without a COUNT(*) on every request.
+
+        estimate: planner row estimate (EXPLAIN, no scan)
+        cached: exact COUNT(*), reused for COUNT_CACHE_TTL_SECONDS
+        """
+        if mode not in TOTAL_MODES:
+            raise ValueError(f"Invalid total mode: {mode}")
+        if mode == "none":
+            return {}
+
+        params = tuple(params)
+        if mode == "estimate":
+            plan = self._execute_query(f"EXPLAIN (FORMAT JSON) {query}", params)
+            return {"total": plan_row_estimate(plan), "total_mode": "estimate"}
+
+        key = count_cache.key(query, params)
+        cached = count_cache.get(key)
+        if cached is not None:
+            count, age = cached
+            return {"total": count, "total_mode": "cached", "total_age_seconds": round(age, 1)}
+
+        count_result = self._execute_query(f"SELECT COUNT(*) as total FROM ({query}) AS subq", params)
+        count = count_result[0]["total"] if count_result else 0
+        count_cache.put(key, count)
+        return {"total": count, "total_mode": "cached", "total_age_seconds": 0.0}
+
     def get_balance(
         self,
         part_number: str,
@@ -366,21 +507,50 @@ class SGAPostgresClient:
         self,
         query: str,
         search_type: str = "all",
-        limit: int = 50
+        limit: int = 50,
+        mode: str = "contains"
     ) -> Dict[str, Any]:
         """
         Search assets by serial, part number, or description.
 
+        Serial and part number searches are backed by pg_trgm GIN indexes
+        (contains) and lower(...) text_pattern_ops indexes (prefix), see
+        schema/011_trigram_search.sql.
+
         Args:
             query: Search term
             search_type: Type of search (serial, part_number, description, all)
             limit: Maximum results
+            mode: contains (substring match, ordered by serial),
+                  prefix (starts-with fast path, ordered by serial) or
+                  ranked (best matches first, each item with score and matched_on)
 
         Returns:
             Search results
         """
-        base_query = """
-            SELECT
+        sql, params = self._asset_search_query(query, search_type, limit, mode)
+        results = self._execute_query(sql, params)
+
+        return {
+            "query": query,
+            "search_type": search_type,
+            "mode": mode,
+            "count": len(results),
+            "items": results
+        }
+
+    def _asset_search_query(
+        self,
+        query: str,
+        search_type: str,
+        limit: int,
+        mode: str
+    ) -> Tuple[str, tuple]:
+        """Build the SQL and parameters for search_assets."""
+        if mode not in ASSET_SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: {mode}")
+
+        columns = """
                 a.asset_id,
                 a.serial_number,
                 pn.part_number,
@@ -391,43 +561,56 @@ class SGAPostgresClient:
                 a.status,
                 a.condition,
                 a.last_movement_at
-            FROM sga.assets a
+        """
+        joins = """
             JOIN sga.part_numbers pn ON a.part_number_id = pn.part_number_id
             LEFT JOIN sga.locations l ON a.location_id = l.location_id
             LEFT JOIN sga.projects p ON a.project_id = p.project_id
-            WHERE a.is_active = TRUE
         """
 
+        if mode == "ranked":
+            sql = f"""
+                SELECT {columns}, r.score, r.matched_on
+                FROM sga.search_assets_ranked(%s, %s, %s) r
+                JOIN sga.assets a ON a.asset_id = r.asset_id
+                {joins}
+                ORDER BY r.score DESC, a.serial_number
+            """
+            if search_type not in ASSET_SEARCH_TYPES:
+                search_type = "all"
+            return sql, (query, search_type, limit)
+
+        if mode == "prefix":
+            serial_clause = "lower(a.serial_number) LIKE %s"
+            pn_clause = "lower(pn.part_number) LIKE %s"
+            pattern = like_prefix(query)
+        else:
+            serial_clause = "a.serial_number ILIKE %s"
+            pn_clause = "pn.part_number ILIKE %s"
+            pattern = f"%{query}%"
+        text_clause = "pn.search_vector @@ plainto_tsquery('portuguese', %s)"
+
         if search_type == "serial":
-            base_query += " AND a.serial_number ILIKE %s"
-            params = [f"%{query}%"]
+            where, params = serial_clause, [pattern]
         elif search_type == "part_number":
-            base_query += " AND pn.part_number ILIKE %s"
-            params = [f"%{query}%"]
+            where, params = pn_clause, [pattern]
         elif search_type == "description":
-            base_query += " AND pn.search_vector @@ plainto_tsquery('portuguese', %s)"
-            params = [query]
-        else:  # all
-            base_query += """
-                AND (
-                    a.serial_number ILIKE %s
-                    OR pn.part_number ILIKE %s
-                    OR pn.search_vector @@ plainto_tsquery('portuguese', %s)
-                )
-            """
-            params = [f"%{query}%", f"%{query}%", query]
+            where, params = text_clause, [query]
+        else:  # all (also any unknown search_type)
+            where = f"({serial_clause} OR {pn_clause} OR {text_clause})"
+            params = [pattern, pattern, query]
 
-        base_query += " ORDER BY a.serial_number LIMIT %s"
+        sql = f"""
+            SELECT {columns}
+            FROM sga.assets a
+            {joins}
+            WHERE a.is_active = TRUE
+              AND {where}
+            ORDER BY a.serial_number
+            LIMIT %s
+        """
         params.append(limit)
-
-        results = self._execute_query(base_query, tuple(params))
-
-        return {
-            "query": query,
-            "search_type": search_type,
-            "count": len(results),
-            "items": results
-        }
+        return sql, tuple(params)
 
     def get_asset_timeline(
         self,
@@ -541,17 +724,24 @@ class SGAPostgresClient:
     def get_movements(
         self,
         filters: Optional[Dict[str, Any]] = None,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        total_mode: str = "none"
     ) -> Dict[str, Any]:
         """
-        List movements with filters.
+        List movements with filters, newest first.
+
+        Keyset paginated on (movement_date, movement_id): pass next_cursor
+        back as cursor for the next (older) page.
 
         Args:
             filters: Filter conditions
             limit: Maximum results
+            cursor: Opaque cursor from a previous page
+            total_mode: none, estimate (planner) or cached
 
         Returns:
-            List of movements
+            List of movements with has_more / next_cursor
         """
         filters = filters or {}
 
@@ -600,15 +790,19 @@ class SGAPostgresClient:
             query += " AND (sl.location_code = %s OR dl.location_code = %s)"
             params.extend([filters["location_id"], filters["location_id"]])
 
-        query += " ORDER BY m.movement_date DESC LIMIT %s"
-        params.append(limit)
-
-        results = self._execute_query(query, tuple(params))
-
-        return {
-            "count": len(results),
-            "items": results
-        }
+        result = self._keyset_page(
+            kind="movements",
+            query=query,
+            params=params,
+            filters=filters,
+            cursor=cursor,
+            seek="(m.movement_date, m.movement_id) < (%s::timestamptz, %s::uuid)",
+            order_by="m.movement_date DESC, m.movement_id DESC",
+            key_columns=("movement_date", "movement_id"),
+            limit=limit,
+        )
+        result.update(self._optional_total(query, params, total_mode))
+        return result
 
     def get_pending_tasks(
         self,
@@ -767,21 +961,838 @@ class SGAPostgresClient:
             "message": f"Movement created: {movement_type} - {quantity} x {part_number}"
         }
 
+    def transfer_assets(
+        self,
+        part_number: str,
+        source_location_id: str,
+        destination_location_id: str,
+        serial_numbers: List[str],
+        project_id: Optional[str] = None,
+        reason: Optional[str] = None,
+        requested_by: str = "mcp_lambda"
+    ) -> Dict[str, Any]:
+        """
+        Move a list of serialized assets between locations in one transaction.
+
+        All serials are read and locked with a single query and validated
+        before anything is written. The TRANSFERENCIA movement then updates
+        both balances (balance trigger) and one INSERT ... SELECT of the
+        movement items relocates every asset (statement-level trigger, 014).
+
+        Args:
+            part_number: Part number of the assets
+            source_location_id: Source location code
+            destination_location_id: Destination location code
+            serial_numbers: Serials to move
+            project_id: Project code
+            reason: Reason for movement
+            requested_by: User ID for audit trail
+
+        Returns:
+            Movement info, or success False with invalid_serials
+        """
+        serials = list(dict.fromkeys(serial_numbers or []))
+        if not serials:
+            raise ValueError("serial_numbers is required")
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        (SELECT part_number_id FROM sga.part_numbers WHERE part_number = %s) AS part_number_id,
+                        (SELECT location_id FROM sga.locations WHERE location_code = %s) AS source_id,
+                        (SELECT location_id FROM sga.locations WHERE location_code = %s) AS destination_id,
+                        (SELECT project_id FROM sga.projects WHERE project_code = %s) AS project_id
+                    """,
+                    (part_number, source_location_id, destination_location_id, project_id)
+                )
+                refs = cur.fetchone()
+                missing = [
+                    label for label, key in (
+                        (f"Part number not found: {part_number}", "part_number_id"),
+                        (f"Location not found: {source_location_id}", "source_id"),
+                        (f"Location not found: {destination_location_id}", "destination_id"),
+                    )
+                    if refs[key] is None
+                ]
+                if project_id and refs["project_id"] is None:
+                    missing.append(f"Project not found: {project_id}")
+                if missing:
+                    conn.rollback()
+                    return {"success": False, "error": "; ".join(missing)}
+
+                cur.execute(
+                    """
+                    SELECT asset_id, serial_number, part_number_id, location_id, status::text AS status
+                    FROM sga.assets
+                    WHERE serial_number = ANY(%s) AND is_active = TRUE
+                    ORDER BY asset_id
+                    FOR UPDATE
+                    """,
+                    (serials,)
+                )
+                assets = {row["serial_number"]: row for row in cur.fetchall()}
+
+                invalid = self._invalid_transfer_serials(serials, assets, refs)
+                if invalid:
+                    conn.rollback()
+                    return {
+                        "success": False,
+                        "error": f"{len(invalid)} serial(s) cannot be transferred",
+                        "invalid_serials": invalid,
+                    }
+
+                cur.execute(
+                    """
+                    INSERT INTO sga.movements (
+                        movement_type, part_number_id, quantity,
+                        source_location_id, destination_location_id, project_id,
+                        reason, created_by
+                    ) VALUES ('TRANSFERENCIA', %s, %s, %s, %s, %s, %s, %s)
+                    RETURNING movement_id, movement_date
+                    """,
+                    (
+                        refs["part_number_id"], len(serials),
+                        refs["source_id"], refs["destination_id"], refs["project_id"],
+                        reason, requested_by,
+                    )
+                )
+                movement = cur.fetchone()
+
+                cur.execute(
+                    """
+                    INSERT INTO sga.movement_items (movement_id, asset_id, serial_number)
+                    SELECT %s, asset_id, serial_number
+                    FROM sga.assets
+                    WHERE asset_id = ANY(%s)
+                    """,
+                    (movement["movement_id"], [row["asset_id"] for row in assets.values()])
+                )
+                moved = cur.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(
+            f"transfer_assets: {moved} serial(s) of {part_number} "
+            f"{source_location_id} -> {destination_location_id}"
+        )
+
+        return {
+            "success": True,
+            "movement_id": str(movement["movement_id"]),
+            "movement_date": movement["movement_date"].isoformat(),
+            "quantity": moved,
+            "message": f"Transfer created: {moved} x {part_number}",
+        }
+
+    @staticmethod
+    def _invalid_transfer_serials(
+        serials: List[str],
+        assets: Dict[str, Dict[str, Any]],
+        refs: Dict[str, Any]
+    ) -> List[Dict[str, str]]:
+        """Serials that are missing, of another part number, elsewhere or blocked."""
+        invalid = []
+        for serial in serials:
+            asset = assets.get(serial)
+            if asset is None:
+                reason = "not found"
+            elif asset["part_number_id"] != refs["part_number_id"]:
+                reason = "belongs to another part number"
+            elif asset["location_id"] != refs["source_id"]:
+                reason = "not at source location"
+            elif asset["status"] in TRANSFER_BLOCKED_STATUSES:
+                reason = f"status {asset['status']}"
+            else:
+                continue
+            invalid.append({"serial_number": serial, "reason": reason})
+        return invalid
+
+    # =========================================================================
+    # Inventory Campaign Queries
+    # =========================================================================
+
+    def get_balances_by_locations(
+        self,
+        location_ids: List[str],
+        part_numbers: Optional[List[str]] = None,
+        project_ids: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the balances of many locations with one query.
+
+        Args:
+            location_ids: Location codes
+            part_numbers: Optional part number filter
+            project_ids: Optional project code filter
+
+        Returns:
+            Balance rows (part_number, location_id, project_id and
+            quantity_total/reserved/available), codes instead of UUIDs
+        """
+        if not location_ids:
+            return []
+
+        query = """
+            SELECT
+                pn.part_number,
+                l.location_code AS location_id,
+                p.project_code AS project_id,
+                b.quantity_total,
+                b.quantity_reserved,
+                b.quantity_available
+            FROM sga.balances b
+            JOIN sga.part_numbers pn ON b.part_number_id = pn.part_number_id
+            JOIN sga.locations l ON b.location_id = l.location_id
+            LEFT JOIN sga.projects p ON b.project_id = p.project_id
+            WHERE l.location_code = ANY(%s)
+        """
+        params: List[Any] = [list(location_ids)]
+
+        if part_numbers:
+            query += " AND pn.part_number = ANY(%s)"
+            params.append(list(part_numbers))
+
+        if project_ids:
+            query += " AND p.project_code = ANY(%s)"
+            params.append(list(project_ids))
+
+        query += " ORDER BY l.location_code, pn.part_number, p.project_code"
+        return self._execute_query(query, tuple(params))
+
+    def get_serials_for_balances(
+        self,
+        keys: List[Tuple[str, str]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the countable serials of many (part_number, location) pairs.
+
+        The pairs are passed as two parallel arrays and joined to the
+        assets in one query. Assets in transit, installed or disposed are
+        not at the location and are left out.
+
+        Args:
+            keys: (part_number, location code) pairs
+
+        Returns:
+            Rows with part_number, location_id and serials (sorted); pairs
+            without serials are omitted
+        """
+        pairs = list(dict.fromkeys((pn, loc) for pn, loc in keys))
+        if not pairs:
+            return []
+
+        return self._execute_query(
+            """
+            SELECT
+                k.part_number,
+                k.location_id,
+                array_agg(a.serial_number ORDER BY a.serial_number) AS serials
+            FROM unnest(%s::text[], %s::text[]) AS k(part_number, location_id)
+            JOIN sga.part_numbers pn ON pn.part_number = k.part_number
+            JOIN sga.locations l ON l.location_code = k.location_id
+            JOIN sga.assets a
+              ON a.part_number_id = pn.part_number_id
+             AND a.location_id = l.location_id
+            WHERE a.is_active = TRUE
+              AND a.status::text <> ALL(%s)
+            GROUP BY k.part_number, k.location_id
+            """,
+            (
+                [pn for pn, _ in pairs],
+                [loc for _, loc in pairs],
+                list(UNCOUNTED_ASSET_STATUSES),
+            )
+        )
+
+    # =========================================================================
+    # Expedition Operations
+    # =========================================================================
+
+    def get_expedition_stock(
+        self,
+        part_numbers: List[str],
+        serial_numbers: Optional[List[str]] = None,
+        location_id: Optional[str] = None,
+        project_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Read the stock of a whole expedition with one query per kind.
+
+        Args:
+            part_numbers: Part numbers of the expedition lines
+            serial_numbers: Serials of the serialized lines
+            location_id: Location code of the non-serialized balances
+            project_id: Project code of the expedition (also filters the
+                balances)
+
+        Returns:
+            Dict with project (None if not found or not requested),
+            part_numbers, assets and balances; codes instead of UUIDs
+        """
+        part_numbers = list(dict.fromkeys(part_numbers or []))
+        serials = list(dict.fromkeys(serial_numbers or []))
+
+        project = None
+        if project_id:
+            rows = self._execute_query(
+                """
+                SELECT project_code AS project_id, project_name, client_name, is_active
+                FROM sga.projects
+                WHERE project_code = %s
+                """,
+                (project_id,)
+            )
+            project = rows[0] if rows else None
+
+        pns = []
+        if part_numbers:
+            pns = self._execute_query(
+                """
+                SELECT part_number, description, category, unit_of_measure, is_serialized
+                FROM sga.part_numbers
+                WHERE part_number = ANY(%s) AND is_active = TRUE
+                """,
+                (part_numbers,)
+            )
+
+        assets = []
+        if serials:
+            assets = self._execute_query(
+                """
+                SELECT
+                    a.serial_number,
+                    pn.part_number,
+                    l.location_code AS location_id,
+                    p.project_code AS project_id,
+                    a.status::text AS status
+                FROM sga.assets a
+                JOIN sga.part_numbers pn ON a.part_number_id = pn.part_number_id
+                LEFT JOIN sga.locations l ON a.location_id = l.location_id
+                LEFT JOIN sga.projects p ON a.project_id = p.project_id
+                WHERE a.serial_number = ANY(%s) AND a.is_active = TRUE
+                """,
+                (serials,)
+            )
+
+        balances = []
+        if part_numbers and location_id:
+            balances = self.get_balances_by_locations(
+                [location_id],
+                part_numbers=part_numbers,
+                project_ids=[project_id] if project_id else None
+            )
+
+        return {"project": project, "part_numbers": pns, "assets": assets, "balances": balances}
+
+    def create_reservations(
+        self,
+        expedition_id: str,
+        reservations: List[Dict[str, Any]],
+        project_id: Optional[str] = None,
+        reserved_by: str = "mcp_lambda",
+        ttl_hours: int = EXPEDITION_RESERVATION_TTL_HOURS
+    ) -> Dict[str, Any]:
+        """
+        Reserve every line of an expedition in one transaction.
+
+        References, assets and balances are read with one query each (assets
+        and balances locked) and validated before anything is written. Then
+        one INSERT ... SELECT creates the reservation rows, one creates a
+        RESERVA movement per balance (the balance trigger raises
+        quantity_reserved) and one links the serials (assets RESERVED, 014).
+
+        Args:
+            expedition_id: Expedition ID (reservation metadata and movement
+                reference_document)
+            reservations: Lines [{part_number, quantity, location_id,
+                serial_number}]; serialized lines take location and project
+                from the asset
+            project_id: Project code of the non-serialized lines
+            reserved_by: User ID for audit trail
+            ttl_hours: Hours until the reservations expire
+
+        Returns:
+            reservation_ids and movement_ids, or success False with the
+            unavailable lines
+        """
+        if not reservations:
+            raise ValueError("reservations is required")
+
+        lines = [
+            {
+                "line": line,
+                "part_number": reservation.get("part_number"),
+                "location_code": reservation.get("location_id"),
+                "serial_number": reservation.get("serial_number") or None,
+                "quantity": 1 if reservation.get("serial_number") else int(reservation.get("quantity") or 1),
+            }
+            for line, reservation in enumerate(reservations)
+        ]
+        serials = [line["serial_number"] for line in lines if line["serial_number"]]
+
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    SELECT
+                        (SELECT project_id::text FROM sga.projects WHERE project_code = %s) AS project_id,
+                        (SELECT COALESCE(jsonb_object_agg(part_number, part_number_id), '{}')
+                         FROM sga.part_numbers WHERE part_number = ANY(%s)) AS part_numbers,
+                        (SELECT COALESCE(jsonb_object_agg(location_code, location_id), '{}')
+                         FROM sga.locations WHERE location_code = ANY(%s)) AS locations
+                    """,
+                    (
+                        project_id,
+                        list({line["part_number"] for line in lines}),
+                        list({line["location_code"] for line in lines if line["location_code"]}),
+                    )
+                )
+                refs = cur.fetchone()
+                if project_id and refs["project_id"] is None:
+                    conn.rollback()
+                    return {"success": False, "error": f"Project not found: {project_id}"}
+
+                assets = {}
+                if serials:
+                    cur.execute(
+                        """
+                        SELECT
+                            asset_id, serial_number, part_number_id::text AS part_number_id,
+                            location_id::text AS location_id, project_id::text AS project_id,
+                            status::text AS status
+                        FROM sga.assets
+                        WHERE serial_number = ANY(%s) AND is_active = TRUE
+                        ORDER BY asset_id
+                        FOR UPDATE
+                        """,
+                        (serials,)
+                    )
+                    assets = {row["serial_number"]: row for row in cur.fetchall()}
+
+                unavailable = self._resolve_reservation_lines(lines, refs, assets)
+
+                keys = list(dict.fromkeys(line["key"] for line in lines if "key" in line))
+                cur.execute(
+                    """
+                    SELECT
+                        b.part_number_id::text AS part_number_id,
+                        b.location_id::text AS location_id,
+                        b.project_id::text AS project_id,
+                        b.quantity_available
+                    FROM sga.balances b
+                    JOIN unnest(%s::uuid[], %s::uuid[], %s::uuid[]) AS k(part_number_id, location_id, project_id)
+                      ON b.part_number_id = k.part_number_id
+                     AND b.location_id = k.location_id
+                     AND b.project_id IS NOT DISTINCT FROM k.project_id
+                    ORDER BY b.balance_id
+                    FOR UPDATE OF b
+                    """,
+                    tuple(list(column) for column in zip(*keys)) if keys else ([], [], [])
+                )
+                available = {
+                    (row["part_number_id"], row["location_id"], row["project_id"]): row["quantity_available"]
+                    for row in cur.fetchall()
+                }
+                unavailable += self._insufficient_reservation_lines(lines, available)
+
+                if unavailable:
+                    conn.rollback()
+                    return {
+                        "success": False,
+                        "error": f"{len(unavailable)} line(s) cannot be reserved",
+                        "unavailable": sorted(unavailable, key=lambda item: item["line"]),
+                    }
+
+                key_columns = [list(column) for column in zip(*(line["key"] for line in lines))]
+                quantities = [line["quantity"] for line in lines]
+                cur.execute(
+                    """
+                    INSERT INTO sga.reservations (
+                        part_number_id, location_id, project_id, quantity,
+                        purpose, reserved_by, expires_at, metadata
+                    )
+                    SELECT
+                        k.part_number_id, k.location_id, k.project_id, k.quantity,
+                        %s, %s, NOW() + make_interval(hours => %s),
+                        jsonb_strip_nulls(jsonb_build_object(
+                            'expedition_id', %s::text, 'serial_number', k.serial_number
+                        ))
+                    FROM unnest(%s::uuid[], %s::uuid[], %s::uuid[], %s::int[], %s::text[])
+                         AS k(part_number_id, location_id, project_id, quantity, serial_number)
+                    RETURNING reservation_id
+                    """,
+                    (
+                        f"Expedicao {expedition_id}", reserved_by, ttl_hours, expedition_id,
+                        *key_columns, quantities, [line["serial_number"] for line in lines],
+                    )
+                )
+                reservation_ids = [str(row["reservation_id"]) for row in cur.fetchall()]
+
+                cur.execute(
+                    """
+                    INSERT INTO sga.movements (
+                        movement_type, part_number_id, quantity,
+                        source_location_id, project_id,
+                        reference_document, reason, created_by
+                    )
+                    SELECT
+                        'RESERVA'::sga.movement_type, k.part_number_id, SUM(k.quantity),
+                        k.location_id, k.project_id,
+                        %s, %s, %s
+                    FROM unnest(%s::uuid[], %s::uuid[], %s::uuid[], %s::int[])
+                         AS k(part_number_id, location_id, project_id, quantity)
+                    GROUP BY k.part_number_id, k.location_id, k.project_id
+                    RETURNING movement_id
+                    """,
+                    (expedition_id, f"Reserva expedicao {expedition_id}", reserved_by, *key_columns, quantities)
+                )
+                movement_ids = [row["movement_id"] for row in cur.fetchall()]
+
+                if serials:
+                    self._insert_movement_items(
+                        cur, movement_ids, [line["asset_id"] for line in lines if line.get("asset_id")]
+                    )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(
+            f"create_reservations: {expedition_id}, {len(lines)} line(s), "
+            f"{len(movement_ids)} RESERVA movement(s)"
+        )
+
+        return {
+            "success": True,
+            "expedition_id": expedition_id,
+            "reservation_ids": reservation_ids,
+            "movement_ids": [str(movement_id) for movement_id in movement_ids],
+            "reserved_quantity": sum(quantities),
+        }
+
+    @staticmethod
+    def _resolve_reservation_lines(
+        lines: List[Dict[str, Any]],
+        refs: Dict[str, Any],
+        assets: Dict[str, Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Set the balance key (and asset_id) of each line; return the lines that
+        reference a missing part number, location or serial, or a serial that
+        is not in stock.
+        """
+        unavailable = []
+        seen_serials = set()
+        for line in lines:
+            part_number_id = refs["part_numbers"].get(line["part_number"])
+            serial = line["serial_number"]
+            asset = assets.get(serial) if serial else None
+            if part_number_id is None:
+                reason = f"part number not found: {line['part_number']}"
+            elif serial and asset is None:
+                reason = "serial not found"
+            elif serial and serial in seen_serials:
+                reason = "serial repeated in expedition"
+            elif serial and asset["part_number_id"] != part_number_id:
+                reason = "serial belongs to another part number"
+            elif serial and asset["status"] != "IN_STOCK":
+                reason = f"serial status {asset['status']}"
+            elif not serial and line["location_code"] not in refs["locations"]:
+                reason = f"location not found: {line['location_code']}"
+            else:
+                if serial:
+                    seen_serials.add(serial)
+                    line["asset_id"] = asset["asset_id"]
+                    line["key"] = (part_number_id, asset["location_id"], asset["project_id"])
+                else:
+                    line["key"] = (part_number_id, refs["locations"][line["location_code"]], refs["project_id"])
+                continue
+            unavailable.append({
+                "line": line["line"],
+                "part_number": line["part_number"],
+                "serial_number": serial,
+                "reason": reason,
+            })
+        return unavailable
+
+    @staticmethod
+    def _insufficient_reservation_lines(
+        lines: List[Dict[str, Any]],
+        available: Dict[Tuple[str, str, Optional[str]], int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Non-serialized lines whose balance cannot cover every line of the
+        same balance (serial lines are checked by asset status instead).
+        """
+        requested: Dict[Tuple[str, str, Optional[str]], int] = {}
+        for line in lines:
+            if "key" in line:
+                requested[line["key"]] = requested.get(line["key"], 0) + line["quantity"]
+
+        return [
+            {
+                "line": line["line"],
+                "part_number": line["part_number"],
+                "serial_number": None,
+                "reason": (
+                    f"insufficient stock (available {available.get(line['key'], 0)}, "
+                    f"requested {requested[line['key']]})"
+                ),
+            }
+            for line in lines
+            if "key" in line and not line["serial_number"]
+            and requested[line["key"]] > available.get(line["key"], 0)
+        ]
+
+    @staticmethod
+    def _insert_movement_items(cur: Any, movement_ids: List[Any], asset_ids: List[Any]) -> int:
+        """Link assets to the movement of their balance with one INSERT ... SELECT."""
+        cur.execute(
+            """
+            INSERT INTO sga.movement_items (movement_id, asset_id, serial_number)
+            SELECT m.movement_id, a.asset_id, a.serial_number
+            FROM sga.assets a
+            JOIN sga.movements m
+              ON m.part_number_id = a.part_number_id
+             AND m.source_location_id = a.location_id
+             AND m.project_id IS NOT DISTINCT FROM a.project_id
+            WHERE m.movement_id = ANY(%s) AND a.asset_id = ANY(%s)
+            """,
+            (movement_ids, asset_ids)
+        )
+        return cur.rowcount
+
+    def complete_expedition(
+        self,
+        expedition_id: str,
+        nf_number: str,
+        nf_key: Optional[str] = None,
+        carrier: Optional[str] = None,
+        tracking_code: Optional[str] = None,
+        destination: Optional[str] = None,
+        completed_by: str = "mcp_lambda"
+    ) -> Dict[str, Any]:
+        """
+        Ship every reserved line of an expedition in one transaction.
+
+        The active reservations of the expedition are released with one
+        UPDATE ... RETURNING. One INSERT ... SELECT then creates a LIBERACAO
+        movement per balance (quantity_reserved goes down), one an EXPEDIÇÃO
+        movement per balance (quantity_total goes down, validated against the
+        released stock) and one links the serials (assets IN_TRANSIT, 014).
+
+        Completions of the same expedition are serialized with an advisory
+        lock; a retry after a successful completion returns the existing
+        EXPEDIÇÃO movements with already_completed True.
+
+        Args:
+            expedition_id: Expedition ID (reservation metadata and movement
+                reference_document)
+            nf_number: NF number
+            nf_key: NF access key
+            carrier: Carrier name (movement metadata)
+            tracking_code: Tracking number (movement metadata)
+            destination: Destination client (movement metadata)
+            completed_by: User ID for audit trail
+
+        Returns:
+            movement_ids of the EXPEDIÇÃO movements, or success False if the
+            expedition has no active reservation
+        """
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", (f"expedition:{expedition_id}",))
+
+                cur.execute(
+                    """
+                    SELECT movement_id
+                    FROM sga.movements
+                    WHERE reference_document = %s AND movement_type = 'EXPEDIÇÃO'
+                    ORDER BY movement_id
+                    """,
+                    (expedition_id,)
+                )
+                shipped = [str(row["movement_id"]) for row in cur.fetchall()]
+                if shipped:
+                    conn.commit()
+                    return {
+                        "success": True,
+                        "expedition_id": expedition_id,
+                        "already_completed": True,
+                        "movement_ids": shipped,
+                    }
+
+                cur.execute(
+                    """
+                    UPDATE sga.reservations
+                    SET is_active = FALSE, released_at = NOW()
+                    WHERE metadata->>'expedition_id' = %s AND is_active = TRUE
+                    RETURNING
+                        part_number_id, location_id, project_id, quantity,
+                        metadata->>'serial_number' AS serial_number
+                    """,
+                    (expedition_id,)
+                )
+                released = cur.fetchall()
+                if not released:
+                    conn.rollback()
+                    return {"success": False, "error": f"No active reservations for expedition: {expedition_id}"}
+
+                key_columns = (
+                    [row["part_number_id"] for row in released],
+                    [row["location_id"] for row in released],
+                    [row["project_id"] for row in released],
+                    [row["quantity"] for row in released],
+                )
+
+                cur.execute(
+                    """
+                    INSERT INTO sga.movements (
+                        movement_type, part_number_id, quantity,
+                        source_location_id, project_id,
+                        reference_document, reason, created_by
+                    )
+                    SELECT
+                        'LIBERACAO'::sga.movement_type, k.part_number_id, SUM(k.quantity),
+                        k.location_id, k.project_id,
+                        %s, %s, %s
+                    FROM unnest(%s::uuid[], %s::uuid[], %s::uuid[], %s::int[])
+                         AS k(part_number_id, location_id, project_id, quantity)
+                    GROUP BY k.part_number_id, k.location_id, k.project_id
+                    """,
+                    (expedition_id, f"Conclusao expedicao {expedition_id}", completed_by, *key_columns)
+                )
+
+                cur.execute(
+                    """
+                    INSERT INTO sga.movements (
+                        movement_type, part_number_id, quantity,
+                        source_location_id, project_id,
+                        nf_number, nf_key, reference_document, reason, metadata, created_by
+                    )
+                    SELECT
+                        'EXPEDIÇÃO'::sga.movement_type, k.part_number_id, SUM(k.quantity),
+                        k.location_id, k.project_id,
+                        %s, %s, %s, %s,
+                        jsonb_strip_nulls(jsonb_build_object(
+                            'carrier', %s::text, 'tracking_code', %s::text, 'destination', %s::text
+                        )),
+                        %s
+                    FROM unnest(%s::uuid[], %s::uuid[], %s::uuid[], %s::int[])
+                         AS k(part_number_id, location_id, project_id, quantity)
+                    GROUP BY k.part_number_id, k.location_id, k.project_id
+                    RETURNING movement_id
+                    """,
+                    (
+                        nf_number, nf_key, expedition_id, f"Expedicao {expedition_id}",
+                        carrier, tracking_code, destination, completed_by, *key_columns,
+                    )
+                )
+                movement_ids = [row["movement_id"] for row in cur.fetchall()]
+
+                serials = [row["serial_number"] for row in released if row["serial_number"]]
+                shipped_serials = 0
+                if serials:
+                    cur.execute(
+                        """
+                        SELECT asset_id
+                        FROM sga.assets
+                        WHERE serial_number = ANY(%s) AND is_active = TRUE
+                        ORDER BY asset_id
+                        FOR UPDATE
+                        """,
+                        (serials,)
+                    )
+                    shipped_serials = self._insert_movement_items(
+                        cur, movement_ids, [row["asset_id"] for row in cur.fetchall()]
+                    )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(
+            f"complete_expedition: {expedition_id}, {len(released)} reservation(s), "
+            f"{len(movement_ids)} EXPEDIÇÃO movement(s)"
+        )
+
+        return {
+            "success": True,
+            "expedition_id": expedition_id,
+            "already_completed": False,
+            "movement_ids": [str(movement_id) for movement_id in movement_ids],
+            "released_reservations": len(released),
+            "shipped_quantity": sum(key_columns[3]),
+            "shipped_serials": shipped_serials,
+        }
+
+    # =========================================================================
+    # SAP Reconciliation
+    # =========================================================================
+
     def reconcile_with_sap(
         self,
-        sap_data: List[Dict[str, Any]],
-        include_serials: bool = False
+        sap_data: Optional[List[Dict[str, Any]]] = None,
+        include_serials: bool = False,
+        mode: str = "full",
+        s3_uri: Optional[str] = None,
+        csv_delimiter: str = ",",
+        csv_encoding: str = "UTF8",
+        run_id: Optional[str] = None,
+        category: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 500,
+        requested_by: str = "system"
     ) -> Dict[str, Any]:
         """
         Compare SGA inventory with SAP export data.
 
+        mode "full" compares in memory and returns every row (small exports).
+        mode "set" loads the export into the database and returns summary
+        counts plus one page of non-matching lines; it is used automatically
+        when s3_uri or run_id is given. See _reconcile_with_sap_set.
+
         Args:
             sap_data: List of SAP items with part_number, quantity, location_code
             include_serials: Whether to include serial number comparison
+            mode: "full" or "set"
+            s3_uri: SAP CSV export (s3://bucket/key) instead of sap_data
+            csv_delimiter: CSV delimiter of the S3 export
+            csv_encoding: PostgreSQL encoding name of the S3 export
+            run_id: Existing set-mode run to page through
+            category: Only lines of this category (discrepancy, sap_only, sga_only)
+            cursor: Opaque cursor from a previous page
+            limit: Lines per page (set mode)
+            requested_by: User ID for audit trail
 
         Returns:
             Reconciliation results with matches and discrepancies
         """
+        if s3_uri or run_id:
+            mode = "set"
+        if mode not in sap_reconciliation.RECONCILIATION_MODES:
+            raise ValueError(f"Invalid reconciliation mode: {mode}")
+        if mode == "set":
+            return self._reconcile_with_sap_set(
+                sap_data=sap_data,
+                s3_uri=s3_uri,
+                csv_delimiter=csv_delimiter,
+                csv_encoding=csv_encoding,
+                run_id=run_id,
+                category=category,
+                cursor=cursor,
+                limit=limit,
+                requested_by=requested_by,
+            )
+
+        sap_data = sap_data or []
         results = {
             "total_sap_items": len(sap_data),
             "matches": [],
@@ -858,6 +1869,530 @@ class SGAPostgresClient:
 
         return results
 
+    def _reconcile_with_sap_set(
+        self,
+        sap_data: Optional[List[Dict[str, Any]]],
+        s3_uri: Optional[str],
+        csv_delimiter: str,
+        csv_encoding: str,
+        run_id: Optional[str],
+        category: Optional[str],
+        cursor: Optional[str],
+        limit: int,
+        requested_by: str
+    ) -> Dict[str, Any]:
+        """
+        Set-based reconciliation.
+
+        A new run COPYs the export (sap_data rows, or the S3 CSV streamed in
+        chunks) into a temp table, classifies all keys with one FULL OUTER
+        JOIN against the aggregated balances and stores only the
+        non-matching keys, all in one transaction. Calls with run_id read
+        further pages of a stored run.
+        """
+        if category is not None and category not in sap_reconciliation.LINE_CATEGORIES:
+            raise ValueError(f"Invalid category: {category}")
+
+        if run_id:
+            runs = self._execute_query(
+                "SELECT * FROM sga.sap_reconciliation_runs WHERE run_id = %s::uuid",
+                (run_id,)
+            )
+            if not runs:
+                return {"success": False, "error": f"Reconciliation run not found: {run_id}"}
+            return self._sap_reconciliation_page(runs[0], category, cursor, limit)
+
+        if not sap_data and not s3_uri:
+            raise ValueError("sap_data or s3_uri is required")
+
+        import time
+        import uuid
+
+        started = time.monotonic()
+        run_id = str(uuid.uuid4())
+        conn = self._get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO sga.sap_reconciliation_runs (run_id, source, source_uri, requested_by)
+                    VALUES (%s::uuid, %s, %s, %s)
+                    """,
+                    (run_id, "s3" if s3_uri else "inline", s3_uri, requested_by)
+                )
+
+                if s3_uri:
+                    columns = self._copy_sap_csv_from_s3(cur, s3_uri, csv_delimiter, csv_encoding)
+                else:
+                    columns = sap_reconciliation.INLINE_COLUMNS
+                    cur.execute(sap_reconciliation.staging_table_sql(len(columns)))
+                    with cur.copy("COPY sap_import (col_0, col_1, col_2, col_3) FROM STDIN") as copy:
+                        for row in sap_reconciliation.inline_rows(sap_data):
+                            copy.write_row(row)
+
+                cur.execute(sap_reconciliation.row_counts_sql(columns))
+                row_counts = cur.fetchone()
+
+                cur.execute(sap_reconciliation.reconcile_sql(columns), {"run_id": run_id})
+                category_rows = cur.fetchall()
+
+                summary = sap_reconciliation.summarize(category_rows)
+                cur.execute(
+                    """
+                    UPDATE sga.sap_reconciliation_runs SET
+                        status = 'COMPLETED',
+                        total_rows = %s,
+                        invalid_rows = %s,
+                        matches_count = %s,
+                        discrepancies_count = %s,
+                        sap_only_count = %s,
+                        sga_only_count = %s,
+                        sap_total_quantity = %s,
+                        sga_total_quantity = %s,
+                        completed_at = NOW()
+                    WHERE run_id = %s::uuid
+                    RETURNING *
+                    """,
+                    (
+                        row_counts["total_rows"], row_counts["invalid_rows"],
+                        summary["matches_count"], summary["discrepancies_count"],
+                        summary["sap_only_count"], summary["sga_only_count"],
+                        sum(r["sap_quantity"] or 0 for r in category_rows),
+                        sum(r["sga_quantity"] or 0 for r in category_rows),
+                        run_id,
+                    )
+                )
+                run = cur.fetchone()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+        logger.info(
+            f"SAP reconciliation {run_id}: {run['total_rows']} row(s) in "
+            f"{time.monotonic() - started:.1f}s, {summary}"
+        )
+        return self._sap_reconciliation_page(run, category, cursor, limit)
+
+    def _copy_sap_csv_from_s3(
+        self,
+        cur,
+        s3_uri: str,
+        delimiter: str,
+        encoding: str
+    ) -> Dict[str, int]:
+        """
+        Stream a SAP CSV export from S3 into the sap_import temp table.
+
+        Returns:
+            {field: column index} mapped from the CSV header
+        """
+        bucket, key = sap_reconciliation.parse_s3_uri(s3_uri)
+        options = sap_reconciliation.copy_options(delimiter, encoding)
+
+        s3 = boto3.client("s3", region_name=self._region)
+        body = s3.get_object(Bucket=bucket, Key=key)["Body"]
+        try:
+            header_line, chunks = sap_reconciliation.split_header(body.iter_chunks(1024 * 1024))
+            header = sap_reconciliation.parse_header_line(header_line, delimiter, encoding)
+            columns = sap_reconciliation.map_csv_header(header)
+
+            cur.execute(sap_reconciliation.staging_table_sql(len(header)))
+            with cur.copy(f"COPY sap_import FROM STDIN WITH ({options})") as copy:
+                for chunk in chunks:
+                    copy.write(chunk)
+        finally:
+            body.close()
+
+        return columns
+
+    def _sap_reconciliation_page(
+        self,
+        run: Dict[str, Any],
+        category: Optional[str],
+        cursor: Optional[str],
+        limit: int
+    ) -> Dict[str, Any]:
+        """
+        Build the response for a set-mode reconciliation run.
+
+        Args:
+            run: Row from sga.sap_reconciliation_runs
+            category: Optional line category filter
+            cursor: Opaque cursor from a previous page
+            limit: Lines per page
+
+        Returns:
+            Summary counts plus one keyset page of non-matching lines
+        """
+        run_id = str(run["run_id"])
+        query = """
+            SELECT line_no, category, part_number, location_code,
+                   sap_quantity, sga_quantity, variance
+            FROM sga.sap_reconciliation_lines
+            WHERE run_id = %s::uuid
+        """
+        params: List[Any] = [run_id]
+        if category:
+            query += " AND category = %s"
+            params.append(category)
+
+        page = self._keyset_page(
+            kind="sap_reconciliation",
+            query=query,
+            params=params,
+            filters={"run_id": run_id, "category": category},
+            cursor=cursor,
+            seek="line_no > %s",
+            order_by="line_no",
+            key_columns=("line_no",),
+            limit=limit,
+        )
+
+        summary = {
+            "matches_count": run["matches_count"],
+            "discrepancies_count": run["discrepancies_count"],
+            "sap_only_count": run["sap_only_count"],
+            "sga_only_count": run["sga_only_count"],
+        }
+        summary["accuracy_percentage"] = sap_reconciliation.accuracy_percentage(summary)
+
+        return {
+            "success": True,
+            "mode": "set",
+            "run_id": run_id,
+            "status": run["status"],
+            "source": run["source"],
+            "total_sap_items": run["total_rows"],
+            "invalid_rows": run["invalid_rows"],
+            "summary": summary,
+            "totals": {
+                "sap_quantity": run["sap_total_quantity"],
+                "sga_quantity": run["sga_total_quantity"],
+            },
+            "category": category,
+            **page,
+        }
+
+    # =========================================================================
+    # Compliance Audit Methods (Streaming, Resumable)
+    # =========================================================================
+
+    def create_compliance_audit_run(
+        self,
+        rules_version: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        location_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        requested_by: str = "system"
+    ) -> Dict[str, Any]:
+        """
+        Create an audit run without evaluating any movement.
+
+        Callers create the run first so the run_id is known before the
+        (time-bounded) streaming invocations start.
+
+        Returns:
+            Inserted sga.compliance_audit_runs row
+        """
+        runs = self._execute_query(
+            """
+            INSERT INTO sga.compliance_audit_runs (
+                period_start, period_end, location_code, project_code,
+                rules_version, requested_by
+            ) VALUES (%s, %s, %s, %s, %s, %s)
+            RETURNING *
+            """,
+            (start_date, end_date, location_id, project_id,
+             rules_version, requested_by)
+        )
+        self._get_connection().commit()
+        return runs[0]
+
+    def run_compliance_audit(
+        self,
+        rules: Dict[str, Any],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        location_id: Optional[str] = None,
+        project_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        requested_by: str = "system",
+        chunk_size: int = 5000,
+        max_seconds: float = 20.0,
+        sample_limit: int = 50
+    ) -> Dict[str, Any]:
+        """
+        Audit movements against compiled compliance rules.
+
+        Movements are streamed with a server-side (named) cursor on a
+        dedicated connection, evaluated chunk by chunk and the findings of
+        each chunk are committed together with the run checkpoint. Memory is
+        bounded by chunk_size, independent of the audited period.
+
+        A run that exceeds max_seconds stops at a chunk boundary with status
+        RUNNING; calling again with the same run_id resumes after the last
+        committed (movement_date, movement_id) checkpoint.
+
+        Args:
+            rules: Compiled rules (tools.compliance_audit.compile_rules)
+            start_date: Inclusive period start (YYYY-MM-DD)
+            end_date: Inclusive period end (YYYY-MM-DD)
+            location_id: Optional location code scope
+            project_id: Optional project code scope
+            run_id: Existing run to resume (new run if omitted)
+            requested_by: User ID for audit trail
+            chunk_size: Movements evaluated per chunk
+            max_seconds: Time budget for this invocation
+            sample_limit: Findings returned in the response
+
+        Returns:
+            Run summary with status, counters, findings_by_code and a
+            sample of findings
+        """
+        import time
+
+        try:
+            from compliance_audit import evaluate_chunk
+        except ImportError:
+            from tools.compliance_audit import evaluate_chunk
+
+        started = time.monotonic()
+
+        if run_id:
+            runs = self._execute_query(
+                "SELECT * FROM sga.compliance_audit_runs WHERE run_id = %s::uuid",
+                (run_id,)
+            )
+            if not runs:
+                return {"success": False, "error": f"Audit run not found: {run_id}"}
+            run = runs[0]
+            if run["status"] == "COMPLETED":
+                return self._compliance_audit_summary(run, sample_limit)
+            if run["rules_version"] != rules.get("version"):
+                return {
+                    "success": False,
+                    "error": "Rules changed since the run started; start a new audit",
+                    "run_id": run_id,
+                }
+        else:
+            run = self.create_compliance_audit_run(
+                rules_version=rules.get("version"),
+                start_date=start_date,
+                end_date=end_date,
+                location_id=location_id,
+                project_id=project_id,
+                requested_by=requested_by,
+            )
+            run_id = str(run["run_id"])
+
+        query = """
+            SELECT
+                m.movement_id,
+                m.movement_type::text AS movement_type,
+                m.movement_date,
+                m.quantity,
+                sl.location_code AS source_location,
+                dl.location_code AS destination_location,
+                p.project_code,
+                m.metadata->>'destination_project' AS destination_project,
+                CASE WHEN m.metadata->>'total_value' ~ '^-?[0-9]+(\\.[0-9]+)?$'
+                     THEN (m.metadata->>'total_value')::numeric END AS total_value,
+                m.approved_by,
+                m.approved_at,
+                m.created_by
+            FROM sga.movements m
+            LEFT JOIN sga.locations sl ON m.source_location_id = sl.location_id
+            LEFT JOIN sga.locations dl ON m.destination_location_id = dl.location_id
+            LEFT JOIN sga.projects p ON m.project_id = p.project_id
+            WHERE 1=1
+        """
+        params: List[Any] = []
+
+        if run["period_start"]:
+            query += " AND m.movement_date >= %s"
+            params.append(run["period_start"])
+
+        if run["period_end"]:
+            query += " AND m.movement_date < (%s::date + 1)"
+            params.append(run["period_end"])
+
+        if run["location_code"]:
+            query += " AND (sl.location_code = %s OR dl.location_code = %s)"
+            params.extend([run["location_code"], run["location_code"]])
+
+        if run["project_code"]:
+            query += " AND p.project_code = %s"
+            params.append(run["project_code"])
+
+        if run["checkpoint_movement_date"] is not None:
+            query += " AND (m.movement_date, m.movement_id) > (%s, %s::uuid)"
+            params.extend([
+                run["checkpoint_movement_date"],
+                str(run["checkpoint_movement_id"]),
+            ])
+
+        query += " ORDER BY m.movement_date, m.movement_id"
+
+        insert_finding = """
+            INSERT INTO sga.compliance_audit_findings (
+                run_id, movement_id, movement_type, movement_date,
+                finding_code, severity, required_role, message
+            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+            ON CONFLICT (run_id, movement_id, finding_code) DO NOTHING
+        """
+        update_run = """
+            UPDATE sga.compliance_audit_runs SET
+                total_operations = total_operations + %s,
+                compliant = compliant + %s,
+                non_compliant = non_compliant + %s,
+                warnings = warnings + %s,
+                findings_by_code = (
+                    SELECT COALESCE(jsonb_object_agg(key, total), '{}'::jsonb)
+                    FROM (
+                        SELECT key, SUM(value::bigint) AS total
+                        FROM (
+                            SELECT * FROM jsonb_each_text(findings_by_code)
+                            UNION ALL
+                            SELECT * FROM jsonb_each_text(%s::jsonb)
+                        ) merged
+                        GROUP BY key
+                    ) totals
+                ),
+                checkpoint_movement_date = %s,
+                checkpoint_movement_id = %s::uuid,
+                status = %s,
+                updated_at = NOW()
+            WHERE run_id = %s::uuid
+        """
+
+        write_conn = self._get_connection()
+        stream_conn = self._connect()
+        finished = True
+        chunks = 0
+        try:
+            with stream_conn.cursor(name=f"compliance_audit_{run_id.replace('-', '')[:16]}") as stream:
+                stream.itersize = chunk_size
+                stream.execute(query, tuple(params))
+
+                while True:
+                    rows = stream.fetchmany(chunk_size)
+                    if not rows:
+                        break
+
+                    findings, counts = evaluate_chunk(rows, rules)
+                    by_code: Dict[str, int] = {}
+                    for finding in findings:
+                        by_code[finding["finding_code"]] = by_code.get(finding["finding_code"], 0) + 1
+
+                    last = rows[-1]
+                    try:
+                        with write_conn.cursor() as cur:
+                            if findings:
+                                cur.executemany(insert_finding, [
+                                    (
+                                        run_id, f["movement_id"], f["movement_type"],
+                                        f["movement_date"], f["finding_code"],
+                                        f["severity"], f["required_role"], f["message"],
+                                    )
+                                    for f in findings
+                                ])
+                            cur.execute(update_run, (
+                                counts["total"], counts["compliant"],
+                                counts["non_compliant"], counts["warnings"],
+                                json.dumps(by_code),
+                                last["movement_date"], str(last["movement_id"]),
+                                "RUNNING", run_id,
+                            ))
+                        write_conn.commit()
+                    except Exception:
+                        write_conn.rollback()
+                        raise
+
+                    chunks += 1
+                    if time.monotonic() - started >= max_seconds:
+                        finished = False
+                        break
+        finally:
+            stream_conn.close()
+
+        if finished:
+            self._execute_write(
+                """
+                UPDATE sga.compliance_audit_runs
+                SET status = 'COMPLETED', completed_at = NOW(), updated_at = NOW()
+                WHERE run_id = %s::uuid
+                """,
+                (run_id,)
+            )
+
+        logger.info(
+            f"Compliance audit {run_id}: {chunks} chunk(s) in "
+            f"{time.monotonic() - started:.1f}s (finished={finished})"
+        )
+
+        run = self._execute_query(
+            "SELECT * FROM sga.compliance_audit_runs WHERE run_id = %s::uuid",
+            (run_id,)
+        )[0]
+        return self._compliance_audit_summary(run, sample_limit)
+
+    def _compliance_audit_summary(
+        self,
+        run: Dict[str, Any],
+        sample_limit: int
+    ) -> Dict[str, Any]:
+        """
+        Build the response for a compliance audit run.
+
+        Args:
+            run: Row from sga.compliance_audit_runs
+            sample_limit: Findings to include (non-compliant first)
+
+        Returns:
+            Run summary dictionary
+        """
+        findings = self._execute_query(
+            """
+            SELECT movement_id, movement_type, movement_date, finding_code,
+                   severity, required_role, message
+            FROM sga.compliance_audit_findings
+            WHERE run_id = %s::uuid
+            ORDER BY (severity = 'non_compliant') DESC, movement_date
+            LIMIT %s
+            """,
+            (str(run["run_id"]), sample_limit)
+        )
+
+        return {
+            "success": True,
+            "run_id": str(run["run_id"]),
+            "status": run["status"],
+            "has_more": run["status"] != "COMPLETED",
+            "rules_version": run["rules_version"],
+            "audit_period": {
+                "start": run["period_start"],
+                "end": run["period_end"],
+            },
+            "scope": {
+                "location_id": run["location_code"] or "ALL",
+                "project_id": run["project_code"] or "ALL",
+            },
+            "summary": {
+                "total_operations": run["total_operations"],
+                "compliant": run["compliant"],
+                "non_compliant": run["non_compliant"],
+                "warnings": run["warnings"],
+            },
+            "findings_by_code": run["findings_by_code"] or {},
+            "findings": findings,
+            "checkpoint": {
+                "movement_date": run["checkpoint_movement_date"],
+                "movement_id": str(run["checkpoint_movement_id"]) if run["checkpoint_movement_id"] else None,
+            },
+        }
+
     # =========================================================================
     # Schema Introspection Methods (for Schema-Aware NEXO Import)
     # =========================================================================
@@ -24,6 +24,8 @@ import logging
 import os
 from typing import Any, Dict, List, Optional
 from datetime import datetime, date
+from decimal import Decimal
+from uuid import UUID
 
 # Configure logging
 log_level = os.environ.get("LOG_LEVEL", "INFO")
@@ -97,7 +99,18 @@ def handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
             "sga_get_movements": handle_get_movements,
             "sga_get_pending_tasks": handle_get_pending_tasks,
             "sga_create_movement": handle_create_movement,
+            "sga_transfer_assets": handle_transfer_assets,
+            # Inventory campaigns (set-based generation)
+            "sga_get_balances_by_locations": handle_get_balances_by_locations,
+            "sga_get_serials_for_balances": handle_get_serials_for_balances,
+            # Expeditions (batched stock reads, transactional reservations)
+            "sga_get_expedition_stock": handle_get_expedition_stock,
+            "sga_create_reservations": handle_create_reservations,
+            "sga_complete_expedition": handle_complete_expedition,
             "sga_reconcile_sap": handle_reconcile_sap,
+            # Compliance audit (streaming, resumable)
+            "sga_start_compliance_audit": handle_start_compliance_audit,
+            "sga_audit_compliance": handle_audit_compliance,
             # Schema introspection (for NEXO Import schema-aware validation)
             "sga_get_schema_metadata": handle_get_schema_metadata,
             "sga_get_table_columns": handle_get_table_columns,
@@ -151,6 +164,10 @@ def json_serializer(obj):
     """JSON serializer for objects not serializable by default."""
     if isinstance(obj, (datetime, date)):
         return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return int(obj) if obj == obj.to_integral_value() else float(obj)
+    if isinstance(obj, UUID):
+        return str(obj)
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
@@ -168,7 +185,10 @@ def handle_list_inventory(arguments: Dict[str, Any]) -> Dict[str, Any]:
         part_number: Filter by part number
         status: Filter by asset status
         limit: Max results (default 100)
-        offset: Pagination offset
+        offset: Pagination offset (offset mode, exact total)
+        cursor: Opaque cursor from next_cursor (keyset mode)
+        pagination: offset (default) or keyset
+        total_mode: Keyset total: none, estimate or cached
     """
     from postgres_client import SGAPostgresClient
 
@@ -186,7 +206,14 @@ def handle_list_inventory(arguments: Dict[str, Any]) -> Dict[str, Any]:
     limit = arguments.get("limit", 100)
     offset = arguments.get("offset", 0)
 
-    return client.list_inventory(filters=filters, limit=limit, offset=offset)
+    return client.list_inventory(
+        filters=filters,
+        limit=limit,
+        offset=offset,
+        cursor=arguments.get("cursor"),
+        pagination=arguments.get("pagination", "offset"),
+        total_mode=arguments.get("total_mode", "none")
+    )
 
 
 def handle_get_balance(arguments: Dict[str, Any]) -> Dict[str, Any]:
@@ -221,6 +248,7 @@ def handle_search_assets(arguments: Dict[str, Any]) -> Dict[str, Any]:
         query: Search term (required)
         search_type: Type of search (serial, part_number, description, all)
         limit: Max results
+        mode: contains (default), prefix, or ranked (results with score)
     """
     from postgres_client import SGAPostgresClient
 
@@ -233,7 +261,8 @@ def handle_search_assets(arguments: Dict[str, Any]) -> Dict[str, Any]:
     return client.search_assets(
         query=query,
         search_type=arguments.get("search_type", "all"),
-        limit=arguments.get("limit", 50)
+        limit=arguments.get("limit", 50),
+        mode=arguments.get("mode", "contains")
     )
 
 
@@ -272,6 +301,8 @@ def handle_get_movements(arguments: Dict[str, Any]) -> Dict[str, Any]:
         project_id: Filter by project
         location_id: Filter by location
         limit: Max results
+        cursor: Opaque cursor from next_cursor
+        total_mode: none, estimate or cached
     """
     from postgres_client import SGAPostgresClient
 
@@ -289,7 +320,9 @@ def handle_get_movements(arguments: Dict[str, Any]) -> Dict[str, Any]:
 
     return client.get_movements(
         filters=filters,
-        limit=arguments.get("limit", 100)
+        limit=arguments.get("limit", 100),
+        cursor=arguments.get("cursor"),
+        total_mode=arguments.get("total_mode", "none")
     )
 
 
@@ -361,25 +394,287 @@ def handle_create_movement(arguments: Dict[str, Any]) -> Dict[str, Any]:
     )
 
 
+def handle_transfer_assets(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Move serialized assets between locations in one transaction.
+
+    Args:
+        part_number: Part number (required)
+        source_location_id: Source location (required)
+        destination_location_id: Destination location (required)
+        serial_numbers: Serials to move (required)
+        project_id: Project
+        reason: Reason for movement
+        requested_by: User ID for audit trail
+    """
+    from postgres_client import SGAPostgresClient
+
+    required = ["part_number", "source_location_id", "destination_location_id", "serial_numbers"]
+    for field in required:
+        if not arguments.get(field):
+            return {"error": f"{field} is required"}
+
+    client = SGAPostgresClient()
+
+    return client.transfer_assets(
+        part_number=arguments["part_number"],
+        source_location_id=arguments["source_location_id"],
+        destination_location_id=arguments["destination_location_id"],
+        serial_numbers=arguments["serial_numbers"],
+        project_id=arguments.get("project_id"),
+        reason=arguments.get("reason"),
+        requested_by=arguments.get("requested_by", "mcp_lambda")
+    )
+
+
+def handle_get_balances_by_locations(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the balances of many locations with one query.
+
+    Args:
+        location_ids: Location codes (required)
+        part_numbers: Part number filter
+        project_ids: Project code filter
+    """
+    from postgres_client import SGAPostgresClient
+
+    if not arguments.get("location_ids"):
+        return {"error": "location_ids is required"}
+
+    client = SGAPostgresClient()
+
+    balances = client.get_balances_by_locations(
+        location_ids=arguments["location_ids"],
+        part_numbers=arguments.get("part_numbers"),
+        project_ids=arguments.get("project_ids")
+    )
+    return {"balances": balances, "count": len(balances)}
+
+
+def handle_get_serials_for_balances(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Get the countable serials of many (part_number, location) pairs.
+
+    Args:
+        keys: List of {part_number, location_id} (required)
+    """
+    from postgres_client import SGAPostgresClient
+
+    keys = arguments.get("keys")
+    if not keys:
+        return {"error": "keys is required"}
+
+    client = SGAPostgresClient()
+
+    rows = client.get_serials_for_balances(
+        [(key.get("part_number"), key.get("location_id")) for key in keys]
+    )
+    return {"serials": rows, "count": len(rows)}
+
+
+def handle_get_expedition_stock(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Read the stock of a whole expedition with one query per kind.
+
+    Args:
+        part_numbers: Part numbers of the lines (required)
+        serial_numbers: Serials of the serialized lines
+        location_id: Location of the non-serialized balances
+        project_id: Project of the expedition
+    """
+    from postgres_client import SGAPostgresClient
+
+    if not arguments.get("part_numbers"):
+        return {"error": "part_numbers is required"}
+
+    client = SGAPostgresClient()
+
+    return client.get_expedition_stock(
+        part_numbers=arguments["part_numbers"],
+        serial_numbers=arguments.get("serial_numbers"),
+        location_id=arguments.get("location_id"),
+        project_id=arguments.get("project_id")
+    )
+
+
+def handle_create_reservations(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reserve every line of an expedition in one transaction.
+
+    Args:
+        expedition_id: Expedition ID (required)
+        reservations: Lines [{part_number, quantity, location_id,
+            serial_number}] (required)
+        project_id: Project of the non-serialized lines
+        reserved_by: User ID for audit trail
+        ttl_hours: Hours until the reservations expire
+    """
+    from postgres_client import SGAPostgresClient, EXPEDITION_RESERVATION_TTL_HOURS
+
+    for field in ["expedition_id", "reservations"]:
+        if not arguments.get(field):
+            return {"error": f"{field} is required"}
+
+    client = SGAPostgresClient()
+
+    return client.create_reservations(
+        expedition_id=arguments["expedition_id"],
+        reservations=arguments["reservations"],
+        project_id=arguments.get("project_id"),
+        reserved_by=arguments.get("reserved_by", "mcp_lambda"),
+        ttl_hours=arguments.get("ttl_hours", EXPEDITION_RESERVATION_TTL_HOURS)
+    )
+
+
+def handle_complete_expedition(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ship every reserved line of an expedition in one transaction.
+
+    Args:
+        expedition_id: Expedition ID (required)
+        nf_number: NF number (required)
+        nf_key: NF access key
+        carrier: Carrier name
+        tracking_code: Tracking number
+        destination: Destination client
+        completed_by: User ID for audit trail
+    """
+    from postgres_client import SGAPostgresClient
+
+    for field in ["expedition_id", "nf_number"]:
+        if not arguments.get(field):
+            return {"error": f"{field} is required"}
+
+    client = SGAPostgresClient()
+
+    return client.complete_expedition(
+        expedition_id=arguments["expedition_id"],
+        nf_number=arguments["nf_number"],
+        nf_key=arguments.get("nf_key"),
+        carrier=arguments.get("carrier"),
+        tracking_code=arguments.get("tracking_code"),
+        destination=arguments.get("destination"),
+        completed_by=arguments.get("completed_by", "mcp_lambda")
+    )
+
+
 def handle_reconcile_sap(arguments: Dict[str, Any]) -> Dict[str, Any]:
     """
     Compare SGA inventory with SAP export data.
 
     Args:
-        sap_data: List of SAP items to compare (required)
+        sap_data: List of SAP items to compare (or s3_uri / run_id)
         include_serials: Include serial number comparison
+        mode: full (in memory, every row) or set (summary + paged lines)
+        s3_uri: SAP CSV export in S3 (s3://bucket/key), implies set mode
+        csv_delimiter: CSV delimiter (default ",")
+        csv_encoding: CSV encoding (default UTF8)
+        run_id: Existing set-mode run to page through
+        category: discrepancy, sap_only or sga_only
+        cursor: Opaque cursor from next_cursor
+        limit: Lines per page (default 500)
+        requested_by: User ID for audit trail
     """
     from postgres_client import SGAPostgresClient
 
-    client = SGAPostgresClient()
-
     sap_data = arguments.get("sap_data")
-    if not sap_data:
-        return {"error": "sap_data is required"}
+    if not sap_data and not arguments.get("s3_uri") and not arguments.get("run_id"):
+        return {"error": "sap_data, s3_uri or run_id is required"}
+
+    client = SGAPostgresClient()
 
     return client.reconcile_with_sap(
         sap_data=sap_data,
-        include_serials=arguments.get("include_serials", False)
+        include_serials=arguments.get("include_serials", False),
+        mode=arguments.get("mode", "full"),
+        s3_uri=arguments.get("s3_uri"),
+        csv_delimiter=arguments.get("csv_delimiter", ","),
+        csv_encoding=arguments.get("csv_encoding", "UTF8"),
+        run_id=arguments.get("run_id"),
+        category=arguments.get("category"),
+        cursor=arguments.get("cursor"),
+        limit=min(arguments.get("limit", 500), 5000),
+        requested_by=arguments.get("requested_by", "system")
+    )
+
+
+# Upper bound for one audit invocation: the Lambda and the Gateway HTTP call
+# both time out after 30s, and a chunk started before the deadline must
+# still commit
+MAX_AUDIT_SECONDS = 20.0
+
+
+def handle_start_compliance_audit(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Create a compliance audit run (no movement is evaluated).
+
+    Returns the run_id to pass to sga_audit_compliance, so the caller can
+    resume the run even if the first audit invocation fails.
+
+    Args:
+        rules_version: Version of the compiled rules (required)
+        start_date: Period start (YYYY-MM-DD)
+        end_date: Period end (YYYY-MM-DD)
+        location_id: Location code scope
+        project_id: Project code scope
+        requested_by: User ID for audit trail
+    """
+    from postgres_client import SGAPostgresClient
+
+    rules_version = arguments.get("rules_version")
+    if not rules_version:
+        return {"error": "rules_version is required"}
+
+    run = SGAPostgresClient().create_compliance_audit_run(
+        rules_version=rules_version,
+        start_date=arguments.get("start_date"),
+        end_date=arguments.get("end_date"),
+        location_id=arguments.get("location_id"),
+        project_id=arguments.get("project_id"),
+        requested_by=arguments.get("requested_by", "system"),
+    )
+    return {"success": True, "run_id": str(run["run_id"]), "status": run["status"]}
+
+
+def handle_audit_compliance(arguments: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Audit historical movements against compiled compliance rules.
+
+    Streams movements with a server-side cursor and commits findings per
+    chunk. Runs longer than max_seconds return status RUNNING and are
+    resumed by calling again with the returned run_id.
+
+    Args:
+        rules: Compiled rules from the ComplianceAgent (required)
+        start_date: Period start (YYYY-MM-DD)
+        end_date: Period end (YYYY-MM-DD)
+        location_id: Location code scope
+        project_id: Project code scope
+        run_id: Run to resume
+        requested_by: User ID for audit trail
+        chunk_size: Movements per chunk (default 5000)
+        max_seconds: Time budget for this invocation (default and maximum 20)
+        sample_limit: Findings returned (default 50)
+    """
+    from postgres_client import SGAPostgresClient
+
+    client = SGAPostgresClient()
+
+    rules = arguments.get("rules")
+    if not rules or "by_type" not in rules:
+        return {"error": "rules is required"}
+
+    return client.run_compliance_audit(
+        rules=rules,
+        start_date=arguments.get("start_date"),
+        end_date=arguments.get("end_date"),
+        location_id=arguments.get("location_id"),
+        project_id=arguments.get("project_id"),
+        run_id=arguments.get("run_id"),
+        requested_by=arguments.get("requested_by", "system"),
+        chunk_size=min(int(arguments.get("chunk_size", 5000)), 20000),
+        max_seconds=min(float(arguments.get("max_seconds", MAX_AUDIT_SECONDS)), MAX_AUDIT_SECONDS),
+        sample_limit=min(int(arguments.get("sample_limit", 50)), 500),
     )
 
 
@@ -0,0 +1,292 @@
+# =============================================================================
+# SAP Reconciliation Helpers - SGA Inventory Module
+# =============================================================================
+# Set-based reconciliation of SGA balances against a SAP stock export
+# (SGAPostgresClient.reconcile_with_sap, mode "set").
+#
+# Design:
+# - The SAP export is COPYed into a session temp table (sap_import) with
+#   one text column per input column (col_0 .. col_n). Rows come either
+#   from the inline sap_data list or are streamed from a CSV object in S3,
+#   so the Lambda never holds the whole export in memory.
+# - One FULL OUTER JOIN of the aggregated export against aggregated
+#   balances classifies every (part_number, location) key. Only the
+#   non-matching keys are stored (sga.sap_reconciliation_lines) and are
+#   read back in keyset pages; matches are only counted.
+#
+# This module is pure Python (no AWS/DB imports) and is bundled with the
+# PostgreSQL tools Lambda alongside postgres_client.py.
+#
+# Author: Faiston NEXO Team
+# Updated: October 2026 - Set-based SAP reconciliation
+# =============================================================================
+
+import csv
+import re
+import unicodedata
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# =============================================================================
+# Constants
+# =============================================================================
+
+RECONCILIATION_MODES = ("full", "set")
+
+# Categories stored per run (matches are only counted)
+LINE_CATEGORIES = ("discrepancy", "sap_only", "sga_only")
+
+# Accepted CSV header names (normalized: lowercase, no accents, "_" separators)
+COLUMN_ALIASES = {
+    "part_number": ("part_number", "pn", "material", "codigo_material", "cod_material"),
+    "quantity": ("quantity", "qty", "quantidade", "qtd", "estoque", "saldo"),
+    "location_code": ("location_code", "location", "local", "deposito", "localizacao"),
+    "project_code": ("project_code", "project", "projeto"),
+}
+
+# Column layout used when rows come from the inline sap_data list
+INLINE_COLUMNS = {"part_number": 0, "location_code": 1, "project_code": 2, "quantity": 3}
+
+# Quantities that can be summed; other rows are counted as invalid
+QUANTITY_PATTERN = r"^-?[0-9]+(\.[0-9]+)?$"
+
+_ENCODING_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,32}$")
+
+
+# =============================================================================
+# Input Helpers
+# =============================================================================
+
+
+def normalize_header(name: str) -> str:
+    """Lowercase, strip accents and separators of a CSV header cell."""
+    text = unicodedata.normalize("NFKD", name.strip().lstrip("\ufeff"))
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    return re.sub(r"[^a-z0-9]+", "_", text).strip("_")
+
+
+def map_csv_header(header: List[str]) -> Dict[str, int]:
+    """
+    Map reconciliation fields to CSV column positions.
+
+    Returns:
+        {field: column index} for the fields present in the header
+
+    Raises:
+        ValueError: part_number or quantity column missing
+    """
+    normalized = [normalize_header(cell) for cell in header]
+    columns: Dict[str, int] = {}
+    for field, aliases in COLUMN_ALIASES.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[field] = normalized.index(alias)
+                break
+
+    missing = [f for f in ("part_number", "quantity") if f not in columns]
+    if missing:
+        raise ValueError(f"SAP CSV header missing column(s): {', '.join(missing)}")
+    return columns
+
+
+def parse_s3_uri(uri: str) -> Tuple[str, str]:
+    """Split s3://bucket/key into (bucket, key)."""
+    match = re.match(r"^s3://([^/]+)/(.+)$", uri or "")
+    if not match:
+        raise ValueError(f"Invalid S3 URI: {uri}")
+    return match.group(1), match.group(2)
+
+
+def split_header(chunks: Iterable[bytes]) -> Tuple[bytes, Iterator[bytes]]:
+    """
+    Separate the header line from a stream of CSV byte chunks.
+
+    Returns:
+        (header line without line break, iterator over the remaining bytes)
+    """
+    iterator = iter(chunks)
+    buffered = b""
+    for chunk in iterator:
+        buffered += chunk
+        if b"\n" in buffered:
+            break
+
+    header, _, rest = buffered.partition(b"\n")
+
+    def remaining() -> Iterator[bytes]:
+        if rest:
+            yield rest
+        yield from iterator
+
+    return header.rstrip(b"\r"), remaining()
+
+
+def parse_header_line(line: bytes, delimiter: str, encoding: str) -> List[str]:
+    """Decode and split the CSV header line."""
+    python_encoding = {"UTF8": "utf-8", "LATIN1": "latin-1", "WIN1252": "cp1252"}.get(
+        encoding.upper(), encoding
+    )
+    text = line.decode(python_encoding)
+    return next(csv.reader([text], delimiter=delimiter), [])
+
+
+def copy_options(delimiter: str, encoding: str) -> str:
+    """
+    COPY ... WITH (...) options for a CSV export.
+
+    Raises:
+        ValueError: delimiter is not a single character or encoding is invalid
+    """
+    if len(delimiter) != 1 or delimiter in ("\r", "\n"):
+        raise ValueError("csv_delimiter must be a single character")
+    if not _ENCODING_PATTERN.match(encoding):
+        raise ValueError(f"Invalid csv_encoding: {encoding}")
+    return f"FORMAT csv, DELIMITER '{delimiter.replace(chr(39), chr(39) * 2)}', ENCODING '{encoding}'"
+
+
+def inline_rows(sap_data: Iterable[Dict]) -> Iterator[Tuple[Optional[str], ...]]:
+    """Rows of the inline sap_data list in INLINE_COLUMNS order."""
+    for item in sap_data:
+        quantity = item.get("quantity")
+        yield (
+            item.get("part_number"),
+            item.get("location_code"),
+            item.get("project_code"),
+            None if quantity is None else str(quantity),
+        )
+
+
+# =============================================================================
+# SQL
+# =============================================================================
+
+
+def staging_table_sql(column_count: int) -> str:
+    """CREATE TEMP TABLE for the raw export (dropped at commit)."""
+    columns = ", ".join(f"col_{i} TEXT" for i in range(column_count))
+    return f"CREATE TEMP TABLE sap_import ({columns}) ON COMMIT DROP"
+
+
+def _field(columns: Dict[str, int], name: str) -> Optional[str]:
+    index = columns.get(name)
+    return None if index is None else f"trim(col_{index})"
+
+
+def row_counts_sql(columns: Dict[str, int]) -> str:
+    """Total and invalid (no part number / non-numeric quantity) rows of sap_import."""
+    part_number = _field(columns, "part_number")
+    quantity = _field(columns, "quantity")
+    return f"""
+        SELECT
+            COUNT(*) AS total_rows,
+            COUNT(*) FILTER (
+                WHERE NULLIF({part_number}, '') IS NULL
+                   OR {quantity} IS NULL
+                   OR {quantity} !~ '{QUANTITY_PATTERN}'
+            ) AS invalid_rows
+        FROM sap_import
+    """
+
+
+def reconcile_sql(columns: Dict[str, int]) -> str:
+    """
+    Classify keys with one FULL OUTER JOIN and store the non-matching ones.
+
+    Keys are (part_number, location_code); without a location column in the
+    export, part numbers are compared across all locations. Stored lines are
+    numbered by absolute variance (largest first) for keyset paging.
+
+    Parameters: %(run_id)s
+
+    Returns rows: (category, keys, sap_quantity, sga_quantity)
+    """
+    part_number = _field(columns, "part_number")
+    quantity = _field(columns, "quantity")
+    location = _field(columns, "location_code")
+
+    sap_location = f"COALESCE({location}, '')" if location else "''"
+    sga_location = "l.location_code" if location else "''"
+
+    return f"""
+        WITH sap AS (
+            SELECT
+                {part_number} AS part_number,
+                {sap_location} AS location_key,
+                SUM({quantity}::NUMERIC) AS quantity
+            FROM sap_import
+            WHERE NULLIF({part_number}, '') IS NOT NULL
+              AND {quantity} ~ '{QUANTITY_PATTERN}'
+            GROUP BY 1, 2
+        ),
+        sga_balances AS (
+            SELECT
+                pn.part_number,
+                {sga_location} AS location_key,
+                SUM(b.quantity_total)::NUMERIC AS quantity
+            FROM sga.balances b
+            JOIN sga.part_numbers pn ON b.part_number_id = pn.part_number_id
+            JOIN sga.locations l ON b.location_id = l.location_id
+            GROUP BY 1, 2
+        ),
+        joined AS (
+            SELECT
+                COALESCE(sap.part_number, s.part_number) AS part_number,
+                COALESCE(sap.location_key, s.location_key) AS location_key,
+                COALESCE(sap.quantity, 0) AS sap_quantity,
+                COALESCE(s.quantity, 0) AS sga_quantity,
+                CASE
+                    WHEN sap.part_number IS NULL THEN 'sga_only'
+                    WHEN COALESCE(sap.quantity, 0) = COALESCE(s.quantity, 0) THEN 'match'
+                    WHEN s.part_number IS NULL THEN 'sap_only'
+                    ELSE 'discrepancy'
+                END AS category
+            FROM sap
+            FULL OUTER JOIN sga_balances s
+                ON s.part_number = sap.part_number
+               AND s.location_key = sap.location_key
+        ),
+        stored AS (
+            INSERT INTO sga.sap_reconciliation_lines (
+                run_id, line_no, category, part_number, location_code,
+                sap_quantity, sga_quantity, variance
+            )
+            SELECT
+                %(run_id)s::uuid,
+                ROW_NUMBER() OVER (
+                    ORDER BY ABS(sga_quantity - sap_quantity) DESC, part_number, location_key
+                ),
+                category,
+                part_number,
+                NULLIF(location_key, ''),
+                sap_quantity,
+                sga_quantity,
+                sga_quantity - sap_quantity
+            FROM joined
+            WHERE category <> 'match'
+        )
+        SELECT
+            category,
+            COUNT(*) AS keys,
+            SUM(sap_quantity) AS sap_quantity,
+            SUM(sga_quantity) AS sga_quantity
+        FROM joined
+        GROUP BY category
+    """
+
+
+def summarize(category_rows: List[Dict]) -> Dict[str, int]:
+    """Per-category key counts from the reconcile_sql result."""
+    counts = {row["category"]: int(row["keys"]) for row in category_rows}
+    return {
+        "matches_count": counts.get("match", 0),
+        "discrepancies_count": counts.get("discrepancy", 0),
+        "sap_only_count": counts.get("sap_only", 0),
+        "sga_only_count": counts.get("sga_only", 0),
+    }
+
+
+def accuracy_percentage(summary: Dict[str, int]) -> float:
+    """Share of SAP keys whose quantity matches SGA."""
+    sap_keys = summary["matches_count"] + summary["discrepancies_count"] + summary["sap_only_count"]
+    if not sap_keys:
+        return 100
+    return round(summary["matches_count"] / sap_keys * 100, 2)
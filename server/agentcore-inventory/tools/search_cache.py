@@ -0,0 +1,339 @@
+# =============================================================================
+# Search Result Cache and Quota Rate Limiter for Tavily
+# =============================================================================
+# Equipment enrichment repeats the same (manufacturer, part number, doc type)
+# searches across imports, and every Tavily search spends API credits.
+#
+# SearchResultCache - two tiers, keyed by normalized query + domain filters
+# + result-shaping options:
+#   1. Local SQLite file (per container, survives adapter re-creation)
+#   2. S3 JSON objects (shared by all containers), promoted to SQLite on hit
+#   Entries older than the freshness window are ignored (and overwritten).
+#
+# QuotaRateLimiter - process-wide token bucket (requests/second with burst)
+# plus a daily credit budget (basic search = 1 credit, advanced = 2).
+# 429 responses pause the bucket; 432 (plan limit) exhausts the budget.
+#
+# Environment:
+#   TAVILY_CACHE_TTL_HOURS       freshness window (default 168 = 7 days)
+#   TAVILY_CACHE_PATH            SQLite file (default /tmp/tavily_search_cache.sqlite3)
+#   TAVILY_CACHE_BUCKET          S3 tier bucket (default DOCUMENTS_BUCKET; "" disables)
+#   TAVILY_RATE_PER_SECOND       sustained search rate (default 2)
+#   TAVILY_RATE_BURST            bucket size (default 5)
+#   TAVILY_DAILY_CREDIT_BUDGET   credits per UTC day (default 0 = unlimited)
+#
+# NOTE: The S3 tier lives in the documents bucket, NOT the equipment docs
+#       bucket - that one is indexed by the Bedrock Knowledge Base.
+# =============================================================================
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL_HOURS = float(os.environ.get("TAVILY_CACHE_TTL_HOURS", "168"))
+CACHE_PATH = os.environ.get("TAVILY_CACHE_PATH", "/tmp/tavily_search_cache.sqlite3")
+CACHE_S3_PREFIX = "cache/tavily-search/"
+
+RATE_PER_SECOND = float(os.environ.get("TAVILY_RATE_PER_SECOND", "2"))
+RATE_BURST = int(os.environ.get("TAVILY_RATE_BURST", "5"))
+DAILY_CREDIT_BUDGET = int(os.environ.get("TAVILY_DAILY_CREDIT_BUDGET", "0"))
+
+# Longest a search waits for a rate-limit token before giving up
+MAX_WAIT_SECONDS = 30.0
+# Pause after a 429 from Tavily
+RATE_LIMITED_PAUSE_SECONDS = 30.0
+
+
+def _default_bucket() -> Optional[str]:
+    bucket = os.environ.get("TAVILY_CACHE_BUCKET")
+    if bucket is None:
+        bucket = os.environ.get("DOCUMENTS_BUCKET", "faiston-one-sga-documents-prod")
+    return bucket or None
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase and collapse whitespace."""
+    return " ".join(query.lower().split())
+
+
+def cache_key(query: str, include_domains: Optional[List[str]] = None, **options: Any) -> str:
+    """
+    Cache key for a search.
+
+    Args:
+        query: Search query (normalized here)
+        include_domains: Domain filter (order-insensitive)
+        **options: Other arguments that change results (depth, max_results, ...)
+
+    Returns:
+        Hex SHA-256 of the canonical request
+    """
+    canonical = {
+        "query": normalize_query(query),
+        "include_domains": sorted(d.lower() for d in include_domains or []),
+        **{k: v for k, v in sorted(options.items()) if v is not None},
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode()).hexdigest()
+
+
+class SearchResultCache:
+    """
+    SQLite + S3 cache of search results (lists of JSON-serializable dicts).
+
+    Example:
+        cache = SearchResultCache()
+        key = cache_key("Cisco C9200 datasheet", ["cisco.com"], search_depth="advanced")
+        results = cache.get(key)
+        if results is None:
+            results = do_search()
+            cache.put(key, results)
+    """
+
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        bucket: Optional[str] = None,
+        ttl_hours: float = CACHE_TTL_HOURS,
+        s3_client: Any = None,
+    ):
+        self.path = path
+        self.bucket = bucket if bucket is not None else _default_bucket()
+        self.ttl_seconds = ttl_hours * 3600
+        self._s3 = s3_client
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.stats = {"local_hits": 0, "s3_hits": 0, "misses": 0, "stores": 0}
+
+    # -------------------------------------------------------------------------
+    # Tiers
+    # -------------------------------------------------------------------------
+
+    def _db(self) -> Optional[sqlite3.Connection]:
+        if self._conn is None:
+            try:
+                conn = sqlite3.connect(self.path, timeout=5, check_same_thread=False)
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS search_cache ("
+                    " key TEXT PRIMARY KEY, stored_at REAL NOT NULL, results TEXT NOT NULL)"
+                )
+                conn.commit()
+                self._conn = conn
+            except sqlite3.Error as e:
+                logger.warning(f"[SearchResultCache] SQLite tier disabled: {e}")
+                self.path = None
+        return self._conn
+
+    def _s3_client(self):
+        if self._s3 is None:
+            from tools.s3_client import _get_s3_client
+            self._s3 = _get_s3_client()
+        return self._s3
+
+    def _fresh(self, stored_at: float) -> bool:
+        return time.time() - stored_at < self.ttl_seconds
+
+    def _get_local(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        if not self.path:
+            return None
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return None
+            row = db.execute(
+                "SELECT stored_at, results FROM search_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row and self._fresh(row[0]):
+            return json.loads(row[1])
+        return None
+
+    def _put_local(self, key: str, stored_at: float, results: List[Dict[str, Any]]) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            db = self._db()
+            if db is None:
+                return
+            db.execute(
+                "INSERT OR REPLACE INTO search_cache (key, stored_at, results) VALUES (?, ?, ?)",
+                (key, stored_at, json.dumps(results)),
+            )
+            db.commit()
+
+    def _get_s3(self, key: str) -> Optional[Dict[str, Any]]:
+        if not self.bucket:
+            return None
+        try:
+            response = self._s3_client().get_object(
+                Bucket=self.bucket, Key=f"{CACHE_S3_PREFIX}{key}.json"
+            )
+            entry = json.loads(response["Body"].read())
+        except Exception as e:
+            code = getattr(e, "response", {}).get("Error", {}).get("Code")
+            if code not in ("NoSuchKey", "404"):
+                logger.warning(f"[SearchResultCache] S3 read failed: {e}")
+            return None
+        return entry if self._fresh(entry.get("stored_at", 0)) else None
+
+    def _put_s3(self, key: str, entry: Dict[str, Any]) -> None:
+        if not self.bucket:
+            return
+        try:
+            self._s3_client().put_object(
+                Bucket=self.bucket,
+                Key=f"{CACHE_S3_PREFIX}{key}.json",
+                Body=json.dumps(entry).encode(),
+                ContentType="application/json",
+            )
+        except Exception as e:
+            logger.warning(f"[SearchResultCache] S3 write failed: {e}")
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Fresh results for key, or None."""
+        results = self._get_local(key)
+        if results is not None:
+            self.stats["local_hits"] += 1
+            return results
+
+        entry = self._get_s3(key)
+        if entry is not None:
+            self.stats["s3_hits"] += 1
+            self._put_local(key, entry["stored_at"], entry["results"])
+            return entry["results"]
+
+        self.stats["misses"] += 1
+        return None
+
+    def put(self, key: str, results: List[Dict[str, Any]]) -> None:
+        """Store results in both tiers."""
+        stored_at = time.time()
+        self._put_local(key, stored_at, results)
+        self._put_s3(key, {"stored_at": stored_at, "results": results})
+        self.stats["stores"] += 1
+
+
+class QuotaRateLimiter:
+    """
+    Token bucket plus daily credit budget, shared by all Tavily adapters.
+
+    Example:
+        limiter = get_rate_limiter()
+        if limiter.acquire(credits=2):
+            ...  # call Tavily
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = RATE_PER_SECOND,
+        burst: int = RATE_BURST,
+        daily_credit_budget: int = DAILY_CREDIT_BUDGET,
+        max_wait_seconds: float = MAX_WAIT_SECONDS,
+    ):
+        self.rate = max(rate_per_second, 0.001)
+        self.burst = max(1, burst)
+        self.daily_credit_budget = daily_credit_budget
+        self.max_wait_seconds = max_wait_seconds
+
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._day = self._today()
+        self._credits_used = 0
+        self._exhausted = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+
+    def _roll_day(self) -> None:
+        today = self._today()
+        if today != self._day:
+            self._day, self._credits_used, self._exhausted = today, 0, False
+
+    def acquire(self, credits: int = 1) -> bool:
+        """
+        Wait for a request slot and charge credits.
+
+        Returns:
+            False if the daily budget is spent or no slot frees up within
+            max_wait_seconds (the caller should skip the search)
+        """
+        deadline = time.monotonic() + self.max_wait_seconds
+        while True:
+            with self._lock:
+                self._roll_day()
+                if self._exhausted or (
+                    self.daily_credit_budget
+                    and self._credits_used + credits > self.daily_credit_budget
+                ):
+                    return False
+
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    self._credits_used += credits
+                    return True
+                wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+
+            if time.monotonic() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def record_error(self, status_code: Optional[int]) -> None:
+        """React to Tavily limit responses (429 rate, 432 plan quota)."""
+        with self._lock:
+            if status_code == 429:
+                self._paused_until = time.monotonic() + RATE_LIMITED_PAUSE_SECONDS
+            elif status_code == 432:
+                self._exhausted = True
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._roll_day()
+            return {
+                "day": self._day,
+                "credits_used": self._credits_used,
+                "daily_credit_budget": self.daily_credit_budget,
+                "exhausted": self._exhausted,
+            }
+
+
+# =============================================================================
+# Process-wide Instances
+# =============================================================================
+
+_cache: Optional[SearchResultCache] = None
+_limiter: Optional[QuotaRateLimiter] = None
+_instances_lock = threading.Lock()
+
+
+def get_search_cache() -> SearchResultCache:
+    """Per-container search cache (singleton)."""
+    global _cache
+    with _instances_lock:
+        if _cache is None:
+            _cache = SearchResultCache()
+        return _cache
+
+
+def get_rate_limiter() -> QuotaRateLimiter:
+    """Per-container Tavily rate limiter (singleton)."""
+    global _limiter
+    with _instances_lock:
+        if _limiter is None:
+            _limiter = QuotaRateLimiter()
+        return _limiter
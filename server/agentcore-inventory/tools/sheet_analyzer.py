@@ -21,6 +21,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
+from tools.column_profiler import ColumnProfile, profile_column, profile_records, profile_rows
+
 logger = logging.getLogger(__name__)
 
 
@@ -61,6 +63,7 @@ class ColumnAnalysis:
     is_likely_key: bool         # Appears to be an ID/key column
     suggested_mapping: Optional[str] = None
     mapping_confidence: float = 0.0
+    sketch: Optional[Any] = field(default=None, repr=False, compare=False)  # ColumnSketch of all values
 
 
 @dataclass
@@ -87,6 +90,7 @@ class SheetRelationshipAnalysis:
     confidence: float
     join_columns: List[Tuple[str, str]]  # (sheet1_col, sheet2_col)
     description: str
+    evidence: str = "column_names"       # "column_names" or "value_overlap"
 
 
 @dataclass
@@ -297,44 +301,32 @@ def detect_data_type(values: List[Any]) -> str:
     Returns:
         "text", "number", "date", or "mixed"
     """
-    if not values:
-        return "text"
-
-    type_counts = {"text": 0, "number": 0, "date": 0, "empty": 0}
-
-    for val in values:
-        if val is None or str(val).strip() == "":
-            type_counts["empty"] += 1
-            continue
-
-        str_val = str(val).strip()
-
-        # Check if number
-        try:
-            float(str_val.replace(",", ".").replace(" ", ""))
-            type_counts["number"] += 1
-            continue
-        except ValueError:
-            pass
-
-        # Check if date-like (simple patterns)
-        if any(sep in str_val for sep in ["/", "-"]) and len(str_val) <= 20:
-            if any(c.isdigit() for c in str_val):
-                type_counts["date"] += 1
-                continue
+    return profile_column("", values).data_type(threshold=0.7, fallback="mixed")
 
-        type_counts["text"] += 1
 
-    # Determine predominant type
-    non_empty = sum(v for k, v in type_counts.items() if k != "empty")
-    if non_empty == 0:
-        return "text"
-
-    for dtype, count in type_counts.items():
-        if dtype != "empty" and count / non_empty > 0.7:
-            return dtype
-
-    return "mixed"
+def _column_analyses(
+    profiles: List[ColumnProfile],
+    sketches: Optional[List[Any]] = None,
+    type_threshold: float = 0.7,
+    type_fallback: str = "mixed",
+) -> List[ColumnAnalysis]:
+    """ColumnAnalysis (type, key-likelihood, mapping) for each column profile."""
+    columns = []
+    for col_idx, profile in enumerate(profiles):
+        mapping, confidence = detect_column_mapping(profile.name)
+        columns.append(ColumnAnalysis(
+            name=profile.name,
+            normalized_name=normalize_column_name(profile.name),
+            sample_values=profile.sample_values,
+            data_type=profile.data_type(type_threshold, type_fallback),
+            unique_count=profile.unique_count,
+            null_count=profile.null_count,
+            is_likely_key=profile.is_likely_key,
+            suggested_mapping=mapping,
+            mapping_confidence=confidence,
+            sketch=sketches[col_idx] if sketches else None,
+        ))
+    return columns
 
 
 # =============================================================================
@@ -410,23 +402,98 @@ def detect_sheet_relationships(
     """
     Detect relationships between sheets.
 
+    Pairs whose columns share values (from the column sketches) are related
+    by that overlap; the others fall back to shared column mappings.
+
     Args:
         sheets: List of analyzed sheets
 
     Returns:
         List of relationship analyses
     """
+    value_relationships = _detect_value_relationships(sheets)
     relationships = []
 
     for i, sheet1 in enumerate(sheets):
         for sheet2 in sheets[i + 1:]:
-            relationship = _analyze_sheet_pair(sheet1, sheet2)
+            relationship = value_relationships.get(frozenset((sheet1.name, sheet2.name)))
+            if relationship is None:
+                relationship = _analyze_sheet_pair(sheet1, sheet2)
             if relationship:
                 relationships.append(relationship)
 
     return relationships
 
 
+def _detect_value_relationships(
+    sheets: List[SheetAnalysis],
+) -> Dict[frozenset, SheetRelationshipAnalysis]:
+    """Relationships backed by value overlap, keyed by sheet-name pair."""
+    from tools.column_sketch import MIN_KEY_UNIQUENESS, find_value_overlaps
+
+    candidates = [
+        (sheet.name, column.name, column.sketch)
+        for sheet in sheets
+        if sheet.suggested_action != "skip"
+        for column in sheet.columns
+        if column.sketch is not None
+    ]
+    if not candidates:
+        return {}
+
+    sheets_by_name = {sheet.name: sheet for sheet in sheets}
+    relationships = {}
+
+    for overlap in find_value_overlaps(candidates):
+        parent = sheets_by_name[overlap.parent_sheet]
+        child = sheets_by_name[overlap.child_sheet]
+        parent_col = next(c for c in parent.columns if c.name == overlap.parent_column)
+        child_col = next(c for c in child.columns if c.name == overlap.child_column)
+
+        confidence = overlap.confidence
+        if parent_col.suggested_mapping and parent_col.suggested_mapping == child_col.suggested_mapping:
+            confidence = min(0.99, confidence + 0.05)
+
+        match_text = (
+            f"{overlap.containment:.0%} dos valores de '{child_col.name}' ({child.name}) "
+            f"existem em '{parent_col.name}' ({parent.name})"
+        )
+        if overlap.child_uniqueness >= MIN_KEY_UNIQUENESS:
+            relationship_type = SheetRelationship.COMPLEMENT
+            description = f"Abas '{parent.name}' e '{child.name}' têm registros correspondentes: {match_text}"
+        else:
+            relationship_type = SheetRelationship.ONE_TO_MANY
+            description = (
+                f"Cada registro de '{parent.name}' tem vários registros em '{child.name}': {match_text}"
+            )
+
+        relationships[frozenset((parent.name, child.name))] = SheetRelationshipAnalysis(
+            sheet1=parent.name,
+            sheet2=child.name,
+            relationship_type=relationship_type,
+            confidence=round(confidence, 2),
+            join_columns=[(parent_col.name, child_col.name)],
+            description=description,
+            evidence="value_overlap",
+        )
+
+    return relationships
+
+
+def _assign_merge_targets(
+    sheets: List[SheetAnalysis],
+    relationships: List[SheetRelationshipAnalysis],
+) -> None:
+    """Point detail sheets of one-to-many relationships at their master."""
+    sheets_by_name = {sheet.name: sheet for sheet in sheets}
+    for rel in relationships:
+        if rel.relationship_type == SheetRelationship.ONE_TO_MANY and rel.join_columns:
+            detail = sheets_by_name[rel.sheet2]
+            if detail.merge_target is None:
+                detail.merge_target = rel.sheet1
+                detail.suggested_action = "merge_with"
+
+
 def _analyze_sheet_pair(
     sheet1: SheetAnalysis,
     sheet2: SheetAnalysis,
@@ -596,6 +663,7 @@ def analyze_workbook(
     content: bytes,
     filename: str,
     max_sample_rows: int = 20,
+    sketch_columns: bool = True,
 ) -> WorkbookAnalysis:
     """
     Perform complete analysis of an XLSX workbook.
@@ -606,6 +674,8 @@ def analyze_workbook(
         content: Raw file content as bytes
         filename: Original filename
         max_sample_rows: Maximum rows to sample per sheet
+        sketch_columns: Sketch every column's values to detect relationships
+                        from value overlap (one extra pass over each cell)
 
     Returns:
         Complete WorkbookAnalysis with recommendations
@@ -645,7 +715,7 @@ def analyze_workbook(
         })
 
         ws = wb[sheet_name]
-        sheet_analysis = _analyze_sheet(ws, sheet_name, max_sample_rows)
+        sheet_analysis = _analyze_sheet(ws, sheet_name, max_sample_rows, sketch_columns)
         sheets_analysis.append(sheet_analysis)
         total_rows += sheet_analysis.row_count
 
@@ -667,6 +737,7 @@ def analyze_workbook(
     })
 
     relationships = detect_sheet_relationships(sheets_analysis)
+    _assign_merge_targets(sheets_analysis, relationships)
 
     for rel in relationships:
         reasoning_trace.append({
@@ -709,8 +780,9 @@ def _analyze_sheet(
     ws,
     sheet_name: str,
     max_sample_rows: int,
+    sketch_columns: bool = True,
 ) -> SheetAnalysis:
-    """Analyze a single worksheet."""
+    """Analyze a single worksheet (samples rows, sketches every value)."""
     rows_iter = ws.iter_rows(values_only=True)
 
     # Get headers
@@ -729,6 +801,7 @@ def _analyze_sheet(
         )
 
     headers = [str(h) if h else f"Column_{i}" for i, h in enumerate(headers_row)]
+    sketches = _new_column_sketches(len(headers), ws.max_row) if sketch_columns else []
 
     # Sample rows for analysis
     sample_rows = []
@@ -737,33 +810,10 @@ def _analyze_sheet(
         row_count += 1
         if len(sample_rows) < max_sample_rows:
             sample_rows.append(row)
+        for sketch, value in zip(sketches, row):
+            sketch.add(value)
 
-    # Analyze columns
-    columns = []
-    for col_idx, header in enumerate(headers):
-        col_values = [row[col_idx] if col_idx < len(row) else None for row in sample_rows]
-
-        # Detect mapping
-        mapping, confidence = detect_column_mapping(header)
-
-        # Detect data type
-        data_type = detect_data_type(col_values)
-
-        # Detect if likely key column
-        unique_vals = set(str(v) for v in col_values if v)
-        is_key = len(unique_vals) == len([v for v in col_values if v])
-
-        columns.append(ColumnAnalysis(
-            name=header,
-            normalized_name=normalize_column_name(header),
-            sample_values=[str(v) for v in col_values[:5] if v],
-            data_type=data_type,
-            unique_count=len(unique_vals),
-            null_count=sum(1 for v in col_values if not v),
-            is_likely_key=is_key and len(unique_vals) > 1,
-            suggested_mapping=mapping,
-            mapping_confidence=confidence,
-        ))
+    columns = _column_analyses(profile_rows(sample_rows, headers), sketches)
 
     # Detect sheet purpose
     purpose, purpose_confidence = detect_sheet_purpose(sheet_name, columns, row_count)
@@ -789,6 +839,13 @@ def _analyze_sheet(
     )
 
 
+def _new_column_sketches(column_count: int, max_row: Optional[int]) -> List[Any]:
+    """One ColumnSketch per column, sized from the sheet's row count."""
+    from tools.column_sketch import ColumnSketch
+
+    return [ColumnSketch(capacity=max_row) for _ in range(column_count)]
+
+
 def _determine_processing_strategy(
     sheets: List[SheetAnalysis],
     relationships: List[SheetRelationshipAnalysis],
@@ -798,12 +855,8 @@ def _determine_processing_strategy(
     if len(sheets) == 1:
         return "process_single"
 
-    # All sheets are items - process all
-    items_sheets = [s for s in sheets if s.detected_purpose == SheetPurpose.ITEMS]
-    if len(items_sheets) == len(sheets):
-        return "process_all_separate"
-
-    # Has items + serials relationship
+    # Has items + serials relationship (checked first: value overlap can
+    # link two sheets that were both classified as items)
     has_serial_rel = any(
         r.relationship_type == SheetRelationship.ONE_TO_MANY
         for r in relationships
@@ -811,6 +864,11 @@ def _determine_processing_strategy(
     if has_serial_rel:
         return "merge_items_serials"
 
+    # All sheets are items - process all
+    items_sheets = [s for s in sheets if s.detected_purpose == SheetPurpose.ITEMS]
+    if len(items_sheets) == len(sheets):
+        return "process_all_separate"
+
     # Has complement relationship
     has_complement = any(
         r.relationship_type == SheetRelationship.COMPLEMENT
@@ -878,6 +936,7 @@ def analysis_to_dict(analysis: WorkbookAnalysis) -> Dict[str, Any]:
                 "confidence": r.confidence,
                 "join_columns": r.join_columns,
                 "description": r.description,
+                "evidence": r.evidence,
             }
             for r in analysis.relationships
         ],
@@ -1257,45 +1316,9 @@ def _analyze_csv(
     })
 
     # Analyze columns
-    columns_analysis = []
-
-    for col_idx, header in enumerate(headers):
-        # Get sample values for this column
-        sample_values = []
-        null_count = 0
-        unique_values = set()
-
-        for row in data_rows:
-            if col_idx < len(row):
-                value = row[col_idx].strip()
-                if value:
-                    sample_values.append(value)
-                    unique_values.add(value)
-                else:
-                    null_count += 1
-            else:
-                null_count += 1
-
-        # Detect data type
-        data_type = _detect_data_type(sample_values)
-
-        # Normalize column name
-        normalized = normalize_column_name(header)
-
-        # Get schema-aware mapping suggestion using the existing function
-        suggested_mapping, mapping_confidence = detect_column_mapping(header)
-
-        columns_analysis.append(ColumnAnalysis(
-            name=header,
-            normalized_name=normalized,
-            sample_values=sample_values[:5],
-            data_type=data_type,
-            unique_count=len(unique_values),
-            null_count=null_count,
-            is_likely_key=len(unique_values) == len(data_rows) and null_count == 0,
-            suggested_mapping=suggested_mapping,
-            mapping_confidence=mapping_confidence,
-        ))
+    columns_analysis = _column_analyses(
+        profile_rows(data_rows, headers), type_threshold=0.8, type_fallback="text",
+    )
 
     # Determine sheet purpose (for CSV, always assume ITEMS)
     purpose = SheetPurpose.ITEMS
@@ -1430,37 +1453,9 @@ def _analyze_txt(
     })
 
     # Analyze columns (same logic as CSV)
-    columns_analysis = []
-    for col_idx, header in enumerate(headers):
-        sample_values = []
-        null_count = 0
-        unique_values = set()
-
-        for row in data_rows:
-            if col_idx < len(row):
-                value = row[col_idx].strip() if row[col_idx] else ""
-                if value:
-                    sample_values.append(value)
-                    unique_values.add(value)
-                else:
-                    null_count += 1
-            else:
-                null_count += 1
-
-        data_type = _detect_data_type(sample_values)
-        suggested_mapping, mapping_confidence = detect_column_mapping(header)
-
-        columns_analysis.append(ColumnAnalysis(
-            name=header,
-            normalized_name=normalize_column_name(header),
-            sample_values=sample_values[:5],
-            data_type=data_type,
-            unique_count=len(unique_values),
-            null_count=null_count,
-            is_likely_key=len(unique_values) == len(data_rows) and null_count == 0,
-            suggested_mapping=suggested_mapping,
-            mapping_confidence=mapping_confidence,
-        ))
+    columns_analysis = _column_analyses(
+        profile_rows(data_rows, headers), type_threshold=0.8, type_fallback="text",
+    )
 
     reasoning_trace.append({
         "type": "conclusion",
@@ -1587,38 +1582,9 @@ def _analyze_json(
     })
 
     # Analyze columns
-    columns_analysis = []
-    for header in headers:
-        sample_values = []
-        null_count = 0
-        unique_values = set()
-
-        for obj in data[:max_sample_rows]:
-            if isinstance(obj, dict):
-                value = obj.get(header)
-                if value is not None:
-                    str_val = str(value)[:100]
-                    sample_values.append(str_val)
-                    unique_values.add(str_val)
-                else:
-                    null_count += 1
-            else:
-                null_count += 1
-
-        data_type = _detect_data_type(sample_values)
-        suggested_mapping, mapping_confidence = detect_column_mapping(header)
-
-        columns_analysis.append(ColumnAnalysis(
-            name=header,
-            normalized_name=normalize_column_name(header),
-            sample_values=sample_values[:5],
-            data_type=data_type,
-            unique_count=len(unique_values),
-            null_count=null_count,
-            is_likely_key=len(unique_values) == min(len(data), max_sample_rows) and null_count == 0,
-            suggested_mapping=suggested_mapping,
-            mapping_confidence=mapping_confidence,
-        ))
+    columns_analysis = _column_analyses(
+        profile_records(data[:max_sample_rows], headers), type_threshold=0.8, type_fallback="text",
+    )
 
     reasoning_trace.append({
         "type": "conclusion",
@@ -1745,31 +1711,13 @@ def _analyze_xls(
             row_values = [ws.cell_value(r, c) for c in range(ws.ncols)]
             sample_rows.append(row_values)
 
-        # Analyze columns
-        columns = []
-        for col_idx, header in enumerate(headers):
-            col_values = [
-                row[col_idx] if col_idx < len(row) else None
-                for row in sample_rows
-            ]
-
-            sample_values = [str(v) for v in col_values[:5] if v is not None and str(v).strip()]
-            data_type = detect_data_type(col_values)
-            mapping, confidence = detect_column_mapping(header)
-
-            unique_vals = set(str(v) for v in col_values if v is not None and str(v).strip())
-
-            columns.append(ColumnAnalysis(
-                name=header,
-                normalized_name=normalize_column_name(header),
-                sample_values=sample_values,
-                data_type=data_type,
-                unique_count=len(unique_vals),
-                null_count=sum(1 for v in col_values if v is None or str(v).strip() == ""),
-                is_likely_key=len(unique_vals) == len([v for v in col_values if v]) and len(unique_vals) > 1,
-                suggested_mapping=mapping,
-                mapping_confidence=confidence,
-            ))
+        # Sketch every value (xlrd already holds the sheet in memory)
+        sketches = _new_column_sketches(len(headers), ws.nrows)
+        for r in range(1, ws.nrows):
+            for sketch, value in zip(sketches, ws.row_values(r)):
+                sketch.add(value)
+
+        columns = _column_analyses(profile_rows(sample_rows, headers), sketches)
 
         # Detect sheet purpose
         purpose, purpose_conf = detect_sheet_purpose(sheet_name, columns, row_count)
@@ -1810,6 +1758,7 @@ def _analyze_xls(
 
     # Detect relationships between sheets
     relationships = detect_sheet_relationships(sheets_analysis)
+    _assign_merge_targets(sheets_analysis, relationships)
     strategy = _determine_processing_strategy(sheets_analysis, relationships)
 
     reasoning_trace.append({
@@ -1889,33 +1838,7 @@ def _analyze_pdf_with_vision(
 
 def _detect_data_type(values: List[str]) -> str:
     """Detect data type from sample values."""
-    if not values:
-        return "text"
-
-    numeric_count = 0
-    date_count = 0
-
-    for v in values:
-        # Check numeric
-        try:
-            float(v.replace(",", ".").replace(" ", ""))
-            numeric_count += 1
-            continue
-        except ValueError:
-            pass
-
-        # Check date patterns
-        if any(sep in v for sep in ["/", "-"]) and len(v) <= 20:
-            parts = v.replace("-", "/").split("/")
-            if len(parts) >= 2 and all(p.isdigit() for p in parts if p):
-                date_count += 1
-
-    if numeric_count >= len(values) * 0.8:
-        return "number"
-    elif date_count >= len(values) * 0.8:
-        return "date"
-    else:
-        return "text"
+    return profile_column("", values).data_type(threshold=0.8, fallback="text")
 
 
 def load_workbook_smart(content: bytes):
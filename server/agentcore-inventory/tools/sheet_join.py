@@ -0,0 +1,191 @@
+# =============================================================================
+# Master-Detail Sheet Join - Streaming Hash Join for Multi-Sheet Workbooks
+# =============================================================================
+# Workbooks often split one import into a master sheet (ITEMS: part number,
+# description, quantity) and a detail sheet (SERIALS: part number, serial).
+# sheet_analyzer detects that relationship from value overlap; this module
+# turns it into import rows:
+#
+# 1. Build: stream the master sheet once, keeping only a dict of
+#    normalized key -> row
+# 2. Probe: stream the detail sheet row by row and yield master + detail
+#    columns for each match (the detail sheet is never held in memory)
+# 3. Optionally yield master rows that had no detail rows
+#
+# Keys are compared with column_sketch.normalize_key (1234.0 == "1234",
+# case-insensitive), the same normalization used for overlap detection.
+#
+# Usage:
+#   from tools.sheet_join import plan_master_detail_join, stream_joined_rows
+#
+#   plan = plan_master_detail_join(analysis)   # WorkbookAnalysis
+#   if plan:
+#       for row in stream_joined_rows(content, plan):
+#           ...
+# =============================================================================
+
+import io
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+from tools.column_sketch import normalize_key
+
+logger = logging.getLogger(__name__)
+
+# Relationships below this confidence are not joined automatically
+MIN_JOIN_CONFIDENCE = 0.75
+
+
+@dataclass
+class JoinPlan:
+    """Which sheets and columns to join."""
+    master_sheet: str
+    master_key: str
+    detail_sheet: str
+    detail_key: str
+    confidence: float = 0.0
+
+
+@dataclass
+class JoinStats:
+    """Counters filled while stream_joined_rows() runs."""
+    master_rows: int = 0
+    detail_rows: int = 0
+    matched_rows: int = 0
+    orphan_detail_rows: int = 0
+    unmatched_master_rows: int = 0
+    duplicate_master_keys: int = 0
+    renamed_columns: Dict[str, str] = field(default_factory=dict)
+
+
+def plan_master_detail_join(
+    analysis: Any,
+    min_confidence: float = MIN_JOIN_CONFIDENCE,
+) -> Optional[JoinPlan]:
+    """
+    Best one-to-many relationship of a WorkbookAnalysis as a JoinPlan.
+
+    Args:
+        analysis: WorkbookAnalysis from sheet_analyzer.analyze_workbook
+        min_confidence: Minimum relationship confidence
+
+    Returns:
+        JoinPlan, or None if no one-to-many relationship qualifies
+    """
+    from tools.sheet_analyzer import SheetRelationship
+
+    candidates = [
+        rel for rel in analysis.relationships
+        if rel.relationship_type == SheetRelationship.ONE_TO_MANY
+        and rel.join_columns
+        and rel.confidence >= min_confidence
+    ]
+    if not candidates:
+        return None
+
+    best = max(candidates, key=lambda rel: rel.confidence)
+    master_key, detail_key = best.join_columns[0]
+    return JoinPlan(
+        master_sheet=best.sheet1,
+        master_key=master_key,
+        detail_sheet=best.sheet2,
+        detail_key=detail_key,
+        confidence=best.confidence,
+    )
+
+
+def _headers(row: Optional[tuple]) -> List[str]:
+    # Same header naming as sheet_analyzer._analyze_sheet
+    return [str(h) if h else f"Column_{i}" for i, h in enumerate(row or ())]
+
+
+def stream_joined_rows(
+    content: bytes,
+    plan: JoinPlan,
+    include_unmatched_master: bool = True,
+    include_orphan_details: bool = True,
+    stats: Optional[JoinStats] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield merged rows of a master-detail XLSX workbook.
+
+    Each detail row is merged with its master row. Detail columns whose
+    name also exists in the master are renamed "<detail sheet>.<column>";
+    the detail join key is dropped (it equals the master key).
+
+    Args:
+        content: Raw XLSX bytes
+        plan: Sheets and join columns (see plan_master_detail_join)
+        include_unmatched_master: Also yield master rows without details
+        include_orphan_details: Also yield detail rows whose key is not in the master
+        stats: Optional JoinStats filled while iterating
+
+    Yields:
+        Row dicts (column name -> cell value)
+    """
+    from openpyxl import load_workbook
+
+    stats = stats if stats is not None else JoinStats()
+    wb = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
+    try:
+        # Build: master key -> row
+        master_iter = wb[plan.master_sheet].iter_rows(values_only=True)
+        master_headers = _headers(next(master_iter, None))
+        master_key_idx = master_headers.index(plan.master_key)
+
+        masters: Dict[str, Dict[str, Any]] = {}
+        for row in master_iter:
+            stats.master_rows += 1
+            key = normalize_key(row[master_key_idx] if master_key_idx < len(row) else None)
+            if key is None:
+                continue
+            if key in masters:
+                stats.duplicate_master_keys += 1
+                continue
+            masters[key] = dict(zip(master_headers, row))
+
+        # Probe: stream detail rows
+        detail_iter = wb[plan.detail_sheet].iter_rows(values_only=True)
+        detail_headers = _headers(next(detail_iter, None))
+        detail_key_idx = detail_headers.index(plan.detail_key)
+        master_names = set(master_headers)
+        output_names = []
+        for name in detail_headers:
+            output = f"{plan.detail_sheet}.{name}" if name in master_names else name
+            if output != name:
+                stats.renamed_columns[name] = output
+            output_names.append(output)
+
+        matched = set()
+        for row in detail_iter:
+            stats.detail_rows += 1
+            key = normalize_key(row[detail_key_idx] if detail_key_idx < len(row) else None)
+            detail = {
+                output_names[i]: value
+                for i, value in enumerate(row[:len(output_names)])
+                if i != detail_key_idx
+            }
+            master = masters.get(key) if key is not None else None
+            if master is not None:
+                matched.add(key)
+                stats.matched_rows += 1
+                yield {**master, **detail}
+            else:
+                stats.orphan_detail_rows += 1
+                if include_orphan_details:
+                    yield {plan.master_key: row[detail_key_idx] if detail_key_idx < len(row) else None, **detail}
+
+        stats.unmatched_master_rows = len(masters) - len(matched)
+        if include_unmatched_master:
+            for key, master in masters.items():
+                if key not in matched:
+                    yield dict(master)
+    finally:
+        wb.close()
+
+    logger.info(
+        f"[SheetJoin] {plan.master_sheet} x {plan.detail_sheet}: "
+        f"{stats.matched_rows} matched, {stats.orphan_detail_rows} orphan details, "
+        f"{stats.unmatched_master_rows} masters without details"
+    )
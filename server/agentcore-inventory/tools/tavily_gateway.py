@@ -39,11 +39,20 @@
 import json
 import logging
 import os
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
 from enum import Enum
 from typing import Any, Dict, List, Optional
 
+from shared.dependency_registry import get_dependency_registry, is_server_failure
 from tools.cognito_mcp_client import CognitoMCPClient, CognitoMCPClientFactory
+from tools.search_cache import (
+    QuotaRateLimiter,
+    SearchResultCache,
+    cache_key,
+    get_rate_limiter,
+    get_search_cache,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -58,6 +67,9 @@ TAVILY_GATEWAY_URL = f"https://{TAVILY_GATEWAY_ID}.gateway.bedrock-agentcore.us-
 TAVILY_TOKEN_URL = "https://my-domain-ze9v2zyh.auth.us-east-2.amazoncognito.com/oauth2/token"
 TAVILY_COGNITO_CLIENT_ID = "5nq8g72i81uc25dd966tht601p"
 
+# Tavily API credits per search
+SEARCH_CREDITS = {"basic": 1, "advanced": 2}
+
 
 # =============================================================================
 # Types and Enums
@@ -130,6 +142,9 @@ class TavilyGatewayAdapter:
     - Argument serialization
     - Response parsing into typed dataclasses
     - Error handling with sensible defaults
+    - Search result caching (SQLite + S3, see tools/search_cache.py)
+    - Process-wide rate limiting and daily credit budget
+    - Adaptive concurrency limit + circuit breaker ("tavily" dependency)
 
     Note: Uses CognitoMCPClient for OAuth2 authentication (CUSTOM_JWT).
           NOT SigV4/IAM - the Tavily Gateway uses Cognito for auth.
@@ -162,14 +177,23 @@ class TavilyGatewayAdapter:
     # MCP target name (from AWS Console - built-in Tavily template)
     TARGET_PREFIX = "target-tavily"
 
-    def __init__(self, mcp_client: CognitoMCPClient):
+    def __init__(
+        self,
+        mcp_client: CognitoMCPClient,
+        cache: Optional[SearchResultCache] = None,
+        rate_limiter: Optional[QuotaRateLimiter] = None,
+    ):
         """
         Initialize Tavily Gateway Adapter.
 
         Args:
             mcp_client: Configured CognitoMCPClient for Gateway communication
+            cache: Search result cache (default: per-container shared cache)
+            rate_limiter: Rate limiter (default: per-container shared limiter)
         """
         self._client = mcp_client
+        self._cache = cache or get_search_cache()
+        self._rate_limiter = rate_limiter or get_rate_limiter()
         logger.info("[TavilyGatewayAdapter] Initialized with Cognito OAuth2 client")
 
     def _tool_name(self, tool: str) -> str:
@@ -222,6 +246,7 @@ class TavilyGatewayAdapter:
         days: Optional[int] = None,
         country: Optional[str] = None,
         timeout: int = 60,
+        use_cache: bool = True,
     ) -> List[SearchResult]:
         """
         Search the web using Tavily's AI-optimized search engine.
@@ -234,6 +259,9 @@ class TavilyGatewayAdapter:
         - Raw content extraction for RAG pipelines
         - Image extraction for documentation
 
+        Fresh cached results are returned without calling Tavily. Searches
+        that would exceed the rate limit or daily credit budget return [].
+
         Args:
             query: Search query (e.g., "Cisco C9200-24P specifications PDF")
             search_depth: BASIC (fast) or ADVANCED (comprehensive)
@@ -248,6 +276,7 @@ class TavilyGatewayAdapter:
             days: Number of days for news search
             country: Country for localized results
             timeout: Request timeout in seconds
+            use_cache: Read and write the search result cache
 
         Returns:
             List of SearchResult objects with url, title, content
@@ -280,19 +309,45 @@ class TavilyGatewayAdapter:
             "country": country,
         })
 
-        try:
-            result = self._client.call_tool(
-                tool_name=self._tool_name("TavilySearchPost"),
-                arguments=arguments,
-                timeout=timeout,
+        key = None
+        if use_cache:
+            key = cache_key(
+                query,
+                include_domains,
+                **{k: v for k, v in arguments.items() if k not in ("query", "include_domains")},
             )
+            cached = self._cache.get(key)
+            if cached is not None:
+                logger.info(f"[TavilyGatewayAdapter] search cache hit ({len(cached)} results)")
+                return [SearchResult(**item) for item in cached]
+
+        if not self._rate_limiter.acquire(SEARCH_CREDITS.get(search_depth.value, 1)):
+            logger.warning(
+                f"[TavilyGatewayAdapter] search skipped, Tavily rate limit or daily "
+                f"budget reached: {self._rate_limiter.get_stats()}"
+            )
+            return []
+
+        try:
+            with get_dependency_registry().get("tavily").guard(is_server_failure, wait_timeout=timeout):
+                result = self._client.call_tool(
+                    tool_name=self._tool_name("TavilySearchPost"),
+                    arguments=arguments,
+                    timeout=timeout,
+                )
 
             # Parse response into SearchResult objects
             results = self._parse_search_results(result)
             logger.info(f"[TavilyGatewayAdapter] search returned {len(results)} results")
+
+            # Empty results are not cached so a later import can retry
+            if key and results:
+                self._cache.put(key, [asdict(r) for r in results])
             return results
 
         except Exception as e:
+            response = getattr(e, "response", None)
+            self._rate_limiter.record_error(getattr(response, "status_code", None))
             logger.error(f"[TavilyGatewayAdapter] search failed: {e}")
             return []
 
@@ -436,7 +491,7 @@ class TavilyGatewayAdapter:
         Comprehensive equipment research using Tavily search and extract.
 
         Combines search and extract tools to gather complete documentation
-        for a piece of equipment.
+        for a piece of equipment. Document types are searched concurrently.
 
         Args:
             part_number: Equipment part number (e.g., "C9200-24P")
@@ -496,13 +551,12 @@ class TavilyGatewayAdapter:
                 manufacturer.lower(), [f"{manufacturer.lower()}.com"]
             )
 
-        # Search for each document type
-        for doc_type in search_types:
+        def search_doc_type(doc_type: str) -> List[SearchResult]:
             query = f"{part_number} {doc_type}"
             if manufacturer:
                 query = f"{manufacturer} {query}"
 
-            search_results = self.search(
+            return self.search(
                 query=query,
                 search_depth=SearchDepth.ADVANCED,
                 include_domains=include_domains,
@@ -510,6 +564,11 @@ class TavilyGatewayAdapter:
                 include_raw_content=True,
             )
 
+        # Search all document types concurrently (search() never raises)
+        with ThreadPoolExecutor(max_workers=max(1, len(search_types))) as executor:
+            doc_results = list(executor.map(search_doc_type, search_types))
+
+        for doc_type, search_results in zip(search_types, doc_results):
             if search_results:
                 best_result = search_results[0]
                 sources.append(best_result.url)
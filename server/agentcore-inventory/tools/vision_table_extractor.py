@@ -17,6 +17,8 @@ import json
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
 
+from tools.column_profiler import profile_records
+
 logger = logging.getLogger(__name__)
 
 # =============================================================================
@@ -234,10 +236,7 @@ def extract_table_from_image(
     Returns:
         WorkbookAnalysis with extracted table data
     """
-    from tools.sheet_analyzer import (
-        WorkbookAnalysis, SheetAnalysis, ColumnAnalysis,
-        SheetPurpose, detect_column_mapping, normalize_column_name
-    )
+    from tools.sheet_analyzer import WorkbookAnalysis, SheetAnalysis, SheetPurpose
 
     reasoning_trace = []
 
@@ -334,36 +333,7 @@ def extract_table_from_image(
     })
 
     # Build column analysis
-    columns_analysis = []
-    for header in headers:
-        sample_values = [
-            str(row.get(header, ""))[:100]
-            for row in rows[:5]
-            if row.get(header) is not None and str(row.get(header)).strip()
-        ]
-
-        # Detect column mapping
-        mapping, map_conf = detect_column_mapping(header)
-
-        # Detect data type from sample values
-        data_type = _detect_data_type_from_samples(sample_values)
-
-        # Count unique and null values
-        all_values = [row.get(header) for row in rows]
-        unique_vals = set(str(v) for v in all_values if v is not None and str(v).strip())
-        null_count = sum(1 for v in all_values if v is None or str(v).strip() == "")
-
-        columns_analysis.append(ColumnAnalysis(
-            name=header,
-            normalized_name=normalize_column_name(header),
-            sample_values=sample_values,
-            data_type=data_type,
-            unique_count=len(unique_vals),
-            null_count=null_count,
-            is_likely_key=len(unique_vals) == len(rows) - null_count and len(unique_vals) > 1,
-            suggested_mapping=mapping,
-            mapping_confidence=map_conf * confidence,  # Adjust by extraction confidence
-        ))
+    columns_analysis = _build_column_analysis(headers, rows, confidence)
 
     # Build notes
     notes = [f"Extraído via Gemini Vision (confiança: {confidence:.0%})"]
@@ -413,10 +383,7 @@ def extract_table_from_pdf(
     Returns:
         WorkbookAnalysis with extracted table data
     """
-    from tools.sheet_analyzer import (
-        WorkbookAnalysis, SheetAnalysis, ColumnAnalysis,
-        SheetPurpose, detect_column_mapping, normalize_column_name
-    )
+    from tools.sheet_analyzer import WorkbookAnalysis, SheetAnalysis, SheetPurpose
 
     reasoning_trace = []
 
@@ -505,32 +472,7 @@ def extract_table_from_pdf(
     })
 
     # Build column analysis
-    columns_analysis = []
-    for header in headers:
-        sample_values = [
-            str(row.get(header, ""))[:100]
-            for row in rows[:5]
-            if row.get(header) is not None and str(row.get(header)).strip()
-        ]
-
-        mapping, map_conf = detect_column_mapping(header)
-        data_type = _detect_data_type_from_samples(sample_values)
-
-        all_values = [row.get(header) for row in rows]
-        unique_vals = set(str(v) for v in all_values if v is not None and str(v).strip())
-        null_count = sum(1 for v in all_values if v is None or str(v).strip() == "")
-
-        columns_analysis.append(ColumnAnalysis(
-            name=header,
-            normalized_name=normalize_column_name(header),
-            sample_values=sample_values,
-            data_type=data_type,
-            unique_count=len(unique_vals),
-            null_count=null_count,
-            is_likely_key=len(unique_vals) == len(rows) - null_count and len(unique_vals) > 1,
-            suggested_mapping=mapping,
-            mapping_confidence=map_conf * confidence,
-        ))
+    columns_analysis = _build_column_analysis(headers, rows, confidence)
 
     # Build notes
     notes = [f"Extraído de PDF via Gemini Vision (confiança: {confidence:.0%})"]
@@ -583,40 +525,26 @@ def _detect_image_mime(content: bytes) -> str:
         return "image/jpeg"
 
 
-def _detect_data_type_from_samples(values: List[str]) -> str:
-    """Detect data type from sample string values."""
-    if not values:
-        return "text"
-
-    numeric_count = 0
-    date_count = 0
-
-    for v in values:
-        if not v:
-            continue
-
-        # Check numeric
-        try:
-            float(v.replace(",", ".").replace(" ", "").replace("R$", "").replace("$", ""))
-            numeric_count += 1
-            continue
-        except ValueError:
-            pass
-
-        # Check date patterns
-        if any(sep in v for sep in ["/", "-"]) and len(v) <= 20:
-            parts = v.replace("-", "/").split("/")
-            if len(parts) >= 2:
-                try:
-                    if all(p.isdigit() for p in parts if p):
-                        date_count += 1
-                        continue
-                except:
-                    pass
-
-    if numeric_count >= len(values) * 0.7:
-        return "number"
-    elif date_count >= len(values) * 0.7:
-        return "date"
-    else:
-        return "text"
+def _build_column_analysis(
+    headers: List[str],
+    rows: List[Dict[str, Any]],
+    confidence: float,
+) -> List[Any]:
+    """ColumnAnalysis for each extracted column (profiled over all rows)."""
+    from tools.sheet_analyzer import ColumnAnalysis, detect_column_mapping, normalize_column_name
+
+    columns_analysis = []
+    for profile in profile_records(rows, headers):
+        mapping, map_conf = detect_column_mapping(profile.name)
+        columns_analysis.append(ColumnAnalysis(
+            name=profile.name,
+            normalized_name=normalize_column_name(profile.name),
+            sample_values=[v[:100] for v in profile.sample_values],
+            data_type=profile.data_type(threshold=0.7, fallback="text"),
+            unique_count=profile.unique_count,
+            null_count=profile.null_count,
+            is_likely_key=profile.is_likely_key,
+            suggested_mapping=mapping,
+            mapping_confidence=map_conf * confidence,  # Adjust by extraction confidence
+        ))
+    return columns_analysis
@@ -175,6 +175,9 @@ locals {
           status      = { type = "string", enum = ["IN_STOCK", "IN_TRANSIT", "RESERVED", "INSTALLED"] }
           limit       = { type = "integer", default = 100, maximum = 1000 }
           offset      = { type = "integer", default = 0 }
+          cursor      = { type = "string", description = "Cursor opaco (next_cursor da página anterior)" }
+          pagination  = { type = "string", enum = ["offset", "keyset"], default = "offset" }
+          total_mode  = { type = "string", enum = ["none", "estimate", "cached"], default = "none", description = "Total aproximado (modo keyset)" }
         }
       }
     },
@@ -201,6 +204,7 @@ locals {
           query       = { type = "string", description = "Termo de busca (serial, PN ou descrição)" }
           search_type = { type = "string", enum = ["serial", "part_number", "description", "all"], default = "all" }
           limit       = { type = "integer", default = 50 }
+          mode        = { type = "string", enum = ["contains", "prefix", "ranked"], default = "contains", description = "ranked retorna os melhores resultados primeiro, com score" }
         }
       }
     },
@@ -229,6 +233,8 @@ locals {
           project_id    = { type = "string" }
           location_id   = { type = "string" }
           limit         = { type = "integer", default = 100 }
+          cursor        = { type = "string", description = "Cursor opaco (next_cursor da página anterior)" }
+          total_mode    = { type = "string", enum = ["none", "estimate", "cached"], default = "none" }
         }
       }
     },
@@ -266,11 +272,123 @@ locals {
       }
     },
     {
-      name        = "sga_reconcile_sap"
-      description = "Compara estoque SGA com dados exportados do SAP"
+      name        = "sga_transfer_assets"
+      description = "Transfere uma lista de seriais entre locais em uma única transação (valida todos os seriais antes de mover)"
+      input_schema = {
+        type     = "object"
+        required = ["part_number", "source_location_id", "destination_location_id", "serial_numbers"]
+        properties = {
+          part_number             = { type = "string" }
+          source_location_id      = { type = "string", description = "Local de origem" }
+          destination_location_id = { type = "string", description = "Local de destino" }
+          serial_numbers          = { type = "array", items = { type = "string" }, minItems = 1, description = "Seriais a transferir" }
+          project_id              = { type = "string" }
+          reason                  = { type = "string" }
+          requested_by            = { type = "string" }
+        }
+      }
+    },
+    {
+      name        = "sga_get_balances_by_locations"
+      description = "Retorna os saldos de vários locais em uma única consulta (geração de campanhas de inventário)"
+      input_schema = {
+        type     = "object"
+        required = ["location_ids"]
+        properties = {
+          location_ids = { type = "array", items = { type = "string" }, minItems = 1, description = "Códigos dos locais" }
+          part_numbers = { type = "array", items = { type = "string" }, description = "Filtrar por part numbers" }
+          project_ids  = { type = "array", items = { type = "string" }, description = "Filtrar por projetos" }
+        }
+      }
+    },
+    {
+      name        = "sga_get_serials_for_balances"
+      description = "Retorna os seriais contáveis de vários pares (part number, local) em uma única consulta"
+      input_schema = {
+        type     = "object"
+        required = ["keys"]
+        properties = {
+          keys = {
+            type = "array"
+            items = {
+              type     = "object"
+              required = ["part_number", "location_id"]
+              properties = {
+                part_number = { type = "string" }
+                location_id = { type = "string" }
+              }
+            }
+            minItems    = 1
+            description = "Pares (part_number, location_id)"
+          }
+        }
+      }
+    },
+    {
+      name        = "sga_get_expedition_stock"
+      description = "Retorna part numbers, seriais e saldos de todos os itens de uma expedição em uma única chamada"
+      input_schema = {
+        type     = "object"
+        required = ["part_numbers"]
+        properties = {
+          part_numbers   = { type = "array", items = { type = "string" }, minItems = 1, description = "Part numbers dos itens" }
+          serial_numbers = { type = "array", items = { type = "string" }, description = "Seriais dos itens serializados" }
+          location_id    = { type = "string", description = "Local dos saldos não serializados" }
+          project_id     = { type = "string", description = "Projeto da expedição" }
+        }
+      }
+    },
+    {
+      name        = "sga_create_reservations"
+      description = "Reserva todos os itens de uma expedição em uma única transação (tudo ou nada)"
+      input_schema = {
+        type     = "object"
+        required = ["expedition_id", "reservations"]
+        properties = {
+          expedition_id = { type = "string" }
+          reservations = {
+            type = "array"
+            items = {
+              type     = "object"
+              required = ["part_number"]
+              properties = {
+                part_number   = { type = "string" }
+                quantity      = { type = "integer", minimum = 1 }
+                location_id   = { type = "string" }
+                serial_number = { type = "string" }
+              }
+            }
+            minItems    = 1
+            description = "Itens a reservar"
+          }
+          project_id  = { type = "string" }
+          reserved_by = { type = "string" }
+          ttl_hours   = { type = "integer", minimum = 1, description = "Validade da reserva em horas (padrão 72)" }
+        }
+      }
+    },
+    {
+      name        = "sga_complete_expedition"
+      description = "Conclui uma expedição em uma única transação: libera as reservas e registra as saídas (EXPEDIÇÃO) com a NF"
       input_schema = {
         type     = "object"
-        required = ["sap_data"]
+        required = ["expedition_id", "nf_number"]
+        properties = {
+          expedition_id = { type = "string" }
+          nf_number     = { type = "string" }
+          nf_key        = { type = "string", description = "Chave de acesso da NF (44 dígitos)" }
+          carrier       = { type = "string" }
+          tracking_code = { type = "string" }
+          destination   = { type = "string", description = "Cliente de destino" }
+          completed_by  = { type = "string" }
+        }
+      }
+    },
+    {
+      name        = "sga_reconcile_sap"
+      description = "Compara estoque SGA com dados exportados do SAP. Modo set (ou s3_uri) reconcilia no banco e retorna contagens e divergências paginadas"
+      input_schema = {
+        type = "object"
         properties = {
           sap_data = {
             type = "array"
@@ -287,6 +405,51 @@ locals {
             description = "Lista de itens do SAP para reconciliação"
           }
           include_serials = { type = "boolean", default = false }
+          mode            = { type = "string", enum = ["full", "set"], default = "full", description = "full: todas as linhas em memória; set: contagens + divergências paginadas" }
+          s3_uri          = { type = "string", description = "Export CSV do SAP no S3 (s3://bucket/sap-exports/...), usa modo set" }
+          csv_delimiter   = { type = "string", default = ",", description = "Delimitador do CSV" }
+          csv_encoding    = { type = "string", default = "UTF8", description = "Encoding do CSV (UTF8, LATIN1, WIN1252)" }
+          run_id          = { type = "string", description = "Reconciliação existente para paginar" }
+          category        = { type = "string", enum = ["discrepancy", "sap_only", "sga_only"], description = "Filtrar divergências por categoria" }
+          cursor          = { type = "string", description = "Cursor opaco (next_cursor) da página anterior" }
+          limit           = { type = "integer", default = 500, description = "Linhas por página (modo set, máx. 5000)" }
+          requested_by    = { type = "string" }
+        }
+      }
+    },
+    {
+      name        = "sga_start_compliance_audit"
+      description = "Cria uma auditoria de compliance e retorna o run_id (nenhuma movimentação é avaliada)"
+      input_schema = {
+        type     = "object"
+        required = ["rules_version"]
+        properties = {
+          rules_version = { type = "string", description = "Versão das regras compiladas" }
+          start_date    = { type = "string", format = "date", description = "Data inicial (YYYY-MM-DD)" }
+          end_date      = { type = "string", format = "date", description = "Data final (YYYY-MM-DD)" }
+          location_id   = { type = "string" }
+          project_id    = { type = "string" }
+          requested_by  = { type = "string" }
+        }
+      }
+    },
+    {
+      name        = "sga_audit_compliance"
+      description = "Audita movimentações históricas contra a matriz de aprovação (streaming, retomável)"
+      input_schema = {
+        type     = "object"
+        required = ["rules"]
+        properties = {
+          rules        = { type = "object", description = "Regras compiladas pelo ComplianceAgent" }
+          start_date   = { type = "string", format = "date", description = "Data inicial (YYYY-MM-DD)" }
+          end_date     = { type = "string", format = "date", description = "Data final (YYYY-MM-DD)" }
+          location_id  = { type = "string" }
+          project_id   = { type = "string" }
+          run_id       = { type = "string", description = "Auditoria a retomar" }
+          requested_by = { type = "string" }
+          chunk_size   = { type = "integer", default = 5000, maximum = 20000 }
+          max_seconds  = { type = "number", default = 20, maximum = 20, description = "Abaixo do timeout de 30s da Lambda" }
+          sample_limit = { type = "integer", default = 50, maximum = 500 }
         }
       }
     },
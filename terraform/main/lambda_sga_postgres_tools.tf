@@ -15,6 +15,8 @@
 # - sga_get_pending_tasks: HIL tasks
 # - sga_create_movement: Create movement
 # - sga_reconcile_sap: SAP comparison
+# - sga_start_compliance_audit: Create a resumable compliance audit run
+# - sga_audit_compliance: Streaming compliance audit
 #
 # Security:
 # - VPC-attached (private subnets)
@@ -88,6 +90,22 @@ resource "aws_iam_role_policy" "sga_postgres_tools_rds" {
   })
 }
 
+# SAP export read access (sga_reconcile_sap with s3_uri)
+resource "aws_iam_role_policy" "sga_postgres_tools_sap_exports" {
+  name = "${local.name_prefix}-sga-postgres-tools-sap-exports"
+  role = aws_iam_role.sga_postgres_tools.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Sid      = "AllowSAPExportRead"
+      Effect   = "Allow"
+      Action   = ["s3:GetObject"]
+      Resource = "${aws_s3_bucket.sga_documents.arn}/sap-exports/*"
+    }]
+  })
+}
+
 # CloudWatch Logs policy
 resource "aws_iam_role_policy" "sga_postgres_tools_logs" {
   name = "${local.name_prefix}-sga-postgres-tools-logs"